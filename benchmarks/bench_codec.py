@@ -0,0 +1,93 @@
+"""Benchmark JSON encode/decode speed and size for task files.
+
+Compares the stdlib codec (pretty and compact) with orjson when installed,
+on 1k, 10k and 100k synthetic tasks.
+
+Usage:
+    uv run python benchmarks/bench_codec.py
+    uv run python benchmarks/bench_codec.py --sizes 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable, List, Tuple
+
+from synthetic import make_tasks
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """Run func `repeat` times and return (best seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _codecs() -> List[Tuple[str, Callable, Callable]]:
+    """Build (name, encode, decode) triples for every available codec."""
+    codecs = [
+        (
+            "json indent=2 (old default)",
+            lambda d: json.dumps(d, indent=2).encode("utf-8"),
+            json.loads,
+        ),
+        (
+            "json compact",
+            lambda d: json.dumps(d, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            ),
+            json.loads,
+        ),
+    ]
+    if orjson is not None:
+        codecs += [
+            (
+                "orjson indent=2",
+                lambda d: orjson.dumps(d, option=orjson.OPT_INDENT_2),
+                orjson.loads,
+            ),
+            ("orjson compact", orjson.dumps, orjson.loads),
+        ]
+    return codecs
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson not installed - only stdlib codecs are measured\n")
+
+    header = f"{'tasks':>8}  {'codec':<28} {'encode ms':>10} {'decode ms':>10} {'size KB':>10}"
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        records = [t.to_dict() for t in make_tasks(size)]
+        for name, encode, decode in _codecs():
+            encode_s, blob = _best_of(lambda: encode(records), args.repeat)
+            decode_s, _ = _best_of(lambda: decode(blob), args.repeat)
+            print(
+                f"{size:>8}  {name:<28} {encode_s * 1000:>10.1f} "
+                f"{decode_s * 1000:>10.1f} {len(blob) / 1024:>10.0f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
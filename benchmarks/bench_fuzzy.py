@@ -0,0 +1,131 @@
+"""Benchmark the fuzzy matcher behind the snippet and task filters.
+
+Generates snippets (50k by default) and times:
+
+- building the matcher and re-syncing it unchanged (what the Snippets tab
+  does after a reload),
+- single queries on a cold matcher: exact words, abbreviations, typos and
+  several words, taking the first page of results,
+- typing queries one character at a time, as the filter sees them (each
+  keystroke narrows the matches of the one before),
+- the old filter for comparison: a substring scan of name, command and
+  tags, sorted by use count.
+
+Usage:
+    uv run python benchmarks/bench_fuzzy.py
+    uv run python benchmarks/bench_fuzzy.py --snippets 10000 --page 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from synthetic import make_snippets
+
+from todo_tui.fuzzy import FuzzyIndex, frecency
+from todo_tui.models import Snippet
+
+QUERIES = [
+    "d",
+    "dock",
+    "docker",
+    "dokcer",
+    "gco",
+    "kubectl roll",
+    "dep api",
+    "12345",
+    "xyzq",
+]
+TYPED = ["docker", "dep api", "kubectl roll"]
+
+
+def _items(snippets: List[Snippet], now: datetime):
+    """Get the matcher items of snippets, as the Snippets tab builds them."""
+    for s in snippets:
+        yield (
+            s.id,
+            " ".join([s.name, *s.tags, s.command]),
+            frecency(s.uses, s.last_used, now),
+        )
+
+
+def _substring_filter(snippets: List[Snippet], query: str) -> List[Snippet]:
+    """The filter the Snippets tab used before the fuzzy matcher."""
+    query = query.lower()
+    matches = [
+        s
+        for s in snippets
+        if query in s.name.lower()
+        or query in s.command.lower()
+        or any(query in tag.lower() for tag in s.tags)
+    ]
+    return sorted(matches, key=lambda s: s.uses, reverse=True)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    """Run a function once; returns the elapsed seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snippets", type=int, default=50_000)
+    parser.add_argument("--page", type=int, default=100, help="results taken per query")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query")
+    args = parser.parse_args()
+
+    snippets = make_snippets(args.snippets)
+    now = datetime(2025, 6, 1)
+    matcher = FuzzyIndex()
+    build = _timed(lambda: matcher.sync(_items(snippets, now)))
+    resync = _timed(lambda: matcher.sync(_items(snippets, now)))
+    print(f"{len(matcher)} snippets\n")
+    print(f"{'build matcher':<24} {build * 1000:>9.1f} ms")
+    print(f"{'re-sync, unchanged':<24} {resync * 1000:>9.1f} ms\n")
+
+    def first_page(query: str) -> list:
+        return list(itertools.islice(matcher.search(query), args.page))
+
+    def cold(query: str) -> float:
+        matcher._narrow.clear()
+        return _timed(lambda: first_page(query))
+
+    header = (
+        f"{'query':<16} {'matches':>8} {'fuzzy ms':>9} {'substring ms':>13}  best match"
+    )
+    print(header)
+    print("-" * len(header))
+    names = {s.id: s.name for s in snippets}
+    for query in QUERIES:
+        matches = sum(1 for _ in matcher.search(query))
+        fuzzy = statistics.median(cold(query) for _ in range(args.repeat))
+        substring = statistics.median(
+            _timed(lambda: _substring_filter(snippets, query))
+            for _ in range(args.repeat)
+        )
+        best = next(matcher.search(query), None)
+        print(
+            f"{query:<16} {matches:>8} {fuzzy * 1000:>9.1f} {substring * 1000:>13.1f}  "
+            f"{names[best.key] if best else '-'}"
+        )
+
+    print("\ntyping, ms per keystroke:")
+    for phrase in TYPED:
+        matcher._narrow.clear()
+        steps = [
+            _timed(lambda: first_page(phrase[:i])) for i in range(1, len(phrase) + 1)
+        ]
+        timings = " ".join(f"{step * 1000:.0f}" for step in steps)
+        print(f"  {phrase!r:<16} {timings}  (total {sum(steps) * 1000:.0f})")
+
+
+if __name__ == "__main__":
+    main()
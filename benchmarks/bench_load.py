@@ -0,0 +1,149 @@
+"""Benchmark cold-start loading of many project task files.
+
+Writes a data directory with many projects (200 by default), then times a
+fresh StorageManager loading every project, once with the files read one
+by one (``load_workers=1``) and once on a thread pool. Both
+``load_all_tasks`` (full task files) and ``load_all_task_summaries`` (the
+summary indexes the app reads at startup) are measured, followed by the
+app's whole first-screen load (projects, summaries, stats) with and without
+the startup snapshot.
+
+Local disks answer from the page cache in microseconds, which hides the
+latency a network home directory adds to every file; ``--latency-ms`` adds
+a sleep to each file read to simulate it.
+
+Usage:
+    uv run python benchmarks/bench_load.py
+    uv run python benchmarks/bench_load.py --projects 200 --latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from synthetic import make_tasks
+
+from todo_tui import storage as storage_module
+from todo_tui.models import Project
+from todo_tui.storage import StorageManager
+
+
+def _build_data_dir(data_dir: Path, projects: int, tasks: int) -> None:
+    """Write ``projects`` projects of ``tasks`` tasks each, with their indexes."""
+    manager = StorageManager(data_dir, skip_migrations=True)
+    project_ids = []
+    for i in range(projects):
+        project = Project(id=f"project-{i:03d}", name=f"Project {i}")
+        manager.add_project(project)
+        project_ids.append(project.id)
+    all_tasks = make_tasks(projects * tasks, projects=projects)
+    for project_id in project_ids:
+        manager.save_tasks(
+            project_id, [t for t in all_tasks if t.project_id == project_id]
+        )
+    manager.flush()
+
+
+def _slow_reads(latency: float) -> Callable[[], None]:
+    """Make every data file read sleep first; returns a function undoing it."""
+    original = Path.read_bytes
+
+    def read_bytes(self: Path) -> bytes:
+        time.sleep(latency)
+        return original(self)
+
+    Path.read_bytes = read_bytes
+    return lambda: setattr(Path, "read_bytes", original)
+
+
+def _time_cold(data_dir: Path, workers: int, method: str, repeat: int) -> float:
+    """Best time of ``repeat`` cold loads by fresh managers."""
+    best = float("inf")
+    for _ in range(repeat):
+        manager = StorageManager(data_dir, skip_migrations=True, load_workers=workers)
+        manager.load_projects()  # startup reads this first in any case
+        start = time.perf_counter()
+        getattr(manager, method)()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _first_screen(manager: StorageManager) -> None:
+    """Load what the app shows on its first screen."""
+    manager.load_projects()
+    manager.load_all_task_summaries()
+    manager.load_project_stats()
+
+
+def _time_first_screen(data_dir: Path, use_snapshot: bool, repeat: int) -> float:
+    """Best time of ``repeat`` first-screen loads by fresh managers."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        manager = StorageManager(data_dir, skip_migrations=True)
+        if use_snapshot:
+            manager.load_startup_snapshot()
+        _first_screen(manager)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=50, help="tasks per project")
+    parser.add_argument(
+        "--latency-ms", type=float, default=2.0, help="simulated per-file read latency"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, storage_module.DEFAULT_LOAD_WORKERS, 32],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _build_data_dir(data_dir, args.projects, args.tasks)
+        restore = _slow_reads(args.latency_ms / 1000)
+        try:
+            print(
+                f"{args.projects} projects x {args.tasks} tasks, "
+                f"{args.latency_ms:g} ms simulated latency per file\n"
+            )
+            header = f"{'method':<26} {'workers':>8} {'ms':>10} {'speedup':>8}"
+            print(header)
+            print("-" * len(header))
+            for method in ("load_all_task_summaries", "load_all_tasks"):
+                timings: List[float] = []
+                for workers in args.workers:
+                    timings.append(_time_cold(data_dir, workers, method, args.repeat))
+                    print(
+                        f"{method:<26} {workers:>8} {timings[-1] * 1000:>10.1f} "
+                        f"{timings[0] / timings[-1]:>7.1f}x"
+                    )
+                print()
+
+            writer = StorageManager(data_dir, skip_migrations=True)
+            _first_screen(writer)
+            writer.write_startup_snapshot()
+            files = _time_first_screen(data_dir, False, args.repeat)
+            cached = _time_first_screen(data_dir, True, args.repeat)
+            print(f"{'first screen, files':<35} {files * 1000:>10.1f}")
+            print(
+                f"{'first screen, startup snapshot':<35} {cached * 1000:>10.1f} "
+                f"{files / cached:>7.1f}x"
+            )
+        finally:
+            restore()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark memory used by materialized Task objects.
+
+Decodes 100k synthetic tasks from JSON and measures, with tracemalloc, the
+memory held by the Task objects built from them: once with plain dataclasses
+(the model layout before ``__slots__`` and string interning) and once with
+the current models.
+
+Usage:
+    uv run python benchmarks/bench_memory.py
+    uv run python benchmarks/bench_memory.py --count 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from synthetic import make_tasks
+
+from todo_tui.models import Task
+
+
+@dataclass
+class LegacySubtask:
+    """Subtask as it was before slots: a plain dataclass."""
+
+    id: str = ""
+    title: str = ""
+    completed: bool = False
+
+
+@dataclass
+class LegacyTask:
+    """Task as it was before slots and interning: a plain dataclass."""
+
+    id: str = ""
+    title: str = ""
+    description: str = ""
+    notes: str = ""
+    completed: bool = False
+    created_at: str = ""
+    completed_at: Optional[str] = None
+    subtasks: List[LegacySubtask] = field(default_factory=list)
+    project_id: str = ""
+    priority: str = "none"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LegacyTask":
+        """Create task from dictionary, without interning."""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            description=data.get("description", ""),
+            notes=data.get("notes", ""),
+            completed=data["completed"],
+            created_at=data["created_at"],
+            completed_at=data.get("completed_at"),
+            subtasks=[
+                LegacySubtask(id=s["id"], title=s["title"], completed=s["completed"])
+                for s in data.get("subtasks", [])
+            ],
+            project_id=data.get("project_id", ""),
+            priority=data.get("priority", "none"),
+        )
+
+
+def measure(records_json: str, from_dict: Callable[[dict], object]) -> int:
+    """Decode the records and build objects, returning bytes still held.
+
+    The decoded dicts are dropped afterwards, so only memory retained by the
+    objects (and the strings they reference) is counted.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = [from_dict(record) for record in json.loads(records_json)]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    records_json = json.dumps([t.to_dict() for t in make_tasks(args.count)])
+
+    before = measure(records_json, LegacyTask.from_dict)
+    after = measure(records_json, Task.from_dict)
+
+    print(f"{args.count} tasks")
+    print(f"  plain dataclasses:       {before / 1024 / 1024:8.1f} MiB")
+    print(f"  slots + interned fields: {after / 1024 / 1024:8.1f} MiB")
+    print(f"  saved:                   {(before - after) / before:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
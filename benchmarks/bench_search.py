@@ -0,0 +1,147 @@
+"""Benchmark the full-text search index.
+
+Writes a data directory with many tasks (100k by default, spread over 50
+projects) plus some notes and snippets, then times:
+
+- a full index build from the loaded data (no saved index),
+- saving the index and a later start that loads it (nothing re-indexed),
+- ranked queries of one or more words, exact and prefix,
+- the first query after a task edit, which re-indexes that task's project.
+
+The synthetic task text uses a small vocabulary, so ``--rare-words`` adds
+made-up words to each description to give the index a realistic number of
+distinct tokens.
+
+Usage:
+    uv run python benchmarks/bench_search.py
+    uv run python benchmarks/bench_search.py --tasks 200000 --projects 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from synthetic import WORDS, make_tasks
+
+from todo_tui.models import Note, Project, Snippet
+from todo_tui.storage import StorageManager
+
+QUERIES = [
+    "deploy",
+    "dep",
+    "api cache",
+    "rel doc",
+    "review budget meeting",
+    "w123",
+    "nomatch",
+]
+
+
+def _build_data_dir(
+    data_dir: Path, tasks: int, projects: int, notes: int, rare_words: int
+) -> List[str]:
+    """Write the synthetic data set.
+
+    Returns:
+        The project ids.
+    """
+    rng = random.Random(7)
+    manager = StorageManager(data_dir, skip_migrations=True)
+    project_ids = [f"project-{i:03d}" for i in range(projects)]
+    for i, project_id in enumerate(project_ids):
+        manager.add_project(Project(id=project_id, name=f"Project {i}"))
+    all_tasks = make_tasks(tasks, projects=projects)
+    for task in all_tasks:
+        extra = (
+            (f"w{rng.randrange(rare_words)}" for _ in range(3)) if rare_words else ()
+        )
+        task.description = " ".join([task.description, *extra])
+    for project_id in project_ids:
+        manager.save_tasks(
+            project_id, [t for t in all_tasks if t.project_id == project_id]
+        )
+    for i in range(notes):
+        content = "\n".join(" ".join(rng.choices(WORDS, k=12)) for _ in range(20))
+        manager.add_note(Note(title=f"Note {i}", content=content))
+        manager.add_snippet(
+            Snippet(
+                name=f"{rng.choice(WORDS)} snippet {i}",
+                command=f"run --{rng.choice(WORDS)} {i}",
+                tags=rng.sample(WORDS, 2),
+            )
+        )
+    manager.flush()
+    return project_ids
+
+
+def _timed(func: Callable[[], object]) -> float:
+    """Run a function once; returns the elapsed seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument(
+        "--notes", type=int, default=200, help="notes and snippets each"
+    )
+    parser.add_argument("--rare-words", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        project_ids = _build_data_dir(
+            data_dir, args.tasks, args.projects, args.notes, args.rare_words
+        )
+
+        manager = StorageManager(data_dir, skip_migrations=True)
+        load = _timed(manager.load_all_tasks)
+        build = _timed(manager.refresh_search_index)
+        documents = manager.refresh_search_index()
+        save = _timed(manager.save_search_index)
+        size_mb = manager.search_file.stat().st_size / 1e6
+
+        warm = StorageManager(data_dir, skip_migrations=True)
+        reopen = _timed(warm.refresh_search_index)
+
+        print(f"{documents} documents, {args.projects} projects\n")
+        print(f"{'load task files (not search)':<34} {load * 1000:>10.1f} ms")
+        print(f"{'full index build':<34} {build * 1000:>10.1f} ms")
+        print(f"{'save index':<34} {save * 1000:>10.1f} ms  ({size_mb:.1f} MB)")
+        print(f"{'start with saved index':<34} {reopen * 1000:>10.1f} ms\n")
+
+        header = f"{'query':<24} {'hits':>7} {'median ms':>10} {'max ms':>8}"
+        print(header)
+        print("-" * len(header))
+        for query in QUERIES:
+            hits = len(warm.search(query, limit=None))
+            runs = [_timed(lambda: warm.search(query)) for _ in range(args.repeat)]
+            print(
+                f"{query:<24} {hits:>7} {statistics.median(runs) * 1000:>10.2f} "
+                f"{max(runs) * 1000:>8.2f}"
+            )
+
+        task = warm.load_tasks(project_ids[0])[0]
+        task.title = "Renamed quasar task"
+        warm.update_task(task)
+        resync = _timed(lambda: warm.search("quasar"))
+        per_project = args.tasks // args.projects
+        print(
+            f"\n{'query after editing a task':<34} {resync * 1000:>10.1f} ms "
+            f"(re-indexes ~{per_project} tasks)"
+        )
+
+
+if __name__ == "__main__":
+    main()
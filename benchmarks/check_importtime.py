@@ -0,0 +1,119 @@
+"""Check the TUI's startup imports against a budget.
+
+Runs ``python -X importtime -c "import todo_tui.app"`` in a fresh
+interpreter and fails (exit status 1) if:
+
+- a module kept behind a lazy import boundary is loaded at startup (sync
+  and encryption, the markdown grammar, weather, the rarely used dialogs,
+  the clipboard helper, the Scratchpad and Snippets tabs), or
+- the cumulative import time of ``todo_tui.app`` exceeds ``--budget-ms``
+  (best of ``--repeat`` runs, to ride out a noisy machine).
+
+The deferred-module check is exact and catches most regressions (it also
+runs in the test suite, see ``tests/test_importtime.py``); the time budget
+catches the rest but depends on the machine, so raise it rather than
+deleting it when a slower CI runner needs more room.
+
+Usage:
+    uv run python benchmarks/check_importtime.py
+    uv run python benchmarks/check_importtime.py --budget-ms 500 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+ENTRY_MODULE = "todo_tui.app"
+
+# Modules that must not be imported just by starting the TUI
+DEFERRED_MODULES = (
+    "cryptography",
+    "httpx",
+    "requests",
+    "pyperclip",
+    "tree_sitter_markdown",
+    "todo_tui.cloud_sync",
+    "todo_tui.encryption",
+    "todo_tui.markdown_syntax",
+    "todo_tui.widgets.forecast_widget",
+    "todo_tui.widgets.onboarding",
+    "todo_tui.widgets.scratchpad",
+    "todo_tui.widgets.snippets",
+    "todo_tui.widgets.sync_dialogs",
+    "todo_tui.widgets.weather_widget",
+)
+
+DEFAULT_BUDGET_MS = 450.0
+
+
+def deferred(modules: Iterable[str]) -> List[str]:
+    """Pick the deferred modules (and their submodules) out of module names."""
+    return sorted(
+        name
+        for name in modules
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES)
+    )
+
+
+def measure() -> Dict[str, Tuple[int, int]]:
+    """Import the entry module in a fresh interpreter.
+
+    Returns:
+        Self and cumulative import time in microseconds, per module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main() -> None:
+    """Run the check and print the slowest startup imports."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeat)]
+    timings = min(runs, key=lambda t: t[ENTRY_MODULE][1])
+    total_ms = timings[ENTRY_MODULE][1] / 1000
+
+    failures: List[str] = []
+    loaded = deferred(timings)
+    if loaded:
+        failures.append("deferred modules imported at startup: " + ", ".join(loaded))
+    if total_ms > args.budget_ms:
+        failures.append(
+            f"import {ENTRY_MODULE} took {total_ms:.1f} ms "
+            f"(budget {args.budget_ms:g} ms)"
+        )
+
+    print(f"import {ENTRY_MODULE}: {total_ms:.1f} ms, {len(timings)} modules")
+    print("\nslowest modules (self time):")
+    slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[: args.top]:
+        print(f"  {self_us / 1000:>8.1f} ms  {name}")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
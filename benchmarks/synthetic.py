@@ -0,0 +1,96 @@
+"""Synthetic data generators shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+from todo_tui.models import Snippet, Subtask, Task
+
+PRIORITIES = ["high", "medium", "low", "none"]
+WORDS = (
+    "fix update review deploy write refactor plan call email draft test "
+    "release docs meeting budget design api cache index sync backup notes"
+).split()
+TOOLS = (
+    "git docker kubectl npm uv make ssh rsync curl psql redis-cli terraform "
+    "aws gcloud helm pytest ffmpeg tar grep systemctl"
+).split()
+
+
+def make_tasks(count: int, projects: int = 10, seed: int = 42) -> List[Task]:
+    """Generate realistic-looking tasks spread over several projects.
+
+    Args:
+        count: Number of tasks to generate.
+        projects: Number of distinct project ids to spread them over.
+        seed: Random seed, so runs are comparable.
+
+    Returns:
+        List of Task objects.
+    """
+    rng = random.Random(seed)
+    project_ids = [f"project-{i:03d}" for i in range(projects)]
+    start = datetime(2025, 1, 1)
+    tasks = []
+    for i in range(count):
+        created = start + timedelta(minutes=rng.randint(0, 500_000))
+        completed = rng.random() < 0.4
+        tasks.append(
+            Task(
+                id=f"task-{i:07d}",
+                title=" ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+                description=" ".join(rng.choices(WORDS, k=rng.randint(0, 40))),
+                notes=" ".join(rng.choices(WORDS, k=rng.randint(0, 20))),
+                completed=completed,
+                created_at=created.isoformat(),
+                completed_at=(created + timedelta(days=rng.randint(0, 30))).isoformat()
+                if completed
+                else None,
+                subtasks=[
+                    Subtask(
+                        id=f"sub-{i:07d}-{j}",
+                        title=" ".join(rng.choices(WORDS, k=3)),
+                        completed=rng.random() < 0.5,
+                    )
+                    for j in range(rng.randint(0, 4))
+                ],
+                project_id=rng.choice(project_ids),
+                priority=rng.choice(PRIORITIES),
+            )
+        )
+    return tasks
+
+
+def make_snippets(count: int, seed: int = 42) -> List[Snippet]:
+    """Generate command snippets with skewed usage counts.
+
+    Args:
+        count: Number of snippets to generate.
+        seed: Random seed, so runs are comparable.
+
+    Returns:
+        List of Snippet objects.
+    """
+    rng = random.Random(seed)
+    now = datetime(2025, 6, 1)
+    snippets = []
+    for i in range(count):
+        tool = rng.choice(TOOLS)
+        words = rng.choices(WORDS, k=rng.randint(1, 4))
+        uses = int(rng.paretovariate(1.2)) - 1
+        snippets.append(
+            Snippet(
+                id=f"snippet-{i:07d}",
+                name=f"{tool} {' '.join(words)} {i}",
+                command=f"{tool} {rng.choice(WORDS)} --{rng.choice(WORDS)}-{i} "
+                f"{'/'.join(rng.choices(WORDS, k=2))}",
+                tags=rng.sample(WORDS, rng.randint(0, 3)),
+                uses=uses,
+                last_used=(now - timedelta(hours=rng.randint(0, 2_000))).isoformat()
+                if uses
+                else None,
+            )
+        )
+    return snippets
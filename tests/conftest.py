@@ -0,0 +1,55 @@
+"""Shared fixtures for the storage tests."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from todo_tui.models import Project
+from todo_tui.storage import StorageManager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    """An empty data directory."""
+    return tmp_path / "data"
+
+
+@pytest.fixture
+def project(data_dir: Path) -> Project:
+    """A project created in ``data_dir`` by a manager that is closed again."""
+    project = Project(name="Inbox")
+    StorageManager(data_dir=data_dir).add_project(project)
+    return project
+
+
+def _run_process(data_dir: Path, code: str) -> None:
+    script = "\n".join(
+        [
+            "import os",
+            "from pathlib import Path",
+            "from todo_tui.models import Project, Task",
+            "from todo_tui.storage import StorageManager",
+            f"data_dir = Path({str(data_dir)!r})",
+            textwrap.dedent(code),
+            "os._exit(0)",
+        ]
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True)
+
+
+@pytest.fixture
+def run_process(data_dir: Path) -> Callable[[str], None]:
+    """Run code in a separate Python process with ``data_dir`` defined.
+
+    The process exits with ``os._exit`` at the end of the code, so nothing is
+    flushed or cleaned up on the way out, as if it had crashed.
+    """
+    return lambda code: _run_process(data_dir, code)
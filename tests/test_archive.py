@@ -0,0 +1,116 @@
+"""Tests for the compressed archive of old completed tasks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from todo_tui.archive import ARCHIVE_DIRNAME, TaskArchive
+from todo_tui.models import Project, Task
+from todo_tui.storage import StorageManager
+
+
+def done(title: str, project: Project, completed_at: str) -> Task:
+    return Task(
+        title=title, project_id=project.id, completed=True, completed_at=completed_at
+    )
+
+
+@pytest.fixture
+def storage(data_dir: Path, project: Project) -> StorageManager:
+    """A manager with three old completed tasks in two months and a recent one."""
+    storage = StorageManager(data_dir=data_dir)
+    storage.bulk_add_tasks(
+        [
+            done("March report", project, "2024-03-05T09:00:00"),
+            done("March invoice", project, "2024-03-05T17:30:00"),
+            done("April report", project, "2024-04-02T10:00:00"),
+            done("Recent", project, "2999-01-01T00:00:00"),
+        ]
+    )
+    return storage
+
+
+def test_entries_round_trip_through_the_month_files(tmp_path: Path):
+    archive = TaskArchive(tmp_path / ARCHIVE_DIRNAME)
+    march = {"project": "p", "record": {"id": "a", "completed_at": "2024-03-05"}}
+    april = {"project": "p", "record": {"id": "b", "completed_at": "2024-04-02"}}
+    archive.add([march, april, {"project": "p", "record": {"id": "c"}}])
+    # Archiving a task again replaces it
+    archive.add([{**march, "record": {**march["record"], "title": "again"}}])
+
+    assert archive.months() == ["2024-03", "2024-04"]
+    assert [e["record"]["title"] for e in archive.read_month("2024-03")] == ["again"]
+
+    removed = archive.remove(lambda e: e["record"]["id"] == "a", archive.months())
+    assert [e["record"]["id"] for e in removed] == ["a"]
+    assert archive.months() == ["2024-04"]
+    assert not archive.month_file("2024-03").exists()
+    assert TaskArchive(tmp_path / ARCHIVE_DIRNAME).read_month("2024-04") == [april]
+
+
+def test_archive_and_restore_round_trip(
+    storage: StorageManager, data_dir: Path, project: Project
+):
+    assert storage.archive_completed_tasks(30) == 3
+    assert [t.title for t in storage.load_tasks(project.id)] == ["Recent"]
+    [task] = storage.search_archived_tasks("april")
+
+    restored = storage.restore_archived_task(project.id, task.id)
+
+    assert restored == task
+    assert storage.search_archived_tasks("april") == []
+    reopened = StorageManager(data_dir=data_dir)
+    assert sorted(t.title for t in reopened.load_tasks(project.id)) == [
+        "April report",
+        "Recent",
+    ]
+    assert [t.title for t in reopened.search_archived_tasks("report")] == [
+        "March report"
+    ]
+
+
+def test_tasks_reopened_before_archiving_stay(
+    storage: StorageManager, project: Project
+):
+    due = storage.archivable_tasks(30)
+    assert len(due[project.id]) == 3
+    task = next(t for t in storage.load_tasks(project.id) if t.title == "April report")
+    task.completed = False
+    storage.update_task(task)
+
+    assert storage.archive_tasks(due) == 2
+    assert storage.search_archived_tasks("april") == []
+    assert storage.get_task(project.id, task.id) is not None
+
+
+def test_rollup_counts_archived_completions(
+    storage: StorageManager, data_dir: Path, project: Project
+):
+    other = Project(name="Work")
+    storage.add_project(other)
+    storage.add_task(done("Work report", other, "2024-04-02T12:00:00"))
+    storage.archive_completed_tasks(30)
+
+    expected = {"2024-03-05": 2, "2024-04-02": 2}
+    assert storage.archived_completions() == expected
+    assert StorageManager(data_dir=data_dir).archived_completions() == expected
+
+    [task] = storage.search_archived_tasks("march invoice")
+    storage.restore_archived_task(project.id, task.id)
+    assert storage.archived_completions() == {"2024-03-05": 1, "2024-04-02": 2}
+
+
+def test_rollup_is_recounted_when_it_is_stale(storage: StorageManager, data_dir: Path):
+    storage.archive_completed_tasks(30)
+    archive = TaskArchive(data_dir / ARCHIVE_DIRNAME)
+    # A crash between writing a month and the rollup
+    archive.rollup_file.write_bytes(b'{"months": {}}')
+    assert TaskArchive(archive.archive_dir).completions_by_day() == {
+        "2024-03-05": 2,
+        "2024-04-02": 1,
+    }
+
+    archive.month_file("2024-03").unlink()
+    assert TaskArchive(archive.archive_dir).completions_by_day() == {"2024-04-02": 1}
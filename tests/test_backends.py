@@ -0,0 +1,171 @@
+"""Tests running the StorageManager API against both storage backends."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from todo_tui import migrations
+from todo_tui.models import Note, Project, Settings, Snippet, Subtask, Task
+from todo_tui.sqlite_storage import SQLiteStorageManager
+from todo_tui.storage import StorageManager, open_storage
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, data_dir: Path) -> StorageManager:
+    return open_storage(Settings(storage_backend=request.param), data_dir=data_dir)
+
+
+def reopen(storage: StorageManager) -> StorageManager:
+    storage.flush()
+    return open_storage(
+        Settings(storage_backend=storage.BACKEND), data_dir=storage.data_dir
+    )
+
+
+def test_projects_and_tasks(storage: StorageManager):
+    inbox, work = Project(name="Inbox"), Project(name="Work")
+    storage.add_project(inbox)
+    storage.add_project(work)
+    task = Task(
+        title="Write tests",
+        description="Both backends",
+        project_id=inbox.id,
+        subtasks=[Subtask(title="JSON"), Subtask(title="SQLite")],
+    )
+    storage.add_task(task)
+    storage.bulk_add_tasks(
+        [Task(title=f"Task {i}", project_id=inbox.id) for i in range(3)]
+    )
+    task.completed = True
+    task.priority = "high"
+    storage.update_task(task)
+
+    reopened = reopen(storage)
+    assert [p.name for p in reopened.load_projects()] == ["Inbox", "Work"]
+    loaded = reopened.get_task(inbox.id, task.id)
+    assert loaded.completed and loaded.priority == "high"
+    assert [s.title for s in loaded.subtasks] == ["JSON", "SQLite"]
+    assert len(reopened.load_tasks(inbox.id)) == 4
+
+    stats = reopened.get_project_stats(inbox.id)
+    assert (stats.total, stats.completed) == (4, 1)
+
+
+def test_summaries_and_bodies(storage: StorageManager):
+    project = Project(name="Inbox")
+    storage.add_project(project)
+    task = Task(title="T", description="Body", notes="Notes", project_id=project.id)
+    storage.add_task(task)
+
+    [summary] = reopen(storage).load_task_summaries(project.id)
+    assert summary.summary_only and summary.description == ""
+    full = storage.load_task_body(summary)
+    assert (full.description, full.notes) == ("Body", "Notes")
+
+
+def test_batch_mutations(storage: StorageManager):
+    source, target = Project(name="Source"), Project(name="Target")
+    storage.add_project(source)
+    storage.add_project(target)
+    tasks = [Task(title=f"Task {i}", project_id=source.id) for i in range(4)]
+    storage.bulk_add_tasks(tasks)
+
+    storage.move_tasks([tasks[0].id, tasks[1].id], target.id, source.id)
+    storage.delete_tasks(source.id, [tasks[2].id])
+
+    reopened = reopen(storage)
+    assert [t.title for t in reopened.load_tasks(source.id)] == ["Task 3"]
+    assert [t.title for t in reopened.load_tasks(target.id)] == ["Task 0", "Task 1"]
+    assert all(t.project_id == target.id for t in reopened.load_tasks(target.id))
+
+
+def test_transaction_rollback(storage: StorageManager):
+    project = Project(name="Inbox")
+    storage.add_project(project)
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            storage.add_task(Task(title="T", project_id=project.id))
+            storage.delete_project(project.id)
+            raise RuntimeError("abort")
+
+    assert [p.id for p in storage.load_projects()] == [project.id]
+    assert storage.load_tasks(project.id) == []
+
+
+def test_notes_and_revisions(storage: StorageManager):
+    note = Note(title="Ideas", content="one\n")
+    storage.add_note(note)
+    note.content = "one\ntwo\n"
+    storage.autosave_note(note)
+    storage.fold_note(note.id)
+    note.content = "one\ntwo\nthree\n"
+    storage.update_note(note)
+
+    reopened = reopen(storage)
+    assert reopened.get_note(note.id).content == "one\ntwo\nthree\n"
+    revisions = reopened.list_note_revisions(note.id)
+    assert reopened.get_note_revision(note.id, revisions[-1].number) == "one\n"
+
+    reopened.delete_note(note.id)
+    assert reopen(reopened).get_note(note.id) is None
+
+
+def test_snippets(storage: StorageManager):
+    snippet = Snippet(name="Status", command="git status", tags=["git"])
+    storage.add_snippet(snippet)
+    snippet.uses = 3
+    storage.update_snippet(snippet)
+
+    loaded = reopen(storage).get_snippet(snippet.id)
+    assert (loaded.command, loaded.tags, loaded.uses) == ("git status", ["git"], 3)
+
+
+def test_search(storage: StorageManager):
+    project = Project(name="Inbox")
+    storage.add_project(project)
+    task = Task(title="Renew passport", description="Embassy", project_id=project.id)
+    storage.add_task(task)
+    storage.add_note(Note(title="Travel", content="passport photos"))
+
+    hits = storage.search("passport")
+    assert {hit.kind for hit in hits} == {"task", "note"}
+    assert [hit.id for hit in storage.search("embassy")] == [task.id]
+
+
+def test_archive_and_restore(storage: StorageManager):
+    project = Project(name="Inbox")
+    storage.add_project(project)
+    old = (datetime.now() - timedelta(days=60)).isoformat()
+    task = Task(title="Old", project_id=project.id, completed=True, completed_at=old)
+    storage.add_task(task)
+
+    assert storage.archive_completed_tasks(30) == 1
+    assert storage.load_tasks(project.id) == []
+    assert [t.id for t in storage.search_archived_tasks("old")] == [task.id]
+
+    restored = storage.restore_archived_task(project.id, task.id)
+    assert restored == task
+    assert reopen(storage).load_tasks(project.id) == [task]
+
+
+def test_json_data_is_imported_once_by_a_migration(data_dir: Path):
+    json_storage = StorageManager(data_dir=data_dir)
+    project = Project(name="Inbox")
+    json_storage.add_project(project)
+    json_storage.add_task(Task(title="T", project_id=project.id))
+
+    storage = SQLiteStorageManager(data_dir=data_dir)
+    assert [t.title for t in storage.load_tasks(project.id)] == ["T"]
+    assert migrations.read_version(data_dir, "sqlite") == migrations.latest_version(
+        "sqlite"
+    )
+
+    # Later JSON changes are not copied again
+    json_storage.add_task(Task(title="Later", project_id=project.id))
+    storage.close()
+    reopened = SQLiteStorageManager(data_dir=data_dir)
+    assert [t.title for t in reopened.load_tasks(project.id)] == ["T"]
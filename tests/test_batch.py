@@ -0,0 +1,114 @@
+"""Tests for the batch task mutation APIs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from todo_tui.journal import MutationJournal
+from todo_tui.models import Project, Task
+from todo_tui.storage import StorageManager
+
+
+@pytest.fixture
+def appends(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Record the entries of each journal append."""
+    calls = []
+    real_extend = MutationJournal.extend
+
+    def extend(self, entries):
+        calls.append([(e["op"], e["project"]) for e in entries])
+        real_extend(self, entries)
+
+    monkeypatch.setattr(MutationJournal, "extend", extend)
+    return calls
+
+
+@pytest.fixture
+def other(data_dir: Path, project: Project) -> Project:
+    other = Project(name="Other")
+    StorageManager(data_dir=data_dir).add_project(other)
+    return other
+
+
+def titles(data_dir: Path, *project_ids: str) -> list:
+    """Titles per project, as seen by a manager replaying leftover journals."""
+    storage = StorageManager(data_dir=data_dir, use_journal=True)
+    return [sorted(t.title for t in storage.load_tasks(pid)) for pid in project_ids]
+
+
+def test_batch_writes_each_project_once(data_dir: Path, project: Project, other):
+    storage = StorageManager(data_dir=data_dir)
+    tasks = [Task(title=f"T{i}", project_id=project.id) for i in range(3)]
+    tasks.append(Task(title="O", project_id=other.id))
+
+    storage.bulk_add_tasks(tasks)
+    for task in tasks:
+        task.completed = True
+    storage.update_tasks(tasks)
+    storage.delete_tasks(project.id, [tasks[0].id, tasks[1].id])
+
+    # Two files added to, two updated, one deleted from
+    assert storage.flush_stats()["written"] == 5
+    assert titles(data_dir, project.id) == [["T2"]]
+    assert StorageManager(data_dir=data_dir).get_task(other.id, tasks[3].id).completed
+
+
+def test_each_batch_is_one_journal_append_per_project(
+    data_dir: Path, project: Project, other, appends: list
+):
+    storage = StorageManager(data_dir=data_dir, use_journal=True)
+    tasks = [Task(title=f"T{i}", project_id=project.id) for i in range(3)]
+
+    storage.bulk_add_tasks(tasks)
+    storage.delete_tasks(project.id, [tasks[0].id, tasks[1].id, "missing"])
+    storage.move_tasks([tasks[2].id], other.id, project.id)
+
+    assert appends == [
+        [("add", project.id)] * 3,
+        [("delete", project.id)] * 2,
+        [("add", other.id)],
+        [("delete", project.id)],
+    ]
+
+
+def test_moved_tasks_survive_a_crash_between_the_appends(
+    data_dir: Path, project: Project, other, run_process
+):
+    run_process(
+        f"""
+        from todo_tui.journal import MutationJournal
+        storage = StorageManager(data_dir=data_dir, use_journal=True)
+        tasks = [Task(title=f"T{{i}}", project_id={project.id!r}) for i in range(2)]
+        storage.bulk_add_tasks(tasks)
+        storage.compact_journal()
+
+        # Die right after the additions to the target project are journaled
+        real_extend = MutationJournal.extend
+        def extend(self, entries):
+            real_extend(self, entries)
+            if entries[0]["op"] == "add":
+                os._exit(0)
+        MutationJournal.extend = extend
+        storage.move_tasks([t.id for t in tasks], {other.id!r}, {project.id!r})
+        """
+    )
+
+    # Nothing is lost: the tasks are in the target and still in the source
+    assert titles(data_dir, other.id, project.id) == [["T0", "T1"], ["T0", "T1"]]
+
+
+def test_move_is_replayed_from_the_journal(
+    data_dir: Path, project: Project, other, run_process
+):
+    run_process(
+        f"""
+        storage = StorageManager(data_dir=data_dir, use_journal=True)
+        tasks = [Task(title=f"T{{i}}", project_id={project.id!r}) for i in range(3)]
+        storage.bulk_add_tasks(tasks)
+        storage.move_tasks([tasks[0].id, tasks[1].id], {other.id!r})
+        """
+    )
+
+    assert titles(data_dir, project.id, other.id) == [["T2"], ["T0", "T1"]]
@@ -0,0 +1,98 @@
+"""Tests for the headless command line interface."""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from todo_tui.cli import run
+from todo_tui.models import Note, Project
+from todo_tui.storage import StorageManager
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """The default data directory, moved into a temporary directory.
+
+    It holds the projects "Inbox" and "Work" and a note "Log".
+    """
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "share"))
+    data_dir = StorageManager.get_default_data_dir()
+    assert data_dir.is_relative_to(tmp_path)
+    storage = StorageManager(data_dir=data_dir)
+    storage.add_project(Project(name="Inbox"))
+    storage.add_project(Project(name="Work"))
+    storage.add_note(Note(title="Log", content="started"))
+    storage.flush()
+    return data_dir
+
+
+def run_json(capsys: pytest.CaptureFixture, *argv: str):
+    """Run a command with ``--json`` and return its parsed output."""
+    capsys.readouterr()
+    assert run([*argv, "--json"]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_task_add_and_list(data_dir: Path, capsys):
+    added = run_json(capsys, "task", "add", "Write report", "--priority", "high")
+    run_json(capsys, "task", "add", "Plan sprint", "-p", "work")
+
+    listed = run_json(capsys, "task", "list")
+    assert [t["title"] for t in listed] == ["Write report", "Plan sprint"]
+    assert listed[0] == added
+    assert [t["title"] for t in run_json(capsys, "task", "list", "-p", "Work")] == [
+        "Plan sprint"
+    ]
+
+
+def test_task_done_and_undo(data_dir: Path, capsys):
+    task = run_json(capsys, "task", "add", "Write report")
+
+    assert run_json(capsys, "task", "done", task["id"][:6])["completed"]
+    assert run_json(capsys, "task", "list") == []
+    assert [t["title"] for t in run_json(capsys, "task", "list", "--all")] == [
+        "Write report"
+    ]
+
+    assert not run_json(capsys, "task", "done", "write report", "--undo")["completed"]
+    assert [t["id"] for t in run_json(capsys, "task", "list")] == [task["id"]]
+
+
+def test_task_move(data_dir: Path, capsys):
+    task = run_json(capsys, "task", "add", "Write report")
+
+    moved = run_json(capsys, "task", "move", task["id"], "Work")
+
+    assert moved["id"] == task["id"]
+    assert run_json(capsys, "task", "list", "-p", "Inbox") == []
+    assert [t["id"] for t in run_json(capsys, "task", "list", "-p", "Work")] == [
+        task["id"]
+    ]
+
+
+def test_note_append_reads_stdin(data_dir: Path, capsys, monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("- call the bank\n"))
+    assert run(["note", "append", "log"]) == 0
+
+    capsys.readouterr()
+    assert run(["note", "cat", "Log"]) == 0
+    assert capsys.readouterr().out == "started\n- call the bank\n"
+
+
+def test_ambiguous_prefix_fails(data_dir: Path, capsys):
+    ids = [run_json(capsys, "task", "add", f"Task {i}")["id"] for i in range(20)]
+    # Of twenty ids, some start with the same hex digit
+    first = [i[0] for i in ids]
+    prefix = next(c for c in first if first.count(c) > 1)
+
+    assert run(["task", "done", prefix]) == 1
+    assert "matches" in capsys.readouterr().err
+    assert run(["task", "done", "no such task"]) == 1
+    assert "no task matches" in capsys.readouterr().err
+    assert len(run_json(capsys, "task", "list")) == 20
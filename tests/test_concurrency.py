@@ -0,0 +1,70 @@
+"""Tests for several storage managers sharing one data directory."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from todo_tui import locking
+from todo_tui.models import Project, Task
+from todo_tui.storage import StorageManager
+
+
+def task_titles(storage: StorageManager, project_id: str) -> list:
+    return sorted(t.title for t in storage.load_tasks(project_id))
+
+
+def test_writes_of_two_managers_are_merged(data_dir: Path, project: Project):
+    first = StorageManager(data_dir=data_dir)
+    second = StorageManager(data_dir=data_dir)
+    kept = Task(title="Kept", project_id=project.id)
+    gone = Task(title="Gone", project_id=project.id)
+    first.bulk_add_tasks([kept, gone])
+    second.load_tasks(project.id)
+
+    first.add_task(Task(title="A", project_id=project.id))
+    second.add_task(Task(title="B", project_id=project.id))
+    second.delete_task(project.id, gone.id)
+
+    reopened = StorageManager(data_dir=data_dir)
+    assert task_titles(reopened, project.id) == ["A", "B", "Kept"]
+
+
+def test_write_bumps_the_file_generation(data_dir: Path, project: Project):
+    storage = StorageManager(data_dir=data_dir)
+    task_file = storage.get_task_file(project.id)
+    before = locking.read_generation(task_file)
+
+    storage.add_task(Task(title="A", project_id=project.id))
+
+    assert locking.read_generation(task_file) == before + 1
+
+
+def test_each_manager_keeps_its_own_journal(data_dir: Path, project: Project):
+    first = StorageManager(data_dir=data_dir, use_journal=True)
+    second = StorageManager(data_dir=data_dir, use_journal=True)
+    assert first._journal.path != second._journal.path
+
+    first.add_task(Task(title="A", project_id=project.id))
+    second.add_task(Task(title="B", project_id=project.id))
+    second.compact_journal()
+
+    # The second manager neither adopted nor deleted the first one's journal
+    assert first._journal.path.exists()
+    assert [e["record"]["title"] for e in first._journal.read_all()] == ["A"]
+
+    first.compact_journal()
+    reopened = StorageManager(data_dir=data_dir)
+    assert task_titles(reopened, project.id) == ["A", "B"]
+
+
+def test_journal_of_a_running_manager_is_not_adopted(data_dir: Path, project: Project):
+    running = StorageManager(data_dir=data_dir, use_journal=True)
+    running.add_task(Task(title="A", project_id=project.id))
+
+    starting = StorageManager(data_dir=data_dir, use_journal=True)
+
+    assert starting._adopted == []
+    assert running._journal.path.exists()
+    # Its entries show up once the running manager folds them in
+    running.compact_journal()
+    assert task_titles(starting, project.id) == ["A"]
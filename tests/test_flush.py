@@ -0,0 +1,200 @@
+"""Tests for the coalescing flush scheduler."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from todo_tui import flush
+from todo_tui.flush import FlushError, FlushScheduler
+from todo_tui.models import Note, Project
+from todo_tui.notelog import PATCH_SUFFIX
+from todo_tui.storage import StorageManager
+
+
+@pytest.fixture
+def failing_writes(monkeypatch: pytest.MonkeyPatch):
+    """Make every atomic write fail like a full disk until ``heal`` is called."""
+
+    class Disk:
+        full = True
+
+        def heal(self) -> None:
+            self.full = False
+
+    disk = Disk()
+    real_write = flush.atomic_write
+
+    def atomic_write(path: Path, data) -> None:
+        if disk.full:
+            raise OSError(28, "No space left on device")
+        real_write(path, data)
+
+    monkeypatch.setattr(flush, "atomic_write", atomic_write)
+    return disk
+
+
+def start_flush_under_lock(storage: StorageManager, action) -> threading.Thread:
+    """Run ``action`` holding the storage lock while a flush is rendering.
+
+    The flush renders on its own thread and blocks on the storage lock, as
+    it does when a mutation races the background flush. Returns the daemon
+    thread running ``action``, so a deadlock shows up as a live thread.
+    """
+    flusher = storage._flusher
+    rendering = threading.Event()
+
+    def blocking(producer):
+        def render():
+            rendering.set()
+            return producer()
+
+        return render
+
+    flusher._pending = {p: blocking(f) for p, f in flusher._pending.items()}
+    flushing = threading.Thread(target=flusher.flush, daemon=True)
+
+    def run() -> None:
+        with storage._lock:
+            flushing.start()
+            assert rendering.wait(5)
+            action()
+        flushing.join()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+    return thread
+
+
+def test_writes_within_the_window_are_coalesced(tmp_path: Path):
+    target = tmp_path / "file.txt"
+    scheduler = FlushScheduler(window=60)
+    for i in range(5):
+        scheduler.schedule(target, lambda i=i: f"version {i}")
+
+    assert not target.exists()
+    scheduler.flush()
+
+    assert target.read_text() == "version 4"
+    assert scheduler.stats() == {
+        "scheduled": 5,
+        "written": 1,
+        "coalesced": 4,
+        "pending": 0,
+    }
+    scheduler.close()
+
+
+def test_failed_synchronous_write_is_reported_once_and_kept(
+    tmp_path: Path, failing_writes
+):
+    target = tmp_path / "file.txt"
+    errors = []
+    scheduler = FlushScheduler(on_error=lambda path, e: errors.append(path))
+
+    scheduler.schedule(target, lambda: "first")
+    scheduler.schedule(target, lambda: "second")
+
+    assert errors == [target]
+    assert scheduler.is_pending(target)
+
+    failing_writes.heal()
+    scheduler.flush()
+    assert target.read_text() == "second"
+    assert not scheduler.is_pending(target)
+
+
+def test_flush_raises_and_keeps_the_files_pending(tmp_path: Path, failing_writes):
+    target = tmp_path / "file.txt"
+    scheduler = FlushScheduler(window=60)
+    scheduler.schedule(target, lambda: "data")
+
+    with pytest.raises(FlushError) as raised:
+        scheduler.flush()
+    assert list(raised.value.errors) == [target]
+    assert scheduler.is_pending(target)
+
+    failing_writes.heal()
+    scheduler.flush()
+    assert target.read_text() == "data"
+    scheduler.close()
+
+
+def test_failure_is_reported_again_after_a_successful_write(
+    tmp_path: Path, failing_writes
+):
+    target = tmp_path / "file.txt"
+    errors = []
+    scheduler = FlushScheduler(on_error=lambda path, e: errors.append(path))
+
+    scheduler.schedule(target, lambda: "first")
+    failing_writes.heal()
+    scheduler.schedule(target, lambda: "second")
+    failing_writes.full = True
+    scheduler.schedule(target, lambda: "third")
+
+    assert errors == [target, target]
+
+
+def test_storage_reports_failed_writes_and_flush_raises(data_dir: Path, failing_writes):
+    failing_writes.heal()
+    storage = StorageManager(data_dir=data_dir)
+    errors = []
+    storage.on_write_error = lambda path, e: errors.append(path)
+    failing_writes.full = True
+
+    project = Project(name="Inbox")
+    storage.add_project(project)
+    storage.update_project(project)
+
+    # Once per file, although the project file was scheduled twice
+    assert errors == [storage.projects_file, storage.get_task_file(project.id)]
+    with pytest.raises(FlushError):
+        storage.flush()
+
+    failing_writes.heal()
+    storage.flush()
+    assert [p.name for p in StorageManager(data_dir=data_dir).load_projects()] == [
+        "Inbox"
+    ]
+
+
+def test_deleting_a_note_while_it_is_flushed(data_dir: Path):
+    storage = StorageManager(data_dir=data_dir, flush_window=60)
+    note = Note(title="Draft", content="text")
+    storage.add_note(note)
+    note_file = storage.get_note_file(note.id)
+    assert storage._flusher.is_pending(note_file)
+
+    thread = start_flush_under_lock(storage, lambda: storage.delete_note(note.id))
+
+    assert not thread.is_alive()
+    assert not note_file.exists()
+    storage.flush()
+    notes = StorageManager(data_dir=data_dir).load_notes()
+    assert note.id not in [n.id for n in notes]
+
+
+def test_folding_a_note_while_it_is_flushed(data_dir: Path):
+    storage = StorageManager(data_dir=data_dir, flush_window=60)
+    note = Note(title="Draft", content="first line\n")
+    storage.add_note(note)
+    note_file = storage.get_note_file(note.id)
+
+    def edit_and_fold() -> None:
+        # The base is still pending, so the autosave writes it synchronously
+        note.content = "first line\nsecond line\n"
+        storage.autosave_note(note)
+        storage.fold_note(note.id)
+
+    thread = start_flush_under_lock(storage, edit_and_fold)
+
+    assert not thread.is_alive()
+    storage.flush()
+    assert note_file.read_text(encoding="utf-8") == "first line\nsecond line\n"
+    assert not (storage.notes_dir / f"{note.id}{PATCH_SUFFIX}").exists()
+    notes = {n.id: n for n in StorageManager(data_dir=data_dir).load_notes()}
+    assert notes[note.id].content == "first line\nsecond line\n"
@@ -0,0 +1,100 @@
+"""Tests for the fuzzy matcher of the snippet and task filters."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List
+
+from todo_tui.fuzzy import FuzzyIndex, frecency
+
+SNIPPETS = {
+    "checkout": "git checkout",
+    "configure": "configure logging",
+    "legacy": "legacy script output",
+    "cloud": "tag cloud",
+    "docker": "docker ps -a",
+}
+
+
+def make_index() -> FuzzyIndex:
+    index = FuzzyIndex()
+    index.sync((key, text, 0.0) for key, text in SNIPPETS.items())
+    return index
+
+
+def keys(index: FuzzyIndex, query: str) -> List[str]:
+    return [match.key for match in index.search(query)]
+
+
+def test_words_match_in_order():
+    index = make_index()
+
+    # Word starts score a bonus; "configure logging" has the letters, but
+    # not in this order
+    assert keys(index, "gco") == ["checkout", "cloud", "legacy"]
+    assert keys(index, "ogc") == []
+    assert keys(index, "GIT Chk") == ["checkout"]
+    assert keys(index, "git nothing") == []
+
+
+def test_typos_match_similar_words():
+    index = make_index()
+
+    assert keys(index, "dokcer") == ["docker"]
+    assert keys(index, "chekcout") == ["checkout"]
+    # Short words must match in order
+    assert keys(index, "dkco") == []
+
+
+def test_narrowing_sees_updates_and_removals():
+    index = make_index()
+    assert keys(index, "do") == ["docker"]
+
+    # Extending "do" to "dot" narrows to the matches cached for "do"
+    index.update("dotfiles", "sync dotfiles")
+    assert keys(index, "dot") == ["dotfiles"]
+    index.update("docker", "podman ps -a")
+    assert keys(index, "doc") == []
+    assert keys(index, "podm") == ["docker"]
+
+    keys(index, "g")
+    index.discard("checkout")
+    assert "checkout" not in keys(index, "gc")
+    assert keys(index, "gco") == ["cloud", "legacy"]
+
+
+def test_empty_query_ranks_by_frecency():
+    now = datetime(2026, 5, 1, 12, 0)
+    recently = (now - timedelta(hours=1)).isoformat()
+    long_ago = (now - timedelta(days=365)).isoformat()
+    assert frecency(0, recently, now) == 0.0
+    assert frecency(10, recently, now) > frecency(10, long_ago, now)
+    assert frecency(100, long_ago, now) > frecency(10, long_ago, now)
+    assert frecency(5, "not a date", now) == frecency(5, None, now)
+
+    index = FuzzyIndex()
+    index.sync(
+        [
+            ("unused", "git stash", frecency(0, None, now)),
+            ("old", "git status", frecency(50, long_ago, now)),
+            ("recent", "git switch", frecency(50, recently, now)),
+            ("also unused", "git show", 0.0),
+        ]
+    )
+
+    # Ties keep the order the items were added in
+    assert keys(index, "") == ["recent", "old", "unused", "also unused"]
+    assert keys(index, "git s") == ["recent", "old", "unused", "also unused"]
+
+
+def test_sync_removes_stale_keys():
+    index = make_index()
+    keys(index, "docker")
+
+    index.sync([("docker", "docker ps -a", 0.0), ("new", "kubectl get pods", 0.0)])
+
+    assert len(index) == 2
+    assert keys(index, "") == ["docker", "new"]
+    assert keys(index, "gco") == []
+    assert keys(index, "docker") == ["docker"]
+    assert keys(index, "kgp") == ["new"]
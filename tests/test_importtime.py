@@ -0,0 +1,37 @@
+"""Test that starting the TUI leaves the lazily imported modules alone."""
+
+from __future__ import annotations
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_check():
+    """Import ``benchmarks/check_importtime.py``, which is not a package."""
+    path = ROOT / "benchmarks" / "check_importtime.py"
+    spec = importlib.util.spec_from_file_location("check_importtime", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_deferred_modules_are_not_imported_at_startup():
+    check = load_check()
+    # A fresh interpreter: this one has imported whatever the other tests use
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {check.ENTRY_MODULE}; print('\\n'.join(sys.modules))",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert check.deferred(result.stdout.split()) == []
@@ -0,0 +1,112 @@
+"""Tests for the task mutation journal and its compaction."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from todo_tui import codec
+from todo_tui.journal import MutationJournal, adopt_orphans
+from todo_tui.models import Project, Task
+from todo_tui.storage import StorageManager
+
+
+def journal_files(data_dir: Path) -> list:
+    return sorted(p.name for p in data_dir.glob("journal*.jsonl*"))
+
+
+def wait_for_compaction(storage: StorageManager) -> None:
+    if storage._compaction_thread is not None:
+        storage._compaction_thread.join()
+
+
+def test_mutations_are_journaled_instead_of_rewriting_the_task_file(
+    data_dir: Path, project: Project
+):
+    storage = StorageManager(data_dir=data_dir, use_journal=True)
+    task_file = storage.get_task_file(project.id)
+    before = task_file.read_bytes()
+
+    task = Task(title="Write tests", project_id=project.id)
+    storage.add_task(task)
+    task.completed = True
+    storage.update_task(task)
+
+    assert task_file.read_bytes() == before
+    assert [e["op"] for e in storage._journal.read_all()] == ["add", "update"]
+    assert storage.get_task(project.id, task.id).completed
+
+
+def test_compaction_folds_the_journal_into_the_task_file(
+    data_dir: Path, project: Project
+):
+    storage = StorageManager(data_dir=data_dir, use_journal=True)
+    task = Task(title="Write tests", project_id=project.id)
+    storage.add_task(task)
+
+    storage.compact_journal()
+
+    assert storage._journal.is_empty()
+    records = codec.loads(storage.get_task_file(project.id).read_bytes())
+    assert [r["id"] for r in records] == [task.id]
+
+
+def test_journal_of_a_crashed_process_is_replayed_and_folded_in(
+    data_dir: Path, project: Project, run_process
+):
+    run_process(
+        f"""
+        storage = StorageManager(data_dir=data_dir, use_journal=True)
+        storage.add_task(Task(id="t1", title="Survives", project_id={project.id!r}))
+        """,
+    )
+    assert len(journal_files(data_dir)) == 1
+
+    storage = StorageManager(data_dir=data_dir, use_journal=True)
+    assert [t.title for t in storage.load_tasks(project.id)] == ["Survives"]
+
+    wait_for_compaction(storage)
+    assert journal_files(data_dir) == []
+    reopened = StorageManager(data_dir=data_dir)
+    assert [t.id for t in reopened.load_tasks(project.id)] == ["t1"]
+
+
+def test_torn_last_line_of_a_crashed_journal_is_skipped(
+    data_dir: Path, project: Project
+):
+    data_dir.mkdir(exist_ok=True)
+    orphan = data_dir / "journal-1-dead.jsonl"
+    record = Task(id="t1", title="Kept", project_id=project.id).to_dict()
+    entry = {"op": "add", "project": project.id, "record": record}
+    orphan.write_bytes(codec.dumps(entry, compact=True) + b'\n{"op": "add", "pro')
+
+    storage = StorageManager(data_dir=data_dir, use_journal=True)
+
+    assert [t.title for t in storage.load_tasks(project.id)] == ["Kept"]
+
+
+def test_interrupted_compaction_is_replayed_before_the_live_journal(
+    data_dir: Path, project: Project
+):
+    data_dir.mkdir(exist_ok=True)
+    record = Task(id="t1", title="Old", project_id=project.id).to_dict()
+    journal = MutationJournal(data_dir, name="journal-1-dead.jsonl")
+    journal.append({"op": "add", "project": project.id, "record": record})
+    journal.rotate()
+    journal.append(
+        {"op": "update", "project": project.id, "id": "t1", "fields": {"title": "New"}}
+    )
+    journal.close()
+    journal._owner.release()
+
+    storage = StorageManager(data_dir=data_dir, use_journal=True)
+
+    assert [t.title for t in storage.load_tasks(project.id)] == ["New"]
+
+
+def test_empty_orphans_are_cleaned_up(data_dir: Path):
+    data_dir.mkdir()
+    journal = MutationJournal(data_dir, name="journal-1-dead.jsonl")
+    journal._owner.release()
+
+    assert adopt_orphans(data_dir) == []
+    assert list(data_dir.iterdir()) == []
@@ -0,0 +1,76 @@
+"""Tests for the versioned data directory migrations."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from todo_tui import migrations
+from todo_tui.flush import FlushError
+from todo_tui.models import Note
+from todo_tui.storage import StorageManager
+
+
+def test_fresh_directory_is_brought_to_the_latest_version(data_dir: Path):
+    storage = StorageManager(data_dir=data_dir, flush_window=60)
+
+    assert migrations.read_version(data_dir) == migrations.latest_version()
+    # The marker was only written once the migrations' files were on disk
+    assert storage.projects_file.exists()
+    assert storage.notes_index_file.exists()
+    assert migrations.run(storage, data_dir) == 0
+
+
+def test_data_migrations_wait_for_a_normal_start(data_dir: Path):
+    StorageManager(data_dir=data_dir, skip_migrations=True)
+    assert migrations.read_version(data_dir) == 1
+
+    StorageManager(data_dir=data_dir)
+    assert migrations.read_version(data_dir) == migrations.latest_version()
+
+
+def test_legacy_notes_file_is_split_into_note_files(data_dir: Path):
+    data_dir.mkdir()
+    note = Note(title="Ideas", content="# Ideas\n")
+    (data_dir / "notes.json").write_text(json.dumps([note.to_dict()]))
+
+    storage = StorageManager(data_dir=data_dir)
+
+    assert storage.get_note_file(note.id).read_text() == "# Ideas\n"
+    assert [n.content for n in storage.load_notes()] == ["# Ideas\n"]
+
+
+def test_marker_stays_below_a_migration_whose_writes_failed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    class Storage:
+        disk_full = True
+
+        def flush(self) -> None:
+            if self.disk_full:
+                raise FlushError({tmp_path / "file": OSError(28, "Disk full")})
+
+    applied = []
+    monkeypatch.setattr(
+        migrations,
+        "_REGISTRY",
+        {
+            "json": [
+                migrations.Migration(1, "First", lambda storage: applied.append(1)),
+                migrations.Migration(2, "Second", lambda storage: applied.append(2)),
+            ]
+        },
+    )
+    storage = Storage()
+
+    with pytest.raises(FlushError):
+        migrations.run(storage, tmp_path)
+    assert migrations.read_version(tmp_path) == 0
+
+    # The migration runs again on the next start and the marker then moves
+    storage.disk_full = False
+    assert migrations.run(storage, tmp_path) == 2
+    assert applied == [1, 1, 2]
+    assert migrations.read_version(tmp_path) == 2
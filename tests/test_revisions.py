@@ -0,0 +1,132 @@
+"""Tests for the delta-compressed note revision history."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from todo_tui import revisions
+from todo_tui.models import Note
+from todo_tui.revisions import NoteHistory
+from todo_tui.storage import StorageManager
+
+VERSIONS = ["# Plan\n\n" + "step\n" * i + "done\n" for i in range(1, 8)]
+
+
+@pytest.fixture
+def history_file(data_dir: Path) -> Path:
+    """History of a note with seven revisions, every third one in full."""
+    storage = StorageManager(data_dir=data_dir, history_snapshot_interval=3)
+    note = Note(title="Plan", content=VERSIONS[0])
+    storage.add_note(note)
+    for content in VERSIONS[1:]:
+        note.content = content
+        storage.update_note(note)
+    storage.flush()
+    return storage.get_note_history_file(note.id)
+
+
+def reopen(data_dir: Path) -> StorageManager:
+    return StorageManager(data_dir=data_dir, history_snapshot_interval=3)
+
+
+def note_id(history_file: Path) -> str:
+    return history_file.name[: -len(revisions.HISTORY_SUFFIX)]
+
+
+def rewrite_lines(history_file: Path, lines: List[bytes]) -> None:
+    history_file.write_bytes(b"".join(lines))
+
+
+def test_revisions_round_trip(history_file: Path, data_dir: Path):
+    entries = revisions.load(history_file)
+    assert ["full" in e for e in entries] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+
+    storage = reopen(data_dir)
+    listed = storage.list_note_revisions(note_id(history_file))
+    assert [r.number for r in listed] == [7, 6, 5, 4, 3, 2, 1]
+    for number, content in enumerate(VERSIONS, start=1):
+        assert storage.get_note_revision(note_id(history_file), number) == content
+    assert storage.get_note_revision(note_id(history_file), 8) is None
+
+
+def test_restoring_an_old_revision(history_file: Path, data_dir: Path):
+    storage = reopen(data_dir)
+    note = storage.get_note(note_id(history_file))
+    note.content = storage.get_note_revision(note.id, 2)
+    storage.update_note(note)
+    storage.flush()
+
+    storage = reopen(data_dir)
+    assert storage.get_note(note.id).content == VERSIONS[1]
+    # The restore is a revision of its own; the newer ones are kept
+    assert [r.number for r in storage.list_note_revisions(note.id)][:2] == [8, 7]
+    assert storage.get_note_revision(note.id, 8) == VERSIONS[1]
+    assert storage.get_note_revision(note.id, 7) == VERSIONS[6]
+
+
+def test_truncated_last_entry_is_skipped(history_file: Path, data_dir: Path):
+    lines = history_file.read_bytes().splitlines(keepends=True)
+    rewrite_lines(history_file, lines[:-1] + [lines[-1][:10]])
+
+    storage = reopen(data_dir)
+    note = storage.get_note(note_id(history_file))
+    assert storage.list_note_revisions(note.id)[0].number == 6
+    assert storage.get_note_revision(note.id, 6) == VERSIONS[5]
+
+    # New revisions continue the intact chain
+    note.content = "rewritten\n"
+    storage.update_note(note)
+    storage = reopen(data_dir)
+    assert storage.list_note_revisions(note.id)[0].number == 7
+    assert storage.get_note_revision(note.id, 7) == "rewritten\n"
+    assert storage.get_note_revision(note.id, 5) == VERSIONS[4]
+
+
+def test_missing_first_snapshot_drops_its_deltas(history_file: Path, data_dir: Path):
+    lines = history_file.read_bytes().splitlines(keepends=True)
+    rewrite_lines(history_file, lines[1:])
+
+    storage = reopen(data_dir)
+    listed = storage.list_note_revisions(note_id(history_file))
+    assert [r.number for r in listed] == [7, 6, 5, 4]
+    assert storage.get_note_revision(note_id(history_file), 2) is None
+    assert storage.get_note_revision(note_id(history_file), 5) == VERSIONS[4]
+
+
+def test_gap_in_the_delta_chain(history_file: Path, data_dir: Path):
+    lines = history_file.read_bytes().splitlines(keepends=True)
+    # Lose revision 2, and damage the delta of revision 5
+    damaged = lines[4].replace(b'"delta":[', b'"delta":[null,')
+    rewrite_lines(history_file, lines[:1] + lines[2:4] + [damaged] + lines[5:])
+
+    storage = reopen(data_dir)
+    listed = storage.list_note_revisions(note_id(history_file))
+    assert [r.number for r in listed] == [7, 4, 1]
+    for number in (1, 4, 7):
+        assert (
+            storage.get_note_revision(note_id(history_file), number)
+            == VERSIONS[number - 1]
+        )
+
+
+def test_pruning_rewrites_the_first_delta_as_a_snapshot():
+    history = NoteHistory([], snapshot_interval=3, max_revisions=4)
+    for i, content in enumerate(VERSIONS):
+        history.record(content, f"2026-01-0{i + 1}")
+        history.prune()
+
+    assert [r.number for r in history.revisions()] == [7, 6, 5, 4]
+    assert "full" in history.entries[0]
+    assert [history.content(n) for n in range(4, 8)] == VERSIONS[3:]
+    assert history.content(3) is None
@@ -0,0 +1,159 @@
+"""Tests for the inverted full-text index."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from todo_tui.models import Project
+from todo_tui.search import (
+    FIELD_WEIGHTS,
+    PREFIX_FACTOR,
+    Document,
+    SearchIndex,
+    read_index,
+    tokenize,
+    write_index,
+)
+from todo_tui.storage import StorageManager
+
+
+def task(task_id: str, title: str, **fields: str) -> Document:
+    return Document("task", task_id, title, "p", {"title": title, **fields})
+
+
+def ids(index: SearchIndex, query: str) -> list:
+    return [hit.id for hit in index.search(query)]
+
+
+def test_tokenize():
+    assert tokenize("Fix BUG_42: déjà-vu, again!") == [
+        "fix",
+        "bug_42",
+        "déjà",
+        "vu",
+        "again",
+    ]
+    assert tokenize("STRASSE Straße") == ["strasse", "strasse"]
+    assert tokenize(" -- ") == []
+
+
+def test_words_match_as_prefixes():
+    index = SearchIndex()
+    index.sync_source(
+        "tasks/p",
+        [
+            task("a", "Deploy"),
+            task("b", "Deployment"),
+            task("c", "Redeploy"),
+            task("d", "Deploy docs"),
+        ],
+    )
+
+    title = FIELD_WEIGHTS["task"]["title"]
+    assert [(hit.id, hit.score) for hit in index.search("deploy")] == [
+        ("a", title),
+        ("d", title),
+        ("b", title * PREFIX_FACTOR),
+    ]
+    assert ids(index, "DEPLOYM") == ["b"]
+    assert ids(index, "rede") == ["c"]
+    # Every word has to match
+    assert ids(index, "deploy do") == ["d"]
+    assert ids(index, "deploy nothing") == []
+
+
+def test_ranking_follows_the_field_weights():
+    index = SearchIndex()
+    index.sync_source(
+        "tasks/p",
+        [
+            task("description", "Zebra", description="quarterly report"),
+            task("title", "Report"),
+            task("subtasks", "Yak", subtasks="draft the report"),
+            task("both", "Report", notes="report sent"),
+            task("tie", "Annual report"),
+        ],
+    )
+
+    # Equal scores are ordered by title
+    assert ids(index, "report") == ["both", "tie", "title", "subtasks", "description"]
+    weights = FIELD_WEIGHTS["task"]
+    assert index.search("report")[0].score == weights["title"] + weights["notes"]
+    assert ids(index, "report")[:2] == [h.id for h in index.search("report", limit=2)]
+    assert [h.id for h in index.search("report", kinds=["note"])] == []
+
+
+def test_sync_reindexes_only_changed_documents():
+    index = SearchIndex()
+    notes = [
+        Document(
+            "note", "n1", "Groceries", "", {"title": "Groceries", "content": "milk"}
+        ),
+        Document("note", "n2", "Trip", "", {"title": "Trip", "content": "passport"}),
+    ]
+    assert index.sync_source("notes", notes) == 2
+    assert index.sync_source("notes", notes) == 0
+
+    # A renamed document keeps its postings when its text is unchanged
+    renamed = Document(
+        "note", "n2", "Holiday", "", {"title": "Trip", "content": "passport"}
+    )
+    assert index.sync_source("notes", [notes[0], renamed]) == 0
+    assert [h.title for h in index.search("passport")] == ["Holiday"]
+
+    edited = Document(
+        "note", "n1", "Groceries", "", {"title": "Groceries", "content": "eggs"}
+    )
+    assert index.sync_source("notes", [edited, renamed]) == 1
+    assert ids(index, "milk") == [] and ids(index, "mil") == []
+    assert ids(index, "eggs") == ["n1"]
+
+    assert index.sync_source("notes", [edited]) == 1
+    assert ids(index, "passport") == [] and ids(index, "pass") == []
+    assert len(index) == 1
+
+    index.sync_source("tasks/p", [task("t", "Pack the passport")])
+    index.drop_source("notes")
+    assert ids(index, "eggs") == []
+    assert ids(index, "pass") == ["t"]
+
+
+def test_saved_index_round_trips(tmp_path: Path):
+    index = SearchIndex()
+    index.sync_source("tasks/p", [task("a", "Deploy"), task("b", "Deployment")])
+    index.sources["tasks/p"] = (1, 2)
+    path = tmp_path / "search.idx"
+    write_index(path, index)
+
+    loaded = read_index(path)
+
+    assert loaded.search("deploy") == index.search("deploy")
+    assert loaded.sources == {"tasks/p": (1, 2)}
+    assert loaded.sync_source("tasks/p", [task("a", "Deploy")]) == 1
+    assert ids(loaded, "deploy") == ["a"]
+    path.write_bytes(b"garbage")
+    assert read_index(path) is None
+
+
+def test_indexing_thread_does_not_hide_changes_from_others(
+    data_dir: Path, project: Project
+):
+    storage = StorageManager(data_dir=data_dir)
+    storage.load_projects()
+    indexing, done = threading.Event(), threading.Event()
+
+    def index() -> None:
+        with storage._cached_reads():
+            indexing.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=index)
+    thread.start()
+    try:
+        assert indexing.wait(5)
+        StorageManager(data_dir=data_dir).add_project(Project(name="Work"))
+        assert [p.name for p in storage.load_projects()] == ["Inbox", "Work"]
+    finally:
+        done.set()
+        thread.join()
@@ -0,0 +1,94 @@
+"""Tests for the startup snapshot that seeds the caches on launch."""
+
+from __future__ import annotations
+
+import marshal
+from pathlib import Path
+
+import pytest
+
+from todo_tui import snapshot
+from todo_tui.models import Project, Task
+from todo_tui.storage import StorageManager
+
+
+@pytest.fixture
+def task(data_dir: Path, project: Project) -> Task:
+    """A task of ``project``, saved along with a startup snapshot."""
+    storage = StorageManager(data_dir=data_dir)
+    task = Task(title="Seeded", project_id=project.id)
+    storage.add_task(task)
+    storage.compact_journal()
+    assert storage.write_startup_snapshot()
+    return task
+
+
+def titles(storage: StorageManager, project_id: str) -> list:
+    return [t.title for t in storage.load_task_summaries(project_id)]
+
+
+def test_snapshot_seeds_the_caches(data_dir: Path, project: Project, task: Task):
+    storage = StorageManager(data_dir=data_dir)
+
+    assert storage.load_startup_snapshot()
+    assert storage.verify_startup_snapshot() == set()
+    assert [p.name for p in storage.load_projects()] == ["Inbox"]
+    assert titles(storage, project.id) == ["Seeded"]
+
+
+def test_changed_files_are_reported_by_verify(
+    data_dir: Path, project: Project, task: Task
+):
+    other = StorageManager(data_dir=data_dir)
+    other.add_project(Project(name="Work"))
+    task.title = "Renamed"
+    other.update_task(task)
+    other.compact_journal()
+
+    storage = StorageManager(data_dir=data_dir)
+    assert storage.load_startup_snapshot()
+    changed = storage.verify_startup_snapshot()
+
+    assert changed == {storage.projects_file, storage.get_task_file(project.id)}
+    assert storage.external_changes(changed) == {
+        "projects": set(),
+        "tasks": {project.id},
+    }
+    assert [p.name for p in storage.load_projects()] == ["Inbox", "Work"]
+    assert titles(storage, project.id) == ["Renamed"]
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        pytest.param(lambda data: data[: len(data) // 2], id="truncated"),
+        pytest.param(lambda data: b"garbage" + data, id="corrupt"),
+        pytest.param(
+            lambda data: marshal.dumps(
+                {
+                    **marshal.loads(data),
+                    "format": (snapshot.FORMAT_VERSION - 1, marshal.version),
+                }
+            ),
+            id="old-format",
+        ),
+        pytest.param(
+            lambda data: marshal.dumps(
+                {
+                    **marshal.loads(data),
+                    "format": (snapshot.FORMAT_VERSION, marshal.version + 1),
+                }
+            ),
+            id="other-python",
+        ),
+    ],
+)
+def test_unusable_snapshot_falls_back_to_the_files(
+    data_dir: Path, project: Project, task: Task, damage
+):
+    storage = StorageManager(data_dir=data_dir)
+    storage.snapshot_file.write_bytes(damage(storage.snapshot_file.read_bytes()))
+
+    assert not storage.load_startup_snapshot()
+    assert [p.name for p in storage.load_projects()] == ["Inbox"]
+    assert titles(storage, project.id) == ["Seeded"]
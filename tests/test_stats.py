@@ -0,0 +1,75 @@
+"""Tests for the per-project task stats and their index."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from todo_tui import codec
+from todo_tui.models import Project, ProjectStats, Task
+from todo_tui.storage import StorageManager
+
+
+def counts(stats: ProjectStats) -> tuple:
+    return stats.total, stats.completed, stats.by_priority
+
+
+def test_stats_follow_task_mutations(data_dir: Path, project: Project):
+    storage = StorageManager(data_dir=data_dir)
+    other = Project(name="Other")
+    storage.add_project(other)
+    high = Task(title="High", priority="high", project_id=project.id)
+    low = Task(title="Low", priority="low", project_id=project.id)
+    plain = Task(title="Plain", project_id=project.id)
+    storage.bulk_add_tasks([high, low, plain])
+    assert counts(storage.get_project_stats(project.id)) == (
+        3,
+        0,
+        {"high": 1, "low": 1, "none": 1},
+    )
+
+    high.toggle_complete()
+    storage.update_task(high)
+    assert counts(storage.get_project_stats(project.id))[:2] == (3, 1)
+
+    storage.move_tasks([high.id], other.id, project.id)
+    assert counts(storage.get_project_stats(project.id)) == (
+        2,
+        0,
+        {"low": 1, "none": 1},
+    )
+    assert counts(storage.get_project_stats(other.id)) == (1, 1, {"high": 1})
+
+    storage.delete_task(project.id, low.id)
+    assert counts(storage.get_project_stats(project.id)) == (1, 0, {"none": 1})
+
+
+def test_stats_are_served_from_the_index_without_loading_tasks(
+    data_dir: Path, project: Project
+):
+    storage = StorageManager(data_dir=data_dir)
+    storage.bulk_add_tasks(
+        [Task(title="A", project_id=project.id, completed=True)]
+        + [Task(title="B", project_id=project.id)]
+    )
+    storage.get_project_stats(project.id)
+
+    reopened = StorageManager(data_dir=data_dir)
+    assert counts(reopened.get_project_stats(project.id))[:2] == (2, 1)
+    assert project.id not in reopened._tasks
+    index = codec.loads(reopened.stats_file.read_bytes())
+    assert tuple(index[project.id]["source"]) == reopened._file_signature(
+        reopened.get_task_file(project.id)
+    )
+
+
+def test_stale_stats_are_recomputed_after_an_external_edit(
+    data_dir: Path, project: Project
+):
+    storage = StorageManager(data_dir=data_dir)
+    storage.add_task(Task(title="A", project_id=project.id))
+    reader = StorageManager(data_dir=data_dir)
+    assert reader.get_project_stats(project.id).total == 1
+
+    storage.add_task(Task(title="B", project_id=project.id))
+
+    assert reader.get_project_stats(project.id).total == 2
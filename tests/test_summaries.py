@@ -0,0 +1,104 @@
+"""Tests for task summaries and their index files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from todo_tui import codec
+from todo_tui.models import Project, Task
+from todo_tui.storage import SUMMARY_FORMAT, StorageManager
+from todo_tui.widgets.task_list import TaskListPanel
+
+
+def read_index(storage: StorageManager, project_id: str) -> dict:
+    return codec.loads(storage.get_summary_file(project_id).read_bytes())
+
+
+def test_summaries_leave_out_the_bodies(data_dir: Path, project: Project):
+    StorageManager(data_dir=data_dir).add_task(
+        Task(title="T", description="Call The Bank", notes="n", project_id=project.id)
+    )
+
+    [summary] = StorageManager(data_dir=data_dir).load_task_summaries(project.id)
+
+    assert summary.summary_only
+    assert (summary.description, summary.notes) == ("", "")
+    assert summary.search_text == "call the bank"
+
+
+def test_index_is_stamped_with_the_task_file(data_dir: Path, project: Project):
+    StorageManager(data_dir=data_dir).add_task(Task(title="T", project_id=project.id))
+    storage = StorageManager(data_dir=data_dir)
+
+    storage.load_task_summaries(project.id)
+
+    index = read_index(storage, project.id)
+    signature = storage._file_signature(storage.get_task_file(project.id))
+    assert tuple(index["source"]) == signature
+    assert index["format"] == SUMMARY_FORMAT
+    assert "description" not in index["tasks"][0]
+
+
+def test_index_is_rebuilt_after_an_external_edit(data_dir: Path, project: Project):
+    storage = StorageManager(data_dir=data_dir)
+    storage.add_task(Task(title="First", project_id=project.id))
+    assert [t.title for t in storage.load_task_summaries(project.id)] == ["First"]
+
+    other = StorageManager(data_dir=data_dir)
+    other.add_task(Task(title="Second", project_id=project.id))
+
+    reader = StorageManager(data_dir=data_dir)
+    titles = [t.title for t in reader.load_task_summaries(project.id)]
+    assert titles == ["First", "Second"]
+    signature = reader._file_signature(reader.get_task_file(project.id))
+    assert tuple(read_index(reader, project.id)["source"]) == signature
+
+
+def test_index_of_an_older_format_is_rebuilt(data_dir: Path, project: Project):
+    StorageManager(data_dir=data_dir).add_task(
+        Task(title="T", description="Body", project_id=project.id)
+    )
+    storage = StorageManager(data_dir=data_dir)
+    storage.load_task_summaries(project.id)
+    summary_file = storage.get_summary_file(project.id)
+    index = read_index(storage, project.id)
+    del index["format"]
+    summary_file.write_bytes(codec.dumps(index))
+
+    [summary] = StorageManager(data_dir=data_dir).load_task_summaries(project.id)
+
+    assert summary.search_text == "body"
+    assert read_index(storage, project.id)["format"] == SUMMARY_FORMAT
+
+
+def test_saving_a_summary_task_keeps_the_stored_body(data_dir: Path, project: Project):
+    StorageManager(data_dir=data_dir).add_task(
+        Task(title="T", description="Body", notes="Notes", project_id=project.id)
+    )
+    storage = StorageManager(data_dir=data_dir)
+    [summary] = storage.load_task_summaries(project.id)
+
+    summary.title = "Renamed"
+    storage.update_task(summary)
+
+    task = StorageManager(data_dir=data_dir).get_task(project.id, summary.id)
+    assert (task.title, task.description, task.notes) == ("Renamed", "Body", "Notes")
+
+
+def test_task_filter_matches_descriptions_of_summaries(
+    data_dir: Path, project: Project
+):
+    storage = StorageManager(data_dir=data_dir)
+    storage.bulk_add_tasks(
+        [
+            Task(title="Groceries", description="Milk", project_id=project.id),
+            Task(
+                title="Taxes", description="Call the accountant", project_id=project.id
+            ),
+        ]
+    )
+    panel = TaskListPanel()
+    panel.tasks = StorageManager(data_dir=data_dir).load_task_summaries(project.id)
+    panel.search_query = "ACCOUNTANT"
+
+    assert [t.title for t in panel._match_tasks(panel.tasks)] == ["Taxes"]
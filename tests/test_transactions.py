@@ -0,0 +1,122 @@
+"""Tests for atomic storage transactions and their crash recovery."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from todo_tui import staging
+from todo_tui.models import Project, Task
+from todo_tui.storage import StorageManager
+
+
+def staging_dirs(data_dir: Path) -> list:
+    root = data_dir / staging.STAGING_DIRNAME
+    return [p for p in root.iterdir() if p.is_dir()] if root.exists() else []
+
+
+def task_titles(data_dir: Path, project_id: str) -> list:
+    storage = StorageManager(data_dir=data_dir)
+    return sorted(t.title for t in storage.load_tasks(project_id))
+
+
+def test_transaction_commits_every_file(data_dir: Path, project: Project):
+    storage = StorageManager(data_dir=data_dir)
+    other = Project(name="Work")
+
+    with storage.transaction():
+        storage.add_project(other)
+        storage.add_task(Task(title="A", project_id=project.id))
+        storage.add_task(Task(title="B", project_id=other.id))
+
+    reopened = StorageManager(data_dir=data_dir)
+    assert {p.name for p in reopened.load_projects()} == {"Inbox", "Work"}
+    assert task_titles(data_dir, project.id) == ["A"]
+    assert task_titles(data_dir, other.id) == ["B"]
+    assert staging_dirs(data_dir) == []
+
+
+def test_exception_rolls_the_transaction_back(data_dir: Path, project: Project):
+    storage = StorageManager(data_dir=data_dir)
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            storage.add_task(Task(title="A", project_id=project.id))
+            storage.delete_project(project.id)
+            raise RuntimeError("abort")
+
+    assert [p.id for p in storage.load_projects()] == [project.id]
+    assert storage.load_tasks(project.id) == []
+    assert task_titles(data_dir, project.id) == []
+
+
+def test_crash_after_the_commit_point_is_rolled_forward(
+    data_dir: Path, project: Project, run_process
+):
+    run_process(
+        f"""
+        from todo_tui import staging
+        staging.apply = lambda staging_dir: os._exit(0)
+        storage = StorageManager(data_dir=data_dir)
+        with storage.transaction():
+            storage.add_task(Task(title="A", project_id={project.id!r}))
+            storage.add_task(Task(title="B", project_id={project.id!r}))
+        """
+    )
+    assert len(staging_dirs(data_dir)) == 1
+
+    assert task_titles(data_dir, project.id) == ["A", "B"]
+    assert staging_dirs(data_dir) == []
+
+
+def test_crash_before_the_commit_point_is_rolled_back(
+    data_dir: Path, project: Project, run_process
+):
+    run_process(
+        f"""
+        from todo_tui import staging
+        staging.atomic_write = lambda path, data: os._exit(0)
+        storage = StorageManager(data_dir=data_dir)
+        with storage.transaction():
+            storage.add_task(Task(title="A", project_id={project.id!r}))
+        """
+    )
+    assert len(staging_dirs(data_dir)) == 1
+
+    assert task_titles(data_dir, project.id) == []
+    assert staging_dirs(data_dir) == []
+
+
+def test_recovery_leaves_a_running_transaction_alone(data_dir: Path):
+    data_dir.mkdir()
+    target = data_dir / "file.txt"
+
+    with staging.stage(data_dir, {target: b"staged"}, []) as staging_dir:
+        # Another manager starting meanwhile must not apply or discard it
+        StorageManager(data_dir=data_dir)
+        assert staging_dir.exists()
+        assert not target.exists()
+        staging.apply(staging_dir)
+
+    assert target.read_bytes() == b"staged"
+    assert staging_dirs(data_dir) == []
+
+
+def test_concurrent_managers_commit_without_losing_changes(
+    data_dir: Path, project: Project
+):
+    first = StorageManager(data_dir=data_dir)
+    second = StorageManager(data_dir=data_dir)
+    first.load_tasks(project.id)
+    second.load_tasks(project.id)
+
+    with first.transaction():
+        first.add_task(Task(title="A", project_id=project.id))
+    with second.transaction():
+        second.add_task(Task(title="B", project_id=project.id))
+        second.update_project(Project(id=project.id, name="Renamed"))
+
+    assert task_titles(data_dir, project.id) == ["A", "B"]
+    assert StorageManager(data_dir=data_dir).get_project(project.id).name == "Renamed"
+    assert staging_dirs(data_dir) == []
@@ -0,0 +1,56 @@
+"""Tests for noticing data changed by other processes."""
+
+from __future__ import annotations
+
+import queue
+from pathlib import Path
+from typing import Dict, Set
+
+import pytest
+
+from todo_tui.models import Project
+from todo_tui.storage import StorageManager
+from todo_tui.watcher import DataDirWatcher
+
+
+@pytest.fixture
+def storage(data_dir: Path, project: Project):
+    """A manager with its caches loaded and a polling watcher reporting to it.
+
+    Yields the manager and a queue receiving the result of
+    ``external_changes`` for every batch of changed files.
+    """
+    storage = StorageManager(data_dir=data_dir)
+    storage.load_projects()
+    storage.load_tasks(project.id)
+    batches: queue.Queue = queue.Queue()
+    watcher = DataDirWatcher(
+        storage.get_watch_dirs(),
+        lambda paths: batches.put(storage.external_changes(paths)),
+        poll_interval=0.05,
+        settle=0.05,
+        use_inotify=False,
+    )
+    watcher.start()
+    yield storage, batches
+    watcher.stop()
+
+
+def next_change(batches: queue.Queue) -> Dict[str, Set[str]]:
+    """Wait for the next batch that holds an external change."""
+    while True:
+        changes = batches.get(timeout=5)
+        if changes:
+            return changes
+
+
+def test_changes_by_another_manager_are_reported(storage, run_process):
+    storage, batches = storage
+    # Our own write shows up as a batch, but not as a change
+    storage.add_project(Project(name="Own"))
+    assert batches.get(timeout=5) == {}
+
+    run_process("StorageManager(data_dir=data_dir).add_project(Project(name='Other'))")
+
+    assert "projects" in next_change(batches)
+    assert [p.name for p in storage.load_projects()] == ["Inbox", "Own", "Other"]
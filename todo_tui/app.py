@@ -2,36 +2,40 @@
 
 from __future__ import annotations
 
+import shutil
+import tempfile
 from datetime import datetime
+from importlib import import_module
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 from dotenv import load_dotenv
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
-from textual.css.query import NoMatches
 from textual.widgets import Footer, TabbedContent, TabPane
 
 from .icons import Icons
+from .flush import FlushError
 from .models import Project, Settings, Task
-from .storage import StorageManager
+from .search import SearchHit
+from .storage import StorageManager, open_storage
 from .themes import ALL_THEMES
+from .watcher import DataDirWatcher
 from .widgets.dashboard import Dashboard
 from .widgets.dialogs import (
     AddProjectDialog,
     AddTaskDialog,
+    ArchiveDialog,
     ConfirmDialog,
-    DeviceLinkDialog,
     EditProjectDialog,
     EditTaskDialog,
     ErrorDialog,
     HelpDialog,
     InfoDialog,
     MoveTaskDialog,
-    OnboardingDialog,
+    SearchDialog,
     SettingsDialog,
-    UnlinkDeviceDialog,
 )
 from .widgets.pomodoro_widget import PomodoroWidget
 from .widgets.project_list import (
@@ -40,8 +44,6 @@ from .widgets.project_list import (
     ProjectListPanel,
     ProjectSelected,
 )
-from .widgets.scratchpad import ScratchpadPanel
-from .widgets.snippets import SnippetsPanel
 from .widgets.task_detail import SubtaskToggled, TaskDetailPanel
 from .widgets.task_list import TaskListPanel, TaskSelected
 
@@ -56,31 +58,58 @@ class TodoApp(App):
         Binding("p", "add_project", "Add Project"),
         Binding("space", "toggle_task", "Toggle Complete"),
         Binding("s", "settings", "Settings"),
+        Binding("f4", "archive", "Archive", show=False),
+        Binding("f5", "search", "Search All", show=False),
         Binding("ctrl+shift+s", "cloud_sync", "Cloud Sync"),
         Binding("ctrl+shift+w", "setup_wizard", "Setup Wizard", show=False),
         Binding("q", "quit", "Quit"),
         Binding("?", "help", "Help"),
     ]
 
+    # Tabs whose panel is built on first activation:
+    # pane id -> (module, panel class, panel id)
+    LAZY_TABS = {
+        "scratchpad-tab": (".widgets.scratchpad", "ScratchpadPanel", "scratchpad-panel"),
+        "snippets-tab": (".widgets.snippets", "SnippetsPanel", "snippets-panel"),
+    }
+    # Seconds after startup before hidden tabs are built (``prefetch_tabs``)
+    # and the search index is brought up to date
+    PREFETCH_DELAY = 1.0
+
     def __init__(self, demo_data_dir: Optional[Path] = None):
         super().__init__()
         self._demo_mode = demo_data_dir is not None
 
         if self._demo_mode:
-            # Demo mode: load settings and data from demo directory
+            # Demo mode: load settings and data from a copy of the demo
+            # directory, so edits, indexes and lock files never land in the
+            # installed package (removed at exit)
+            self._demo_copy = tempfile.TemporaryDirectory(prefix="tuido-demo-")
+            data_dir = Path(self._demo_copy.name)
+            shutil.copytree(demo_data_dir, data_dir, dirs_exist_ok=True)
             self.settings = StorageManager.load_settings_from_path(
-                demo_data_dir / "settings.json"
+                data_dir / "settings.json"
+            )
+            self.storage = open_storage(
+                self.settings, data_dir=data_dir, skip_migrations=True
             )
-            self.storage = StorageManager(data_dir=demo_data_dir, skip_migrations=True)
         else:
             # Normal mode: load from default locations
             self.settings = StorageManager.load_settings()
-            self.storage = StorageManager()
+            self.storage = open_storage(self.settings)
+        self.storage.on_write_error = self._on_write_error
+        # Set when quitting failed to save; the next quit exits anyway
+        self._quit_unsaved = False
+
+        # Seed the caches before any panel loads; checked against the files
+        # in the background once the UI is up
+        self._from_snapshot = self.storage.load_startup_snapshot()
 
         self.projects: List[Project] = []
         self.current_project_id: Optional[str] = None
         self.current_project: Optional[Project] = None
         self.current_task: Optional[Task] = None
+        self._watcher: Optional[DataDirWatcher] = None
 
     def compose(self) -> ComposeResult:
         """Compose the application layout."""
@@ -93,12 +122,13 @@ class TodoApp(App):
                 with Horizontal(id="main-content"):
                     with Vertical(id="left-column"):
                         yield ProjectListPanel(id="projects-panel")
-                        yield TaskListPanel(id="task-list-panel")
+                        yield TaskListPanel(
+                            id="task-list-panel", search=self._search_task_ids
+                        )
                     yield TaskDetailPanel(id="task-detail-panel")
-            with TabPane(f"{Icons.PENCIL} Scratchpad", id="scratchpad-tab"):
-                yield ScratchpadPanel(self.storage, id="scratchpad-panel")
-            with TabPane(f"{Icons.CODE} Snippets", id="snippets-tab"):
-                yield SnippetsPanel(self.storage, id="snippets-panel")
+            # Filled in by _mount_tab when first shown
+            yield TabPane(f"{Icons.PENCIL} Scratchpad", id="scratchpad-tab")
+            yield TabPane(f"{Icons.CODE} Snippets", id="snippets-tab")
         yield Footer()
 
     def on_mount(self) -> None:
@@ -129,6 +159,30 @@ class TodoApp(App):
         # Load all tasks initially
         self._load_all_tasks()
 
+        # Pick up changes made by other instances sharing the data directory
+        if self.settings.storage_watch:
+            self._watcher = DataDirWatcher(
+                self.storage.get_watch_dirs(), self._on_data_files_changed
+            )
+            self._watcher.start()
+
+        if self._from_snapshot:
+            self.run_worker(self._verify_startup_snapshot, thread=True)
+
+        # Build the hidden tabs once the first screen is up
+        if self.settings.prefetch_tabs:
+            self.set_timer(self.PREFETCH_DELAY, self._prefetch_tabs)
+
+        # Load the search index (re-indexing what changed) off the UI thread
+        self.set_timer(
+            self.PREFETCH_DELAY,
+            lambda: self.run_worker(self.storage.refresh_search_index, thread=True),
+        )
+
+        # Move old completed tasks out of the project files
+        if self.settings.archive_completed_after_days > 0:
+            self.run_worker(self._archive_old_tasks, thread=True)
+
         # Startup cloud sync (if enabled and device is linked, skip in demo mode)
         if not self._demo_mode:
             from .encryption import has_device_token
@@ -142,6 +196,7 @@ class TodoApp(App):
 
     def _show_onboarding(self) -> None:
         """Show the onboarding/setup wizard dialog."""
+        from .widgets.onboarding import OnboardingDialog
 
         def check_onboarding(result) -> None:
             """Callback when onboarding dialog is dismissed."""
@@ -160,6 +215,7 @@ class TodoApp(App):
 
     def _show_device_link(self) -> None:
         """Show the device link dialog for cloud sync authorization."""
+        from .widgets.sync_dialogs import DeviceLinkDialog
 
         def check_device_link(result) -> None:
             """Callback when device link dialog is dismissed."""
@@ -177,6 +233,7 @@ class TodoApp(App):
 
     def _show_unlink_device(self) -> None:
         """Show the unlink device confirmation dialog."""
+        from .widgets.sync_dialogs import UnlinkDeviceDialog
 
         def check_unlink(result) -> None:
             """Callback when unlink dialog is dismissed."""
@@ -206,19 +263,41 @@ class TodoApp(App):
         except Exception:
             pass  # Widgets might not be mounted
 
+    def _mount_tab(self, pane_id: str) -> None:
+        """Build a lazily mounted tab's panel, unless it is already built.
+
+        The panel loads its data (notes, snippets) in its own ``on_mount``,
+        so neither is read before the tab is opened or prefetched.
+        """
+        spec = self.LAZY_TABS.get(pane_id)
+        if spec is None:
+            return
+        pane = self.query_one(f"#{pane_id}", TabPane)
+        if pane.children:
+            return
+        module, class_name, panel_id = spec
+        panel_class = getattr(import_module(module, __package__), class_name)
+        pane.mount(panel_class(self.storage, id=panel_id))
+
+    def _prefetch_tabs(self) -> None:
+        """Build the tabs not opened yet."""
+        for pane_id in self.LAZY_TABS:
+            self._mount_tab(pane_id)
+
+    def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        """Build a main tab's panel the first time it is opened."""
+        if event.tabbed_content.id == "main-tabs" and event.pane is not None:
+            self._mount_tab(event.pane.id)
+
     def watch_theme(self, new_theme: str) -> None:
         """React to theme changes and update TextArea themes."""
-        try:
-            from .widgets.scratchpad import ScratchpadPanel
-
-            scratchpad = self.query_one("#scratchpad-panel", ScratchpadPanel)
+        # The scratchpad is not mounted until its tab is first built
+        for scratchpad in self.query("#scratchpad-panel"):
             scratchpad._update_textarea_theme()
-        except NoMatches:
-            pass  # Widget might not be mounted yet
 
     def _load_all_tasks(self) -> None:
         """Load and display all tasks across all projects."""
-        all_tasks = self.storage.load_all_tasks()
+        all_tasks = self.storage.load_all_task_summaries()
         task_panel = self.query_one("#task-list-panel", TaskListPanel)
         task_panel.set_tasks(
             all_tasks, self.settings.show_completed_tasks if self.settings else True
@@ -226,30 +305,199 @@ class TodoApp(App):
 
         # Update dashboard
         dashboard = self.query_one("#dashboard", Dashboard)
-        dashboard.update_metrics(all_tasks)
+        dashboard.update_metrics(all_tasks, self.storage.archived_completions())
 
         # Update project panel with task counts
         project_panel = self.query_one("#projects-panel", ProjectListPanel)
-        project_panel.update_tasks(all_tasks)
+        project_panel.update_stats(self.storage.load_project_stats())
 
         self.current_project_id = None
 
+    def _verify_startup_snapshot(self) -> None:
+        """Reload whatever changed since the startup snapshot (worker thread)."""
+        changed = self.storage.verify_startup_snapshot()
+        if changed:
+            self.call_from_thread(self._apply_external_changes, changed)
+
+    def _archive_old_tasks(self) -> None:
+        """Find tasks completed long ago (worker thread).
+
+        The archiving itself deletes tasks from the storage caches, which the
+        UI thread reads without locking, so it is handed to the UI thread.
+        """
+        due = self.storage.archivable_tasks(self.settings.archive_completed_after_days)
+        if due:
+            self.call_from_thread(self._archive_tasks, due)
+
+    def _archive_tasks(self, due: Dict[str, Set[str]]) -> None:
+        """Move the given tasks to the archive and refresh the task views."""
+        count = self.storage.archive_tasks(due)
+        if not count:
+            return
+        self._refresh_task_views(set(due))
+        self.notify(f"Archived {count} old completed task(s). Press F4 to browse them.")
+
+    def action_archive(self) -> None:
+        """Search archived tasks and restore one into its project."""
+
+        def restore(task: Optional[Task]) -> None:
+            if task is None:
+                return
+            restored = self.storage.restore_archived_task(task.project_id, task.id)
+            if restored is None:
+                self.notify("The task's project no longer exists.", severity="error")
+                return
+            self._refresh_task_views({restored.project_id})
+            if self.settings.archive_completed_after_days > 0:
+                # Restored as it was, i.e. still completed long ago
+                self.notify(
+                    f"Restored: {restored.title}. It is still completed; "
+                    "reopen it to keep it out of the next archiving run.",
+                    timeout=8,
+                )
+            else:
+                self.notify(f"Restored: {restored.title}")
+
+        self.push_screen(
+            ArchiveDialog(
+                self.storage.search_archived_tasks,
+                {p.id: p.name for p in self.projects},
+            ),
+            restore,
+        )
+
+    def _search_task_ids(self, query: str) -> Set[str]:
+        """Get the IDs of the tasks matching a query (task list filter)."""
+        return {hit.id for hit in self.storage.search(query, kinds=("task",), limit=None)}
+
+    def action_search(self) -> None:
+        """Search tasks, notes and snippets and open the chosen result."""
+        self.storage.refresh_search_index()
+        self.push_screen(
+            SearchDialog(
+                lambda query, limit: self.storage.search(query, limit=limit),
+                {p.id: p.name for p in self.projects},
+            ),
+            self._open_search_hit,
+        )
+
+    def _open_search_hit(self, hit: Optional[SearchHit]) -> None:
+        """Switch to the tab showing a search result and select it."""
+        if hit is None:
+            return
+        tabs = self.query_one("#main-tabs", TabbedContent)
+        if hit.kind == "task":
+            tabs.active = "tasks-tab"
+            self.query_one("#projects-panel", ProjectListPanel).select_project(hit.parent)
+            self.current_project = next(
+                (p for p in self.projects if p.id == hit.parent), None
+            )
+            self._load_project_tasks(hit.parent)
+            task_panel = self.query_one("#task-list-panel", TaskListPanel)
+            if not task_panel.select_task(hit.id):
+                # Hidden from the list (e.g. completed tasks are not shown)
+                task = self.storage.get_task(hit.parent, hit.id)
+                if task is not None:
+                    self.current_task = task
+                    self.query_one("#task-detail-panel", TaskDetailPanel).show_task(task)
+            return
+
+        pane_id = "scratchpad-tab" if hit.kind == "note" else "snippets-tab"
+        self._mount_tab(pane_id)
+        tabs.active = pane_id
+
+        def select() -> None:
+            if hit.kind == "note":
+                self.query_one("#scratchpad-panel").select_note(hit.id)
+            else:
+                self.query_one("#snippets-panel").select_snippet(hit.id)
+
+        # A panel mounted just now loads its data in on_mount
+        self.call_after_refresh(select)
+
+    def _on_data_files_changed(self, paths: Set[Path]) -> None:
+        """Hand files changed on disk (watcher thread) over to the UI thread."""
+        self.call_from_thread(self._apply_external_changes, paths)
+
+    def _apply_external_changes(self, paths: Set[Path]) -> None:
+        """Refresh only the panels showing data another process changed."""
+        changes = self.storage.external_changes(paths)
+        if not changes:
+            return
+
+        if "projects" in changes:
+            self.projects = self.storage.load_projects()
+            project_panel = self.query_one("#projects-panel", ProjectListPanel)
+            project_panel.set_projects(self.projects)
+            if self.current_project_id is not None and not any(
+                p.id == self.current_project_id for p in self.projects
+            ):
+                # The selected project was deleted elsewhere
+                self.current_project = None
+                self._load_all_tasks()
+            else:
+                self.current_project = next(
+                    (p for p in self.projects if p.id == self.current_project_id), None
+                )
+
+        if "projects" in changes or "tasks" in changes:
+            self._refresh_task_views(changes.get("tasks", set()))
+
+        # Tabs not built yet read the current data when they are
+        if "notes" in changes:
+            for scratchpad in self.query("#scratchpad-panel"):
+                scratchpad.refresh_notes(changes["notes"])
+
+        if "snippets" in changes:
+            for snippets_panel in self.query("#snippets-panel"):
+                snippets_panel.refresh_snippets()
+
+    def _refresh_task_views(self, project_ids: Set[str]) -> None:
+        """Refresh task views after the given projects' tasks changed on disk."""
+        all_tasks = self.storage.load_all_task_summaries()
+        if self.current_project_id is None:
+            task_panel = self.query_one("#task-list-panel", TaskListPanel)
+            task_panel.set_tasks(all_tasks, self.settings.show_completed_tasks)
+        elif self.current_project_id in project_ids:
+            task_panel = self.query_one("#task-list-panel", TaskListPanel)
+            task_panel.set_tasks(
+                self.storage.load_task_summaries(self.current_project_id),
+                self.settings.show_completed_tasks,
+            )
+
+        dashboard = self.query_one("#dashboard", Dashboard)
+        dashboard.update_metrics(all_tasks, self.storage.archived_completions())
+        project_panel = self.query_one("#projects-panel", ProjectListPanel)
+        project_panel.update_stats(self.storage.load_project_stats())
+
+        # Re-read the task shown in the detail panel, if it changed
+        if self.current_task and self.current_task.project_id in project_ids:
+            detail_panel = self.query_one("#task-detail-panel", TaskDetailPanel)
+            task = self.storage.get_task(
+                self.current_task.project_id, self.current_task.id
+            )
+            self.current_task = task
+            if task is not None:
+                detail_panel.show_task(task)
+            else:
+                detail_panel.clear()
+
     def _load_project_tasks(self, project_id: str) -> None:
         """Load and display tasks for a specific project."""
-        tasks = self.storage.load_tasks(project_id)
+        tasks = self.storage.load_task_summaries(project_id)
         task_panel = self.query_one("#task-list-panel", TaskListPanel)
         task_panel.set_tasks(
             tasks, self.settings.show_completed_tasks if self.settings else True
         )
 
         # Update dashboard with all tasks for global metrics
-        all_tasks = self.storage.load_all_tasks()
+        all_tasks = self.storage.load_all_task_summaries()
         dashboard = self.query_one("#dashboard", Dashboard)
-        dashboard.update_metrics(all_tasks)
+        dashboard.update_metrics(all_tasks, self.storage.archived_completions())
 
         # Update project panel with task counts
         project_panel = self.query_one("#projects-panel", ProjectListPanel)
-        project_panel.update_tasks(all_tasks)
+        project_panel.update_stats(self.storage.load_project_stats())
 
         self.current_project_id = project_id
 
@@ -272,7 +520,8 @@ class TodoApp(App):
 
     def on_task_selected(self, message: TaskSelected) -> None:
         """Handle task selection."""
-        self.current_task = message.task
+        # List entries are summaries; fetch the body only for the shown task
+        self.current_task = self.storage.load_task_body(message.task)
         detail_panel = self.query_one("#task-detail-panel", TaskDetailPanel)
         detail_panel.show_task(message.task)
 
@@ -303,9 +552,13 @@ class TodoApp(App):
         detail_panel.show_task(task)
 
         # Update dashboard
-        all_tasks = self.storage.load_all_tasks()
+        all_tasks = self.storage.load_all_task_summaries()
         dashboard = self.query_one("#dashboard", Dashboard)
-        dashboard.update_metrics(all_tasks)
+        dashboard.update_metrics(all_tasks, self.storage.archived_completions())
+
+        # Completing the last subtask completes the task; refresh sidebar counts
+        project_panel = self.query_one("#projects-panel", ProjectListPanel)
+        project_panel.update_stats(self.storage.load_project_stats())
 
         # Update current task reference
         self.current_task = task
@@ -339,6 +592,7 @@ class TodoApp(App):
         """Show edit task dialog for current task."""
         if not self.current_task:
             return
+        self.storage.load_task_body(self.current_task)
 
         # Store original project_id BEFORE dialog modifies the task
         original_project_id = self.current_task.project_id
@@ -351,9 +605,17 @@ class TodoApp(App):
 
                 # Handle project change as a move operation
                 if project_changed:
-                    # Delete from old project, add to new project
-                    self.storage.delete_task(original_project_id, result.id)
-                    self.storage.add_task(result)
+                    # Move into the new project, then save the edits there
+                    try:
+                        with self.storage.transaction():
+                            self.storage.move_tasks(
+                                [result.id], result.project_id, original_project_id
+                            )
+                            self.storage.update_task(result)
+                    except OSError as e:
+                        # Rolled back: the task stays where it was
+                        self.notify(f"Could not move the task: {e}", severity="error")
+                        return
                 else:
                     # Normal update within same project
                     self.storage.update_task(result)
@@ -443,12 +705,16 @@ class TodoApp(App):
 
         # Update dashboard
         if self.current_project_id is None:
-            all_tasks = self.storage.load_all_tasks()
+            all_tasks = self.storage.load_all_task_summaries()
         else:
-            all_tasks = self.storage.load_all_tasks()
+            all_tasks = self.storage.load_all_task_summaries()
 
         dashboard = self.query_one("#dashboard", Dashboard)
-        dashboard.update_metrics(all_tasks)
+        dashboard.update_metrics(all_tasks, self.storage.archived_completions())
+
+        # Completion changed, so refresh the sidebar counts
+        project_panel = self.query_one("#projects-panel", ProjectListPanel)
+        project_panel.update_stats(self.storage.load_project_stats())
 
     def action_add_project(self) -> None:
         """Show add project dialog."""
@@ -506,7 +772,7 @@ class TodoApp(App):
         project_to_delete = self.current_project
 
         # Get tasks in this project
-        tasks_to_migrate = self.storage.load_tasks(project_to_delete.id)
+        tasks_to_migrate = self.storage.load_task_summaries(project_to_delete.id)
         task_count = len(tasks_to_migrate)
 
         if task_count > 0:
@@ -521,19 +787,30 @@ class TodoApp(App):
         def check_delete_project(confirmed: bool) -> None:
             """Callback when dialog is dismissed."""
             if confirmed:
-                # If there are tasks, migrate them to first available project
-                if task_count > 0:
-                    # Find first project that's not the one being deleted
-                    target_project = next(
-                        (p for p in self.projects if p.id != project_to_delete.id), None
-                    )
-                    if target_project:
-                        for task in tasks_to_migrate:
-                            task.project_id = target_project.id
-                            self.storage.update_task(task)
-
-                # Delete the project
-                self.storage.delete_project(project_to_delete.id)
+                # Migrate and delete in one transaction so a failure can't
+                # leave the tasks half-moved
+                try:
+                    with self.storage.transaction():
+                        # If there are tasks, migrate them to first available project
+                        if task_count > 0:
+                            # Find first project that's not the one being deleted
+                            target_project = next(
+                                (p for p in self.projects if p.id != project_to_delete.id),
+                                None,
+                            )
+                            if target_project:
+                                self.storage.move_tasks(
+                                    [task.id for task in tasks_to_migrate],
+                                    target_project.id,
+                                    project_to_delete.id,
+                                )
+
+                        # Delete the project
+                        self.storage.delete_project(project_to_delete.id)
+                except OSError as e:
+                    # Rolled back: the project and its tasks are untouched
+                    self.notify(f"Could not delete the project: {e}", severity="error")
+                    return
                 self.projects = self.storage.load_projects()
 
                 # Update project list
@@ -567,9 +844,8 @@ class TodoApp(App):
         def check_move_task(result: Optional[str]) -> None:
             """Callback when dialog is dismissed with selected project_id."""
             if result:
-                # Update task's project_id
-                task_to_move.project_id = result
-                self.storage.update_task(task_to_move)
+                # Move the task into the selected project
+                self.storage.move_tasks([task_to_move.id], result, task_to_move.project_id)
 
                 # Refresh display for current project
                 self._load_project_tasks(self.current_project_id)
@@ -650,8 +926,35 @@ class TodoApp(App):
         """Show help information."""
         self.push_screen(HelpDialog())
 
+    def _on_write_error(self, file_path: Path, error: OSError) -> None:
+        """Tell the user a save failed (called from the storage flush thread)."""
+        # notify() posts a message, so it is safe from any thread
+        self.notify(
+            f"Could not save {file_path.name}: {error}. Retrying.",
+            severity="error",
+            timeout=10,
+        )
+
     async def action_quit(self) -> None:
         """Quit the application with cloud sync on exit."""
+        # Write out any changes still waiting in the coalescing window
+        try:
+            self.storage.flush()
+        except FlushError as e:
+            if not self._quit_unsaved:
+                self._quit_unsaved = True
+                self.notify(
+                    f"{e}. Quit again to exit without saving.",
+                    severity="error",
+                    timeout=10,
+                )
+                return
+        if self._watcher is not None:
+            self._watcher.stop()
+        self.log(f"Storage write stats: {self.storage.flush_stats()}")
+        self.storage.write_startup_snapshot()
+        self.storage.save_search_index()
+
         # Skip cloud sync in demo mode
         if not self._demo_mode:
             from .encryption import has_device_token
@@ -687,7 +990,7 @@ class TodoApp(App):
         """Sync on app startup - asks user before downloading from cloud."""
         from .cloud_sync import CloudSyncClient
         from .encryption import get_device_token, get_encryption_password
-        from .widgets.dialogs import StartupSyncDialog
+        from .widgets.sync_dialogs import StartupSyncDialog
 
         try:
             client = CloudSyncClient(
@@ -724,13 +1027,11 @@ class TodoApp(App):
                 self.projects = self.storage.load_projects()
                 self._load_all_tasks()
 
-                # Reload scratchpad notes
-                scratchpad = self.query_one("#scratchpad-panel", ScratchpadPanel)
-                scratchpad.reload_notes()
-
-                # Reload snippets
-                snippets_panel = self.query_one("#snippets-panel", SnippetsPanel)
-                snippets_panel.reload_snippets()
+                # Reload scratchpad notes and snippets (if their tabs are built)
+                for scratchpad in self.query("#scratchpad-panel"):
+                    scratchpad.reload_notes()
+                for snippets_panel in self.query("#snippets-panel"):
+                    snippets_panel.reload_snippets()
 
                 self.notify(f"☁️  {message}", severity="success")
             else:
@@ -743,7 +1044,7 @@ class TodoApp(App):
         """Manual sync triggered by user."""
         from .cloud_sync import CloudSyncClient
         from .encryption import get_device_token, get_encryption_password
-        from .widgets.dialogs import SyncDirectionDialog
+        from .widgets.sync_dialogs import SyncDirectionDialog
 
         try:
             self.notify("Checking sync status...", severity="information")
@@ -796,13 +1097,11 @@ class TodoApp(App):
                 self.projects = self.storage.load_projects()
                 self._load_all_tasks()
 
-                # Reload scratchpad notes
-                scratchpad = self.query_one("#scratchpad-panel", ScratchpadPanel)
-                scratchpad.reload_notes()
-
-                # Reload snippets
-                snippets_panel = self.query_one("#snippets-panel", SnippetsPanel)
-                snippets_panel.reload_snippets()
+                # Reload scratchpad notes and snippets (if their tabs are built)
+                for scratchpad in self.query("#scratchpad-panel"):
+                    scratchpad.reload_notes()
+                for snippets_panel in self.query("#snippets-panel"):
+                    snippets_panel.reload_snippets()
 
                 self.notify(f"☁️  {message}", severity="success")
             else:
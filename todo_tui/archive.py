@@ -0,0 +1,221 @@
+"""Compressed cold storage for old completed tasks.
+
+Tasks completed long ago are moved out of the project files into
+``archive/<YYYY-MM>.jsonl.gz``, one gzip file per month of completion, so
+they are no longer parsed, counted or rendered on every refresh. Each line
+holds one archived task::
+
+    {"project": "<project_id>", "record": {...task dict...}}
+
+``archive/rollup.json`` summarizes the months without opening them: per
+month the compressed file's size and, per project, the number of archived
+tasks and their completions per day (for the dashboard). The rollup is
+derived data. A month whose file size does not match is recounted from the
+file, so a crash between writing a month and the rollup heals itself.
+
+Archived tasks stay searchable (``search`` decompresses the months) and can
+be taken out again with ``remove``.
+"""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from . import codec
+from .flush import atomic_write
+
+ARCHIVE_DIRNAME = "archive"
+ROLLUP_FILENAME = "rollup.json"
+MONTH_SUFFIX = ".jsonl.gz"
+
+
+def month_of(record: dict) -> Optional[str]:
+    """Get the ``YYYY-MM`` month a task record was completed in, if known."""
+    completed_at = record.get("completed_at")
+    if not completed_at or len(completed_at) < 7:
+        return None
+    return completed_at[:7]
+
+
+def _summarize(entries: List[dict], size: int) -> dict:
+    """Build a month's rollup entry from its archived tasks."""
+    projects: Dict[str, dict] = {}
+    for entry in entries:
+        project = projects.setdefault(entry["project"], {"count": 0, "by_day": {}})
+        project["count"] += 1
+        day = (entry["record"].get("completed_at") or "")[:10]
+        if day:
+            project["by_day"][day] = project["by_day"].get(day, 0) + 1
+    return {"size": size, "projects": projects}
+
+
+class TaskArchive:
+    """Per-month compressed archive files plus their rollup."""
+
+    def __init__(self, archive_dir: Path):
+        """Initialize the archive.
+
+        Args:
+            archive_dir: Directory holding the month files (created on first write).
+        """
+        self.archive_dir = archive_dir
+        self.rollup_file = archive_dir / ROLLUP_FILENAME
+        self._rollup: Optional[Dict[str, dict]] = None
+
+    def month_file(self, month: str) -> Path:
+        """Get the archive file of a month."""
+        return self.archive_dir / f"{month}{MONTH_SUFFIX}"
+
+    def months(self) -> List[str]:
+        """List the months holding archived tasks, oldest first."""
+        return sorted(self._load_rollup())
+
+    def project_months(self, project_id: str) -> List[str]:
+        """List the months holding archived tasks of a project."""
+        return [
+            month
+            for month, summary in sorted(self._load_rollup().items())
+            if project_id in summary["projects"]
+        ]
+
+    def read_month(self, month: str) -> List[dict]:
+        """Read the archived tasks of a month (empty if there are none)."""
+        try:
+            data = gzip.decompress(self.month_file(month).read_bytes())
+        except FileNotFoundError:
+            return []
+        return [codec.loads(line) for line in data.splitlines() if line.strip()]
+
+    def add(self, entries: List[dict]) -> None:
+        """Archive tasks, merging them into their months.
+
+        A task already in the archive (same project and id) is replaced, so
+        archiving the same task twice, e.g. after an interrupted run, keeps
+        one copy.
+
+        Args:
+            entries: ``{"project": ..., "record": ...}`` dicts; records without
+                a completion month are ignored.
+        """
+        by_month: Dict[str, List[dict]] = {}
+        for entry in entries:
+            month = month_of(entry["record"])
+            if month is not None:
+                by_month.setdefault(month, []).append(entry)
+        for month, new in sorted(by_month.items()):
+            merged = {
+                (e["project"], e["record"]["id"]): e for e in self.read_month(month)
+            }
+            for entry in new:
+                merged[(entry["project"], entry["record"]["id"])] = entry
+            self._write_month(month, list(merged.values()))
+        if by_month:
+            self._save_rollup()
+
+    def remove(
+        self, predicate: Callable[[dict], bool], months: Iterable[str]
+    ) -> List[dict]:
+        """Take the archived tasks matching a predicate out of the archive.
+
+        Args:
+            predicate: Called with each entry of the given months.
+            months: Months to look in.
+
+        Returns:
+            The removed entries.
+        """
+        removed = []
+        for month in months:
+            entries = self.read_month(month)
+            kept = [e for e in entries if not predicate(e)]
+            if len(kept) != len(entries):
+                removed.extend(e for e in entries if predicate(e))
+                self._write_month(month, kept)
+        if removed:
+            self._save_rollup()
+        return removed
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[dict]:
+        """Find archived tasks whose title, description or notes contain a query.
+
+        Matching is case-insensitive. Newest months are searched first.
+
+        Args:
+            query: Text to look for.
+            limit: Stop after this many matches.
+
+        Returns:
+            Matching entries.
+        """
+        needle = query.casefold()
+        matches = []
+        for month in reversed(self.months()):
+            for entry in self.read_month(month):
+                record = entry["record"]
+                text = " ".join(
+                    record.get(key) or "" for key in ("title", "description", "notes")
+                )
+                if needle in text.casefold():
+                    matches.append(entry)
+                    if limit is not None and len(matches) >= limit:
+                        return matches
+        return matches
+
+    def completions_by_day(self) -> Dict[str, int]:
+        """Count archived completions per ISO day, across all projects."""
+        counts: Dict[str, int] = {}
+        for summary in self._load_rollup().values():
+            for project in summary["projects"].values():
+                for day, count in project["by_day"].items():
+                    counts[day] = counts.get(day, 0) + count
+        return counts
+
+    def _write_month(self, month: str, entries: List[dict]) -> None:
+        """Replace a month's file (or delete it if empty) and its rollup entry."""
+        rollup = self._load_rollup()
+        month_file = self.month_file(month)
+        if not entries:
+            month_file.unlink(missing_ok=True)
+            rollup.pop(month, None)
+            return
+        data = gzip.compress(
+            b"".join(codec.dumps(e, compact=True) + b"\n" for e in entries), mtime=0
+        )
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(month_file, data)
+        rollup[month] = _summarize(entries, len(data))
+
+    def _load_rollup(self) -> Dict[str, dict]:
+        """Get the rollup, recounting months whose file changed behind its back."""
+        if self._rollup is not None:
+            return self._rollup
+        try:
+            rollup = codec.loads(self.rollup_file.read_bytes()).get("months", {})
+        except (OSError, ValueError, AttributeError):
+            rollup = {}
+
+        on_disk = {}
+        if self.archive_dir.is_dir():
+            for path in self.archive_dir.glob(f"*{MONTH_SUFFIX}"):
+                on_disk[path.name[: -len(MONTH_SUFFIX)]] = path.stat().st_size
+        stale = False
+        for month in set(rollup) - set(on_disk):
+            del rollup[month]
+            stale = True
+        for month, size in on_disk.items():
+            if rollup.get(month, {}).get("size") != size:
+                rollup[month] = _summarize(self.read_month(month), size)
+                stale = True
+        self._rollup = rollup
+        if stale:
+            self._save_rollup()
+        return rollup
+
+    def _save_rollup(self) -> None:
+        """Write the rollup."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(
+            self.rollup_file, codec.dumps({"months": self._load_rollup()}, compact=True)
+        )
@@ -0,0 +1,303 @@
+"""Headless command line interface for scripting tuido.
+
+``tuido task|note|snippet ...`` runs a single command against the data
+directory and exits without starting the TUI. This module imports only the
+models and the storage layer, never Textual or the widgets, so a command
+returns in a few tens of milliseconds. Writes go through the same storage
+layer as the app (file locks and merging), so commands are safe to run
+next to an open tuido; the running app picks the change up through its
+data directory watcher.
+
+Every command accepts ``--json`` to print machine-readable output::
+
+    tuido task add "Write report" -p Work --priority high
+    tuido task list --json | jq -r '.[].title'
+    tuido task done 3f2a
+    tuido note append "Quick Notes" "- call the bank"
+    tuido snippet copy deploy
+
+Tasks, notes and snippets are referred to by id, a unique id prefix, or
+their (case-insensitive) title or name.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from .models import Project, Task
+from .storage import StorageManager, open_storage
+
+COMMANDS = ("task", "note", "snippet")
+
+T = TypeVar("T")
+
+
+class CommandError(Exception):
+    """A command could not be carried out; the message is shown to the user."""
+
+
+def _find(items: List[T], ref: str, label: Callable[[T], str], kind: str) -> T:
+    """Find an item by id, unique id prefix or case-insensitive label.
+
+    Raises:
+        CommandError: If nothing or more than one item matches.
+    """
+    for item in items:
+        if item.id == ref:
+            return item
+    matches = [item for item in items if item.id.startswith(ref)]
+    if not matches:
+        folded = ref.casefold()
+        matches = [item for item in items if label(item).casefold() == folded]
+    if not matches:
+        raise CommandError(f"no {kind} matches '{ref}'")
+    if len(matches) > 1:
+        raise CommandError(f"'{ref}' matches {len(matches)} {kind}s; use its id")
+    return matches[0]
+
+
+def _find_project(storage: StorageManager, ref: Optional[str]) -> Project:
+    """Find a project, defaulting to the first one."""
+    projects = storage.load_projects()
+    if not projects:
+        raise CommandError("no projects yet; create one in tuido first")
+    if ref is None:
+        return projects[0]
+    return _find(projects, ref, lambda p: p.name, "project")
+
+
+def _find_task(storage: StorageManager, ref: str) -> Task:
+    """Find a task in any project (from the summary indexes)."""
+    return _find(storage.load_all_task_summaries(), ref, lambda t: t.title, "task")
+
+
+def _print_json(data: object) -> None:
+    """Print data as indented JSON."""
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def _print_task(task: Task, project_names: dict) -> None:
+    """Print one task as a line of text."""
+    mark = "x" if task.completed else " "
+    priority = f" !{task.priority}" if task.priority != "none" else ""
+    project = project_names.get(task.project_id, "?")
+    print(f"[{mark}] {task.id[:8]}  {task.title}{priority}  ({project})")
+
+
+# Task commands
+def _task_add(storage: StorageManager, args: argparse.Namespace) -> None:
+    project = _find_project(storage, args.project)
+    task = Task(
+        title=args.title,
+        description=args.description,
+        project_id=project.id,
+        priority=args.priority,
+    )
+    storage.add_task(task)
+    if args.json:
+        _print_json(task.to_dict())
+    else:
+        print(f"Added {task.id[:8]} to {project.name}")
+
+
+def _task_list(storage: StorageManager, args: argparse.Namespace) -> None:
+    projects = storage.load_projects()
+    if args.project is not None:
+        project_ids = [_find_project(storage, args.project).id]
+    else:
+        project_ids = [p.id for p in projects]
+    # Text output needs only the summaries; JSON includes the full tasks
+    load = storage.load_tasks if args.json else storage.load_task_summaries
+    tasks = [t for pid in project_ids for t in load(pid)]
+    if not args.all:
+        tasks = [t for t in tasks if not t.completed]
+    if args.json:
+        _print_json([t.to_dict() for t in tasks])
+        return
+    names = {p.id: p.name for p in projects}
+    for task in tasks:
+        _print_task(task, names)
+
+
+def _task_done(storage: StorageManager, args: argparse.Namespace) -> None:
+    found = _find_task(storage, args.task)
+    task = storage.get_task(found.project_id, found.id)
+    if task.completed == args.undo:
+        task.toggle_complete()
+        storage.update_task(task)
+    if args.json:
+        _print_json(task.to_dict())
+    else:
+        state = "Reopened" if args.undo else "Completed"
+        print(f"{state} {task.id[:8]}  {task.title}")
+
+
+def _task_move(storage: StorageManager, args: argparse.Namespace) -> None:
+    task = _find_task(storage, args.task)
+    project = _find_project(storage, args.project)
+    if project.id != task.project_id:
+        storage.move_tasks([task.id], project.id, task.project_id)
+    if args.json:
+        _print_json(storage.get_task(project.id, task.id).to_dict())
+    else:
+        print(f"Moved {task.id[:8]} to {project.name}")
+
+
+# Note commands
+def _note_cat(storage: StorageManager, args: argparse.Namespace) -> None:
+    found = _find(storage.load_notes(), args.note, lambda n: n.title, "note")
+    note = storage.get_note(found.id)
+    if args.json:
+        _print_json(note.to_dict())
+    else:
+        sys.stdout.write(note.content)
+        if note.content and not note.content.endswith("\n"):
+            sys.stdout.write("\n")
+
+
+def _note_append(storage: StorageManager, args: argparse.Namespace) -> None:
+    found = _find(storage.load_notes(), args.note, lambda n: n.title, "note")
+    note = storage.get_note(found.id)
+    text = " ".join(args.text) if args.text else sys.stdin.read()
+    if not text.strip():
+        raise CommandError("nothing to append")
+    if note.content and not note.content.endswith("\n"):
+        note.content += "\n"
+    note.content += text if text.endswith("\n") else text + "\n"
+    storage.update_note(note)
+    if args.json:
+        _print_json(note.to_dict())
+    else:
+        print(f"Appended to {note.title}")
+
+
+# Snippet commands
+def _snippet_copy(storage: StorageManager, args: argparse.Namespace) -> None:
+    snippet = _find(storage.load_snippets(), args.snippet, lambda s: s.name, "snippet")
+    if args.print:
+        print(snippet.command)
+    else:
+        import pyperclip
+
+        try:
+            pyperclip.copy(snippet.command)
+        except pyperclip.PyperclipException as e:
+            raise CommandError(f"clipboard unavailable ({e}); use --print") from e
+
+    # Update usage stats like the Snippets tab does
+    snippet.uses += 1
+    snippet.last_used = datetime.now().isoformat()
+    storage.update_snippet(snippet)
+    if args.json:
+        _print_json(snippet.to_dict())
+    elif not args.print:
+        print(f"Copied {snippet.name}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser of the headless commands."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="print JSON output")
+
+    parser = argparse.ArgumentParser(
+        prog="tuido",
+        description="Tuido - headless commands (run without one for the TUI)",
+    )
+    groups = parser.add_subparsers(dest="group", required=True)
+
+    task = groups.add_parser("task", help="add, list, complete and move tasks")
+    task_commands = task.add_subparsers(dest="command", required=True)
+
+    add = task_commands.add_parser("add", parents=[common], help="add a task")
+    add.add_argument("title")
+    add.add_argument("-p", "--project", help="project (default: the first one)")
+    add.add_argument("-d", "--description", default="")
+    add.add_argument(
+        "--priority", choices=["high", "medium", "low", "none"], default="none"
+    )
+    add.set_defaults(func=_task_add)
+
+    list_ = task_commands.add_parser("list", parents=[common], help="list open tasks")
+    list_.add_argument("-p", "--project", help="only this project")
+    list_.add_argument("-a", "--all", action="store_true", help="include completed")
+    list_.set_defaults(func=_task_list)
+
+    done = task_commands.add_parser("done", parents=[common], help="complete a task")
+    done.add_argument("task")
+    done.add_argument("--undo", action="store_true", help="reopen the task instead")
+    done.set_defaults(func=_task_done)
+
+    move = task_commands.add_parser(
+        "move", parents=[common], help="move a task to another project"
+    )
+    move.add_argument("task")
+    move.add_argument("project")
+    move.set_defaults(func=_task_move)
+
+    note = groups.add_parser("note", help="read and append to notes")
+    note_commands = note.add_subparsers(dest="command", required=True)
+
+    cat = note_commands.add_parser("cat", parents=[common], help="print a note")
+    cat.add_argument("note")
+    cat.set_defaults(func=_note_cat)
+
+    append = note_commands.add_parser(
+        "append", parents=[common], help="append text (or stdin) to a note"
+    )
+    append.add_argument("note")
+    append.add_argument("text", nargs="*")
+    append.set_defaults(func=_note_append)
+
+    snippet = groups.add_parser("snippet", help="use snippets")
+    snippet_commands = snippet.add_subparsers(dest="command", required=True)
+
+    copy = snippet_commands.add_parser(
+        "copy", parents=[common], help="copy a snippet to the clipboard"
+    )
+    copy.add_argument("snippet")
+    copy.add_argument(
+        "--print", action="store_true", help="print the command instead of copying it"
+    )
+    copy.set_defaults(func=_snippet_copy)
+
+    return parser
+
+
+def run(argv: Sequence[str]) -> int:
+    """Run a headless command.
+
+    Args:
+        argv: Command line arguments, starting with the command group.
+
+    Returns:
+        Process exit status: 1 if the command failed or its changes could
+        not be saved.
+    """
+    args = build_parser().parse_args(argv)
+    storage = open_storage(StorageManager.load_settings())
+    try:
+        try:
+            args.func(storage, args)
+        finally:
+            # Writes may wait in the coalescing window; a command only
+            # succeeded once they are on disk
+            storage.flush()
+    except (CommandError, OSError) as e:
+        print(f"tuido: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main() -> None:
+    """Entry point: run a headless command, or the TUI without one."""
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        sys.exit(run(argv))
+
+    from .app import main as app_main
+
+    app_main()
@@ -14,6 +14,7 @@ import httpx
 
 from cryptography.exceptions import InvalidTag
 
+from . import codec
 from .encryption import (
     EncryptedPayload,
     decrypt_data,
@@ -156,22 +157,25 @@ class CloudSyncClient:
                     file=sys.stderr,
                 )
 
-        # Save projects
-        projects = [Project.from_dict(p) for p in projects_list]
-        storage.save_projects(projects)
+        # Replace everything in one transaction: either all of the cloud data
+        # lands on disk or none of it does
+        with storage.transaction():
+            # Save projects
+            projects = [Project.from_dict(p) for p in projects_list]
+            storage.save_projects(projects)
 
-        # Save tasks for each project
-        for project_id, task_list in tasks_dict.items():
-            tasks = [Task.from_dict(t) for t in task_list]
-            storage.save_tasks(project_id, tasks)
+            # Save tasks for each project
+            for project_id, task_list in tasks_dict.items():
+                tasks = [Task.from_dict(t) for t in task_list]
+                storage.save_tasks(project_id, tasks)
 
-        # Save notes
-        notes = [Note.from_dict(n) for n in notes_list]
-        storage.save_notes(notes)
+            # Save notes
+            notes = [Note.from_dict(n) for n in notes_list]
+            storage.save_notes(notes)
 
-        # Save snippets
-        snippets = [Snippet.from_dict(s) for s in snippets_list]
-        storage.save_snippets(snippets)
+            # Save snippets
+            snippets = [Snippet.from_dict(s) for s in snippets_list]
+            storage.save_snippets(snippets)
 
     async def upload(self, storage: StorageManager) -> tuple[bool, str]:
         """Upload local data to cloud.
@@ -190,7 +194,7 @@ class CloudSyncClient:
 
             # Encrypt if password is set
             if self.encryption_password:
-                json_data = json.dumps(data)
+                json_data = codec.dumps(data, compact=True).decode("utf-8")
                 encrypted = encrypt_data(json_data, self.encryption_password)
                 payload = {
                     **encrypted.to_dict(),
@@ -205,7 +209,7 @@ class CloudSyncClient:
                 response = await client.post(
                     f"{self.api_url}/sync/upload",
                     headers=self.headers,
-                    json=payload,
+                    content=codec.dumps(payload, compact=True),
                 )
 
                 if response.status_code == 200:
@@ -277,7 +281,7 @@ class CloudSyncClient:
                             decrypted_json = decrypt_data(
                                 payload, self.encryption_password
                             )
-                            cloud_data = json.loads(decrypted_json)
+                            cloud_data = codec.loads(decrypted_json)
                         except InvalidTag:
                             # Wrong password or tampered data
                             return (
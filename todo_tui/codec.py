@@ -0,0 +1,56 @@
+"""JSON encoding/decoding used by storage and cloud sync.
+
+Uses orjson when it is installed (``pip install tuido-tui[fast]``) and falls
+back to the standard library otherwise. Both paths produce UTF-8 JSON that
+either implementation can read back, so the codec can change between runs
+without touching the data files.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+#: Name of the active codec, for diagnostics and benchmarks
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(data: Any, compact: bool = False) -> bytes:
+    """Encode data as UTF-8 JSON.
+
+    Args:
+        data: JSON-serializable data.
+        compact: If True, omit indentation and whitespace; otherwise indent
+            with two spaces like the original data files.
+
+    Returns:
+        Encoded JSON bytes.
+    """
+    if orjson is not None:
+        return (
+            orjson.dumps(data)
+            if compact
+            else orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        )
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or str.
+
+    Raises:
+        ValueError: If the data is not valid JSON (json.JSONDecodeError and
+            orjson.JSONDecodeError both subclass ValueError).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -14,8 +14,6 @@ import os
 from dataclasses import dataclass
 from typing import Optional
 
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
 
 # Keyring is DISABLED - these are kept for reference only
 # KEYRING_SERVICE = "tuido"
@@ -72,6 +70,10 @@ def derive_key(password: str, salt: bytes) -> bytes:
     Returns:
         32-byte encryption key
     """
+    # cryptography is imported on first use: checking for a linked device
+    # at startup should not load it
+    from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
+
     kdf = Argon2id(
         salt=salt,
         length=32,  # 256 bits
@@ -108,6 +110,8 @@ def encrypt_data(plaintext: str, password: str) -> EncryptedPayload:
     key = derive_key(password, salt)
 
     # Encrypt with AES-256-GCM
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
     aesgcm = AESGCM(key)
     ciphertext_with_tag = aesgcm.encrypt(nonce, plaintext.encode(), None)
 
@@ -153,6 +157,8 @@ def decrypt_data(payload: EncryptedPayload, password: str) -> str:
     key = derive_key(password, salt)
 
     # Decrypt with AES-256-GCM
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
     aesgcm = AESGCM(key)
     ciphertext_with_tag = ciphertext + tag
     plaintext = aesgcm.decrypt(nonce, ciphertext_with_tag, None)
@@ -0,0 +1,345 @@
+"""Coalescing, crash-safe file writer for the storage layer.
+
+``StorageManager`` marks data files dirty instead of writing them on the UI
+thread. The ``FlushScheduler`` collects those marks and, once the coalescing
+window has passed, writes each dirty file once on a background thread. A
+burst of edits to the same file therefore costs a single write.
+
+Every write goes through ``atomic_write``: the data is written to a temporary
+file in the same directory, fsynced and then moved over the target with
+``os.replace``, so a crash never leaves a truncated file behind.
+
+Files are rendered before the write lock is taken. Producers may need
+locks of their own (the storage's cache lock), and a thread holding those
+may call ``discard``, which only waits for a write already on its way to
+the disk and cancels one that is still rendering.
+
+A write that fails (a full disk, a lock held too long by another process)
+is never dropped: the file stays pending and is retried. Scheduled writes
+do not raise; their failures go to the ``on_error`` callback, once per file
+until it is written again. ``flush`` raises ``FlushError`` if any file is
+still unwritten, so callers that need the data on disk (quit, scripts,
+migrations) find out.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Producer = Callable[[], Union[str, bytes]]
+
+
+class _Cancelled(Exception):
+    """A write in flight was cancelled by ``discard`` before reaching the disk."""
+
+
+class FlushError(OSError):
+    """Pending files could not be written; they stay pending and are retried.
+
+    Attributes:
+        errors: The error of each file that failed.
+    """
+
+    def __init__(self, errors: Dict[Path, OSError]):
+        self.errors = errors
+        names = ", ".join(sorted(path.name for path in errors))
+        super().__init__(f"Could not write {names}: {next(iter(errors.values()))}")
+
+
+def atomic_write(path: Path, data: Union[str, bytes]) -> None:
+    """Atomically replace ``path`` with ``data``.
+
+    Args:
+        path: Target file path.
+        data: File contents; str is encoded as UTF-8.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class FlushScheduler:
+    """Coalesces file writes within a time window and flushes them in the background.
+
+    A file is registered with a producer callable that renders its current
+    contents. The producer is only invoked when the file is actually written,
+    so N marks within one window cost one serialization and one write.
+
+    With a window of 0 every scheduled write happens synchronously, which is
+    what short-lived scripts and tests want.
+    """
+
+    # Seconds the background thread waits before retrying failed writes
+    RETRY_DELAY = 2.0
+
+    def __init__(
+        self,
+        window: float = 0.0,
+        on_written: Optional[Callable[[Path], None]] = None,
+        guard: Optional[Callable[[Path], ContextManager]] = None,
+        on_error: Optional[Callable[[Path, OSError], None]] = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            window: Seconds to wait after the first dirty mark before flushing.
+            on_written: Called with the path after each successful write.
+            guard: Returns a context manager held around rendering, writing
+                and ``on_written`` for a path (e.g. a cross-process lock).
+            on_error: Called with the path and error when a scheduled write
+                fails, on the thread that attempted it. Not called again for
+                the path until it has been written.
+        """
+        self.window = window
+        self.on_written = on_written
+        self.guard = guard
+        self.on_error = on_error
+        self._pending: Dict[Path, Producer] = {}
+        # Writes in flight per file, and how often the file was discarded
+        # meanwhile: a write started before a discard is cancelled
+        self._inflight: Dict[Path, int] = {}
+        self._discards: Dict[Path, int] = {}
+        # Files whose failure was reported and that were not written since
+        self._failing: Set[Path] = set()
+        self._first_marked: Optional[float] = None
+        self._cond = threading.Condition()
+        # Serializes flushes, rendering included
+        self._flush_lock = threading.RLock()
+        # Held only while a rendered file is written to disk
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Counters
+        self.scheduled = 0
+        self.written = 0
+
+        if window > 0:
+            atexit.register(self.close)
+
+    @property
+    def coalesced(self) -> int:
+        """Number of writes saved by coalescing."""
+        return max(0, self.scheduled - self.written - len(self._pending))
+
+    def stats(self) -> Dict[str, int]:
+        """Get write counters.
+
+        Returns:
+            Dictionary with scheduled, written, coalesced and pending counts.
+        """
+        with self._cond:
+            return {
+                "scheduled": self.scheduled,
+                "written": self.written,
+                "coalesced": self.coalesced,
+                "pending": len(self._pending),
+            }
+
+    def schedule(self, path: Path, producer: Producer) -> None:
+        """Mark a file dirty.
+
+        Never raises: if a synchronous write (window 0) fails, the file
+        stays pending and the failure goes to ``on_error``.
+
+        Args:
+            path: File to write.
+            producer: Callable returning the file's contents at flush time.
+        """
+        if self.window <= 0 or self._closed:
+            # Supersedes a failed write still pending and any in flight
+            self.discard(path)
+            with self._cond:
+                self.scheduled += 1
+                batch = {path: (producer, self._begin(path))}
+            for error in self._write_batch(batch).values():
+                self._report(path, error)
+            return
+
+        with self._cond:
+            self.scheduled += 1
+            self._pending[path] = producer
+            if self._first_marked is None:
+                self._first_marked = time.monotonic()
+            self._ensure_thread()
+            self._cond.notify()
+
+    def discard(self, path: Path) -> None:
+        """Drop a pending write (e.g. because the file is being deleted).
+
+        A write of the file that is still rendering is cancelled, and one
+        already being written is waited for, so the caller can safely remove
+        or rewrite the file afterwards. Never waits for a producer, so it is
+        safe to call while holding locks that producers take.
+        """
+        with self._write_lock:
+            with self._cond:
+                self._pending.pop(path, None)
+                if path in self._inflight:
+                    self._discards[path] = self._discards.get(path, 0) + 1
+
+    def is_pending(self, path: Path) -> bool:
+        """Check whether a write for ``path`` is waiting or being written."""
+        with self._cond:
+            return path in self._pending or path in self._inflight
+
+    def flush(self) -> None:
+        """Write every pending file now, on the calling thread.
+
+        Raises:
+            FlushError: If any file could not be written. Those files stay
+                pending, so the next flush retries them.
+        """
+        errors = self._flush_pending()
+        if errors:
+            raise FlushError(errors)
+
+    def _flush_pending(self) -> Dict[Path, OSError]:
+        """Write every pending file now; returns the errors of those that failed."""
+        with self._flush_lock:
+            with self._cond:
+                batch = {
+                    path: (producer, self._begin(path))
+                    for path, producer in self._pending.items()
+                }
+                self._pending = {}
+                self._first_marked = None
+            return self._write_batch(batch)
+
+    def _begin(self, path: Path) -> int:
+        """Mark a write of ``path`` in flight (caller holds the condition).
+
+        Returns:
+            The file's discard count, which ``_write`` checks against.
+        """
+        self._inflight[path] = self._inflight.get(path, 0) + 1
+        return self._discards.get(path, 0)
+
+    def _write_batch(
+        self, batch: Dict[Path, Tuple[Producer, int]]
+    ) -> Dict[Path, OSError]:
+        """Write files marked in flight by ``_begin``.
+
+        Returns:
+            The errors of the files that failed; they are pending again.
+        """
+        errors: Dict[Path, OSError] = {}
+        for path, (producer, discards) in batch.items():
+            try:
+                self._write(path, producer, discards)
+            except OSError as e:
+                errors[path] = e
+            finally:
+                with self._cond:
+                    if self._discards.get(path, 0) != discards:
+                        errors.pop(path, None)
+                    elif path in errors:
+                        # Keep failed data dirty so the next flush retries it
+                        self._pending.setdefault(path, producer)
+                    self._inflight[path] -= 1
+                    if not self._inflight[path]:
+                        del self._inflight[path]
+                        self._discards.pop(path, None)
+        return errors
+
+    def _report(self, path: Path, error: OSError) -> None:
+        """Log a failed write and pass it to ``on_error`` (once until written)."""
+        logger.error("Failed to write %s: %s", path, error)
+        with self._cond:
+            if path in self._failing:
+                return
+            self._failing.add(path)
+        if self.on_error is not None:
+            self.on_error(path, error)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the background thread.
+
+        Runs at interpreter exit too, where failures can only be logged.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        for path, error in self._flush_pending().items():
+            logger.error("Failed to write %s at exit: %s", path, error)
+
+    def _write(self, path: Path, producer: Producer, discards: int) -> None:
+        """Render and atomically write a single file, unless it was discarded.
+
+        Args:
+            path: File to write.
+            producer: Callable returning the file's contents.
+            discards: The file's discard count when the write was started.
+        """
+        try:
+            with self.guard(path) if self.guard is not None else nullcontext():
+                data = producer()
+                with self._write_lock:
+                    with self._cond:
+                        if self._discards.get(path, 0) != discards:
+                            raise _Cancelled
+                    atomic_write(path, data)
+                with self._cond:
+                    self.written += 1
+                    self._failing.discard(path)
+                if self.on_written is not None:
+                    self.on_written(path)
+        except _Cancelled:
+            pass
+
+    def _ensure_thread(self) -> None:
+        """Start the background flush thread on first use (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="tuido-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Background loop: wait for the coalescing window, then flush."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                deadline = (self._first_marked or time.monotonic()) + self.window
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            errors = self._flush_pending()
+            for path, error in errors.items():
+                self._report(path, error)
+            if errors:
+                with self._cond:
+                    if not self._closed:
+                        self._cond.wait(self.RETRY_DELAY)
@@ -0,0 +1,364 @@
+"""Fuzzy matching with ranking, for the snippet and task filters.
+
+Where the search index (``search.py``) matches whole words and their
+prefixes, this matcher also finds abbreviations and typos in short texts
+such as snippet names and task titles:
+
+- Each query word must appear in order, not necessarily contiguously
+  ("gco" matches "git checkout"). Every matched character scores, with
+  bonuses for starting a word or camelCase hump and for following the
+  previous match directly, and a penalty for the characters skipped. The
+  window scored is the shortest one ending where the first one found does
+  (the fzf v1 algorithm).
+- A word of ``TYPO_MIN_LENGTH`` characters or more that does not appear in
+  order may still match a word of the text sharing enough of its trigrams
+  ("dokcer" matches "docker"). These matches score lower.
+- Each item carries a boost: its score is multiplied by ``1 + boost``.
+  ``frecency`` turns usage counts and last use times into a boost, so often
+  and recently used items rank higher when matches are close, and come
+  first for an empty query.
+
+A character index narrows the texts scored for a word to those containing
+all its characters, and a trigram index over the distinct words of all
+texts finds the typo candidates. Typing only appends characters, so the
+matches of each word are kept and the next keystroke scans just those.
+``FuzzyIndex.search`` ranks lazily: matches are heapified, not sorted, and
+handed out best first, so a list can show its first page without paying
+for sorting the rest.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Scores per matched character (as in fzf)
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+BONUS_BOUNDARY = 8
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = -(SCORE_GAP_START + SCORE_GAP_EXTENSION)
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+
+# Typo matches: minimum word length and share of trigrams in common
+TYPO_MIN_LENGTH = 4
+TYPO_MIN_SIMILARITY = 0.3
+# Score per character of a typo match, times the share of trigrams in common
+TYPO_SCORE = SCORE_MATCH / 2
+
+# Frecency: boost per doubling of the use count, and the half-life of the
+# extra boost for recent use
+FRECENCY_WEIGHT = 0.05
+FRECENCY_HALF_LIFE_DAYS = 14.0
+
+# Matches kept per query word for narrowing the next keystroke
+_NARROW_CACHE_SIZE = 64
+
+_WORD_RE = re.compile(r"\w+")
+# Letters and digits starting a word (named group), or a camelCase hump
+_BONUS_RE = re.compile(
+    r"(?P<boundary>(?<![^\W_])[^\W_])|(?<=[a-z])[A-Z]|(?<=[^\W\d_])\d"
+)
+
+
+def frecency(
+    uses: int, last_used: Optional[str], now: Optional[datetime] = None
+) -> float:
+    """Get the boost of an item from how often and how recently it was used.
+
+    The boost grows with the log of the use count (0.5 for 1000 uses) and
+    is doubled for an item used just now, the extra halving every
+    ``FRECENCY_HALF_LIFE_DAYS``.
+
+    Args:
+        uses: Number of uses.
+        last_used: ISO timestamp of the last use, if any.
+        now: Current time (defaults to now).
+    """
+    if uses <= 0:
+        return 0.0
+    recency = 0.0
+    if last_used:
+        try:
+            used = datetime.fromisoformat(last_used)
+        except ValueError:
+            used = None
+        if used is not None:
+            age_days = ((now or datetime.now()) - used).total_seconds() / 86400
+            recency = 0.5 ** (max(age_days, 0.0) / FRECENCY_HALF_LIFE_DAYS)
+    return FRECENCY_WEIGHT * math.log2(1 + uses) * (1 + recency)
+
+
+def _trigrams(word: str) -> Set[str]:
+    """Get the trigrams of a word padded with spaces (as many as it has characters)."""
+    padded = f" {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def bonuses(text: str) -> bytes:
+    """Get the bonus for matching each character of a text.
+
+    A letter or digit starting a word (at the start or after a space,
+    punctuation or underscore) gets ``BONUS_BOUNDARY``; an upper case
+    letter after a lower case one, or a digit after a letter, gets
+    ``BONUS_CAMEL``.
+    """
+    result = bytearray(len(text))
+    for match in _BONUS_RE.finditer(text):
+        result[match.start()] = BONUS_BOUNDARY if match.lastgroup else BONUS_CAMEL
+    return bytes(result)
+
+
+def score_word(folded: str, bonus: bytes, word: str) -> Optional[int]:
+    """Score a lowercase word matched in order against a text.
+
+    Args:
+        folded: The text, lowercased.
+        bonus: ``bonuses`` of the text as written.
+        word: The query word, lowercased.
+
+    Returns:
+        The score, or None if the word's characters are not all in the
+        text in order.
+    """
+    end = -1
+    for char in word:
+        end = folded.find(char, end + 1)
+        if end < 0:
+            return None
+    # Walk back from the end for the shortest window ending there, scoring
+    # each matched character against the one before it
+    score = SCORE_MATCH * len(word)
+    pos = end
+    for char in word[-2::-1]:
+        prev = folded.rfind(char, 0, pos)
+        if pos == prev + 1:
+            score += max(bonus[pos], BONUS_CONSECUTIVE)
+        else:
+            score += (
+                bonus[pos] + SCORE_GAP_START + SCORE_GAP_EXTENSION * (pos - prev - 2)
+            )
+        pos = prev
+    score += bonus[pos] * BONUS_FIRST_CHAR_MULTIPLIER
+    # However scattered, a match scores something
+    return max(score, 1)
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    """A ranked fuzzy match."""
+
+    key: str
+    score: float
+
+
+class FuzzyIndex:
+    """Texts to match, indexed by character and by word trigram.
+
+    Items are identified by a key (e.g. a snippet id) and kept up to date
+    with ``update``, ``discard`` or ``sync``; unchanged texts are not
+    re-indexed.
+    """
+
+    def __init__(self) -> None:
+        self._numbers: Dict[str, int] = {}
+        self._next_number = 0
+        # item number -> (key, text, folded text, boost, words, bonuses)
+        self._items: Dict[int, tuple] = {}
+        self._chars: Dict[str, Set[int]] = {}
+        self._words: Dict[str, Set[int]] = {}
+        self._word_trigrams: Dict[str, Set[str]] = {}
+        # query word -> scores of the items it matched in order
+        self._narrow: Dict[str, Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # Maintenance
+    def update(self, key: str, text: str, boost: float = 0.0) -> None:
+        """Add an item or change its text or boost."""
+        number = self._numbers.get(key)
+        if number is not None:
+            item = self._items[number]
+            if item[1] == text:
+                if item[3] != boost:
+                    self._items[number] = (*item[:3], boost, *item[4:])
+                return
+            self._unindex(number)
+        else:
+            number = self._numbers[key] = self._next_number
+            self._next_number += 1
+
+        folded = text.lower()
+        # Rare case changes alter the length; take the bonuses of the
+        # folded text then
+        bonus = bonuses(text if len(folded) == len(text) else folded)
+        words = tuple(set(_WORD_RE.findall(folded)))
+        self._items[number] = (key, text, folded, boost, words, bonus)
+        for char in set(folded):
+            self._chars.setdefault(char, set()).add(number)
+        for word in words:
+            numbers = self._words.get(word)
+            if numbers is None:
+                numbers = self._words[word] = set()
+                for gram in _trigrams(word):
+                    self._word_trigrams.setdefault(gram, set()).add(word)
+            numbers.add(number)
+        self._narrow.clear()
+
+    def discard(self, key: str) -> None:
+        """Remove an item, if present."""
+        number = self._numbers.pop(key, None)
+        if number is not None:
+            self._unindex(number)
+            del self._items[number]
+
+    def sync(self, items: Iterable[Tuple[str, str, float]]) -> None:
+        """Make the index hold exactly the given (key, text, boost) items."""
+        keys = set()
+        for key, text, boost in items:
+            keys.add(key)
+            self.update(key, text, boost)
+        for key in self._numbers.keys() - keys:
+            self.discard(key)
+
+    def _unindex(self, number: int) -> None:
+        """Remove an item's characters and words from the indexes."""
+        folded, words = self._items[number][2], self._items[number][4]
+        for char in set(folded):
+            self._chars[char].discard(number)
+        for word in words:
+            numbers = self._words[word]
+            numbers.discard(number)
+            if not numbers:
+                del self._words[word]
+                for gram in _trigrams(word):
+                    self._word_trigrams[gram].discard(word)
+        self._narrow.clear()
+
+    # Queries
+    def search(self, query: str) -> Iterator[FuzzyMatch]:
+        """Find the items matching every word of a query, best first.
+
+        Matching is done up front; ranking is lazy, so taking the first
+        few matches costs little more than matching. An empty query returns
+        all items by boost. Ties keep the order items were first added in.
+
+        Args:
+            query: Words to look for (case-insensitive).
+        """
+        items = self._items
+        words = list(dict.fromkeys(query.lower().split()))
+        if not words:
+            totals = {number: item[3] for number, item in items.items()}
+        else:
+            # Start from the word with the fewest candidates
+            candidates = {word: self._candidates(word) for word in words}
+            words.sort(key=lambda word: len(candidates[word]))
+            totals = self._match_word(words[0], candidates[words[0]], None)
+            for word in words[1:]:
+                if not totals:
+                    break
+                scores = self._match_word(word, candidates[word], totals.keys())
+                totals = {
+                    number: totals[number] + score for number, score in scores.items()
+                }
+            totals = {
+                number: score * (1 + items[number][3])
+                for number, score in totals.items()
+            }
+        heap = [(-score, number) for number, score in totals.items()]
+        heapq.heapify(heap)
+        return self._ranked(heap)
+
+    def _ranked(self, heap: List[Tuple[float, int]]) -> Iterator[FuzzyMatch]:
+        """Hand out the matches of a heap, best first."""
+        items = self._items
+        while heap:
+            score, number = heapq.heappop(heap)
+            yield FuzzyMatch(items[number][0], -score)
+
+    def _match_word(
+        self, word: str, candidates: Set[int], pool: Optional[AbstractSet[int]]
+    ) -> Dict[int, float]:
+        """Score the items matching one query word.
+
+        Args:
+            word: The lowercase word.
+            candidates: Items containing all of the word's characters.
+            pool: Only score these items (the matches of earlier words);
+                None for all.
+        """
+        items = self._items
+        cached = self._narrow.get(word)
+        if cached is not None:
+            scores: Dict[int, float] = dict(cached)
+        else:
+            scores = {}
+            for number in candidates if pool is None else candidates & pool:
+                item = items[number]
+                score = score_word(item[2], item[5], word)
+                if score is not None:
+                    scores[number] = score
+            if pool is None:
+                if len(self._narrow) >= _NARROW_CACHE_SIZE:
+                    self._narrow.clear()
+                self._narrow[word] = dict(scores)
+        if pool is not None:
+            scores = {
+                number: score for number, score in scores.items() if number in pool
+            }
+
+        if len(word) >= TYPO_MIN_LENGTH:
+            for similar, similarity in self._similar_words(word):
+                score = TYPO_SCORE * len(word) * similarity
+                for number in self._words[similar]:
+                    if (pool is None or number in pool) and scores.get(
+                        number, 0
+                    ) < score:
+                        scores[number] = score
+        return scores
+
+    def _similar_words(self, word: str) -> List[Tuple[str, float]]:
+        """Find indexed words sharing enough trigrams with a word.
+
+        Returns:
+            (word, share of trigrams in common) pairs.
+        """
+        grams = _trigrams(word)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._word_trigrams.get(gram, ()))
+        similar = []
+        for other, count in shared.items():
+            # A padded word has as many trigrams as characters
+            similarity = count / max(len(word), len(other))
+            if count >= 2 and similarity >= TYPO_MIN_SIMILARITY:
+                similar.append((other, similarity))
+        return similar
+
+    def _candidates(self, word: str) -> Set[int]:
+        """Get the items that may match a word in order.
+
+        Those are the items containing all of its characters, narrowed to
+        the matches of the longest cached prefix of the word (or the word
+        itself): an item matching the word matches its prefixes too.
+        """
+        postings = []
+        for char in set(word):
+            posting = self._chars.get(char)
+            if not posting:
+                return set()
+            postings.append(posting)
+        for end in range(len(word), 0, -1):
+            matched = self._narrow.get(word[:end])
+            if matched is not None:
+                return set(matched).intersection(*postings)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
@@ -0,0 +1,267 @@
+"""Append-only mutation journal for task files.
+
+Instead of rewriting ``<project_id>.json`` on every change, each task mutation
+is appended as one JSON line to a journal file in the data directory. The
+project files remain the snapshot format; the journal is folded back into
+them ("compacted") once it grows past a size or entry-count threshold.
+
+Each storage manager writes its own journal, ``journal-<pid>-<random>.jsonl``,
+and holds its lock (see ``locking.py``) for as long as it is open, so several
+processes sharing a data directory never replay, compact or delete each
+other's entries. A journal whose lock is free was left behind by a process
+that exited before compacting it; the next manager to start adopts it with
+``adopt_orphans`` and folds it in.
+
+Entry format (one object per line)::
+
+    {"op": "add", "project": "<project_id>", "record": {...task dict...}}
+    {"op": "update", "project": "<project_id>", "id": "<task_id>", "fields": {...}}
+    {"op": "delete", "project": "<project_id>", "id": "<task_id>"}
+
+Replaying the entries in order is idempotent with respect to the snapshot: a
+replay on top of either the pre-journal snapshot or an already compacted one
+ends in the same state, which makes an interrupted compaction safe.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from . import codec, locking
+
+# Journal of releases that shared one per data directory; adopted like any
+# journal whose owner is gone
+JOURNAL_FILENAME = "journal.jsonl"
+COMPACTING_SUFFIX = ".compacting"
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+
+def apply_entry(tasks: Dict[str, dict], entry: dict) -> None:
+    """Apply one journal entry to a project's task records (in place).
+
+    Args:
+        tasks: Task records keyed by id for the entry's project.
+        entry: Decoded journal entry.
+    """
+    op = entry.get("op")
+    if op == "add":
+        record = entry["record"]
+        tasks[record["id"]] = record
+    elif op == "update":
+        record = tasks.get(entry["id"])
+        if record is not None:
+            tasks[entry["id"]] = {**record, **entry["fields"]}
+    elif op == "delete":
+        tasks.pop(entry["id"], None)
+
+
+class MutationJournal:
+    """Append-only JSON-lines log of task mutations for one data directory."""
+
+    def __init__(
+        self,
+        data_dir: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        name: Optional[str] = None,
+    ):
+        """Open a journal and take its lock.
+
+        Args:
+            data_dir: Data directory holding the journal file.
+            max_entries: Entry count that triggers compaction.
+            max_bytes: Journal size in bytes that triggers compaction.
+            name: File name of an existing journal to take over; a new
+                journal is named after this process by default.
+
+        Raises:
+            LockTimeout: If another process owns the journal.
+        """
+        if name is None:
+            name = f"journal-{os.getpid()}-{uuid.uuid4().hex[:12]}.jsonl"
+        self.path = data_dir / name
+        self.compacting_path = data_dir / f"{name}{COMPACTING_SUFFIX}"
+        self._owner = locking.FileLock(self.path, timeout=0)
+        self._owner.acquire()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._handle = None
+        self._entries = 0
+        self._bytes = 0
+
+        if self.path.exists():
+            self._bytes = self.path.stat().st_size
+            self._entries = sum(1 for _ in self._read_lines(self.path))
+
+    @staticmethod
+    def _read_lines(path: Path) -> List[dict]:
+        """Decode all complete entries in a journal file.
+
+        A line that fails to decode can only be the tail of an append that
+        was interrupted by a crash, so it is skipped.
+        """
+        entries = []
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(codec.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def read_all(self) -> List[dict]:
+        """Read every pending entry, oldest first.
+
+        Includes entries from a compaction that was interrupted before it
+        finished, which must be replayed before the live journal.
+        """
+        entries: List[dict] = []
+        for path in (self.compacting_path, self.path):
+            if path.exists():
+                entries.extend(self._read_lines(path))
+        return entries
+
+    def append(self, entry: dict) -> None:
+        """Append a single entry to the journal."""
+        self.extend([entry])
+
+    def extend(self, entries: List[dict]) -> None:
+        """Append several entries to the journal with a single write.
+
+        The lines are flushed to the OS immediately so they survive a crash
+        of the process; fsync is left to compaction to keep appends cheap.
+        """
+        if not entries:
+            return
+        if self._handle is None:
+            self._handle = open(self.path, "ab")
+        data = b"".join(codec.dumps(entry, compact=True) + b"\n" for entry in entries)
+        self._handle.write(data)
+        self._handle.flush()
+        self._entries += len(entries)
+        self._bytes += len(data)
+
+    def needs_compaction(self) -> bool:
+        """Check whether the journal has grown past its thresholds."""
+        return self._entries >= self.max_entries or self._bytes >= self.max_bytes
+
+    def is_empty(self) -> bool:
+        """Check whether there are no pending entries at all."""
+        return self._entries == 0 and not self.compacting_path.exists()
+
+    def rotate(self) -> Optional[Path]:
+        """Move the live journal aside so compaction can fold it in.
+
+        New entries go to a fresh journal file while the rotated one is being
+        compacted. Returns the rotated path, or None if there was nothing to
+        rotate.
+        """
+        self.close()
+        if not self.path.exists():
+            return None
+        if self.compacting_path.exists():
+            # An earlier compaction never finished; keep its entries first
+            with open(self.compacting_path, "ab") as dest:
+                dest.write(self.path.read_bytes())
+            self.path.unlink()
+        else:
+            os.replace(self.path, self.compacting_path)
+        self._entries = 0
+        self._bytes = 0
+        return self.compacting_path
+
+    def discard_rotated(self) -> None:
+        """Delete the rotated journal once its snapshot files are written."""
+        self.compacting_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Close the append handle."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def remove(self) -> None:
+        """Delete the journal files and give up the lock (once folded in)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self.compacting_path.unlink(missing_ok=True)
+        locking.lock_file_for(self.path).unlink(missing_ok=True)
+        self._owner.release()
+
+
+def adopt_orphans(data_dir: Path) -> List[MutationJournal]:
+    """Take over the journals of processes that are gone.
+
+    Journals whose lock is held belong to running processes and are left
+    alone. Lock files of orphans that left no entries are cleaned up.
+
+    Args:
+        data_dir: Data directory holding the journals.
+
+    Returns:
+        The orphaned journals with entries, oldest first. Their entries
+        must be folded into the snapshots before ``remove`` is called.
+    """
+    orphans = []
+    for name in _journal_names(data_dir, locks=True):
+        try:
+            journal = MutationJournal(data_dir, name=name)
+        except locking.LockTimeout:
+            continue
+        if journal.is_empty():
+            journal.remove()
+        else:
+            orphans.append(journal)
+    orphans.sort(key=lambda journal: _last_modified(journal.path))
+    return orphans
+
+
+def read_journals(data_dir: Path) -> List[dict]:
+    """Read the entries of every journal in a data directory, without locking.
+
+    For reading a data directory as it is (e.g. to copy it elsewhere); the
+    journals of running processes are included. Journals are taken oldest
+    first.
+    """
+    entries: List[dict] = []
+    for name in sorted(
+        _journal_names(data_dir), key=lambda n: _last_modified(data_dir / n)
+    ):
+        for path in (data_dir / f"{name}{COMPACTING_SUFFIX}", data_dir / name):
+            if path.exists():
+                entries.extend(MutationJournal._read_lines(path))
+    return entries
+
+
+def _journal_names(data_dir: Path, locks: bool = False) -> Set[str]:
+    """Get the file names of the journals in a data directory.
+
+    Args:
+        data_dir: Data directory holding the journals.
+        locks: Also count journals that only have a lock file left.
+    """
+    names = {path.name for path in data_dir.glob("journal*.jsonl")}
+    names.update(
+        path.name[: -len(COMPACTING_SUFFIX)]
+        for path in data_dir.glob(f"journal*.jsonl{COMPACTING_SUFFIX}")
+    )
+    if locks:
+        names.update(path.name[1:-5] for path in data_dir.glob(".journal*.jsonl.lock"))
+    return names
+
+
+def _last_modified(path: Path) -> float:
+    """Get the time a journal was last appended to (or rotated)."""
+    for candidate in (path, path.with_name(f"{path.name}{COMPACTING_SUFFIX}")):
+        try:
+            return candidate.stat().st_mtime
+        except FileNotFoundError:
+            continue
+    return 0.0
@@ -0,0 +1,152 @@
+"""Ordered, versioned migrations of the data directory layout.
+
+The data directory records the version of its layout in a small
+``schema_version`` file. Each registered migration upgrades the layout to
+its version; on start only the migrations above the recorded version run,
+so an up-to-date directory costs a single small read instead of probing
+for every legacy file.
+
+To change the on-disk format (a new index, a file moving), register a
+function taking the storage manager under the next version number::
+
+    @migrations.register(4, "Build the search index")
+    def _build_search_index(storage: StorageManager) -> None:
+        ...
+
+Each storage backend has its own migrations, registered with
+``backend="sqlite"`` and so on, and its own marker (``schema_version`` for
+the JSON files, ``schema_version.sqlite`` for the database).
+
+Migrations must be idempotent: the marker is advanced after each one, once
+its writes are flushed to disk, so a migration interrupted by a crash runs
+again on the next start. Migrations that import or rewrite user data are
+registered with ``data=True`` and are skipped when the storage is opened
+with ``skip_migrations`` (demo mode); the marker then stays below them so
+a normal start still runs them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .flush import atomic_write
+
+SCHEMA_VERSION_FILENAME = "schema_version"
+DEFAULT_BACKEND = "json"
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One step of the data directory layout."""
+
+    version: int
+    description: str
+    apply: Callable[[Any], None]
+    data: bool = False
+
+
+# Backend name -> its migrations, oldest first
+_REGISTRY: Dict[str, List[Migration]] = {}
+
+
+def register(
+    version: int,
+    description: str,
+    data: bool = False,
+    backend: str = DEFAULT_BACKEND,
+) -> Callable[[Callable[[Any], None]], Callable[[Any], None]]:
+    """Register a migration function under a layout version.
+
+    Args:
+        version: Layout version the migration upgrades to; must be unique
+            within the backend.
+        description: One line saying what the migration does.
+        data: True if it imports or rewrites user data (skipped in demo mode).
+        backend: Storage backend whose layout the migration upgrades.
+    """
+
+    def decorator(func: Callable[[Any], None]) -> Callable[[Any], None]:
+        backend_migrations = _REGISTRY.setdefault(backend, [])
+        if any(m.version == version for m in backend_migrations):
+            raise ValueError(f"Duplicate {backend} migration version {version}")
+        backend_migrations.append(Migration(version, description, func, data))
+        backend_migrations.sort(key=lambda m: m.version)
+        return func
+
+    return decorator
+
+
+def registered(backend: str = DEFAULT_BACKEND) -> List[Migration]:
+    """Get a backend's registered migrations, oldest first."""
+    return list(_REGISTRY.get(backend, []))
+
+
+def latest_version(backend: str = DEFAULT_BACKEND) -> int:
+    """Get the layout version a backend's registered migrations lead to."""
+    backend_migrations = _REGISTRY.get(backend)
+    return backend_migrations[-1].version if backend_migrations else 0
+
+
+def version_file(data_dir: Path, backend: str = DEFAULT_BACKEND) -> Path:
+    """Get the file recording a backend's layout version."""
+    if backend == DEFAULT_BACKEND:
+        return data_dir / SCHEMA_VERSION_FILENAME
+    return data_dir / f"{SCHEMA_VERSION_FILENAME}.{backend}"
+
+
+def read_version(data_dir: Path, backend: str = DEFAULT_BACKEND) -> int:
+    """Read a data directory's layout version (0 if never recorded)."""
+    try:
+        return int(version_file(data_dir, backend).read_bytes().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def write_version(data_dir: Path, version: int, backend: str = DEFAULT_BACKEND) -> None:
+    """Record a data directory's layout version."""
+    atomic_write(version_file(data_dir, backend), f"{version}\n".encode("ascii"))
+
+
+def run(
+    storage: Any,
+    data_dir: Path,
+    skip_data: bool = False,
+    backend: str = DEFAULT_BACKEND,
+) -> int:
+    """Bring a data directory up to the latest layout version.
+
+    Args:
+        storage: Storage manager passed to each migration.
+        data_dir: Data directory holding the version marker.
+        skip_data: Skip migrations registered with ``data=True``.
+        backend: Storage backend whose migrations to run.
+
+    Returns:
+        Number of migrations that ran.
+
+    Raises:
+        FlushError: If a migration's writes could not be saved; the marker
+            stays below it, so it runs again on the next start.
+    """
+    current = read_version(data_dir, backend)
+    if current >= latest_version(backend):
+        return 0
+
+    ran = 0
+    held = False  # a skipped migration keeps the marker from advancing
+    for migration in _REGISTRY[backend]:
+        if migration.version <= current:
+            continue
+        if skip_data and migration.data:
+            held = True
+            continue
+        migration.apply(storage)
+        ran += 1
+        # Its writes may still wait in the coalescing window; the marker
+        # only moves past it once they are on disk (flush raises otherwise)
+        storage.flush()
+        if not held:
+            write_version(data_dir, migration.version, backend)
+    return ran
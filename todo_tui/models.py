@@ -1,14 +1,21 @@
-"""Data models for the todo application."""
+"""Data models for the todo application.
+
+The record classes use ``__slots__`` to keep per-instance memory low, and
+``from_dict`` interns the low-cardinality strings that repeat across records
+(priorities, project ids, subtask ids, snippet tags) so they are shared
+instead of copied.
+"""
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from sys import intern
+from typing import Dict, List, Optional
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class Subtask:
     """A subtask within a task."""
 
@@ -17,9 +24,15 @@ class Subtask:
     completed: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
-    """A todo task."""
+    """A todo task.
+
+    Tasks loaded as summaries (see ``StorageManager.load_task_summaries``)
+    have ``summary_only`` set and empty ``description``/``notes`` until
+    ``StorageManager.load_task_body`` fills them in. Their ``search_text``
+    holds the description lowercased, so filters can match it meanwhile.
+    """
 
     id: str = field(default_factory=lambda: str(uuid4()))
     title: str = ""
@@ -31,6 +44,8 @@ class Task:
     subtasks: List[Subtask] = field(default_factory=list)
     project_id: str = ""
     priority: str = "none"  # Options: "high", "medium", "low", "none"
+    summary_only: bool = field(default=False, repr=False, compare=False)
+    search_text: str = field(default="", repr=False, compare=False)
 
     def toggle_complete(self) -> None:
         """Toggle task completion status."""
@@ -91,7 +106,7 @@ class Task:
     def from_dict(cls, data: dict) -> "Task":
         """Create task from dictionary."""
         subtasks = [
-            Subtask(id=s["id"], title=s["title"], completed=s["completed"])
+            Subtask(id=intern(s["id"]), title=s["title"], completed=s["completed"])
             for s in data.get("subtasks", [])
         ]
         return cls(
@@ -103,8 +118,8 @@ class Task:
             created_at=data["created_at"],
             completed_at=data.get("completed_at"),
             subtasks=subtasks,
-            project_id=data.get("project_id", ""),
-            priority=data.get("priority", "none"),
+            project_id=intern(data.get("project_id", "")),
+            priority=intern(data.get("priority", "none")),
         )
 
     def get_priority_display(self, completed: bool = False) -> tuple[str, str]:
@@ -136,7 +151,7 @@ class Task:
         return priority_map.get(self.priority, ("", ""))
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     """A project that contains tasks."""
 
@@ -154,7 +169,39 @@ class Project:
         return cls(id=data["id"], name=data["name"], created_at=data["created_at"])
 
 
-@dataclass
+@dataclass(slots=True)
+class ProjectStats:
+    """Aggregate task counts for a project, maintained by the storage layer."""
+
+    project_id: str = ""
+    total: int = 0
+    completed: int = 0
+    by_priority: Dict[str, int] = field(default_factory=dict)
+    last_modified: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert stats to dictionary for JSON serialization."""
+        return {
+            "project_id": self.project_id,
+            "total": self.total,
+            "completed": self.completed,
+            "by_priority": dict(self.by_priority),
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ProjectStats":
+        """Create stats from dictionary."""
+        return cls(
+            project_id=data.get("project_id", ""),
+            total=data.get("total", 0),
+            completed=data.get("completed", 0),
+            by_priority=dict(data.get("by_priority", {})),
+            last_modified=data.get("last_modified"),
+        )
+
+
+@dataclass(slots=True)
 class Note:
     """A markdown note in the scratchpad."""
 
@@ -186,7 +233,16 @@ class Note:
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class NoteRevision:
+    """A stored revision of a note (its content is rebuilt on request)."""
+
+    number: int = 0
+    created_at: str = ""
+    size: int = 0
+
+
+@dataclass(slots=True)
 class Snippet:
     """A code snippet for quick copying."""
 
@@ -204,7 +260,7 @@ class Snippet:
             "id": self.id,
             "name": self.name,
             "command": self.command,
-            "tags": self.tags,
+            "tags": list(self.tags),
             "uses": self.uses,
             "last_used": self.last_used,
             "created_at": self.created_at,
@@ -217,7 +273,7 @@ class Snippet:
             id=data["id"],
             name=data["name"],
             command=data.get("command", ""),
-            tags=data.get("tags", []),
+            tags=[intern(tag) for tag in data.get("tags", [])],
             uses=data.get("uses", 0),
             last_used=data.get("last_used"),
             created_at=data["created_at"],
@@ -242,6 +298,25 @@ class Settings:
         cloud_sync_enabled: Whether cloud sync is enabled (device must be linked)
         cloud_sync_url: Base URL for cloud sync API
         last_cloud_sync: ISO timestamp of last successful cloud sync
+        storage_backend: Storage backend for user data ('json' or 'sqlite')
+        storage_journal: Append task changes to a journal that is compacted in
+            the background, instead of rewriting task files (JSON backend only)
+        storage_flush_window_ms: Milliseconds to coalesce data file writes for
+            before flushing them in the background (0 writes immediately)
+        storage_compact_json: Write data files as compact JSON (no indentation)
+        storage_watch: Watch the data directory and show changes made by other
+            tuido instances or scripts without a restart
+        storage_load_workers: Threads reading project files in parallel at
+            startup (JSON backend; 1 reads them one by one)
+        note_history_revisions: Number of revisions kept per note (0 disables
+            note history)
+        note_history_snapshot_interval: Store every N-th note revision in
+            full; the others are deltas, so a restore applies at most N-1
+        note_history_max_kb: Size limit of a note's revision history in KiB
+        archive_completed_after_days: Move tasks completed more than this many
+            days ago to the compressed archive at startup (0 disables it)
+        prefetch_tabs: Build the Scratchpad and Snippets tabs in the background
+            shortly after startup instead of when they are first opened
 
     Note: Device token is stored securely in system keyring, not in settings file.
     """
@@ -262,6 +337,17 @@ class Settings:
     encryption_password: str = ""  # Stored locally (keyring disabled)
     device_token: str = ""  # Stored locally (keyring disabled)
     device_id: str = ""  # Stored locally (keyring disabled)
+    storage_backend: str = "json"  # "json" (default) or "sqlite"
+    storage_journal: bool = False  # Journal task changes (JSON backend only)
+    storage_flush_window_ms: int = 250  # Write coalescing window (JSON backend)
+    storage_compact_json: bool = False  # Compact (unindented) data files
+    storage_watch: bool = True  # Live-reload changes from other instances
+    storage_load_workers: int = 8  # Parallel project file reads at startup
+    note_history_revisions: int = 50  # Revisions kept per note (0 = off)
+    note_history_snapshot_interval: int = 10  # Full snapshot every N revisions
+    note_history_max_kb: int = 512  # History size limit per note
+    archive_completed_after_days: int = 0  # Archive old completed tasks (0 = off)
+    prefetch_tabs: bool = True  # Build hidden tabs after the first paint
 
     def to_dict(self) -> dict:
         """Convert settings to dictionary for JSON serialization."""
@@ -282,6 +368,17 @@ class Settings:
             "encryption_password": self.encryption_password,
             "device_token": self.device_token,
             "device_id": self.device_id,
+            "storage_backend": self.storage_backend,
+            "storage_journal": self.storage_journal,
+            "storage_flush_window_ms": self.storage_flush_window_ms,
+            "storage_compact_json": self.storage_compact_json,
+            "storage_watch": self.storage_watch,
+            "storage_load_workers": self.storage_load_workers,
+            "note_history_revisions": self.note_history_revisions,
+            "note_history_snapshot_interval": self.note_history_snapshot_interval,
+            "note_history_max_kb": self.note_history_max_kb,
+            "archive_completed_after_days": self.archive_completed_after_days,
+            "prefetch_tabs": self.prefetch_tabs,
         }
 
     @classmethod
@@ -304,4 +401,17 @@ class Settings:
             encryption_password=data.get("encryption_password", ""),
             device_token=data.get("device_token", ""),
             device_id=data.get("device_id", ""),
+            storage_backend=data.get("storage_backend", "json"),
+            storage_journal=data.get("storage_journal", False),
+            storage_flush_window_ms=data.get("storage_flush_window_ms", 250),
+            storage_compact_json=data.get("storage_compact_json", False),
+            storage_watch=data.get("storage_watch", True),
+            storage_load_workers=data.get("storage_load_workers", 8),
+            note_history_revisions=data.get("note_history_revisions", 50),
+            note_history_snapshot_interval=data.get(
+                "note_history_snapshot_interval", 10
+            ),
+            note_history_max_kb=data.get("note_history_max_kb", 512),
+            archive_completed_after_days=data.get("archive_completed_after_days", 0),
+            prefetch_tabs=data.get("prefetch_tabs", True),
         )
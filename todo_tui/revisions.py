@@ -0,0 +1,246 @@
+"""Delta-compressed revision history for notes.
+
+Each note's history is a sequence of numbered revisions. Every
+``snapshot_interval``-th revision is stored in full; the ones in between are
+stored as a single-span delta against the previous revision (see
+``notelog.diff``). Rebuilding any revision therefore applies at most
+``snapshot_interval - 1`` deltas on top of the nearest earlier snapshot.
+
+Entry format::
+
+    {"n": 7, "at": "<iso time>", "size": 1234, "full": "<content>"}
+    {"n": 8, "at": "<iso time>", "size": 1240, "delta": [start, end, "text"]}
+
+Retention keeps the newest ``max_revisions`` revisions within ``max_bytes``
+of encoded entries. Older revisions are cut off the front; when the first
+kept revision is a delta it is rewritten as a snapshot, so the history
+always starts with one. Stored entries that cannot be rebuilt (a line lost
+to a crash, a damaged entry) are dropped on load together with the deltas
+that depend on them, up to the next snapshot.
+
+``NoteHistory`` only manages the entries in memory. The JSON backend keeps
+them one per line in ``notes/<note_id>.history`` (``load``, ``append``,
+``rewrite``); the SQLite backend keeps them in the ``note_revisions`` table.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional
+
+from . import codec, notelog
+from .flush import atomic_write
+from .models import NoteRevision
+
+HISTORY_SUFFIX = ".history"
+DEFAULT_SNAPSHOT_INTERVAL = 10
+DEFAULT_MAX_REVISIONS = 50
+DEFAULT_MAX_BYTES = 512 * 1024
+
+
+class NoteHistory:
+    """Revision entries of one note, with snapshot/delta encoding and retention."""
+
+    def __init__(
+        self,
+        entries: List[dict],
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        max_revisions: int = DEFAULT_MAX_REVISIONS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """Initialize the history.
+
+        Args:
+            entries: Stored entries, oldest first.
+            snapshot_interval: Store every N-th revision in full.
+            max_revisions: Number of revisions to keep.
+            max_bytes: Encoded size of the entries to stay within.
+        """
+        self.entries = _chain(entries)
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.max_revisions = max(1, max_revisions)
+        self.max_bytes = max_bytes
+        self._sizes = [len(codec.dumps(e, compact=True)) for e in self.entries]
+        self._latest: Optional[str] = None
+
+    def revisions(self) -> List[NoteRevision]:
+        """List the stored revisions, newest first."""
+        return [
+            NoteRevision(number=e["n"], created_at=e["at"], size=e["size"])
+            for e in reversed(self.entries)
+        ]
+
+    def content(self, number: int) -> Optional[str]:
+        """Rebuild the content of a revision.
+
+        Args:
+            number: Revision number.
+
+        Returns:
+            The revision's content, or None if it is not stored.
+        """
+        for index, entry in enumerate(self.entries):
+            if entry["n"] == number:
+                return self._build(index)
+        return None
+
+    def record(self, content: str, created_at: str) -> Optional[dict]:
+        """Add a revision unless the content equals the latest one.
+
+        Args:
+            content: Note content to record.
+            created_at: ISO timestamp of the revision.
+
+        Returns:
+            The new entry, or None if nothing was recorded.
+        """
+        if self.entries:
+            latest = self._latest_content()
+            if latest == content:
+                return None
+            last = self.entries[-1]
+            number = last["n"] + 1
+            since_snapshot = number - self._snapshot_number(len(self.entries) - 1)
+        else:
+            latest = None
+            number = 1
+            since_snapshot = 0
+
+        entry = {"n": number, "at": created_at, "size": len(content.encode("utf-8"))}
+        if latest is None or since_snapshot >= self.snapshot_interval:
+            entry["full"] = content
+        else:
+            entry["delta"] = list(notelog.diff(latest, content))
+        self.entries.append(entry)
+        self._sizes.append(len(codec.dumps(entry, compact=True)))
+        self._latest = content
+        return entry
+
+    def prune(self) -> int:
+        """Apply retention by cutting the oldest revisions.
+
+        Returns:
+            Number of entries removed from the front (0 if none).
+        """
+        removed = 0
+        while True:
+            cut = max(0, len(self.entries) - self.max_revisions)
+            total = sum(self._sizes[cut:])
+            while total > self.max_bytes and cut < len(self.entries) - 1:
+                total -= self._sizes[cut]
+                cut += 1
+            if cut == 0:
+                return removed
+
+            # Turning the new first entry into a snapshot can grow it past
+            # the size limit again, hence the outer loop
+            first = self.entries[cut]
+            if "full" not in first:
+                first = {k: v for k, v in first.items() if k != "delta"}
+                first["full"] = self._build(cut)
+            self.entries = [first] + self.entries[cut + 1 :]
+            self._sizes = [len(codec.dumps(first, compact=True))] + self._sizes[
+                cut + 1 :
+            ]
+            removed += cut
+
+    def _snapshot_number(self, index: int) -> int:
+        """Get the revision number of the snapshot at or before an entry."""
+        while "full" not in self.entries[index]:
+            index -= 1
+        return self.entries[index]["n"]
+
+    def _latest_content(self) -> str:
+        """Get the content of the newest revision."""
+        if self._latest is None:
+            self._latest = self._build(len(self.entries) - 1)
+        return self._latest
+
+    def _build(self, index: int) -> str:
+        """Rebuild an entry's content from its snapshot and deltas."""
+        start = index
+        while "full" not in self.entries[start]:
+            start -= 1
+        content = self.entries[start]["full"]
+        for entry in self.entries[start + 1 : index + 1]:
+            content = notelog.apply(content, tuple(entry["delta"]))
+        return content
+
+
+def _chain(entries: List[dict]) -> List[dict]:
+    """Keep the entries that can be rebuilt.
+
+    Every delta must directly follow the revision it was made against, so a
+    gap in the numbering drops the deltas after it until the next snapshot.
+    """
+    kept: List[dict] = []
+    for entry in entries:
+        if not _well_formed(entry):
+            continue
+        if "full" in entry:
+            if not kept or entry["n"] > kept[-1]["n"]:
+                kept.append(entry)
+        elif kept and entry["n"] == kept[-1]["n"] + 1:
+            kept.append(entry)
+    return kept
+
+
+def _well_formed(entry: object) -> bool:
+    """Check the fields of a stored entry."""
+    if not (
+        isinstance(entry, dict)
+        and isinstance(entry.get("n"), int)
+        and isinstance(entry.get("at"), str)
+        and isinstance(entry.get("size"), int)
+    ):
+        return False
+    if "full" in entry:
+        return isinstance(entry["full"], str)
+    delta = entry.get("delta")
+    return (
+        isinstance(delta, list)
+        and len(delta) == 3
+        and isinstance(delta[0], int)
+        and isinstance(delta[1], int)
+        and isinstance(delta[2], str)
+    )
+
+
+def load(path: Path) -> List[dict]:
+    """Read the entries of a history file (empty if it does not exist)."""
+    entries = []
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(codec.loads(line))
+                except ValueError:
+                    # Tail of an append interrupted by a crash
+                    continue
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def append(path: Path, entry: dict) -> None:
+    """Append one entry to a history file.
+
+    If an earlier append was cut short, the new entry starts on a fresh line
+    so that only the broken line is skipped by ``load``.
+    """
+    with open(path, "a+b") as f:
+        f.seek(0, 2)
+        separator = b""
+        if f.tell():
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                separator = b"\n"
+        f.write(separator + codec.dumps(entry, compact=True) + b"\n")
+
+
+def rewrite(path: Path, entries: List[dict]) -> None:
+    """Atomically replace a history file with the given entries."""
+    atomic_write(path, b"".join(codec.dumps(e, compact=True) + b"\n" for e in entries))
@@ -0,0 +1,380 @@
+"""Inverted full-text index over tasks, notes and snippets.
+
+Every task, note and snippet is a document. Its text fields are split into
+lowercase word tokens, and each token gets the summed weight of the fields
+it appears in (``FIELD_WEIGHTS``), so a match in a title outranks one in a
+description. The postings map each token to the documents containing it
+and their weights; a sorted vocabulary makes prefix lookups a bisect.
+
+A query matches the documents containing every query word, either exactly
+or as a prefix of a longer token (a prefix match scores less). Results are
+ranked by summed weight.
+
+Documents are grouped by source: one per project's tasks, one for all
+notes and one for all snippets. The storage layer marks a source dirty
+when its data changes and calls ``sync_source`` with its current documents
+before the next query. Only documents whose text changed (by CRC) are
+re-tokenized, so an edit costs one pass over its source, not a rebuild.
+
+The index is saved to ``index/search.idx`` (marshal, like the startup
+snapshot) with the signature of each source's data file. On the next start
+only sources whose file changed are re-indexed. Like the other indexes it
+is derived data: deleting it only costs one full rebuild.
+"""
+
+from __future__ import annotations
+
+import heapq
+import marshal
+import re
+import zlib
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .flush import atomic_write
+
+SEARCH_FILENAME = "search.idx"
+FORMAT_VERSION = 1
+
+NOTES_SOURCE = "notes"
+SNIPPETS_SOURCE = "snippets"
+TASK_SOURCE_PREFIX = "tasks/"
+
+# Weight of a token found in each field, per document kind
+FIELD_WEIGHTS = {
+    "task": {"title": 4.0, "subtasks": 2.0, "description": 1.0, "notes": 1.0},
+    "note": {"title": 4.0, "content": 1.0},
+    "snippet": {"name": 4.0, "tags": 3.0, "command": 1.0},
+}
+
+# Score factor of a token matched by prefix rather than exactly
+PREFIX_FACTOR = 0.5
+
+# Vocabulary changes above this size re-sort the vocabulary in one go
+_VOCAB_BATCH = 256
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def task_source(project_id: str) -> str:
+    """Get the source holding a project's tasks."""
+    return f"{TASK_SOURCE_PREFIX}{project_id}"
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+@dataclass(frozen=True)
+class Document:
+    """A searchable item as handed to ``SearchIndex.sync_source``.
+
+    Attributes:
+        kind: ``"task"``, ``"note"`` or ``"snippet"``.
+        id: The item's id.
+        title: Text shown for the item in results.
+        parent: Containing item (the project id of a task), if any.
+        fields: Field name to text; names are keys of ``FIELD_WEIGHTS``.
+    """
+
+    kind: str
+    id: str
+    title: str
+    parent: str
+    fields: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A ranked search result."""
+
+    kind: str
+    id: str
+    title: str
+    parent: str
+    score: float
+
+
+class SearchIndex:
+    """Token postings for all documents, maintained one source at a time."""
+
+    def __init__(self) -> None:
+        # token -> {doc number: weight}; documents are numbered because int
+        # keys hash, compare and marshal much faster than "kind:id" strings
+        self.postings: Dict[str, Dict[int, float]] = {}
+        # doc number -> (title, kind, id, parent, source, crc, tokens); the
+        # title comes first so sorting numbers by their doc orders by title
+        self.docs: Dict[int, tuple] = {}
+        # source -> signature of its data file when indexed (None: unknown)
+        self.sources: Dict[str, Any] = {}
+        self._numbers: Dict[Tuple[str, str], int] = {}
+        self._next_number = 0
+        self._source_docs: Dict[str, Set[int]] = {}
+        self._vocab: List[str] = []
+
+    # Maintenance
+    def sync_source(self, source: str, documents: Iterable[Document]) -> int:
+        """Make a source's indexed documents match the given ones.
+
+        Documents whose text is unchanged keep their postings; changed and
+        new ones are re-tokenized, and ones no longer present are removed.
+
+        Returns:
+            Number of documents (re)indexed or removed.
+        """
+        old_keys = self._source_docs.get(source, set())
+        new_keys: Set[int] = set()
+        touched: Set[str] = set()
+        changed = 0
+        for document in documents:
+            key = self._numbers.get((document.kind, document.id))
+            if key is None:
+                key = self._next_number
+                self._next_number += 1
+                self._numbers[(document.kind, document.id)] = key
+            new_keys.add(key)
+            weights = FIELD_WEIGHTS[document.kind]
+            texts = [document.fields.get(name) or "" for name in weights]
+            crc = zlib.crc32("\x00".join(texts).encode("utf-8"))
+            head = (document.title, document.kind, document.id, document.parent)
+            indexed = self.docs.get(key)
+            if indexed is not None and indexed[5] == crc and indexed[4] == source:
+                if indexed[:4] != head:
+                    self.docs[key] = (*head, source, crc, indexed[6])
+                continue
+            self._remove(key, touched)
+            terms: Dict[str, float] = {}
+            for weight, text in zip(weights.values(), texts):
+                field_terms = dict.fromkeys(tokenize(text), weight)
+                for token in field_terms.keys() & terms.keys():
+                    field_terms[token] += terms[token]
+                terms.update(field_terms)
+            self._add(key, (*head, source, crc, tuple(terms)), terms, touched)
+            changed += 1
+        for key in old_keys - new_keys:
+            self._remove(key, touched, forget=True)
+            changed += 1
+        self._update_vocab(touched)
+        self.sources[source] = None
+        return changed
+
+    def drop_source(self, source: str) -> None:
+        """Remove a source and all of its documents."""
+        touched: Set[str] = set()
+        for key in list(self._source_docs.get(source, ())):
+            self._remove(key, touched, forget=True)
+        self._update_vocab(touched)
+        self._source_docs.pop(source, None)
+        self.sources.pop(source, None)
+
+    def _add(
+        self, key: int, doc: tuple, terms: Dict[str, float], touched: Set[str]
+    ) -> None:
+        """Index a document that is not in the index.
+
+        Tokens new to the postings are added to ``touched``.
+        """
+        self.docs[key] = doc
+        self._source_docs.setdefault(doc[4], set()).add(key)
+        postings = self.postings
+        for token, weight in terms.items():
+            posting = postings.get(token)
+            if posting is None:
+                postings[token] = {key: weight}
+                touched.add(token)
+            else:
+                posting[key] = weight
+
+    def _remove(self, key: int, touched: Set[str], forget: bool = False) -> None:
+        """Remove a document from the index, if it is there.
+
+        Tokens left without documents are added to ``touched``. With
+        ``forget`` the document's number is released too.
+        """
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        if forget:
+            self._numbers.pop((doc[1], doc[2]), None)
+        self._source_docs.get(doc[4], set()).discard(key)
+        for token in doc[6]:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self.postings[token]
+                touched.add(token)
+
+    def _in_vocab(self, token: str) -> bool:
+        """Check whether a token is in the sorted vocabulary."""
+        index = bisect_left(self._vocab, token)
+        return index < len(self._vocab) and self._vocab[index] == token
+
+    def _update_vocab(self, touched: Set[str]) -> None:
+        """Bring the sorted vocabulary in line with the postings.
+
+        Args:
+            touched: Tokens that were added to or emptied from the postings
+                (possibly both, in either order).
+
+        A few tokens are inserted or deleted in place; larger batches (a
+        full build) are merged in one pass instead of a list shift each.
+        """
+        added = [t for t in touched if t in self.postings and not self._in_vocab(t)]
+        dropped = {t for t in touched if t not in self.postings and self._in_vocab(t)}
+        if len(dropped) > _VOCAB_BATCH:
+            self._vocab = [token for token in self._vocab if token not in dropped]
+        else:
+            for token in dropped:
+                del self._vocab[bisect_left(self._vocab, token)]
+        if len(added) > _VOCAB_BATCH:
+            # Sorting a sorted list plus a sorted tail is a single merge
+            added.sort()
+            self._vocab.extend(added)
+            self._vocab.sort()
+        else:
+            for token in added:
+                self._vocab.insert(bisect_left(self._vocab, token), token)
+
+    # Queries
+    def search(
+        self,
+        query: str,
+        kinds: Optional[Sequence[str]] = None,
+        limit: Optional[int] = 50,
+    ) -> List[SearchHit]:
+        """Find the documents matching every word of a query, best first.
+
+        Ties are ordered by title.
+
+        Args:
+            query: Words to look for; each matches tokens equal to it or
+                starting with it.
+            kinds: Only return documents of these kinds.
+            limit: Maximum number of hits (None for all).
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+        per_word = sorted((self._match(word) for word in words), key=len)
+        scores = per_word[0]
+        for matches in per_word[1:]:
+            scores = {
+                key: score + matches[key]
+                for key, score in scores.items()
+                if key in matches
+            }
+            if not scores:
+                return []
+
+        docs = self.docs
+        if kinds is not None:
+            wanted = set(kinds)
+            scores = {
+                key: score for key, score in scores.items() if docs[key][1] in wanted
+            }
+        if limit is not None and len(scores) > limit:
+            # Only documents scoring at least the limit-th best score can
+            # make the cut; the rest are never sorted
+            cutoff = heapq.nlargest(limit, scores.values())[-1]
+            scores = {key: score for key, score in scores.items() if score >= cutoff}
+        # Two stable sorts: by title, then by descending score
+        ranked = sorted(scores, key=docs.__getitem__)
+        ranked.sort(key=scores.__getitem__, reverse=True)
+        if limit is not None:
+            del ranked[limit:]
+        return [
+            SearchHit(doc[1], doc[2], doc[0], doc[3], scores[key])
+            for key, doc in ((key, docs[key]) for key in ranked)
+        ]
+
+    def _match(self, word: str) -> Dict[int, float]:
+        """Score the documents containing a word, exactly or as a prefix.
+
+        A document containing several matching tokens scores its best one.
+        """
+        exact = self.postings.get(word)
+        matches = dict(exact) if exact else {}
+        vocab = self._vocab
+        index = bisect_left(vocab, word)
+        while index < len(vocab) and vocab[index].startswith(word):
+            token = vocab[index]
+            index += 1
+            if token == word:
+                continue
+            posting = self.postings[token]
+            if not matches:
+                matches = {
+                    key: weight * PREFIX_FACTOR for key, weight in posting.items()
+                }
+                continue
+            for key in posting.keys() & matches.keys():
+                weight = posting[key] * PREFIX_FACTOR
+                if matches[key] < weight:
+                    matches[key] = weight
+            matches.update(
+                {
+                    key: posting[key] * PREFIX_FACTOR
+                    for key in posting.keys() - matches.keys()
+                }
+            )
+        return matches
+
+    # Persistence
+    def to_payload(self) -> dict:
+        """Get the index as plain data for ``write_index``."""
+        return {
+            "postings": self.postings,
+            "docs": self.docs,
+            "sources": self.sources,
+            "next_number": self._next_number,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> SearchIndex:
+        """Rebuild an index from ``to_payload`` data."""
+        index = cls()
+        index.postings = payload["postings"]
+        index.docs = payload["docs"]
+        index.sources = payload["sources"]
+        index._next_number = payload["next_number"]
+        for key, doc in index.docs.items():
+            index._numbers[(doc[1], doc[2])] = key
+            index._source_docs.setdefault(doc[4], set()).add(key)
+        index._vocab = sorted(index.postings)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+
+def read_index(path: Path) -> Optional[SearchIndex]:
+    """Read a saved index, or None if missing, unreadable or incompatible."""
+    try:
+        payload = marshal.loads(path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != (
+        FORMAT_VERSION,
+        marshal.version,
+    ):
+        return None
+    return SearchIndex.from_payload(payload)
+
+
+def write_index(path: Path, index: SearchIndex) -> None:
+    """Atomically save an index."""
+    payload: Dict[str, Any] = index.to_payload()
+    payload["format"] = (FORMAT_VERSION, marshal.version)
+    atomic_write(path, marshal.dumps(payload))
+
+
+def split_source(source: str) -> Tuple[str, str]:
+    """Split a source into its kind of data and project id (tasks only)."""
+    if source.startswith(TASK_SOURCE_PREFIX):
+        return "tasks", source[len(TASK_SOURCE_PREFIX) :]
+    return source, ""
@@ -0,0 +1,58 @@
+"""Startup snapshot: what the first screen shows, in a single file.
+
+On quit (and after journal compaction) the storage layer writes
+``index/startup.snapshot``: the project, snippet and note index records,
+the task summaries of every project and the persisted project stats, each
+stamped with the signature of the file it was taken from. On the next
+launch the caches are seeded from it with one read, so the first paint
+does not touch the individual data files at all; the signatures are then
+checked in the background and anything that changed meanwhile is reloaded
+like a change made by another instance (see
+``StorageManager.verify_startup_snapshot``).
+
+The file is encoded with ``marshal``, the fastest stdlib codec for plain
+dicts, lists and strings. Its format may change between Python versions, so
+the snapshot records ``marshal.version`` and is ignored on a mismatch. Like
+the summary and stats indexes it is derived data: deleting it only costs
+one slower start.
+"""
+
+from __future__ import annotations
+
+import marshal
+from pathlib import Path
+from typing import Optional
+
+from .flush import atomic_write
+
+SNAPSHOT_FILENAME = "startup.snapshot"
+FORMAT_VERSION = 2
+
+
+def read(path: Path) -> Optional[dict]:
+    """Read a snapshot file.
+
+    Returns:
+        The snapshot payload, or None if the file is missing, unreadable or
+        written by an incompatible version.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        payload = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != (
+        FORMAT_VERSION,
+        marshal.version,
+    ):
+        return None
+    return payload
+
+
+def write(path: Path, payload: dict) -> None:
+    """Atomically write a snapshot file, stamped with the format version."""
+    payload = {**payload, "format": (FORMAT_VERSION, marshal.version)}
+    atomic_write(path, marshal.dumps(payload))
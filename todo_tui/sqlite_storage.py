@@ -0,0 +1,880 @@
+"""SQLite storage backend implementing the StorageManager API.
+
+Projects, tasks, subtasks, notes and snippets are stored as rows in a single
+WAL-mode database, so updating one task or note touches one row (plus its
+indexes) instead of rewriting a whole JSON file. Row order follows insertion
+order (``rowid``), matching the order of the JSON lists.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from sys import intern
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import codec, migrations, revisions
+from .models import Note, Project, ProjectStats, Snippet, Subtask, Task
+from .search import NOTES_SOURCE, SNIPPETS_SOURCE, task_source
+from .storage import StorageManager
+
+DB_FILENAME = "tuido.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    completed_at TEXT,
+    priority TEXT NOT NULL DEFAULT 'none'
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks(completed_at);
+
+CREATE TABLE IF NOT EXISTS subtasks (
+    task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (task_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS notes (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+-- Revision history entries (see revisions.py); not cascaded from notes,
+-- because save_notes() replaces every note row
+CREATE TABLE IF NOT EXISTS note_revisions (
+    note_id TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    PRIMARY KEY (note_id, number)
+);
+
+CREATE TABLE IF NOT EXISTS snippets (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    command TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '[]',
+    uses INTEGER NOT NULL DEFAULT 0,
+    last_used TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+
+_TASK_FIELDS = (
+    "id",
+    "project_id",
+    "title",
+    "description",
+    "notes",
+    "completed",
+    "created_at",
+    "completed_at",
+    "priority",
+)
+_TASK_COLUMNS = ", ".join(_TASK_FIELDS)
+
+
+def _summary_columns(prefix: str = "") -> str:
+    """Build the task column list for summary queries, with empty bodies.
+
+    The description is selected as ``search_text`` for the task filter.
+    """
+    columns = [
+        f"'' AS {field}" if field in ("description", "notes") else prefix + field
+        for field in _TASK_FIELDS
+    ]
+    return ", ".join([*columns, f"{prefix}description AS search_text"])
+
+
+class SQLiteStorageManager(StorageManager):
+    """Manages SQLite storage for projects, tasks, notes and snippets.
+
+    Drop-in replacement for the JSON ``StorageManager``; settings are still
+    read and written through the inherited static methods.
+
+    The search index is kept in memory only: there are no data files whose
+    signatures could tell a saved index is still current.
+    """
+
+    PERSIST_SEARCH_INDEX = False
+    BACKEND = "sqlite"
+
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        skip_migrations: bool = False,
+        history_revisions: int = revisions.DEFAULT_MAX_REVISIONS,
+        history_snapshot_interval: int = revisions.DEFAULT_SNAPSHOT_INTERVAL,
+        history_max_bytes: int = revisions.DEFAULT_MAX_BYTES,
+    ):
+        """Initialize the SQLite storage manager.
+
+        Args:
+            data_dir: Custom data directory path. If None, uses default XDG location.
+            skip_migrations: If True, skip data migrations (useful for demo mode).
+            history_revisions: Revisions kept per note; 0 disables note history.
+            history_snapshot_interval: Store every N-th note revision in full.
+            history_max_bytes: Size limit of each note's revision history.
+        """
+        # Notes autosaved since their last revision was recorded
+        self._autosaved: Set[str] = set()
+        super().__init__(
+            data_dir=data_dir,
+            skip_migrations=skip_migrations,
+            history_revisions=history_revisions,
+            history_snapshot_interval=history_snapshot_interval,
+            history_max_bytes=history_max_bytes,
+        )
+
+    def _ensure_data_dir(self) -> None:
+        """Create the data directory and open (or create) the database."""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.data_dir / DB_FILENAME
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _is_empty(self) -> bool:
+        """Check whether the database holds no data at all."""
+        return not self._query(
+            "SELECT 1 FROM projects UNION ALL SELECT 1 FROM tasks "
+            "UNION ALL SELECT 1 FROM notes UNION ALL SELECT 1 FROM snippets LIMIT 1"
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def flush(self) -> None:
+        """Record revisions of autosaved notes; every write is already committed."""
+        self.fold_notes()
+
+    def flush_stats(self) -> Dict[str, int]:
+        """Get write counters (writes are never coalesced in SQLite)."""
+        return {"scheduled": 0, "written": 0, "coalesced": 0, "pending": 0}
+
+    def get_watch_dirs(self) -> List[Path]:
+        """Get the directory holding the database (and its WAL file)."""
+        return [self.data_dir]
+
+    def external_changes(self, paths: Iterable[Path]) -> Dict[str, Set[str]]:
+        """Work out which data another process changed (see StorageManager).
+
+        Row-level changes are not visible from the file events, so a commit
+        by another connection reports everything as changed. Our own commits
+        are told apart with ``PRAGMA data_version``.
+        """
+        if not any(path.name.startswith(DB_FILENAME) for path in paths):
+            return {}
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return {}
+            self._data_version = version
+            self._histories.clear()
+            changes = {
+                "projects": set(),
+                "tasks": {row["id"] for row in self._query("SELECT id FROM projects")},
+                "notes": {row["id"] for row in self._query("SELECT id FROM notes")},
+                "snippets": set(),
+            }
+            self._mark_search_changes(changes)
+            return changes
+
+    def write_startup_snapshot(self) -> bool:
+        """No snapshot: the database already answers startup queries in one read."""
+        return False
+
+    def load_startup_snapshot(self) -> bool:
+        """No snapshot to seed from (see write_startup_snapshot)."""
+        return False
+
+    def verify_startup_snapshot(self) -> Set[Path]:
+        """Nothing was seeded, so nothing can be stale."""
+        return set()
+
+    @contextmanager
+    def transaction(self) -> Iterator[SQLiteStorageManager]:
+        """Group mutations into a single database transaction.
+
+        Nested blocks join the enclosing transaction; an exception escaping
+        the outermost block rolls everything back.
+        """
+        with self._lock:
+            if self._txn_depth:
+                self._txn_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._txn_depth -= 1
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._txn_depth = 1
+            try:
+                yield self
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # Cached histories may hold revisions that were rolled back
+                self._histories.clear()
+                if self._search is not None:
+                    self._search_dirty.update(self._search.sources)
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._txn_depth = 0
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements inside a write transaction (joining an open one)."""
+        with self.transaction():
+            yield self._conn
+
+    def _search_signature(self, source: str) -> Optional[tuple]:
+        """Rows have no file signature; the index is never saved."""
+        return None
+
+    def _search_task_records(
+        self, project_id: str
+    ) -> Tuple[List[dict], Optional[tuple]]:
+        """Read a project's tasks for indexing (rows are not cached)."""
+        return [task.to_dict() for task in self.load_tasks(project_id)], None
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Run a read query and return all rows."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # Row conversion helpers
+    def _subtasks_for(self, task_ids: List[str]) -> Dict[str, List[Subtask]]:
+        """Load subtasks for the given tasks, grouped by task id."""
+        grouped: Dict[str, List[Subtask]] = {task_id: [] for task_id in task_ids}
+        if not task_ids:
+            return grouped
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._query(
+                f"SELECT task_id, id, title, completed FROM subtasks "
+                f"WHERE task_id IN ({placeholders}) ORDER BY rowid",
+                tuple(chunk),
+            )
+            for row in rows:
+                grouped[row["task_id"]].append(
+                    Subtask(
+                        id=intern(row["id"]),
+                        title=row["title"],
+                        completed=bool(row["completed"]),
+                    )
+                )
+        return grouped
+
+    def _rows_to_tasks(
+        self, rows: List[sqlite3.Row], summary_only: bool = False
+    ) -> List[Task]:
+        """Convert task rows (and their subtasks) into Task objects."""
+        subtasks = self._subtasks_for([row["id"] for row in rows])
+        return [
+            Task(
+                id=row["id"],
+                title=row["title"],
+                description=row["description"],
+                notes=row["notes"],
+                completed=bool(row["completed"]),
+                created_at=row["created_at"],
+                completed_at=row["completed_at"],
+                subtasks=subtasks[row["id"]],
+                project_id=intern(row["project_id"]),
+                priority=intern(row["priority"]),
+                summary_only=summary_only,
+                search_text=row["search_text"].lower() if summary_only else "",
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _task_params(task: Task) -> tuple:
+        """Build the column values for a task row."""
+        return (
+            task.id,
+            task.project_id,
+            task.title,
+            task.description,
+            task.notes,
+            int(task.completed),
+            task.created_at,
+            task.completed_at,
+            task.priority,
+        )
+
+    def _insert_task(self, conn: sqlite3.Connection, task: Task) -> None:
+        """Insert a task row and its subtasks."""
+        conn.execute(
+            f"INSERT OR REPLACE INTO tasks ({_TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._task_params(task),
+        )
+        self._replace_subtasks(conn, task)
+
+    @staticmethod
+    def _replace_subtasks(conn: sqlite3.Connection, task: Task) -> None:
+        """Replace all subtask rows for a task."""
+        conn.execute("DELETE FROM subtasks WHERE task_id = ?", (task.id,))
+        conn.executemany(
+            "INSERT INTO subtasks (task_id, id, title, completed) VALUES (?, ?, ?, ?)",
+            [(task.id, s.id, s.title, int(s.completed)) for s in task.subtasks],
+        )
+
+    @staticmethod
+    def _row_to_snippet(row: sqlite3.Row) -> Snippet:
+        """Convert a snippet row into a Snippet object."""
+        return Snippet(
+            id=row["id"],
+            name=row["name"],
+            command=row["command"],
+            tags=json.loads(row["tags"]),
+            uses=row["uses"],
+            last_used=row["last_used"],
+            created_at=row["created_at"],
+        )
+
+    # Project operations
+    def load_projects(self) -> List[Project]:
+        """Load all projects."""
+        rows = self._query("SELECT id, name, created_at FROM projects ORDER BY rowid")
+        return [
+            Project(id=r["id"], name=r["name"], created_at=r["created_at"])
+            for r in rows
+        ]
+
+    def save_projects(self, projects: List[Project]) -> None:
+        """Save all projects."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM projects")
+            conn.executemany(
+                "INSERT INTO projects (id, name, created_at) VALUES (?, ?, ?)",
+                [(p.id, p.name, p.created_at) for p in projects],
+            )
+
+    def add_project(self, project: Project) -> None:
+        """Add a new project."""
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO projects (id, name, created_at) VALUES (?, ?, ?)",
+                (project.id, project.name, project.created_at),
+            )
+
+    def update_project(self, project: Project) -> None:
+        """Update an existing project."""
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE projects SET name = ?, created_at = ? WHERE id = ?",
+                (project.name, project.created_at, project.id),
+            )
+
+    def delete_project(self, project_id: str) -> None:
+        """Delete a project and its tasks."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM tasks WHERE project_id = ?", (project_id,))
+            conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        self._purge_archived_project(project_id)
+
+    def get_project(self, project_id: str) -> Optional[Project]:
+        """Get a specific project by ID."""
+        rows = self._query(
+            "SELECT id, name, created_at FROM projects WHERE id = ?", (project_id,)
+        )
+        if not rows:
+            return None
+        return Project(
+            id=rows[0]["id"], name=rows[0]["name"], created_at=rows[0]["created_at"]
+        )
+
+    def load_project_stats(self) -> Dict[str, ProjectStats]:
+        """Get task counts for every project, keyed by project id.
+
+        Aggregated by one indexed GROUP BY query rather than a stored index.
+        """
+        stats = {
+            row["id"]: ProjectStats(project_id=row["id"])
+            for row in self._query("SELECT id FROM projects ORDER BY rowid")
+        }
+        rows = self._query(
+            "SELECT project_id, priority, COUNT(*) AS total, "
+            "SUM(completed) AS completed, "
+            "MAX(MAX(created_at, COALESCE(completed_at, ''))) AS last_modified "
+            "FROM tasks GROUP BY project_id, priority"
+        )
+        for row in rows:
+            entry = stats.get(row["project_id"])
+            if entry is None:
+                continue
+            entry.total += row["total"]
+            entry.completed += row["completed"]
+            entry.by_priority[row["priority"]] = row["total"]
+            if row["last_modified"] > (entry.last_modified or ""):
+                entry.last_modified = row["last_modified"]
+        return stats
+
+    def get_project_stats(self, project_id: str) -> ProjectStats:
+        """Get task counts for a project."""
+        return self.load_project_stats().get(
+            project_id, ProjectStats(project_id=project_id)
+        )
+
+    # Task operations
+    def load_tasks(self, project_id: str) -> List[Task]:
+        """Load all tasks for a project."""
+        rows = self._query(
+            f"SELECT {_TASK_COLUMNS} FROM tasks WHERE project_id = ? ORDER BY rowid",
+            (project_id,),
+        )
+        return self._rows_to_tasks(rows)
+
+    def save_tasks(self, project_id: str, tasks: List[Task]) -> None:
+        """Save all tasks for a project."""
+        for task in tasks:
+            self.load_task_body(task)
+        with self._write() as conn:
+            conn.execute("DELETE FROM tasks WHERE project_id = ?", (project_id,))
+            for task in tasks:
+                self._insert_task(conn, task)
+        self._search_dirty.add(task_source(project_id))
+
+    def add_task(self, task: Task) -> None:
+        """Add a new task to a project."""
+        with self._write() as conn:
+            self._insert_task(conn, task)
+        self._search_dirty.add(task_source(task.project_id))
+
+    def update_task(self, task: Task) -> None:
+        """Update an existing task.
+
+        The stored description and notes are kept for summary tasks.
+        """
+        with self._write() as conn:
+            self._update_task_row(conn, task)
+        self._search_dirty.add(task_source(task.project_id))
+
+    def _update_task_row(self, conn: sqlite3.Connection, task: Task) -> None:
+        """Update a task row and its subtasks, if the task exists."""
+        body = "" if task.summary_only else "description = ?, notes = ?, "
+        body_params = () if task.summary_only else (task.description, task.notes)
+        cursor = conn.execute(
+            f"UPDATE tasks SET title = ?, {body}completed = ?, "
+            "created_at = ?, completed_at = ?, priority = ? "
+            "WHERE id = ? AND project_id = ?",
+            (
+                task.title,
+                *body_params,
+                int(task.completed),
+                task.created_at,
+                task.completed_at,
+                task.priority,
+                task.id,
+                task.project_id,
+            ),
+        )
+        if cursor.rowcount:
+            self._replace_subtasks(conn, task)
+
+    def delete_task(self, project_id: str, task_id: str) -> None:
+        """Delete a task from a project."""
+        with self._write() as conn:
+            conn.execute(
+                "DELETE FROM tasks WHERE id = ? AND project_id = ?",
+                (task_id, project_id),
+            )
+        self._search_dirty.add(task_source(project_id))
+
+    # Batch task operations
+    def bulk_add_tasks(self, tasks: List[Task]) -> None:
+        """Add many tasks in a single transaction."""
+        with self._write() as conn:
+            for task in tasks:
+                self._insert_task(conn, task)
+        self._search_dirty.update(task_source(task.project_id) for task in tasks)
+
+    def update_tasks(self, tasks: List[Task]) -> None:
+        """Update many existing tasks in a single transaction."""
+        with self._write() as conn:
+            for task in tasks:
+                self._update_task_row(conn, task)
+        self._search_dirty.update(task_source(task.project_id) for task in tasks)
+
+    def delete_tasks(self, project_id: str, task_ids: List[str]) -> None:
+        """Delete many tasks from a project in a single transaction."""
+        with self._write() as conn:
+            conn.executemany(
+                "DELETE FROM tasks WHERE id = ? AND project_id = ?",
+                [(task_id, project_id) for task_id in task_ids],
+            )
+        self._search_dirty.add(task_source(project_id))
+
+    def move_tasks(
+        self,
+        task_ids: List[str],
+        target_project_id: str,
+        source_project_id: Optional[str] = None,
+    ) -> None:
+        """Move tasks to another project in a single transaction."""
+        sql = "UPDATE tasks SET project_id = ? WHERE id = ?"
+        source: tuple = ()
+        if source_project_id is not None:
+            sql += " AND project_id = ?"
+            source = (source_project_id,)
+        with self._write() as conn:
+            conn.executemany(
+                sql, [(target_project_id, task_id, *source) for task_id in task_ids]
+            )
+        if source_project_id is None:
+            # The tasks may have come from any project
+            self._search_dirty.update(task_source(p.id) for p in self.load_projects())
+        else:
+            self._search_dirty.add(task_source(source_project_id))
+        self._search_dirty.add(task_source(target_project_id))
+
+    def get_task(self, project_id: str, task_id: str) -> Optional[Task]:
+        """Get a specific task by ID."""
+        rows = self._query(
+            f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id = ? AND project_id = ?",
+            (task_id, project_id),
+        )
+        tasks = self._rows_to_tasks(rows)
+        return tasks[0] if tasks else None
+
+    def load_all_tasks(self) -> List[Task]:
+        """Load all tasks across all projects, in project order."""
+        rows = self._query(
+            f"SELECT {', '.join('t.' + column for column in _TASK_FIELDS)} "
+            "FROM tasks t JOIN projects p ON p.id = t.project_id "
+            "ORDER BY p.rowid, t.rowid"
+        )
+        return self._rows_to_tasks(rows)
+
+    def load_task_summaries(self, project_id: str) -> List[Task]:
+        """Load a project's tasks without their description and notes bodies."""
+        rows = self._query(
+            f"SELECT {_summary_columns()} FROM tasks WHERE project_id = ? ORDER BY rowid",
+            (project_id,),
+        )
+        return self._rows_to_tasks(rows, summary_only=True)
+
+    def load_all_task_summaries(self) -> List[Task]:
+        """Load summaries of all tasks across all projects, in project order."""
+        rows = self._query(
+            f"SELECT {_summary_columns('t.')} "
+            "FROM tasks t JOIN projects p ON p.id = t.project_id "
+            "ORDER BY p.rowid, t.rowid"
+        )
+        return self._rows_to_tasks(rows, summary_only=True)
+
+    def load_task_body(self, task: Task) -> Task:
+        """Fill in the description and notes of a summary task, in place."""
+        if not task.summary_only:
+            return task
+        rows = self._query(
+            "SELECT description, notes FROM tasks WHERE id = ? AND project_id = ?",
+            (task.id, task.project_id),
+        )
+        if rows:
+            task.description = rows[0]["description"]
+            task.notes = rows[0]["notes"]
+        task.summary_only = False
+        return task
+
+    # Note operations
+    def load_notes(self) -> List[Note]:
+        """Load all notes."""
+        rows = self._query(
+            "SELECT id, title, content, created_at, updated_at FROM notes ORDER BY rowid"
+        )
+        return [Note(**dict(row)) for row in rows]
+
+    def save_notes(self, notes: List[Note]) -> None:
+        """Save all notes."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM notes")
+            conn.executemany(
+                "INSERT INTO notes (id, title, content, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(n.id, n.title, n.content, n.created_at, n.updated_at) for n in notes],
+            )
+            conn.execute(
+                "DELETE FROM note_revisions WHERE note_id NOT IN (SELECT id FROM notes)"
+            )
+            self._histories.clear()
+            for note in notes:
+                self._record_note_revision(note.id, note.content)
+        self._search_dirty.add(NOTES_SOURCE)
+
+    def add_note(self, note: Note) -> None:
+        """Add a new note."""
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO notes (id, title, content, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (note.id, note.title, note.content, note.created_at, note.updated_at),
+            )
+            self._record_note_revision(note.id, note.content)
+        self._search_dirty.add(NOTES_SOURCE)
+
+    def update_note(self, note: Note) -> None:
+        """Update an existing note and record its content as a revision."""
+        with self._write():
+            self.autosave_note(note)
+            self._record_note_revision(note.id, note.content)
+            self._autosaved.discard(note.id)
+
+    def autosave_note(self, note: Note) -> None:
+        """Save an edited note (a single-row update).
+
+        Unlike ``update_note`` no revision is recorded; that happens when the
+        note is folded (the user leaves it or the app quits).
+        """
+        # Update the updated_at timestamp
+        note.updated_at = datetime.now().isoformat()
+
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE notes SET title = ?, content = ?, created_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (note.title, note.content, note.created_at, note.updated_at, note.id),
+            )
+            self._autosaved.add(note.id)
+        self._search_dirty.add(NOTES_SOURCE)
+
+    def fold_note(self, note_id: str) -> None:
+        """Record the content of an autosaved note as a revision.
+
+        Note content is updated in place, so there is no patch log to fold.
+        """
+        with self._lock:
+            if note_id not in self._autosaved:
+                return
+            self._autosaved.discard(note_id)
+            note = self.get_note(note_id)
+            if note is not None:
+                self._record_note_revision(note_id, note.content)
+
+    def fold_notes(self) -> None:
+        """Record revisions for every note autosaved since its last one."""
+        with self._lock:
+            for note_id in list(self._autosaved):
+                self.fold_note(note_id)
+
+    def delete_note(self, note_id: str) -> None:
+        """Delete a note."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+            conn.execute("DELETE FROM note_revisions WHERE note_id = ?", (note_id,))
+        self._histories.pop(note_id, None)
+        self._autosaved.discard(note_id)
+        self._search_dirty.add(NOTES_SOURCE)
+
+    def _load_note_history(self, note_id: str) -> List[dict]:
+        """Read the stored revision entries of a note."""
+        rows = self._query(
+            "SELECT entry FROM note_revisions WHERE note_id = ? ORDER BY number",
+            (note_id,),
+        )
+        return [codec.loads(row["entry"]) for row in rows]
+
+    def _store_note_revision(
+        self, note_id: str, history: revisions.NoteHistory, entry: dict, cut: int
+    ) -> None:
+        """Persist a newly recorded revision entry (see StorageManager)."""
+        with self._write() as conn:
+            if cut:
+                first = history.entries[0]
+                conn.execute(
+                    "DELETE FROM note_revisions WHERE note_id = ? AND number < ?",
+                    (note_id, first["n"]),
+                )
+                conn.execute(
+                    "UPDATE note_revisions SET entry = ? WHERE note_id = ? AND number = ?",
+                    (
+                        codec.dumps(first, compact=True).decode("utf-8"),
+                        note_id,
+                        first["n"],
+                    ),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO note_revisions (note_id, number, entry) "
+                "VALUES (?, ?, ?)",
+                (note_id, entry["n"], codec.dumps(entry, compact=True).decode("utf-8")),
+            )
+
+    def get_note(self, note_id: str) -> Optional[Note]:
+        """Get a specific note by ID."""
+        rows = self._query(
+            "SELECT id, title, content, created_at, updated_at FROM notes WHERE id = ?",
+            (note_id,),
+        )
+        return Note(**dict(rows[0])) if rows else None
+
+    # Snippet operations
+    def load_snippets(self) -> List[Snippet]:
+        """Load all snippets."""
+        rows = self._query("SELECT * FROM snippets ORDER BY rowid")
+        return [self._row_to_snippet(row) for row in rows]
+
+    def save_snippets(self, snippets: List[Snippet]) -> None:
+        """Save all snippets."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM snippets")
+            for snippet in snippets:
+                self._upsert_snippet(conn, snippet)
+        self._search_dirty.add(SNIPPETS_SOURCE)
+
+    @staticmethod
+    def _upsert_snippet(conn: sqlite3.Connection, snippet: Snippet) -> None:
+        """Insert or replace a snippet row."""
+        conn.execute(
+            "INSERT OR REPLACE INTO snippets "
+            "(id, name, command, tags, uses, last_used, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                snippet.id,
+                snippet.name,
+                snippet.command,
+                json.dumps(snippet.tags),
+                snippet.uses,
+                snippet.last_used,
+                snippet.created_at,
+            ),
+        )
+
+    def add_snippet(self, snippet: Snippet) -> None:
+        """Add a new snippet."""
+        with self._write() as conn:
+            self._upsert_snippet(conn, snippet)
+        self._search_dirty.add(SNIPPETS_SOURCE)
+
+    def update_snippet(self, snippet: Snippet) -> None:
+        """Update an existing snippet."""
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE snippets SET name = ?, command = ?, tags = ?, uses = ?, "
+                "last_used = ?, created_at = ? WHERE id = ?",
+                (
+                    snippet.name,
+                    snippet.command,
+                    json.dumps(snippet.tags),
+                    snippet.uses,
+                    snippet.last_used,
+                    snippet.created_at,
+                    snippet.id,
+                ),
+            )
+        self._search_dirty.add(SNIPPETS_SOURCE)
+
+    def delete_snippet(self, snippet_id: str) -> None:
+        """Delete a snippet."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM snippets WHERE id = ?", (snippet_id,))
+        self._search_dirty.add(SNIPPETS_SOURCE)
+
+    def get_snippet(self, snippet_id: str) -> Optional[Snippet]:
+        """Get a specific snippet by ID."""
+        rows = self._query("SELECT * FROM snippets WHERE id = ?", (snippet_id,))
+        return self._row_to_snippet(rows[0]) if rows else None
+
+
+def migrate_json_to_sqlite(target: SQLiteStorageManager) -> Dict[str, int]:
+    """Copy the JSON data of a data directory into its SQLite database.
+
+    The JSON files are left untouched so the migration can be reverted by
+    switching the ``storage_backend`` setting back to ``"json"``: they are
+    read as they are, with task changes still in a journal replayed, and
+    nothing is created or migrated in the JSON layout.
+
+    Args:
+        target: Storage whose database receives the data of its data
+            directory's projects.json and friends; existing rows are replaced.
+
+    Returns:
+        Number of migrated rows per kind.
+    """
+    source = StorageManager(data_dir=target.data_dir, read_only=True)
+
+    projects = source.load_projects()
+    counts = {"projects": len(projects), "tasks": 0, "notes": 0, "snippets": 0}
+    with target._write() as conn:
+        conn.execute("DELETE FROM projects")
+        conn.execute("DELETE FROM tasks")
+        conn.execute("DELETE FROM notes")
+        conn.execute("DELETE FROM snippets")
+        conn.executemany(
+            "INSERT INTO projects (id, name, created_at) VALUES (?, ?, ?)",
+            [(p.id, p.name, p.created_at) for p in projects],
+        )
+        for project in projects:
+            for task in source.load_tasks(project.id):
+                target._insert_task(conn, task)
+                counts["tasks"] += 1
+        if source.notes_index_file.exists():
+            notes = source.load_notes()
+        else:
+            # Not yet split into notes/ by the JSON backend
+            notes = [Note.from_dict(r) for r in source._load_json(source.notes_file)]
+        conn.executemany(
+            "INSERT INTO notes (id, title, content, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(n.id, n.title, n.content, n.created_at, n.updated_at) for n in notes],
+        )
+        counts["notes"] = len(notes)
+        snippets = source.load_snippets()
+        for snippet in snippets:
+            target._upsert_snippet(conn, snippet)
+        counts["snippets"] = len(snippets)
+    return counts
+
+
+# Database layout versions (see migrations.py). Append new ones at the end.
+@migrations.register(1, "Copy the data of the JSON backend", backend="sqlite")
+def _import_json_data(storage: SQLiteStorageManager) -> None:
+    """Layout 1: a data directory that held JSON data starts with a copy of it."""
+    if storage.projects_file.exists() and storage._is_empty():
+        migrate_json_to_sqlite(storage)
+
+
+@migrations.register(2, "Add a default note", data=True, backend="sqlite")
+def _add_default_note(storage: SQLiteStorageManager) -> None:
+    """Layout 2: a new database starts with a note to write in."""
+    if not storage.load_notes():
+        storage.add_note(
+            Note(
+                title="Quick Notes",
+                content="# Quick Notes\n\nStart writing your notes here...\n",
+            )
+        )
@@ -0,0 +1,165 @@
+"""Staged multi-file commits for storage transactions.
+
+A transaction's files are first written in full to a staging directory inside
+the data directory. Once every file is staged and fsynced, a manifest listing
+the renames and deletions is written atomically: that is the commit point.
+The staged files are then moved over their targets with ``os.replace``.
+
+Each transaction stages into its own directory under ``.staging/``, named
+after the process and a random suffix, and holds that directory's lock (see
+``locking.py``) until it is done. Several processes (the app and the CLI,
+say) can therefore commit at the same time without touching each other's
+files.
+
+If the process dies before the manifest exists, the staging directory is
+simply discarded on the next start (rollback). If it dies after, the next
+start replays the manifest (roll forward), so a transaction is never left
+half-applied. Recovery only touches directories whose lock it can take at
+once: the lock of a running transaction is held, that of a dead process is
+released by the operating system.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from . import codec, locking
+from .flush import atomic_write
+
+STAGING_DIRNAME = ".staging"
+MANIFEST_FILENAME = "MANIFEST.json"
+
+
+@contextmanager
+def stage(
+    data_dir: Path, files: Dict[Path, bytes], deletes: List[Path]
+) -> Iterator[Path]:
+    """Write a transaction's files to a new staging directory and commit it.
+
+    The directory's lock is held until the block exits. If staging fails,
+    the directory is discarded; once committed, a directory left behind by
+    a failed ``apply`` is rolled forward by the next ``recover``.
+
+    Args:
+        data_dir: Data directory the transaction belongs to.
+        files: Target path -> contents for every file to write.
+        deletes: Paths to remove once the files are in place.
+
+    Yields:
+        The staging directory, ready for ``apply``.
+    """
+    root = data_dir / STAGING_DIRNAME
+    root.mkdir(exist_ok=True)
+    staging_dir = root / f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+    # Locked before the directory exists, so recovery never sees it unlocked
+    with locking.FileLock(staging_dir):
+        staging_dir.mkdir()
+        try:
+            renames = []
+            for index, (target, data) in enumerate(files.items()):
+                staged = staging_dir / str(index)
+                with open(staged, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                renames.append([staged.name, str(target.relative_to(data_dir))])
+
+            manifest = {
+                "renames": renames,
+                "deletes": [str(path.relative_to(data_dir)) for path in deletes],
+            }
+            atomic_write(
+                staging_dir / MANIFEST_FILENAME, codec.dumps(manifest, compact=True)
+            )
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            _remove_lock_file(staging_dir)
+            raise
+
+        yield staging_dir
+        if not staging_dir.exists():
+            _remove_lock_file(staging_dir)
+
+
+def apply(staging_dir: Path) -> bool:
+    """Apply a committed staging directory, or discard an uncommitted one.
+
+    Safe to repeat: renames whose staged file is already gone were applied
+    by an earlier, interrupted attempt.
+
+    Args:
+        staging_dir: A directory made by ``stage``, whose lock is held.
+
+    Returns:
+        True if a committed transaction was applied.
+    """
+    if not staging_dir.exists():
+        return False
+    data_dir = staging_dir.parent.parent
+
+    manifest_file = staging_dir / MANIFEST_FILENAME
+    try:
+        manifest = codec.loads(manifest_file.read_bytes())
+    except (OSError, ValueError):
+        # Never committed: roll back by dropping the staged files
+        shutil.rmtree(staging_dir)
+        return False
+
+    for staged_name, target in manifest["renames"]:
+        staged = staging_dir / staged_name
+        if staged.exists():
+            target_path = data_dir / target
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, target_path)
+    for target in manifest["deletes"]:
+        (data_dir / target).unlink(missing_ok=True)
+
+    shutil.rmtree(staging_dir)
+    return True
+
+
+def recover(data_dir: Path) -> int:
+    """Finish or discard the transactions of processes that died mid-commit.
+
+    Staging directories whose lock is held belong to transactions still
+    running (in this process or another) and are left alone.
+
+    Args:
+        data_dir: Data directory holding the staging directories.
+
+    Returns:
+        Number of committed transactions applied.
+    """
+    root = data_dir / STAGING_DIRNAME
+    try:
+        entries = list(root.iterdir())
+    except FileNotFoundError:
+        return 0
+
+    applied = 0
+    for staging_dir in entries:
+        if staging_dir.name.startswith(".") or not staging_dir.is_dir():
+            continue
+        try:
+            lock = locking.FileLock(staging_dir, timeout=0)
+            lock.acquire()
+        except locking.LockTimeout:
+            continue
+        try:
+            # Gone if its transaction finished while we were taking the lock
+            if staging_dir.exists() and apply(staging_dir):
+                applied += 1
+            _remove_lock_file(staging_dir)
+        finally:
+            lock.release()
+    return applied
+
+
+def _remove_lock_file(staging_dir: Path) -> None:
+    """Remove a staging directory's lock file (while holding the lock)."""
+    locking.lock_file_for(staging_dir).unlink(missing_ok=True)
@@ -1,20 +1,182 @@
-"""JSON-based storage manager for tasks and projects."""
+"""JSON-based storage manager for tasks and projects.
+
+Data files are loaded once into in-memory maps keyed by id. Reads are served
+from those maps and every mutation updates the map before persisting the
+affected file, so the public API behaves exactly like a plain JSON store.
+
+Alongside each task file a summary index (``index/<project_id>.summary.json``)
+holds the tasks without their ``description`` and ``notes`` bodies. Views that
+only list tasks load the summaries, and bodies are read on demand.
+Per-project task counts are kept in ``index/project_stats.json`` and updated
+incrementally on every task mutation, so the project sidebar never has to
+read a task file.
+
+Tasks completed long ago can be moved into compressed per-month archive
+files (see ``archive.py``), which keeps them out of the project files.
+
+Notes are stored one per file as ``notes/<note_id>.md``, with their titles,
+timestamps and sizes in ``notes/index.json``, so saving a note rewrites only
+that note's content and the small index. Scratchpad autosaves go further and
+append only the edited span to the note's patch log (see ``notelog.py``).
+Each time a note's file is rewritten, a revision is added to its
+delta-compressed history in ``notes/<note_id>.history`` (see ``revisions.py``).
+
+The first screen's data is also written to a single startup snapshot on
+quit, which seeds the caches on the next launch (see ``snapshot.py``).
+
+Tasks, notes and snippets are searchable through an inverted index (see
+``search.py``) that is kept in memory, updated as data changes, and saved to
+``index/search.idx`` on quit.
+
+``StorageManager.transaction()`` groups several mutations into one unit of
+work that is committed atomically through a staging directory (see
+``staging.py``) or rolled back as a whole.
+
+Record files may be shared with other processes. Every write holds the
+file's cross-process lock and checks its generation counter (see
+``locking.py``); if another process wrote the file since we last read it,
+our changed records are merged into its version instead of overwriting it.
+"""
 
 from __future__ import annotations
 
 import json
 import shutil
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from platformdirs import user_config_dir, user_data_dir
 
-from .models import Note, Project, Settings, Snippet, Task
+from . import codec, locking, migrations, notelog, revisions, snapshot, staging
+from .archive import ARCHIVE_DIRNAME, TaskArchive
+from .flush import FlushScheduler, atomic_write
+from .journal import MutationJournal, adopt_orphans, apply_entry, read_journals
+from .search import (
+    NOTES_SOURCE,
+    SEARCH_FILENAME,
+    SNIPPETS_SOURCE,
+    Document,
+    SearchHit,
+    SearchIndex,
+    read_index,
+    split_source,
+    task_source,
+    write_index,
+)
+from .models import (
+    Note,
+    NoteRevision,
+    Project,
+    ProjectStats,
+    Settings,
+    Snippet,
+    Task,
+)
+
+INDEX_DIRNAME = "index"
+STATS_FILENAME = "project_stats.json"
+# Threads reading project files in parallel at startup
+DEFAULT_LOAD_WORKERS = 8
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Task fields left out of summary records
+_BODY_FIELDS = ("description", "notes")
+# Version of the summary index files; older ones are rebuilt
+SUMMARY_FORMAT = 2
+
+
+def _summary_record(record: dict) -> dict:
+    """Strip the body fields from a task record.
+
+    The description is kept lowercased as ``search_text`` for the task
+    filter, which would otherwise have to load every body to match it.
+    """
+    summary = {k: v for k, v in record.items() if k not in _BODY_FIELDS}
+    summary["search_text"] = record.get("description", "").lower()
+    return summary
+
+
+def _compute_stats(project_id: str, records: List[dict]) -> dict:
+    """Aggregate task records into a project stats record.
+
+    Without a recorded mutation time, ``last_modified`` falls back to the
+    latest creation or completion time among the tasks.
+    """
+    stats = ProjectStats(project_id=project_id).to_dict()
+    for record in records:
+        _count_task(stats, record, 1)
+        stamp = max(record.get("created_at") or "", record.get("completed_at") or "")
+        if stamp and stamp > (stats["last_modified"] or ""):
+            stats["last_modified"] = stamp
+    return stats
+
+
+def _count_task(stats: dict, record: dict, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one task record's counts, in place."""
+    priority = record.get("priority", "none")
+    by_priority = stats["by_priority"]
+    stats["total"] += sign
+    stats["completed"] += sign if record.get("completed") else 0
+    by_priority[priority] = by_priority.get(priority, 0) + sign
+    if not by_priority[priority]:
+        del by_priority[priority]
+
+
+def _map_parallel(func: Callable[[_T], _R], items: List[_T], workers: int) -> List[_R]:
+    """Apply ``func`` to every item on a thread pool, keeping the input order.
+
+    Meant for file reads, which release the GIL while waiting on the disk,
+    so the latency of many small files overlaps. Runs inline for one worker
+    or a single item.
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(items)), thread_name_prefix="tuido-load"
+    ) as pool:
+        return list(pool.map(func, items))
+
+
+def _summary_task(record: dict) -> Task:
+    """Materialize a summary record as a Task flagged ``summary_only``."""
+    task = Task.from_dict(record)
+    task.summary_only = True
+    task.search_text = record.get("search_text", "")
+    return task
 
 
 class StorageManager:
-    """Manages JSON file storage for projects and tasks."""
+    """Manages JSON file storage for projects and tasks.
+
+    Each data file is cached as a dict of raw records keyed by id, preserving
+    file order. Records are plain dicts produced by ``to_dict()`` and are
+    always replaced wholesale, never mutated in place, so model objects handed
+    out by the read methods can be edited freely without touching the cache.
+    """
+
+    # Whether the search index is saved to disk (and validated against the
+    # data files' signatures on the next start)
+    PERSIST_SEARCH_INDEX = True
+    # Name of the migrations (and version marker) of this backend's layout
+    BACKEND = migrations.DEFAULT_BACKEND
 
     @staticmethod
     def get_config_dir() -> Path:
@@ -78,34 +240,171 @@ class StorageManager:
         with open(settings_file, "w") as f:
             json.dump(settings.to_dict(), f, indent=2)
 
-    def __init__(self, data_dir: Optional[Path] = None, skip_migrations: bool = False):
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        skip_migrations: bool = False,
+        use_journal: bool = False,
+        flush_window: float = 0.0,
+        compact_json: bool = False,
+        history_revisions: int = revisions.DEFAULT_MAX_REVISIONS,
+        history_snapshot_interval: int = revisions.DEFAULT_SNAPSHOT_INTERVAL,
+        history_max_bytes: int = revisions.DEFAULT_MAX_BYTES,
+        load_workers: int = DEFAULT_LOAD_WORKERS,
+        read_only: bool = False,
+    ):
         """Initialize storage manager.
 
         Args:
             data_dir: Custom data directory path. If None, uses default XDG location.
             skip_migrations: If True, skip data migrations (useful for demo mode).
+            use_journal: If True, append task mutations to a journal instead of
+                rewriting the project's task file on every change.
+            flush_window: Seconds to coalesce writes for before flushing them on
+                a background thread. 0 writes synchronously.
+            compact_json: If True, write data files without indentation.
+            history_revisions: Revisions kept per note; 0 disables note history.
+            history_snapshot_interval: Store every N-th note revision in full.
+            history_max_bytes: Size limit of each note's revision history.
+            load_workers: Threads reading project files in parallel when
+                every project is loaded at once; 1 reads them one by one.
+            read_only: Read the directory as it is (e.g. to copy it
+                elsewhere): nothing is created or migrated, no index is
+                written and the task journals of all processes are replayed
+                without being taken over. Writing is not supported.
         """
         self.data_dir = data_dir if data_dir else self.get_default_data_dir()
+        self.read_only = read_only
         self.projects_file = self.data_dir / "projects.json"
         self.scratchpad_file = self.data_dir / "scratchpad.md"
+        # Legacy single-file notes, migrated to notes_dir on first start
         self.notes_file = self.data_dir / "notes.json"
+        self.notes_dir = self.data_dir / "notes"
+        self.notes_index_file = self.notes_dir / "index.json"
         self.snippets_file = self.data_dir / "snippets.json"
-        self._ensure_data_dir()
-        if not skip_migrations:
-            self._migrate_old_data_if_needed()
-            self._migrate_scratchpad_to_notes()
+        self.index_dir = self.data_dir / INDEX_DIRNAME
+        self.stats_file = self.index_dir / STATS_FILENAME
+        self.snapshot_file = self.index_dir / snapshot.SNAPSHOT_FILENAME
+        self.search_file = self.index_dir / SEARCH_FILENAME
+        self._archive = TaskArchive(self.data_dir / ARCHIVE_DIRNAME)
+        self.compact_json = compact_json
+        self.history_revisions = history_revisions
+        self.history_snapshot_interval = history_snapshot_interval
+        self.history_max_bytes = history_max_bytes
+        self.load_workers = load_workers
+
+        # In-memory repository: id -> record maps, loaded lazily per file
+        self._projects: Optional[Dict[str, dict]] = None
+        self._tasks: Dict[str, Dict[str, dict]] = {}
+        self._notes: Optional[Dict[str, dict]] = None
+        self._note_contents: Dict[str, str] = {}
+        # Patch logs of notes autosaved since their base file was last written
+        self._note_logs: Dict[str, notelog.NotePatchLog] = {}
+        # Revision histories, loaded when a note first gets a revision
+        self._histories: Dict[str, revisions.NoteHistory] = {}
+        self._snippets: Optional[Dict[str, dict]] = None
+        self._lock = threading.RLock()
+
+        # (st_mtime_ns, st_size) of each cached file as of our last read/write,
+        # used to detect edits made by other processes
+        self._signatures: Dict[Path, Optional[Tuple[int, int]]] = {}
+        # Materialized Task lists per project, valid until its records change
+        self._task_objects: Dict[str, List[Task]] = {}
+        # Materialized summary lists per project, with the task file signature
+        # they were read against (None when derived from the loaded task map)
+        self._summary_objects: Dict[
+            str, Tuple[Optional[Tuple[int, int]], List[Task]]
+        ] = {}
+        # Summary records rendered with a task file write, indexed once it lands
+        self._rendered_summaries: Dict[str, List[dict]] = {}
+        # Live per-project stats, updated incrementally by task mutations
+        self._stats: Dict[str, dict] = {}
+        # Persisted stats, each stamped with the task file signature it matches
+        self._stats_index: Optional[Dict[str, dict]] = None
+        self._index_lock = threading.Lock()
+        # Full-text index, loaded on first use, and the sources whose data
+        # changed since they were last indexed
+        self._search: Optional[SearchIndex] = None
+        self._search_dirty: Set[str] = set()
+        self._search_modified = False
+        # Per thread, ``trust_caches`` is set while the index reads the data:
+        # loaded caches are taken as they are, since reloading a file changed
+        # by another process there would hide the change from external_changes
+        self._reads = threading.local()
+
+        # Unit of work: while a transaction is open, writes and deletions are
+        # buffered here instead of reaching the flush scheduler
+        self._txn_lock = threading.RLock()
+        self._txn_depth = 0
+        self._txn_writes: Dict[Path, Callable[[], bytes]] = {}
+        self._txn_deletes: Set[Path] = set()
+
+        # Optimistic concurrency with other processes, per record file: the
+        # generation and records as of our last read or write, the locks held
+        # by writes in progress and the records those writes rendered
+        self._generations: Dict[Path, int] = {}
+        self._bases: Dict[Path, Dict[str, dict]] = {}
+        self._held_locks: Dict[Path, locking.FileLock] = {}
+        self._rendered_bases: Dict[Path, Dict[str, dict]] = {}
+        # Files whose write merged in another process's changes
+        self._merged_paths: Set[Path] = set()
+        # Files whose caches were seeded from the startup snapshot and are
+        # trusted without a stat until verify_startup_snapshot() runs
+        self._unverified: Set[Path] = set()
+
+        # Called with the path and error when a scheduled write fails (it
+        # stays pending and is retried); set by the app to tell the user
+        self.on_write_error: Optional[Callable[[Path, OSError], None]] = None
+        self._flusher = FlushScheduler(
+            window=flush_window,
+            on_written=self._on_file_written,
+            guard=self._write_guard,
+            on_error=self._on_write_error,
+        )
+
+        # Task mutation journal (optional), replayed onto task maps as they load
+        self._journal: Optional[MutationJournal] = None
+        # Journals of exited processes, removed once folded into the snapshots
+        self._adopted: List[MutationJournal] = []
+        self._journal_backlog: Dict[str, List[dict]] = {}
+        self._journal_dirty: Set[str] = set()
+        # Projects whose snapshot a running compaction is still writing
+        self._compacting: Set[str] = set()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        if read_only:
+            self._queue_entries(read_journals(self.data_dir))
+        else:
+            self._ensure_data_dir()
+            migrations.run(
+                self, self.data_dir, skip_data=skip_migrations, backend=self.BACKEND
+            )
+            if use_journal:
+                self._open_journal()
 
     def _ensure_data_dir(self) -> None:
-        """Create data directory if it doesn't exist."""
+        """Create the data directories if they don't exist.
+
+        The data files themselves are created by the first migration (see
+        ``_create_data_files``), so an up-to-date directory is not probed.
+        """
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(exist_ok=True)
+        self.notes_dir.mkdir(exist_ok=True)
+
+        # Finish (or discard) transactions interrupted by a crash
+        staging.recover(self.data_dir)
 
+    def _create_data_files(self) -> None:
+        """Create missing data files, splitting a legacy notes.json into notes/."""
         # Initialize projects file if it doesn't exist
         if not self.projects_file.exists():
             self._save_json(self.projects_file, [])
 
-        # Initialize notes file if it doesn't exist
-        if not self.notes_file.exists():
-            self._save_json(self.notes_file, [])
+        # Initialize the notes index, moving notes.json into notes/ if needed
+        if not self.notes_index_file.exists():
+            self._migrate_notes_to_files()
 
         # Initialize snippets file if it doesn't exist
         if not self.snippets_file.exists():
@@ -137,125 +436,1585 @@ class StorageManager:
                     dest = self.data_dir / file.name
                     shutil.copy2(file, dest)
                     print(f"   ✓ Copied {file.name}")
+                if (old_data_dir / self.notes_file.name).exists():
+                    self._migrate_notes_to_files()
                 print(f"✅ Migration complete! Your data is now in {self.data_dir}")
                 print(f"   (You can safely delete the old '{old_data_dir}' folder)")
                 print()
 
     def _save_json(self, file_path: Path, data: Union[List, Dict]) -> None:
-        """Save data to JSON file."""
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=2)
+        """Save data to JSON file atomically (temp file, fsync, rename)."""
+        atomic_write(file_path, codec.dumps(data, compact=self.compact_json))
+        self._on_file_written(file_path)
 
     def _load_json(self, file_path: Path) -> Union[List, Dict]:
         """Load data from JSON file."""
         if not file_path.exists():
             return []
-        with open(file_path, "r") as f:
-            return json.load(f)
+        return codec.loads(file_path.read_bytes())
+
+    def _load_records(self, file_path: Path) -> Dict[str, dict]:
+        """Load a JSON list of records into a dict keyed by record id.
+
+        The file's signature and generation are taken before reading, so a
+        concurrent external write can only make the cache look stale, never
+        fresh.
+        """
+        return self._install_records(file_path, self._read_records(file_path))
+
+    def _read_records(
+        self, file_path: Path
+    ) -> Tuple[Optional[Tuple[int, int]], int, Dict[str, dict]]:
+        """Read a record file without touching the cache (safe on any thread).
+
+        Returns:
+            The file's signature and generation, taken before reading, and
+            its records keyed by id.
+        """
+        signature = self._file_signature(file_path)
+        generation = locking.read_generation(file_path)
+        records = {record["id"]: record for record in self._load_json(file_path)}
+        return signature, generation, records
+
+    def _install_records(
+        self,
+        file_path: Path,
+        loaded: Tuple[Optional[Tuple[int, int]], int, Dict[str, dict]],
+    ) -> Dict[str, dict]:
+        """Adopt the result of ``_read_records`` as the file's cached state."""
+        signature, generation, records = loaded
+        self._signatures[file_path] = signature
+        self._generations[file_path] = generation
+        self._bases[file_path] = dict(records)
+        source = self._search_source_of(file_path)
+        if (
+            source is not None
+            and self._search is not None
+            and self._search.sources.get(source) != signature
+        ):
+            self._search_dirty.add(source)
+        return records
+
+    @staticmethod
+    def _file_signature(file_path: Path) -> Optional[Tuple[int, int]]:
+        """Get a file's (st_mtime_ns, st_size), or None if it doesn't exist."""
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _remember_signature(self, file_path: Path) -> None:
+        """Record the on-disk signature matching the cached contents of a file."""
+        self._signatures[file_path] = self._file_signature(file_path)
+
+    def _on_file_written(self, file_path: Path) -> None:
+        """Bookkeeping after one of our writes lands on disk.
+
+        Task files get their summary index rewritten against the new file
+        signature, from the records that were just written.
+        """
+        self._remember_signature(file_path)
+        if file_path.parent != self.data_dir:
+            return
+        summaries = self._rendered_summaries.pop(file_path.stem, None)
+        if summaries is not None:
+            self._write_summary_index(file_path.stem, summaries)
+            self._write_stats_index(file_path.stem, summaries)
+
+    def _file_changed(self, file_path: Path) -> bool:
+        """Check whether a cached file was modified on disk by someone else.
+
+        Files with a write of ours pending (or buffered by an open transaction)
+        are never considered changed: the in-memory copy is newer than the
+        disk until that write lands.
+        """
+        if file_path in self._txn_writes or self._flusher.is_pending(file_path):
+            return False
+        return self._signatures.get(file_path) != self._current_signature(file_path)
+
+    def _current_signature(self, file_path: Path) -> Optional[Tuple[int, int]]:
+        """Get a file's signature, trusting the startup snapshot until verified."""
+        if file_path in self._unverified or (
+            getattr(self._reads, "trust_caches", False)
+            and file_path in self._signatures
+        ):
+            return self._signatures.get(file_path)
+        return self._file_signature(file_path)
 
     def get_task_file(self, project_id: str) -> Path:
         """Get the file path for a project's tasks."""
         return self.data_dir / f"{project_id}.json"
 
+    def get_summary_file(self, project_id: str) -> Path:
+        """Get the file path for a project's task summary index."""
+        return self.index_dir / f"{project_id}.summary.json"
+
+    def _write_summary_index(self, project_id: str, summaries: List[dict]) -> None:
+        """Write a project's summary index, stamped with its task file's signature."""
+        source = self._file_signature(self.get_task_file(project_id))
+        if source is None or self.read_only:
+            return
+        payload = {
+            "format": SUMMARY_FORMAT,
+            "source": list(source),
+            "tasks": summaries,
+        }
+        try:
+            atomic_write(
+                self.get_summary_file(project_id), codec.dumps(payload, compact=True)
+            )
+        except OSError:
+            # The index is only an accelerator; a missing one means a full load
+            pass
+
+    def _read_summary_index(
+        self, project_id: str, source: Optional[Tuple[int, int]]
+    ) -> Optional[List[dict]]:
+        """Read a project's summary index if it matches the task file on disk.
+
+        Args:
+            project_id: Project whose index to read.
+            source: Current signature of the project's task file.
+
+        Returns:
+            The summary records, or None if the index is missing or stale.
+        """
+        if source is None or project_id in self._journal_dirty:
+            return None
+        try:
+            payload = codec.loads(self.get_summary_file(project_id).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(payload, dict)
+            or payload.get("format") != SUMMARY_FORMAT
+            or tuple(payload.get("source", ())) != source
+        ):
+            return None
+        return payload.get("tasks")
+
+    def _load_stats_index(self) -> Dict[str, dict]:
+        """Get the persisted stats index, reading it on first use."""
+        if self._stats_index is None:
+            try:
+                index = codec.loads(self.stats_file.read_bytes())
+            except (OSError, ValueError):
+                index = {}
+            self._stats_index = index if isinstance(index, dict) else {}
+        return self._stats_index
+
+    def _write_stats_index(self, project_id: str, records: List[dict]) -> None:
+        """Persist a project's stats, computed from the task records just written."""
+        source = self._file_signature(self.get_task_file(project_id))
+        if source is None or self.read_only:
+            return
+        stats = _compute_stats(project_id, records)
+        live = self._stats.get(project_id)
+        if live is not None and (live["last_modified"] or "") > (
+            stats["last_modified"] or ""
+        ):
+            stats["last_modified"] = live["last_modified"]
+        stats["source"] = list(source)
+        with self._index_lock:
+            index = self._load_stats_index()
+            index[project_id] = stats
+            self._save_stats_index(index)
+
+    def _save_stats_index(self, index: Dict[str, dict]) -> None:
+        """Write the stats index (caller holds the index lock)."""
+        try:
+            atomic_write(self.stats_file, codec.dumps(index, compact=True))
+        except OSError:
+            # Like the summaries, the index can always be rebuilt
+            pass
+
+    def _live_stats(self, project_id: str) -> dict:
+        """Get the live stats for a project whose task map is loaded."""
+        tasks = self._task_map(project_id)
+        stats = self._stats.get(project_id)
+        if stats is None:
+            stats = _compute_stats(project_id, list(tasks.values()))
+            persisted = self._load_stats_index().get(project_id)
+            if persisted is not None:
+                stats["last_modified"] = (
+                    max(
+                        stats["last_modified"] or "",
+                        persisted.get("last_modified") or "",
+                    )
+                    or None
+                )
+            self._stats[project_id] = stats
+        return stats
+
+    def _update_stats(
+        self, project_id: str, old: Optional[dict], new: Optional[dict]
+    ) -> None:
+        """Apply one task mutation to a project's live stats."""
+        stats = self._live_stats(project_id)
+        if old is not None:
+            _count_task(stats, old, -1)
+        if new is not None:
+            _count_task(stats, new, 1)
+        stats["last_modified"] = datetime.now().isoformat()
+
+    def _invalidate_task_objects(self, project_id: str) -> None:
+        """Drop the materialized task and summary lists of a project."""
+        self._task_objects.pop(project_id, None)
+        self._summary_objects.pop(project_id, None)
+
+    # Repository maps
+    def _project_map(self) -> Dict[str, dict]:
+        """Get the cached project records, reloading them if the file changed."""
+        if self._projects is None or self._file_changed(self.projects_file):
+            self._projects = self._load_records(self.projects_file)
+        return self._projects
+
+    def _task_map(self, project_id: str) -> Dict[str, dict]:
+        """Get the cached task records for a project, reloading them if the file changed.
+
+        Pending journal entries for the project are replayed on top of the
+        snapshot file as it is loaded.
+        """
+        task_file = self.get_task_file(project_id)
+        tasks = self._tasks.get(project_id)
+        if tasks is not None and not self._task_file_changed(project_id, task_file):
+            return tasks
+
+        with self._lock:
+            tasks = self._tasks.get(project_id)
+            if tasks is None or self._task_file_changed(project_id, task_file):
+                tasks = self._set_task_records(
+                    project_id, self._read_records(task_file)
+                )
+        return tasks
+
+    def _set_task_records(
+        self,
+        project_id: str,
+        loaded: Tuple[Optional[Tuple[int, int]], int, Dict[str, dict]],
+    ) -> Dict[str, dict]:
+        """Cache a project's freshly read task file (caller holds the lock).
+
+        Pending journal entries for the project are replayed on top of it.
+        """
+        tasks = self._install_records(self.get_task_file(project_id), loaded)
+        backlog = self._journal_backlog.pop(project_id, [])
+        for entry in backlog:
+            apply_entry(tasks, entry)
+        if backlog:
+            self._search_dirty.add(task_source(project_id))
+        self._tasks[project_id] = tasks
+        self._invalidate_task_objects(project_id)
+        self._stats.pop(project_id, None)
+        return tasks
+
+    def _prefetch_task_maps(self, project_ids: List[str]) -> None:
+        """Read the task files of projects not cached yet, in parallel.
+
+        Only the file reads and decoding run on the pool; the results are
+        cached on the calling thread. A project loaded by another thread in
+        the meantime keeps its cached records.
+        """
+        missing = [
+            project_id for project_id in project_ids if project_id not in self._tasks
+        ]
+        if len(missing) < 2:
+            return
+        loaded = _map_parallel(
+            lambda project_id: self._read_records(self.get_task_file(project_id)),
+            missing,
+            self.load_workers,
+        )
+        with self._lock:
+            for project_id, result in zip(missing, loaded):
+                if project_id not in self._tasks:
+                    self._set_task_records(project_id, result)
+
+    def _task_file_changed(self, project_id: str, task_file: Path) -> bool:
+        """Check whether a project's task file was modified externally."""
+        if project_id in self._journal_dirty or project_id in self._compacting:
+            # Journaled changes not yet compacted make the cache authoritative
+            return False
+        return self._file_changed(task_file)
+
+    def _note_map(self) -> Dict[str, dict]:
+        """Get the cached note index records, reloading them if the index changed."""
+        if self._notes is None or self._file_changed(self.notes_index_file):
+            self._notes = self._load_records(self.notes_index_file)
+        return self._notes
+
+    def get_note_file(self, note_id: str) -> Path:
+        """Get the file path for a note's markdown content."""
+        return self.notes_dir / f"{note_id}.md"
+
+    def _note_content(self, note_id: str) -> str:
+        """Get a note's content, reading its file if it is not cached or changed."""
+        note_file = self.get_note_file(note_id)
+        content = self._note_contents.get(note_id)
+        if content is None or self._file_changed(note_file):
+            self._remember_signature(note_file)
+            try:
+                content = note_file.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                content = ""
+            # Edits autosaved since the last fold (e.g. before a crash)
+            content = self._note_log(note_id).replay(content)
+            if (
+                note_id in self._note_contents
+                and self._note_contents[note_id] != content
+            ):
+                self._search_dirty.add(NOTES_SOURCE)
+            self._note_contents[note_id] = content
+        return content
+
+    def _note_log(self, note_id: str) -> notelog.NotePatchLog:
+        """Get the patch log for a note, creating its handle on first use."""
+        log = self._note_logs.get(note_id)
+        if log is None:
+            log = notelog.NotePatchLog(
+                self.notes_dir / f"{note_id}{notelog.PATCH_SUFFIX}"
+            )
+            self._note_logs[note_id] = log
+        return log
+
+    def _snippet_map(self) -> Dict[str, dict]:
+        """Get the cached snippet records, reloading them if the file changed."""
+        if self._snippets is None or self._file_changed(self.snippets_file):
+            self._snippets = self._load_records(self.snippets_file)
+        return self._snippets
+
+    def _renderer(
+        self,
+        file_path: Path,
+        records: Callable[[], Dict[str, dict]],
+        on_render: Optional[Callable[[List[dict]], None]] = None,
+    ) -> Callable[[], bytes]:
+        """Build a callable that encodes a data file's current records.
+
+        When the file's lock is held (see ``_write_guard``), changes another
+        process made to the file are merged in first.
+
+        Args:
+            file_path: The data file being written.
+            records: Callable returning the file's current records.
+            on_render: Called with the rendered records (under the cache lock).
+        """
+
+        def render() -> bytes:
+            with self._lock:
+                self._merge_external(file_path)
+                current = records()
+                data = list(current.values())
+                if file_path in self._held_locks:
+                    self._rendered_bases[file_path] = dict(current)
+                if on_render is not None:
+                    on_render(data)
+            return codec.dumps(data, compact=self.compact_json)
+
+        return render
+
+    def _task_renderer(self, project_id: str) -> Callable[[], bytes]:
+        """Build the renderer for a project's task file (and its summary index)."""
+        return self._renderer(
+            self.get_task_file(project_id),
+            lambda: self._task_map(project_id),
+            lambda data: self._stage_summaries(project_id, data),
+        )
+
+    def _is_record_file(self, file_path: Path) -> bool:
+        """Check whether a path is a data file of id-keyed records."""
+        if file_path in (self.projects_file, self.snippets_file, self.notes_index_file):
+            return True
+        return (
+            file_path.parent == self.data_dir
+            and file_path.suffix == ".json"
+            and file_path.stem in self._tasks
+        )
+
+    @contextmanager
+    def _write_guard(self, file_path: Path) -> Iterator[None]:
+        """Hold a record file's cross-process lock while it is written.
+
+        On success the file's generation is bumped and the rendered records
+        become the base for the next merge. Other files are not locked.
+
+        Raises:
+            locking.LockTimeout: If another process holds the lock too long;
+                the flush scheduler keeps the write pending and retries.
+        """
+        if not self._is_record_file(file_path):
+            yield
+            return
+        with locking.FileLock(file_path) as lock:
+            self._held_locks[file_path] = lock
+            try:
+                yield
+            finally:
+                del self._held_locks[file_path]
+                rendered = self._rendered_bases.pop(file_path, None)
+            lock.bump()
+            with self._lock:
+                self._generations[file_path] = lock.generation
+                if rendered is not None:
+                    self._bases[file_path] = rendered
+
+    def _merge_external(self, file_path: Path) -> None:
+        """Fold another process's changes to a locked record file into the cache.
+
+        Called under the file's lock, right before rendering it. If the
+        generation or signature on disk differs from what we last read or
+        wrote, the file is re-read and every record we changed, added or
+        deleted since then is applied on top of it (our version of a record
+        wins). The merged records replace the cache and are what gets written.
+        """
+        lock = self._held_locks.get(file_path)
+        if lock is None:
+            return
+        if self._generations.get(file_path) == lock.generation and self._signatures.get(
+            file_path
+        ) == self._file_signature(file_path):
+            return
+
+        base = self._bases.get(file_path)
+        if base is None:
+            # Nothing was read since a full replacement (save_*): ours is final
+            return
+        ours = self._records_of(file_path)
+        merged = {record["id"]: record for record in self._load_json(file_path)}
+        for record_id, record in ours.items():
+            if base.get(record_id) is not record:
+                merged[record_id] = record
+        for record_id in base.keys() - ours.keys():
+            merged.pop(record_id, None)
+        self._set_records(file_path, merged)
+        self._merged_paths.add(file_path)
+
+    def _records_of(self, file_path: Path) -> Dict[str, dict]:
+        """Get the cached records of a record file (see _is_record_file)."""
+        if file_path == self.projects_file:
+            return self._projects or {}
+        if file_path == self.snippets_file:
+            return self._snippets or {}
+        if file_path == self.notes_index_file:
+            return self._notes or {}
+        return self._tasks.get(file_path.stem, {})
+
+    def _set_records(self, file_path: Path, records: Dict[str, dict]) -> None:
+        """Replace the cached records of a record file (see _is_record_file)."""
+        if file_path == self.projects_file:
+            self._projects = records
+        elif file_path == self.snippets_file:
+            self._snippets = records
+            self._search_dirty.add(SNIPPETS_SOURCE)
+        elif file_path == self.notes_index_file:
+            self._notes = records
+            self._search_dirty.add(NOTES_SOURCE)
+        else:
+            project_id = file_path.stem
+            self._tasks[project_id] = records
+            self._invalidate_task_objects(project_id)
+            self._stats.pop(project_id, None)
+            self._search_dirty.add(task_source(project_id))
+
+    def _schedule_write(self, file_path: Path, render: Callable[[], bytes]) -> None:
+        """Mark a data file dirty so the flush scheduler rewrites it.
+
+        The file is rendered when it is actually written, so repeated changes
+        inside the coalescing window cost a single write. Inside a transaction
+        the write is buffered until the transaction commits.
+        """
+        if self._txn_depth:
+            self._txn_deletes.discard(file_path)
+            self._txn_writes[file_path] = render
+            return
+        self._flusher.schedule(file_path, render)
+
+    def _remove_file(self, file_path: Path) -> None:
+        """Delete a data file, dropping any write still pending for it."""
+        if self._txn_depth:
+            self._txn_writes.pop(file_path, None)
+            self._txn_deletes.add(file_path)
+            return
+        self._flusher.discard(file_path)
+        file_path.unlink(missing_ok=True)
+
+    def _persist_projects(self) -> None:
+        """Write the cached project records to disk."""
+        self._schedule_write(
+            self.projects_file, self._renderer(self.projects_file, self._project_map)
+        )
+
+    def _persist_tasks(self, project_id: str) -> None:
+        """Write the cached task records for a project (and its summary index) to disk."""
+        self._schedule_write(
+            self.get_task_file(project_id), self._task_renderer(project_id)
+        )
+
+    def _stage_summaries(self, project_id: str, records: List[dict]) -> None:
+        """Remember the summaries of task records about to be written."""
+        self._rendered_summaries[project_id] = [_summary_record(r) for r in records]
+
+    def _persist_notes(self) -> None:
+        """Write the cached note index to disk."""
+        self._search_dirty.add(NOTES_SOURCE)
+        self._schedule_write(
+            self.notes_index_file,
+            self._renderer(self.notes_index_file, self._note_map),
+        )
+
+    def _persist_note_content(self, note_id: str) -> None:
+        """Write a note's cached content to its markdown file."""
+
+        def render() -> bytes:
+            with self._lock:
+                return self._note_contents.get(note_id, "").encode("utf-8")
+
+        self._schedule_write(self.get_note_file(note_id), render)
+
+    def _rewrite_note_base(self, note_id: str) -> None:
+        """Write a note's cached content as its base file and drop its patch log.
+
+        Without patches on disk this is an ordinary scheduled write. With
+        patches, the base is written synchronously before the log is removed
+        (inside a transaction both are committed together), so no edit is
+        ever only in a write that is still pending. The content is also
+        recorded as a new revision in the note's history.
+        """
+        self._record_note_revision(note_id, self._note_contents.get(note_id, ""))
+        log = self._note_logs.pop(note_id, None)
+        if log is not None:
+            log.close()
+        if log is None or log.is_empty():
+            self._persist_note_content(note_id)
+            return
+        if self._txn_depth:
+            self._persist_note_content(note_id)
+            self._remove_file(log.path)
+            return
+        self._write_note_now(note_id)
+        log.path.unlink(missing_ok=True)
+
+    def _write_note_now(self, note_id: str) -> None:
+        """Write a note's cached content to its base file on the calling thread."""
+        note_file = self.get_note_file(note_id)
+        self._flusher.discard(note_file)
+        atomic_write(note_file, self._note_contents.get(note_id, "").encode("utf-8"))
+        self._remember_signature(note_file)
+
+    def _persist_snippets(self) -> None:
+        """Write the cached snippet records to disk."""
+        self._search_dirty.add(SNIPPETS_SOURCE)
+        self._schedule_write(
+            self.snippets_file, self._renderer(self.snippets_file, self._snippet_map)
+        )
+
+    def flush(self) -> None:
+        """Write all pending changes to disk now.
+
+        Called on quit so nothing waiting in the coalescing window (or the
+        task journal) is lost. Note patch logs are folded into their notes.
+
+        Raises:
+            FlushError: If a file could not be written; it stays pending (and
+                the journal is not compacted).
+        """
+        self.fold_notes()
+        self._flusher.flush()
+        self.compact_journal()
+
+    def _on_write_error(self, file_path: Path, error: OSError) -> None:
+        """Pass a failed scheduled write on to ``on_write_error``."""
+        if self.on_write_error is not None:
+            self.on_write_error(file_path, error)
+
+    def flush_stats(self) -> Dict[str, int]:
+        """Get counters for scheduled, written and coalesced (saved) writes."""
+        return self._flusher.stats()
+
+    # Changes made by other processes
+    def get_watch_dirs(self) -> List[Path]:
+        """Get the directories whose files back the in-memory caches."""
+        return [self.data_dir, self.notes_dir]
+
+    def external_changes(self, paths: Iterable[Path]) -> Dict[str, Set[str]]:
+        """Work out which data another process changed, given changed files.
+
+        Our own writes are recognized by their remembered signatures and
+        ignored. Caches of the changed files are reloaded on the next read,
+        so callers only need to re-query the data that is reported.
+
+        Args:
+            paths: Files reported as changed (e.g. by ``DataDirWatcher``).
+
+        Returns:
+            A dict with a key for each kind of data that changed:
+            ``"projects"`` and ``"snippets"`` (empty sets), ``"tasks"`` (the
+            affected project ids) and ``"notes"`` (ids of notes whose content
+            changed; the set may be empty if only titles or the list did).
+        """
+        changes: Dict[str, Set[str]] = {}
+        with self._lock:
+            for path in paths:
+                if path in self._merged_paths:
+                    # Written by us, with another process's changes merged in
+                    self._merged_paths.discard(path)
+                    self._signatures.pop(path, None)
+                if path.parent == self.notes_dir:
+                    self._external_note_change(path, changes)
+                elif path.parent != self.data_dir or not self._file_changed(path):
+                    continue
+                elif path == self.projects_file:
+                    changes.setdefault("projects", set())
+                elif path == self.snippets_file:
+                    changes.setdefault("snippets", set())
+                elif path.suffix == ".json" and path != self.notes_file:
+                    project_id = path.stem
+                    if not self._task_file_changed(project_id, path):
+                        continue
+                    changes.setdefault("tasks", set()).add(project_id)
+            self._mark_search_changes(changes)
+        return changes
+
+    def _external_note_change(self, path: Path, changes: Dict[str, Set[str]]) -> None:
+        """Classify a changed file in the notes directory (see external_changes)."""
+        if path == self.notes_index_file:
+            if self._file_changed(path):
+                changes.setdefault("notes", set())
+            return
+        note_id = path.stem
+        if path.suffix == ".md":
+            if note_id in self._note_contents and self._file_changed(path):
+                changes.setdefault("notes", set()).add(note_id)
+        elif path.suffix == notelog.PATCH_SUFFIX:
+            log = self._note_logs.get(note_id)
+            if path.exists() and (log is None or log.is_empty()):
+                # Another instance is autosaving this note: replay its log
+                self._note_contents.pop(note_id, None)
+                changes.setdefault("notes", set()).add(note_id)
+
+    # Startup snapshot
+    def write_startup_snapshot(self) -> bool:
+        """Write the startup snapshot from the caches (see ``snapshot.py``).
+
+        Only data that matches the files on disk goes in: nothing is written
+        while a transaction is open or a write of a record file is pending,
+        and projects with journaled changes are left out.
+
+        Returns:
+            True if the snapshot was written.
+        """
+        with self._lock:
+            if self._txn_depth:
+                return False
+            files = {}
+            for file_path, records in (
+                (self.projects_file, self._project_map),
+                (self.snippets_file, self._snippet_map),
+                (self.notes_index_file, self._note_map),
+            ):
+                if self._flusher.is_pending(file_path):
+                    return False
+                files[str(file_path.relative_to(self.data_dir))] = (
+                    list(records().values()),
+                    self._signatures.get(file_path),
+                    self._generations.get(file_path, 0),
+                )
+
+            tasks = {}
+            stats = {}
+            index = self._load_stats_index()
+            for project_id in self._project_map():
+                task_file = self.get_task_file(project_id)
+                if (
+                    project_id in self._journal_dirty
+                    or project_id in self._compacting
+                    or self._flusher.is_pending(task_file)
+                ):
+                    continue
+                source = self._current_signature(task_file)
+                summaries = self._snapshot_summaries(project_id, source)
+                if source is None or summaries is None:
+                    continue
+                tasks[project_id] = (summaries, source)
+                persisted = index.get(project_id)
+                if (
+                    persisted is not None
+                    and tuple(persisted.get("source", ())) == source
+                ):
+                    stats[project_id] = persisted
+
+        try:
+            snapshot.write(
+                self.snapshot_file, {"files": files, "tasks": tasks, "stats": stats}
+            )
+        except OSError:
+            # Derived data, like the indexes: the next start just reads the files
+            return False
+        return True
+
+    def _snapshot_summaries(
+        self, project_id: str, source: Optional[Tuple[int, int]]
+    ) -> Optional[List[dict]]:
+        """Get a project's summary records matching its task file, if known cheaply."""
+        tasks = self._tasks.get(project_id)
+        if tasks is not None:
+            if self._signatures.get(self.get_task_file(project_id)) != source:
+                return None
+            return [_summary_record(r) for r in tasks.values()]
+        cached = self._summary_objects.get(project_id)
+        if cached is not None and cached[0] == source:
+            return [
+                {**_summary_record(t.to_dict()), "search_text": t.search_text}
+                for t in cached[1]
+            ]
+        return self._read_summary_index(project_id, source)
+
+    def load_startup_snapshot(self) -> bool:
+        """Seed the caches from the startup snapshot, if there is one.
+
+        Call right after opening the storage, before anything is loaded.
+        Seeded files are trusted without even a stat until
+        ``verify_startup_snapshot`` runs.
+
+        Returns:
+            True if a snapshot was found and used.
+        """
+        payload = snapshot.read(self.snapshot_file)
+        if payload is None:
+            return False
+        with self._lock:
+            for name, (records, signature, generation) in payload["files"].items():
+                file_path = self.data_dir / name
+                if not self._is_record_file(file_path) or self._records_loaded(
+                    file_path
+                ):
+                    continue
+                records = {record["id"]: record for record in records}
+                self._set_records(file_path, records)
+                self._install_records(file_path, (signature, generation, records))
+                self._unverified.add(file_path)
+
+            for project_id, (summaries, source) in payload["tasks"].items():
+                if project_id in self._tasks or project_id in self._journal_dirty:
+                    continue
+                task_file = self.get_task_file(project_id)
+                self._summary_objects[project_id] = (
+                    source,
+                    [_summary_task(r) for r in summaries],
+                )
+                self._signatures[task_file] = source
+                self._unverified.add(task_file)
+
+            if self._stats_index is None:
+                self._stats_index = payload["stats"]
+        return True
+
+    def _records_loaded(self, file_path: Path) -> bool:
+        """Check whether a record file's cache is populated."""
+        if file_path == self.projects_file:
+            return self._projects is not None
+        if file_path == self.snippets_file:
+            return self._snippets is not None
+        if file_path == self.notes_index_file:
+            return self._notes is not None
+        return file_path.stem in self._tasks
+
+    def verify_startup_snapshot(self) -> Set[Path]:
+        """Check the files seeded from the startup snapshot against the disk.
+
+        Safe to call from a background thread. From then on the seeded
+        caches are validated like any other.
+
+        Returns:
+            Seeded files that changed since the snapshot was written; pass
+            them to ``external_changes`` to find out what to refresh.
+        """
+        with self._lock:
+            paths, self._unverified = self._unverified, set()
+        return {
+            path
+            for path in paths
+            if self._signatures.get(path) != self._file_signature(path)
+        }
+
+    # Transactions
+    @contextmanager
+    def transaction(self) -> Iterator[StorageManager]:
+        """Group mutations into a single atomic unit of work.
+
+        Inside the block, reads see the changes immediately but nothing is
+        written. When the outermost block exits, every affected file is
+        staged and moved into place in one commit (pending journal entries
+        are folded in as well). If an exception escapes the outermost block,
+        all changes are discarded and the caches are reloaded from disk.
+        Nested blocks join the enclosing transaction.
+
+        Example:
+            with storage.transaction():
+                storage.move_tasks(task_ids, target_id, source_id)
+                storage.delete_project(source_id)
+        """
+        with self._txn_lock:
+            if self._txn_depth:
+                self._txn_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._txn_depth -= 1
+                return
+
+            with self._compaction_lock:
+                # Land earlier writes first, so a rollback can reload from disk
+                self._flusher.flush()
+                with self._lock:
+                    self._txn_depth = 1
+                    try:
+                        yield self
+                        self._txn_depth = 0
+                        self._commit_transaction()
+                    except BaseException:
+                        self._rollback_transaction()
+                        raise
+                    finally:
+                        self._txn_depth = 0
+
+    def _commit_transaction(self) -> None:
+        """Stage and apply the buffered writes of the finished transaction.
+
+        The locks of all files written are taken up front, in path order so
+        that two committing processes cannot deadlock.
+        """
+        renders = dict(self._txn_writes)
+        deletes = sorted(self._txn_deletes)
+        journal_dirty = set(self._journal_dirty)
+        adopted: List[MutationJournal] = []
+        if self._journal is not None and journal_dirty:
+            # Fold the journal in: snapshot every project it touches and drop it
+            for project_id in journal_dirty:
+                task_file = self.get_task_file(project_id)
+                if task_file not in renders and task_file not in self._txn_deletes:
+                    renders[task_file] = self._task_renderer(project_id)
+            adopted = list(self._adopted)
+            for journal in (self._journal, *adopted):
+                deletes += [journal.path, journal.compacting_path]
+        if not renders and not deletes:
+            return
+
+        with ExitStack() as guards:
+            for path in sorted(renders):
+                guards.enter_context(self._write_guard(path))
+            files = {path: render() for path, render in renders.items()}
+
+            with staging.stage(self.data_dir, files, deletes) as staging_dir:
+                if self._journal is not None and journal_dirty:
+                    self._journal.rotate()
+                    self._journal_dirty.difference_update(journal_dirty)
+                staging.apply(staging_dir)
+            self._remove_adopted(adopted)
+
+            self._txn_writes.clear()
+            self._txn_deletes.clear()
+            for path in files:
+                self._on_file_written(path)
+
+    def _rollback_transaction(self) -> None:
+        """Discard the buffered changes and reload every cache from disk."""
+        self._txn_writes.clear()
+        self._txn_deletes.clear()
+        self._projects = None
+        self._notes = None
+        self._note_contents.clear()
+        for log in self._note_logs.values():
+            log.close()
+        self._note_logs.clear()
+        self._snippets = None
+        self._tasks.clear()
+        self._signatures.clear()
+        self._task_objects.clear()
+        self._summary_objects.clear()
+        self._rendered_summaries.clear()
+        self._stats.clear()
+        if self._search is not None:
+            self._search_dirty.update(self._search.sources)
+        if self._journal is not None:
+            self._journal_backlog.clear()
+            self._journal_dirty.clear()
+            self._queue_journal_replay()
+
+    # Journal operations
+    def _open_journal(self) -> None:
+        """Open this manager's journal and adopt those of exited processes."""
+        self._journal = MutationJournal(self.data_dir)
+        self._adopted = adopt_orphans(self.data_dir)
+        self._queue_journal_replay()
+
+        # Fold journals left over from earlier sessions into the snapshots
+        if self._adopted:
+            self._start_compaction()
+
+    def _queue_journal_replay(self) -> None:
+        """Queue the journals' entries for replay as their task maps load."""
+        for journal in (*self._adopted, self._journal):
+            self._queue_entries(journal.read_all())
+
+    def _queue_entries(self, entries: List[dict]) -> None:
+        """Queue journal entries for replay as their task maps load."""
+        for entry in entries:
+            project_id = entry.get("project")
+            if project_id:
+                self._journal_backlog.setdefault(project_id, []).append(entry)
+                self._journal_dirty.add(project_id)
+
+    def _record_task_changes(self, project_id: str, entries: List[dict]) -> None:
+        """Persist task mutations that have already been applied to the cache.
+
+        Without a journal the project's task file is rewritten once; with one
+        the mutations are appended as one line each and compaction is kicked
+        off in the background once the journal is large enough. Inside a
+        transaction the task file is always rewritten, as part of the commit.
+        """
+        if not entries:
+            return
+        self._invalidate_task_objects(project_id)
+        self._search_dirty.add(task_source(project_id))
+        if self._journal is None or self._txn_depth:
+            self._persist_tasks(project_id)
+            return
+
+        self._journal.extend(entries)
+        self._journal_dirty.add(project_id)
+        if self._journal.needs_compaction():
+            self._start_compaction()
+
+    def _start_compaction(self) -> None:
+        """Compact the journal on a background thread (if not already running)."""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self._compact_in_background,
+            name="tuido-journal-compaction",
+            daemon=True,
+        )
+        self._compaction_thread.start()
+
+    def _compact_in_background(self) -> None:
+        """Compaction thread: fold the journal, then refresh the startup snapshot."""
+        self.compact_journal()
+        self.write_startup_snapshot()
+
+    def compact_journal(self) -> None:
+        """Fold pending journal entries into the project snapshot files.
+
+        Safe to call from any thread; concurrent calls are serialized. The
+        journal is rotated under the cache lock, then the affected snapshot
+        files are written and the rotated journal is removed. Inside a
+        transaction this does nothing; the commit folds the journal in.
+        """
+        if self._journal is None or self._txn_depth:
+            return
+
+        with self._compaction_lock:
+            with self._lock:
+                project_ids = set(self._journal_dirty)
+                # Replay the backlog before the projects stop counting as dirty
+                for project_id in project_ids:
+                    self._task_map(project_id)
+                self._compacting.update(project_ids)
+                self._journal_dirty.clear()
+                self._journal.rotate()
+                adopted = list(self._adopted)
+
+            try:
+                for project_id in project_ids:
+                    # Rendered under the file's lock, so changes another
+                    # process wrote meanwhile are merged in
+                    task_file = self.get_task_file(project_id)
+                    with self._write_guard(task_file):
+                        atomic_write(task_file, self._task_renderer(project_id)())
+                        self._on_file_written(task_file)
+            finally:
+                with self._lock:
+                    self._compacting.difference_update(project_ids)
+
+            # Also drops a journal left over from an interrupted compaction,
+            # whose projects were part of the dirty set loaded at startup
+            self._journal.discard_rotated()
+            self._remove_adopted(adopted)
+
+    def _remove_adopted(self, journals: List[MutationJournal]) -> None:
+        """Delete adopted journals whose entries are now in the snapshots."""
+        for journal in journals:
+            journal.remove()
+        with self._lock:
+            self._adopted = [j for j in self._adopted if j not in journals]
+
     # Project operations
     def load_projects(self) -> List[Project]:
         """Load all projects."""
-        data = self._load_json(self.projects_file)
-        return [Project.from_dict(p) for p in data]
+        return [Project.from_dict(p) for p in self._project_map().values()]
 
     def save_projects(self, projects: List[Project]) -> None:
         """Save all projects."""
-        data = [p.to_dict() for p in projects]
-        self._save_json(self.projects_file, data)
+        self._projects = {p.id: p.to_dict() for p in projects}
+        self._remember_signature(self.projects_file)
+        self._bases.pop(self.projects_file, None)
+        self._persist_projects()
 
     def add_project(self, project: Project) -> None:
         """Add a new project."""
-        projects = self.load_projects()
-        projects.append(project)
-        self.save_projects(projects)
+        self._project_map()[project.id] = project.to_dict()
+        self._persist_projects()
 
         # Create empty tasks file for the project
-        self._save_json(self.get_task_file(project.id), [])
+        with self._lock:
+            self._tasks[project.id] = {}
+            self._stats.pop(project.id, None)
+        self._persist_tasks(project.id)
 
     def update_project(self, project: Project) -> None:
         """Update an existing project."""
-        projects = self.load_projects()
-        for i, p in enumerate(projects):
-            if p.id == project.id:
-                projects[i] = project
-                break
-        self.save_projects(projects)
+        projects = self._project_map()
+        if project.id in projects:
+            projects[project.id] = project.to_dict()
+        self._persist_projects()
 
     def delete_project(self, project_id: str) -> None:
         """Delete a project and its tasks."""
-        projects = self.load_projects()
-        projects = [p for p in projects if p.id != project_id]
-        self.save_projects(projects)
+        self._project_map().pop(project_id, None)
+        self._persist_projects()
+
+        with self._lock:
+            self._tasks.pop(project_id, None)
+            self._invalidate_task_objects(project_id)
+            self._rendered_summaries.pop(project_id, None)
+            self._stats.pop(project_id, None)
+            self._journal_backlog.pop(project_id, None)
+            self._journal_dirty.discard(project_id)
+        # Fold the journal first so its entries cannot resurrect the project
+        self.compact_journal()
 
         # Delete the project's task file
-        task_file = self.get_task_file(project_id)
-        if task_file.exists():
-            task_file.unlink()
+        self._remove_file(self.get_task_file(project_id))
+        self._remove_file(self.get_summary_file(project_id))
+        with self._index_lock:
+            index = self._load_stats_index()
+            if index.pop(project_id, None) is not None:
+                self._save_stats_index(index)
+        self._purge_archived_project(project_id)
 
     def get_project(self, project_id: str) -> Optional[Project]:
         """Get a specific project by ID."""
-        projects = self.load_projects()
-        for p in projects:
-            if p.id == project_id:
-                return p
-        return None
+        record = self._project_map().get(project_id)
+        return Project.from_dict(record) if record else None
+
+    def get_project_stats(self, project_id: str) -> ProjectStats:
+        """Get task counts for a project.
+
+        Served from the live stats when the project's tasks are loaded, and
+        otherwise from the persisted stats index as long as it matches the
+        task file on disk. Only a stale or missing entry costs a load of the
+        project's task summaries.
+        """
+        with self._lock:
+            if project_id in self._tasks:
+                return ProjectStats.from_dict(self._live_stats(project_id))
+
+            source = self._current_signature(self.get_task_file(project_id))
+            persisted = self._load_stats_index().get(project_id)
+            if (
+                source is not None
+                and persisted is not None
+                and tuple(persisted.get("source", ())) == source
+                and project_id not in self._journal_dirty
+            ):
+                return ProjectStats.from_dict(persisted)
+
+            records = [t.to_dict() for t in self.load_task_summaries(project_id)]
+            stats = _compute_stats(project_id, records)
+            if persisted is not None:
+                stats["last_modified"] = (
+                    max(
+                        stats["last_modified"] or "",
+                        persisted.get("last_modified") or "",
+                    )
+                    or None
+                )
+            if project_id not in self._tasks:
+                self._write_stats_index(project_id, records)
+            return ProjectStats.from_dict(stats)
+
+    def load_project_stats(self) -> Dict[str, ProjectStats]:
+        """Get task counts for every project, keyed by project id."""
+        return {
+            project_id: self.get_project_stats(project_id)
+            for project_id in self._project_map()
+        }
 
     # Task operations
     def load_tasks(self, project_id: str) -> List[Task]:
-        """Load all tasks for a project."""
-        task_file = self.get_task_file(project_id)
-        data = self._load_json(task_file)
-        return [Task.from_dict(t) for t in data]
+        """Load all tasks for a project.
+
+        Task objects are materialized once per version of the project's
+        records and shared between calls until the project changes, either
+        through this manager or on disk.
+        """
+        tasks = self._task_map(project_id)
+        objects = self._task_objects.get(project_id)
+        if objects is None:
+            objects = [Task.from_dict(t) for t in tasks.values()]
+            self._task_objects[project_id] = objects
+        return list(objects)
+
+    def load_task_summaries(self, project_id: str) -> List[Task]:
+        """Load a project's tasks without their description and notes bodies.
+
+        Served from the summary index when it matches the task file, so the
+        task file itself is not parsed. The returned tasks are flagged
+        ``summary_only``; pass one to ``load_task_body`` before showing or
+        editing its body. Saving a summary task keeps the stored body.
+        """
+        if project_id in self._tasks:
+            self._task_map(project_id)  # reloads if the file changed on disk
+            cached = self._summary_objects.get(project_id)
+            if cached is None or cached[0] is not None:
+                records = self._task_map(project_id).values()
+                cached = (None, [_summary_task(_summary_record(r)) for r in records])
+                self._summary_objects[project_id] = cached
+            return list(cached[1])
+
+        source = self._current_signature(self.get_task_file(project_id))
+        cached = self._summary_objects.get(project_id)
+        if cached is not None and cached[0] == source:
+            return list(cached[1])
+        summaries = self._read_summary_index(project_id, source)
+        if summaries is None:
+            # Missing or stale index: fall back to the task file and reindex
+            records = list(self._task_map(project_id).values())
+            if project_id not in self._journal_dirty:
+                self._write_summary_index(
+                    project_id, [_summary_record(r) for r in records]
+                )
+            return self.load_task_summaries(project_id)
+        objects = [_summary_task(r) for r in summaries]
+        self._summary_objects[project_id] = (source, objects)
+        return list(objects)
+
+    def load_all_task_summaries(self) -> List[Task]:
+        """Load summaries of all tasks across all projects.
+
+        On a cold start the summary indexes (or, where an index is stale,
+        the task files) are read in parallel; the tasks are still returned
+        in project order.
+        """
+        project_ids = list(self._project_map())
+        self._prefetch_summaries(project_ids)
+        all_tasks = []
+        for project_id in project_ids:
+            all_tasks.extend(self.load_task_summaries(project_id))
+        return all_tasks
+
+    def _prefetch_summaries(self, project_ids: List[str]) -> None:
+        """Read the summary indexes of projects not cached yet, in parallel.
+
+        Valid indexes are cached like ``load_task_summaries`` would cache
+        them. Projects without one get their task files prefetched instead,
+        and their indexes rebuilt.
+        """
+        missing = [
+            project_id
+            for project_id in project_ids
+            if project_id not in self._tasks and project_id not in self._summary_objects
+        ]
+        if len(missing) < 2:
+            return
+
+        def read(project_id: str):
+            source = self._file_signature(self.get_task_file(project_id))
+            return source, self._read_summary_index(project_id, source)
+
+        stale = []
+        for project_id, (source, summaries) in zip(
+            missing, _map_parallel(read, missing, self.load_workers)
+        ):
+            if summaries is None:
+                stale.append(project_id)
+            else:
+                self._summary_objects[project_id] = (
+                    source,
+                    [_summary_task(r) for r in summaries],
+                )
+        self._prefetch_task_maps(stale)
+        for project_id in stale:
+            if project_id in self._tasks and project_id not in self._journal_dirty:
+                self._write_summary_index(
+                    project_id,
+                    [_summary_record(r) for r in self._task_map(project_id).values()],
+                )
+
+    def load_task_body(self, task: Task) -> Task:
+        """Fill in the description and notes of a summary task, in place.
+
+        Args:
+            task: Task returned by ``load_task_summaries`` (full tasks are
+                returned unchanged).
+
+        Returns:
+            The same task, with ``summary_only`` cleared.
+        """
+        if not task.summary_only:
+            return task
+        record = self._task_map(task.project_id).get(task.id)
+        if record is not None:
+            task.description = record.get("description", "")
+            task.notes = record.get("notes", "")
+        task.summary_only = False
+        return task
+
+    def _task_record(self, task: Task, old: Optional[dict]) -> dict:
+        """Build the record for a task, keeping the stored body of summary tasks."""
+        record = task.to_dict()
+        if task.summary_only and old is not None:
+            for key in _BODY_FIELDS:
+                record[key] = old.get(key, "")
+        return record
 
     def save_tasks(self, project_id: str, tasks: List[Task]) -> None:
         """Save all tasks for a project."""
-        task_file = self.get_task_file(project_id)
-        data = [t.to_dict() for t in tasks]
-        self._save_json(task_file, data)
+        with self._lock:
+            old = (
+                self._task_map(project_id) if any(t.summary_only for t in tasks) else {}
+            )
+            self._journal_backlog.pop(project_id, None)
+            self._tasks[project_id] = {
+                t.id: self._task_record(t, old.get(t.id)) for t in tasks
+            }
+            # The new map replaces whatever is on disk; don't reload over it
+            self._remember_signature(self.get_task_file(project_id))
+            self._bases.pop(self.get_task_file(project_id), None)
+            self._invalidate_task_objects(project_id)
+            self._search_dirty.add(task_source(project_id))
+            self._stats.pop(project_id, None)
+            self._live_stats(project_id)["last_modified"] = datetime.now().isoformat()
+            if self._journal is None:
+                self._persist_tasks(project_id)
+                return
+            self._journal_dirty.add(project_id)
+        # A full replacement goes straight to the snapshot file
+        self.compact_journal()
 
     def add_task(self, task: Task) -> None:
         """Add a new task to a project."""
-        tasks = self.load_tasks(task.project_id)
-        tasks.append(task)
-        self.save_tasks(task.project_id, tasks)
+        with self._lock:
+            record = task.to_dict()
+            tasks = self._task_map(task.project_id)
+            self._update_stats(task.project_id, tasks.get(task.id), record)
+            tasks[task.id] = record
+            self._record_task_changes(
+                task.project_id,
+                [{"op": "add", "project": task.project_id, "record": record}],
+            )
 
     def update_task(self, task: Task) -> None:
         """Update an existing task."""
-        tasks = self.load_tasks(task.project_id)
-        for i, t in enumerate(tasks):
-            if t.id == task.id:
-                tasks[i] = task
-                break
-        self.save_tasks(task.project_id, tasks)
+        with self._lock:
+            tasks = self._task_map(task.project_id)
+            old = tasks.get(task.id)
+            if old is None:
+                return
+            record = self._task_record(task, old)
+            fields = {k: v for k, v in record.items() if old.get(k) != v}
+            if not fields:
+                return
+            self._update_stats(task.project_id, old, record)
+            tasks[task.id] = record
+            self._record_task_changes(
+                task.project_id,
+                [
+                    {
+                        "op": "update",
+                        "project": task.project_id,
+                        "id": task.id,
+                        "fields": fields,
+                    }
+                ],
+            )
 
     def delete_task(self, project_id: str, task_id: str) -> None:
         """Delete a task from a project."""
-        tasks = self.load_tasks(project_id)
-        tasks = [t for t in tasks if t.id != task_id]
-        self.save_tasks(project_id, tasks)
+        with self._lock:
+            tasks = self._task_map(project_id)
+            old = tasks.get(task_id)
+            if old is None:
+                return
+            self._update_stats(project_id, old, None)
+            del tasks[task_id]
+            self._record_task_changes(
+                project_id, [{"op": "delete", "project": project_id, "id": task_id}]
+            )
+
+    # Batch task operations
+    def bulk_add_tasks(self, tasks: List[Task]) -> None:
+        """Add many tasks, writing each affected project's file once."""
+        with self._lock:
+            for project_id, group in self._group_by_project(tasks).items():
+                records = self._task_map(project_id)
+                entries = []
+                for task in group:
+                    record = task.to_dict()
+                    self._update_stats(project_id, records.get(task.id), record)
+                    records[task.id] = record
+                    entries.append(
+                        {"op": "add", "project": project_id, "record": record}
+                    )
+                self._record_task_changes(project_id, entries)
+
+    def update_tasks(self, tasks: List[Task]) -> None:
+        """Update many existing tasks, writing each affected project's file once.
+
+        Like ``update_task``, tasks are looked up in the project named by
+        their ``project_id`` and unknown tasks are ignored; use ``move_tasks``
+        to change a task's project.
+        """
+        with self._lock:
+            for project_id, group in self._group_by_project(tasks).items():
+                records = self._task_map(project_id)
+                entries = []
+                for task in group:
+                    old = records.get(task.id)
+                    if old is None:
+                        continue
+                    record = self._task_record(task, old)
+                    fields = {k: v for k, v in record.items() if old.get(k) != v}
+                    if not fields:
+                        continue
+                    self._update_stats(project_id, old, record)
+                    records[task.id] = record
+                    entries.append(
+                        {
+                            "op": "update",
+                            "project": project_id,
+                            "id": task.id,
+                            "fields": fields,
+                        }
+                    )
+                self._record_task_changes(project_id, entries)
+
+    def delete_tasks(self, project_id: str, task_ids: List[str]) -> None:
+        """Delete many tasks from a project, writing its file once."""
+        with self._lock:
+            records = self._task_map(project_id)
+            entries = []
+            for task_id in task_ids:
+                old = records.get(task_id)
+                if old is None:
+                    continue
+                self._update_stats(project_id, old, None)
+                del records[task_id]
+                entries.append({"op": "delete", "project": project_id, "id": task_id})
+            self._record_task_changes(project_id, entries)
+
+    def move_tasks(
+        self,
+        task_ids: List[str],
+        target_project_id: str,
+        source_project_id: Optional[str] = None,
+    ) -> None:
+        """Move tasks to another project, writing each affected file once.
+
+        Args:
+            task_ids: IDs of the tasks to move.
+            target_project_id: Project to move the tasks into.
+            source_project_id: Project the tasks are in. If None, every
+                project is searched, which loads all task files.
+        """
+        if source_project_id is not None:
+            sources = [source_project_id]
+        else:
+            sources = [pid for pid in self._project_map() if pid != target_project_id]
+        wanted = set(task_ids)
+
+        with self._lock:
+            target = self._task_map(target_project_id)
+            added: List[dict] = []
+            removed: Dict[str, List[dict]] = {}
+            for project_id in sources:
+                if project_id == target_project_id:
+                    continue
+                records = self._task_map(project_id)
+                for task_id in [t for t in records if t in wanted]:
+                    old = records[task_id]
+                    record = {**old, "project_id": target_project_id}
+                    self._update_stats(project_id, old, None)
+                    self._update_stats(target_project_id, target.get(task_id), record)
+                    del records[task_id]
+                    target[task_id] = record
+                    removed.setdefault(project_id, []).append(
+                        {"op": "delete", "project": project_id, "id": task_id}
+                    )
+                    added.append(
+                        {"op": "add", "project": target_project_id, "record": record}
+                    )
+
+            # Persist the additions first: an interrupted move then leaves a
+            # duplicate behind rather than losing tasks
+            self._record_task_changes(target_project_id, added)
+            for project_id, entries in removed.items():
+                self._record_task_changes(project_id, entries)
+
+    @staticmethod
+    def _group_by_project(tasks: List[Task]) -> Dict[str, List[Task]]:
+        """Group tasks by project id, preserving order."""
+        groups: Dict[str, List[Task]] = {}
+        for task in tasks:
+            groups.setdefault(task.project_id, []).append(task)
+        return groups
 
     def get_task(self, project_id: str, task_id: str) -> Optional[Task]:
         """Get a specific task by ID."""
-        tasks = self.load_tasks(project_id)
-        for t in tasks:
-            if t.id == task_id:
-                return t
-        return None
+        record = self._task_map(project_id).get(task_id)
+        return Task.from_dict(record) if record else None
 
     def load_all_tasks(self) -> List[Task]:
-        """Load all tasks across all projects."""
+        """Load all tasks across all projects.
+
+        Task files not cached yet are read in parallel (see ``load_workers``);
+        the tasks are still returned in project order.
+        """
+        project_ids = list(self._project_map())
+        self._prefetch_task_maps(project_ids)
         all_tasks = []
-        projects = self.load_projects()
-        for project in projects:
-            tasks = self.load_tasks(project.id)
-            all_tasks.extend(tasks)
+        for project_id in project_ids:
+            all_tasks.extend(self.load_tasks(project_id))
         return all_tasks
 
+    # Archive operations
+    def archive_completed_tasks(self, older_than_days: int) -> int:
+        """Move tasks completed more than ``older_than_days`` days ago to the archive.
+
+        Shorthand for ``archive_tasks(archivable_tasks(older_than_days))``.
+
+        Args:
+            older_than_days: Age of the completion in days; 0 or less archives
+                nothing.
+
+        Returns:
+            Number of tasks archived.
+        """
+        return self.archive_tasks(self.archivable_tasks(older_than_days))
+
+    def archivable_tasks(self, older_than_days: int) -> Dict[str, Set[str]]:
+        """Find the tasks completed more than ``older_than_days`` days ago.
+
+        Only the task summaries are read, and nothing is changed, so this
+        can run on a worker thread.
+
+        Args:
+            older_than_days: Age of the completion in days; 0 or less finds
+                nothing.
+
+        Returns:
+            IDs of the tasks due for the archive, per project ID.
+        """
+        if older_than_days <= 0:
+            return {}
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        due = {}
+        for project in self.load_projects():
+            ids = {
+                t.id
+                for t in self.load_task_summaries(project.id)
+                if t.completed and t.completed_at and t.completed_at < cutoff
+            }
+            if ids:
+                due[project.id] = ids
+        return due
+
+    def archive_tasks(self, due: Dict[str, Set[str]]) -> int:
+        """Move tasks to the archive.
+
+        Only projects with due tasks load their full task file, and tasks
+        that are no longer completed are left alone. Tasks are archived
+        before they are deleted: an interrupted run leaves a copy in both
+        places, and the next run archives it again without duplicating it.
+        The tasks are deleted from the caches, so call this on the thread
+        that reads them.
+
+        Args:
+            due: IDs of the tasks to archive per project ID, as returned by
+                ``archivable_tasks``.
+
+        Returns:
+            Number of tasks archived.
+        """
+        archived = 0
+        for project_id, ids in due.items():
+            entries = [
+                {"project": project_id, "record": t.to_dict()}
+                for t in self.load_tasks(project_id)
+                if t.id in ids and t.completed
+            ]
+            if not entries:
+                continue
+            self._archive.add(entries)
+            self.delete_tasks(project_id, [e["record"]["id"] for e in entries])
+            archived += len(entries)
+        return archived
+
+    def search_archived_tasks(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Task]:
+        """Find archived tasks by title, description or notes (case-insensitive).
+
+        Args:
+            query: Text to look for.
+            limit: Maximum number of tasks to return.
+
+        Returns:
+            Matching tasks, most recently completed months first.
+        """
+        return [Task.from_dict(e["record"]) for e in self._archive.search(query, limit)]
+
+    def restore_archived_task(self, project_id: str, task_id: str) -> Optional[Task]:
+        """Move an archived task back into its project.
+
+        Returns:
+            The restored task, or None if it is not archived or its project
+            no longer exists.
+        """
+        if self.get_project(project_id) is None:
+            return None
+
+        def matches(entry: dict) -> bool:
+            return entry["project"] == project_id and entry["record"]["id"] == task_id
+
+        months = self._archive.project_months(project_id)
+        entry = next(
+            (
+                e
+                for month in months
+                for e in self._archive.read_month(month)
+                if matches(e)
+            ),
+            None,
+        )
+        if entry is None:
+            return None
+        task = Task.from_dict(entry["record"])
+        self.add_task(task)
+        self._archive.remove(matches, months)
+        return task
+
+    def archived_completions(self) -> Dict[str, int]:
+        """Count archived task completions per ISO day (from the rollup)."""
+        return self._archive.completions_by_day()
+
+    def _purge_archived_project(self, project_id: str) -> None:
+        """Drop a deleted project's archived tasks."""
+        months = self._archive.project_months(project_id)
+        if months:
+            self._archive.remove(lambda e: e["project"] == project_id, months)
+
     # Scratchpad operations (deprecated, kept for backwards compatibility)
     def load_scratchpad(self) -> str:
         """Load scratchpad content.
@@ -277,7 +2036,7 @@ class StorageManager:
 
     def _migrate_scratchpad_to_notes(self) -> None:
         """Migrate old scratchpad.md to new notes system."""
-        # Check if we've already migrated (notes.json has content)
+        # Check if we've already migrated (there are notes)
         notes = self.load_notes()
         if notes:
             return  # Already have notes, skip migration
@@ -314,84 +2073,585 @@ class StorageManager:
             self.add_note(default_note)
 
     # Note operations
+    @staticmethod
+    def _note_index_record(note: Note) -> dict:
+        """Build a note's index record: its metadata without the content."""
+        record = note.to_dict()
+        content = record.pop("content")
+        record["size"] = len(content.encode("utf-8"))
+        return record
+
+    def _note_from_record(self, record: dict) -> Note:
+        """Materialize a note from its index record and content file."""
+        return Note.from_dict({**record, "content": self._note_content(record["id"])})
+
+    def _migrate_notes_to_files(self) -> None:
+        """Split a legacy notes.json into per-note files plus an index.
+
+        notes.json is left in place (and no longer written) so older versions
+        still find the notes as they were at the time of the migration.
+        """
+        records = self._load_json(self.notes_file)
+        index = []
+        for record in records:
+            note = Note.from_dict(record)
+            atomic_write(self.get_note_file(note.id), note.content.encode("utf-8"))
+            index.append(self._note_index_record(note))
+        self._save_json(self.notes_index_file, index)
+
     def load_notes(self) -> List[Note]:
         """Load all notes."""
-        data = self._load_json(self.notes_file)
-        return [Note.from_dict(n) for n in data]
+        return [self._note_from_record(n) for n in self._note_map().values()]
 
     def save_notes(self, notes: List[Note]) -> None:
         """Save all notes."""
-        data = [n.to_dict() for n in notes]
-        self._save_json(self.notes_file, data)
+        with self._lock:
+            for note_id in set(self._note_map()) - {n.id for n in notes}:
+                self._drop_note_files(note_id)
+            self._notes = {n.id: self._note_index_record(n) for n in notes}
+            self._remember_signature(self.notes_index_file)
+            self._bases.pop(self.notes_index_file, None)
+            for note in notes:
+                self._note_contents[note.id] = note.content
+                self._rewrite_note_base(note.id)
+        self._persist_notes()
 
     def add_note(self, note: Note) -> None:
         """Add a new note."""
-        notes = self.load_notes()
-        notes.append(note)
-        self.save_notes(notes)
+        with self._lock:
+            self._note_map()[note.id] = self._note_index_record(note)
+            self._note_contents[note.id] = note.content
+            self._rewrite_note_base(note.id)
+        self._persist_notes()
 
     def update_note(self, note: Note) -> None:
-        """Update an existing note."""
+        """Update an existing note.
+
+        Only the note's own file is rewritten, and only if its content
+        changed; the index entry is updated with the new timestamp and size.
+        """
         # Update the updated_at timestamp
         note.updated_at = datetime.now().isoformat()
 
-        notes = self.load_notes()
-        for i, n in enumerate(notes):
-            if n.id == note.id:
-                notes[i] = note
-                break
-        self.save_notes(notes)
+        with self._lock:
+            notes = self._note_map()
+            if note.id not in notes:
+                return
+            if note.content != self._note_content(note.id):
+                self._note_contents[note.id] = note.content
+                self._rewrite_note_base(note.id)
+            notes[note.id] = self._note_index_record(note)
+        self._persist_notes()
+
+    def autosave_note(self, note: Note) -> None:
+        """Save an edited note by appending the changed span to its patch log.
+
+        The note's markdown file is left alone, so the cost of an autosave
+        scales with the size of the edit rather than the size of the note.
+        The log is folded into the markdown file once it grows past its
+        thresholds, and by ``fold_note`` / ``flush``. Inside a transaction
+        this falls back to ``update_note``.
+
+        Args:
+            note: The note with its edited content.
+        """
+        if self._txn_depth:
+            self.update_note(note)
+            return
+        note.updated_at = datetime.now().isoformat()
+
+        with self._lock:
+            notes = self._note_map()
+            if note.id not in notes:
+                return
+            old = self._note_content(note.id)
+            patch = notelog.diff(old, note.content)
+            size = notes[note.id].get("size", 0)
+            if patch is not None:
+                log = self._note_log(note.id)
+                if log.is_empty() and self._flusher.is_pending(
+                    self.get_note_file(note.id)
+                ):
+                    # The log's header must describe the base actually on disk
+                    self._write_note_now(note.id)
+                start, end, text = patch
+                log.append(old, [patch])
+                size += len(text.encode("utf-8")) - len(old[start:end].encode("utf-8"))
+                self._note_contents[note.id] = note.content
+                if log.needs_fold():
+                    self._rewrite_note_base(note.id)
+            notes[note.id] = {
+                **notes[note.id],
+                "title": note.title,
+                "updated_at": note.updated_at,
+                "size": size,
+            }
+        self._persist_notes()
+
+    def fold_note(self, note_id: str) -> None:
+        """Fold a note's patch log into its markdown file.
+
+        Called when the user leaves a note, so only the note being edited
+        ever carries a log.
+        """
+        with self._lock:
+            log = self._note_logs.get(note_id)
+            if log is not None and not log.is_empty():
+                self._rewrite_note_base(note_id)
+
+    def fold_notes(self) -> None:
+        """Fold every note's patch log into its markdown file."""
+        with self._lock:
+            for note_id in list(self._note_logs):
+                self.fold_note(note_id)
 
     def delete_note(self, note_id: str) -> None:
         """Delete a note."""
-        notes = self.load_notes()
-        notes = [n for n in notes if n.id != note_id]
-        self.save_notes(notes)
+        with self._lock:
+            self._note_map().pop(note_id, None)
+            self._drop_note_files(note_id)
+        self._persist_notes()
+
+    def _drop_note_files(self, note_id: str) -> None:
+        """Forget a deleted note's content and remove its files."""
+        self._note_contents.pop(note_id, None)
+        log = self._note_logs.pop(note_id, None)
+        if log is not None:
+            log.close()
+        self._remove_file(self.get_note_file(note_id))
+        self._remove_file(self.notes_dir / f"{note_id}{notelog.PATCH_SUFFIX}")
+        self._histories.pop(note_id, None)
+        self._remove_file(self.get_note_history_file(note_id))
 
     def get_note(self, note_id: str) -> Optional[Note]:
         """Get a specific note by ID."""
-        notes = self.load_notes()
-        for n in notes:
-            if n.id == note_id:
-                return n
-        return None
+        record = self._note_map().get(note_id)
+        return self._note_from_record(record) if record else None
+
+    # Note revision history
+    def get_note_history_file(self, note_id: str) -> Path:
+        """Get the file path for a note's revision history."""
+        return self.notes_dir / f"{note_id}{revisions.HISTORY_SUFFIX}"
+
+    def _note_history(self, note_id: str) -> revisions.NoteHistory:
+        """Get a note's revision history, loading it on first use."""
+        history = self._histories.get(note_id)
+        if history is None:
+            history = revisions.NoteHistory(
+                self._load_note_history(note_id),
+                snapshot_interval=self.history_snapshot_interval,
+                max_revisions=self.history_revisions,
+                max_bytes=self.history_max_bytes,
+            )
+            self._histories[note_id] = history
+        return history
+
+    def _load_note_history(self, note_id: str) -> List[dict]:
+        """Read the stored revision entries of a note."""
+        return revisions.load(self.get_note_history_file(note_id))
+
+    def _store_note_revision(
+        self, note_id: str, history: revisions.NoteHistory, entry: dict, cut: int
+    ) -> None:
+        """Persist a newly recorded revision entry.
+
+        Args:
+            note_id: ID of the note.
+            history: The note's history, already including the entry.
+            entry: The new entry.
+            cut: Number of old entries retention removed from the front.
+        """
+        history_file = self.get_note_history_file(note_id)
+        if cut:
+            revisions.rewrite(history_file, history.entries)
+        else:
+            revisions.append(history_file, entry)
+
+    def _record_note_revision(self, note_id: str, content: str) -> None:
+        """Add a revision to a note's history unless its content is unchanged.
+
+        History is written directly, outside any transaction: a revision of a
+        change that is later rolled back is still a valid earlier state.
+        """
+        if self.history_revisions <= 0:
+            return
+        with self._lock:
+            history = self._note_history(note_id)
+            entry = history.record(content, datetime.now().isoformat())
+            if entry is not None:
+                self._store_note_revision(note_id, history, entry, history.prune())
+
+    def list_note_revisions(self, note_id: str) -> List[NoteRevision]:
+        """List the stored revisions of a note, newest first."""
+        with self._lock:
+            return self._note_history(note_id).revisions()
+
+    def get_note_revision(self, note_id: str, number: int) -> Optional[str]:
+        """Rebuild the content of one revision of a note.
+
+        Args:
+            note_id: ID of the note.
+            number: Revision number, as listed by ``list_note_revisions``.
+
+        Returns:
+            The revision's content, or None if it is no longer stored.
+        """
+        with self._lock:
+            return self._note_history(note_id).content(number)
 
     # Snippet operations
     def load_snippets(self) -> List[Snippet]:
         """Load all snippets."""
-        data = self._load_json(self.snippets_file)
-        return [Snippet.from_dict(s) for s in data]
+        return [Snippet.from_dict(s) for s in self._snippet_map().values()]
 
     def save_snippets(self, snippets: List[Snippet]) -> None:
         """Save all snippets."""
-        data = [s.to_dict() for s in snippets]
-        self._save_json(self.snippets_file, data)
+        self._snippets = {s.id: s.to_dict() for s in snippets}
+        self._remember_signature(self.snippets_file)
+        self._bases.pop(self.snippets_file, None)
+        self._persist_snippets()
 
     def add_snippet(self, snippet: Snippet) -> None:
         """Add a new snippet."""
-        snippets = self.load_snippets()
-        snippets.append(snippet)
-        self.save_snippets(snippets)
+        self._snippet_map()[snippet.id] = snippet.to_dict()
+        self._persist_snippets()
 
     def update_snippet(self, snippet: Snippet) -> None:
         """Update an existing snippet."""
-        snippets = self.load_snippets()
-        for i, s in enumerate(snippets):
-            if s.id == snippet.id:
-                snippets[i] = snippet
-                break
-        self.save_snippets(snippets)
+        snippets = self._snippet_map()
+        if snippet.id in snippets:
+            snippets[snippet.id] = snippet.to_dict()
+        self._persist_snippets()
 
     def delete_snippet(self, snippet_id: str) -> None:
         """Delete a snippet."""
-        snippets = self.load_snippets()
-        snippets = [s for s in snippets if s.id != snippet_id]
-        self.save_snippets(snippets)
+        self._snippet_map().pop(snippet_id, None)
+        self._persist_snippets()
 
     def get_snippet(self, snippet_id: str) -> Optional[Snippet]:
         """Get a specific snippet by ID."""
-        snippets = self.load_snippets()
-        for s in snippets:
-            if s.id == snippet_id:
-                return s
+        record = self._snippet_map().get(snippet_id)
+        return Snippet.from_dict(record) if record else None
+
+    # Full-text search
+    def search(
+        self,
+        query: str,
+        kinds: Optional[Sequence[str]] = None,
+        limit: Optional[int] = 50,
+    ) -> List[SearchHit]:
+        """Search tasks, notes and snippets (see ``search.py``).
+
+        Sources changed since the last query are re-indexed first, so the
+        results reflect the cached data. Caches are indexed as loaded: a
+        file changed by another process is picked up once it is reloaded
+        (after ``external_changes`` reports it).
+
+        Args:
+            query: Words to look for; each matches whole words or prefixes.
+            kinds: Only return these kinds (``"task"``, ``"note"``,
+                ``"snippet"``).
+            limit: Maximum number of hits (None for all).
+
+        Returns:
+            Hits ranked best first. A task hit's ``parent`` is its project id.
+        """
+        index = self._ensure_search_index()
+        with self._lock:
+            return index.search(query, kinds, limit)
+
+    def refresh_search_index(self) -> int:
+        """Bring the search index up to date, checking the data files too.
+
+        Besides the sources we know changed, re-indexes those whose data
+        file no longer matches the signature it was indexed at (such as
+        everything changed while the app was closed). Called before a search
+        session starts and to build the index in the background after
+        startup.
+
+        Returns:
+            Number of documents in the index.
+        """
+        return len(self._ensure_search_index(check_files=True))
+
+    def save_search_index(self) -> bool:
+        """Save the search index, if it was loaded and changed.
+
+        Each source is saved with the signature of the data file it was
+        indexed from, so the next start re-indexes only what changed.
+
+        Returns:
+            True if the index was written.
+        """
+        if not self.PERSIST_SEARCH_INDEX or self._search is None:
+            return False
+        index = self._ensure_search_index()
+        with self._lock:
+            if self._txn_depth:
+                return False
+            for source, signature in index.sources.items():
+                if signature is None:
+                    index.sources[source] = self._search_signature(source)
+                    self._search_modified = True
+            if not self._search_modified:
+                return False
+            write_index(self.search_file, index)
+            self._search_modified = False
+        return True
+
+    def _ensure_search_index(self, check_files: bool = False) -> SearchIndex:
+        """Load the search index and re-index the sources that changed.
+
+        Each source is synced under the lock on its own, so a full build on
+        a background thread never blocks other storage calls for long.
+        """
+        saved = None
+        if self._search is None and self.PERSIST_SEARCH_INDEX:
+            # Read outside the lock: a large index takes a while to decode
+            saved = read_index(self.search_file)
+        with self._lock:
+            index = self._search
+            loaded = index is None
+            if loaded:
+                self._search = index = saved or SearchIndex()
+            with self._cached_reads():
+                sources = self._search_sources()
+            for source in set(index.sources) - set(sources):
+                index.drop_source(source)
+                self._search_modified = True
+            stale = {source for source in sources if source not in index.sources}
+            if loaded or check_files:
+                stale.update(self._stale_search_sources(index, sources, loaded))
+            self._search_dirty.intersection_update(sources)
+            stale.update(self._search_dirty)
+
+        for source in sources:
+            if source not in stale:
+                continue
+            with self._lock:
+                self._search_dirty.discard(source)
+                with self._cached_reads():
+                    documents, signature = self._search_documents(source)
+                if index.sync_source(source, documents):
+                    self._search_modified = True
+                index.sources[source] = signature
+        return index
+
+    @contextmanager
+    def _cached_reads(self) -> Iterator[None]:
+        """Serve this thread's reads from loaded caches without checking their files.
+
+        Reads on other threads, such as the UI's, which do not take the lock,
+        still check the files.
+        """
+        self._reads.trust_caches = True
+        try:
+            yield
+        finally:
+            self._reads.trust_caches = False
+
+    def _stale_search_sources(
+        self, index: SearchIndex, sources: List[str], loaded: bool
+    ) -> Set[str]:
+        """Find indexed sources whose data file no longer matches the index.
+
+        Args:
+            index: The search index.
+            sources: Sources that currently exist.
+            loaded: True right after the index was read from disk, when
+                journaled task changes are not covered by the signatures.
+        """
+        stale = set()
+        for source in sources:
+            signature = index.sources.get(source)
+            if signature is None and not loaded:
+                # Indexed from the cache while a write of ours was pending
+                signature = index.sources[source] = self._search_signature(source)
+                if signature is None:
+                    continue
+            _, project_id = split_source(source)
+            if (
+                signature is None
+                or signature != self._current_signature(self._search_file_of(source))
+                or (loaded and project_id in self._journal_dirty)
+            ):
+                stale.add(source)
+        return stale
+
+    def _search_sources(self) -> List[str]:
+        """Get the search sources that currently exist."""
+        return [
+            *(task_source(project.id) for project in self.load_projects()),
+            NOTES_SOURCE,
+            SNIPPETS_SOURCE,
+        ]
+
+    def _search_source_of(self, file_path: Path) -> Optional[str]:
+        """Get the search source backed by a record file, if any."""
+        if file_path == self.notes_index_file:
+            return NOTES_SOURCE
+        if file_path == self.snippets_file:
+            return SNIPPETS_SOURCE
+        if file_path.parent == self.data_dir and file_path != self.projects_file:
+            return task_source(file_path.stem)
         return None
+
+    def _search_file_of(self, source: str) -> Path:
+        """Get the data file a search source is indexed from."""
+        kind, project_id = split_source(source)
+        if kind == NOTES_SOURCE:
+            return self.notes_index_file
+        if kind == SNIPPETS_SOURCE:
+            return self.snippets_file
+        return self.get_task_file(project_id)
+
+    def _search_signature(self, source: str) -> Optional[Tuple[int, int]]:
+        """Get the signature of the file the cached data of a source matches.
+
+        None while a write of ours (or journaled task changes) makes the
+        cache newer than the file.
+        """
+        file_path = self._search_file_of(source)
+        _, project_id = split_source(source)
+        if (
+            file_path in self._txn_writes
+            or self._flusher.is_pending(file_path)
+            or project_id in self._journal_dirty
+        ):
+            return None
+        return self._signatures.get(file_path)
+
+    def _mark_search_changes(self, changes: Dict[str, Set[str]]) -> None:
+        """Mark the sources of data reported by ``external_changes`` dirty."""
+        if "tasks" in changes:
+            self._search_dirty.update(task_source(pid) for pid in changes["tasks"])
+        if "notes" in changes:
+            self._search_dirty.add(NOTES_SOURCE)
+        if "snippets" in changes:
+            self._search_dirty.add(SNIPPETS_SOURCE)
+
+    def _search_documents(
+        self, source: str
+    ) -> Tuple[List[Document], Optional[Tuple[int, int]]]:
+        """Build the search documents of a source from the current data.
+
+        Returns:
+            The documents, and the signature of the file they were read
+            from (see ``_search_signature``).
+        """
+        kind, project_id = split_source(source)
+        if kind == NOTES_SOURCE:
+            documents = [
+                Document(
+                    "note", n.id, n.title, "", {"title": n.title, "content": n.content}
+                )
+                for n in self.load_notes()
+            ]
+            return documents, self._search_signature(source)
+        if kind == SNIPPETS_SOURCE:
+            documents = [
+                Document(
+                    "snippet",
+                    s.id,
+                    s.name,
+                    "",
+                    {"name": s.name, "tags": " ".join(s.tags), "command": s.command},
+                )
+                for s in self.load_snippets()
+            ]
+            return documents, self._search_signature(source)
+        records, signature = self._search_task_records(project_id)
+        documents = [
+            Document(
+                "task",
+                r["id"],
+                r["title"],
+                project_id,
+                {
+                    "title": r["title"],
+                    "subtasks": "\n".join(st["title"] for st in r.get("subtasks", ())),
+                    "description": r.get("description", ""),
+                    "notes": r.get("notes", ""),
+                },
+            )
+            for r in records
+        ]
+        return documents, signature
+
+    def _search_task_records(
+        self, project_id: str
+    ) -> Tuple[List[dict], Optional[Tuple[int, int]]]:
+        """Get a project's full task records for indexing, and their signature.
+
+        A project whose tasks are not loaded (the list shows summaries) is
+        read from its file without being cached, so indexing does not keep
+        every description and note in memory.
+        """
+        if project_id in self._tasks or project_id in self._journal_dirty:
+            records = list(self._task_map(project_id).values())
+            return records, self._search_signature(task_source(project_id))
+        signature, _, records = self._read_records(self.get_task_file(project_id))
+        return list(records.values()), signature
+
+
+# Data directory layout versions (see migrations.py). Append new ones at the end.
+@migrations.register(1, "Create the data files and split notes.json into note files")
+def _create_data_files(storage: StorageManager) -> None:
+    """Layout 1: the data files every later version builds on."""
+    storage._create_data_files()
+
+
+@migrations.register(2, "Copy data from the legacy in-package data/ folder", data=True)
+def _import_legacy_data_dir(storage: StorageManager) -> None:
+    """Layout 2: data from before the platform data directory was used."""
+    storage._migrate_old_data_if_needed()
+
+
+@migrations.register(
+    3, "Turn scratchpad.md into a note, or add a default note", data=True
+)
+def _migrate_scratchpad(storage: StorageManager) -> None:
+    """Layout 3: the single scratchpad replaced by notes."""
+    storage._migrate_scratchpad_to_notes()
+
+
+def open_storage(
+    settings: Settings,
+    data_dir: Optional[Path] = None,
+    skip_migrations: bool = False,
+) -> StorageManager:
+    """Create the storage manager selected by the ``storage_backend`` setting.
+
+    The first time the SQLite backend is selected for a data directory that
+    still holds JSON data, its first migration copies the data into the
+    database.
+
+    Args:
+        settings: Application settings.
+        data_dir: Custom data directory path. If None, uses default XDG location.
+        skip_migrations: If True, skip data migrations (useful for demo mode).
+
+    Returns:
+        A StorageManager (or SQLite-backed subclass) for the data directory.
+    """
+    history = {
+        "history_revisions": settings.note_history_revisions,
+        "history_snapshot_interval": settings.note_history_snapshot_interval,
+        "history_max_bytes": settings.note_history_max_kb * 1024,
+    }
+    if settings.storage_backend == "sqlite":
+        from .sqlite_storage import SQLiteStorageManager
+
+        return SQLiteStorageManager(
+            data_dir=data_dir, skip_migrations=skip_migrations, **history
+        )
+
+    return StorageManager(
+        data_dir=data_dir,
+        skip_migrations=skip_migrations,
+        use_journal=settings.storage_journal,
+        flush_window=settings.storage_flush_window_ms / 1000,
+        compact_json=settings.storage_compact_json,
+        load_workers=settings.storage_load_workers,
+        **history,
+    )
@@ -0,0 +1,236 @@
+"""Watch the data directory for changes made by other processes.
+
+Several tuido instances (or scripts) may share one data directory. The
+``DataDirWatcher`` notices files changing underneath the app and reports
+them, in batches, to a callback; the storage layer then decides which of
+those changes are external (see ``StorageManager.external_changes``) and
+the app refreshes only the affected panels.
+
+On Linux the watcher uses inotify (through ctypes, so there is no extra
+dependency). Elsewhere, or if inotify is unavailable, it polls the
+directories and compares file signatures.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 1.0
+# Changes arriving within this window are reported as one batch
+DEFAULT_SETTLE = 0.2
+
+# inotify event masks (from <sys/inotify.h>)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_ignored(name: str) -> bool:
+    """Skip temporary files of atomic writes and the staging directory."""
+    return name.startswith(".") or name.endswith(".tmp")
+
+
+class _InotifyBackend:
+    """Blocking source of changed paths backed by Linux inotify."""
+
+    def __init__(self, directories: List[Path]):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        for directory in directories:
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), _IN_MASK
+            )
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(
+                    ctypes.get_errno(), f"inotify_add_watch failed: {directory}"
+                )
+            self._dirs[wd] = directory
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Wait up to ``timeout`` seconds and return the paths that changed."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = (
+                data[offset : offset + length]
+                .rstrip(b"\0")
+                .decode(sys.getfilesystemencoding(), "replace")
+            )
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is not None and name and not _is_ignored(name):
+                changed.add(directory / name)
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Source of changed paths that compares directory listings periodically."""
+
+    def __init__(self, directories: List[Path], interval: float):
+        self._directories = directories
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Get (st_mtime_ns, st_size) of every file in the watched directories."""
+        snapshot = {}
+        for directory in self._directories:
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if _is_ignored(entry.name):
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                except FileNotFoundError:
+                    continue
+        return snapshot
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Sleep for the poll interval (at most ``timeout``) and diff the listing."""
+        time.sleep(min(timeout, self._interval))
+        snapshot = self._scan()
+        previous = self._snapshot
+        self._snapshot = snapshot
+        return {
+            path
+            for path in previous.keys() | snapshot.keys()
+            if previous.get(path) != snapshot.get(path)
+        }
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class DataDirWatcher:
+    """Reports files changed in a set of directories to a callback.
+
+    The callback runs on the watcher's background thread with the set of
+    changed paths; GUI code should hand it over to its own thread (e.g.
+    with ``App.call_from_thread``). Only the directories themselves are
+    watched, not their subdirectories.
+    """
+
+    def __init__(
+        self,
+        directories: List[Path],
+        on_change: Callable[[Set[Path]], None],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        settle: float = DEFAULT_SETTLE,
+        use_inotify: bool = True,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            directories: Directories to watch (missing ones are skipped).
+            on_change: Called with each batch of changed paths.
+            poll_interval: Seconds between scans when polling.
+            settle: Seconds to keep collecting changes before reporting them.
+            use_inotify: Use inotify when available; False forces polling.
+        """
+        self.directories = [d for d in directories if d.is_dir()]
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.use_inotify = use_inotify
+        self.backend_name = ""
+        self._backend = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _make_backend(self):
+        """Create the inotify backend, falling back to polling."""
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                backend = _InotifyBackend(self.directories)
+                self.backend_name = "inotify"
+                return backend
+            except (OSError, AttributeError) as e:
+                logger.info("inotify unavailable, polling instead: %s", e)
+        self.backend_name = "polling"
+        return _PollingBackend(self.directories, self.poll_interval)
+
+    def start(self) -> None:
+        """Start watching on a background thread."""
+        if self._thread is not None:
+            return
+        self._backend = self._make_backend()
+        self._thread = threading.Thread(
+            target=self._run, name="tuido-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching.
+
+        Does not wait for the thread: it may be blocked handing a batch to
+        the UI thread that is calling this. The thread exits (and releases
+        its inotify descriptor) within half a second.
+        """
+        self._stop.set()
+
+    def _run(self) -> None:
+        """Background loop: collect a batch of changes and report it."""
+        try:
+            self._watch(self._backend)
+        finally:
+            self._backend.close()
+
+    def _watch(self, backend) -> None:
+        """Collect batches of changes until stopped."""
+        while not self._stop.is_set():
+            changed = backend.wait(0.5)
+            if not changed:
+                continue
+            # Let a burst of related writes (e.g. a staged commit) finish
+            deadline = time.monotonic() + self.settle
+            while not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                changed |= backend.wait(remaining)
+            if self._stop.is_set():
+                return
+            try:
+                self.on_change(changed)
+            except Exception:
+                logger.exception("Data directory change handler failed")
@@ -1,6 +1,17 @@
 """Custom Textual widgets for the todo application."""
 
-from .scratchpad import ScratchpadPanel
-from .snippets import SnippetsPanel
+from __future__ import annotations
+
+from importlib import import_module
 
 __all__ = ["ScratchpadPanel", "SnippetsPanel"]
+
+# Exported panels are imported on first access, so importing one widget
+# module (e.g. the dashboard) does not load the others
+_EXPORTS = {"ScratchpadPanel": ".scratchpad", "SnippetsPanel": ".snippets"}
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
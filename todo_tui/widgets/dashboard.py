@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from textual.app import ComposeResult
 from textual.color import Gradient
@@ -77,6 +77,7 @@ class Dashboard(Container):
     def __init__(self, id: str = "dashboard", show_weather: bool = True):
         super().__init__(id=id)
         self.tasks: List[Task] = []
+        self.archived: Dict[str, int] = {}
         self.show_weather = show_weather
 
     def compose(self) -> ComposeResult:
@@ -111,12 +112,22 @@ class Dashboard(Container):
         # Fallback to first theme if not found
         return ALL_THEMES[0] if ALL_THEMES else None
 
-    def update_metrics(self, tasks: List[Task]) -> None:
-        """Update dashboard metrics with current tasks."""
+    def update_metrics(
+        self, tasks: List[Task], archived: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Update dashboard metrics with current tasks.
+
+        Args:
+            tasks: Tasks in the project files.
+            archived: Completions of archived tasks per ISO day (from the
+                archive rollup), counted as completed tasks.
+        """
         self.tasks = tasks
+        self.archived = archived or {}
+        archived_total = sum(self.archived.values())
 
-        total = len(tasks)
-        completed = sum(1 for t in tasks if t.completed)
+        total = len(tasks) + archived_total
+        completed = sum(1 for t in tasks if t.completed) + archived_total
         rate = int((completed / total * 100)) if total > 0 else 0
 
         # Calculate today's completions
@@ -127,7 +138,7 @@ class Dashboard(Container):
             if t.completed
             and t.completed_at
             and datetime.fromisoformat(t.completed_at).date() == today
-        )
+        ) + self.archived.get(today.isoformat(), 0)
 
         # Update quotes card
         quotes_card = self.query_one("#quotes-quadrant", QuotesCard)
@@ -233,7 +244,9 @@ class Dashboard(Container):
         data = []
         for i in range(13, -1, -1):  # 14 days ago to today
             day = today - timedelta(days=i)
-            count = completions_by_day.get(day, 0)
+            count = completions_by_day.get(day, 0) + self.archived.get(
+                day.isoformat(), 0
+            )
             data.append(float(count))
 
         # Return at least some data for display
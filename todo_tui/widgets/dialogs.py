@@ -1,8 +1,13 @@
-"""Dialog widgets for user interactions."""
+"""Dialog widgets for user interactions.
 
-import os
-import webbrowser
-from typing import List, Optional, Tuple
+The first-run wizard lives in ``onboarding`` and the cloud sync dialogs in
+``sync_dialogs``; the app imports those only when it shows them.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
 
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical
@@ -13,7 +18,6 @@ from textual.widgets import (
     Label,
     ListItem,
     ListView,
-    LoadingIndicator,
     Select,
     Static,
     Switch,
@@ -22,10 +26,9 @@ from textual.widgets import (
     TextArea,
 )
 
-from ..cloud_sync import AuthorizationResult, CloudSyncClient, DeviceCodeResponse
-from ..encryption import delete_device_credentials, has_device_token, has_encryption_password
 from ..icons import Icons
-from ..models import Note, Project, Settings, Snippet, Task
+from ..models import Note, NoteRevision, Project, Settings, Snippet, Task
+from ..search import SearchHit
 
 
 class AddTaskDialog(ModalScreen):
@@ -570,139 +573,6 @@ class ConfirmDialog(ModalScreen):
             event.prevent_default()
 
 
-class SyncDirectionDialog(ModalScreen):
-    """Modal dialog for choosing cloud sync direction."""
-
-    DEFAULT_CSS = """
-    SyncDirectionDialog {
-        align: center middle;
-    }
-
-    SyncDirectionDialog > #dialog-container {
-        width: 60;
-        height: 20;
-        border: round $primary;
-        padding: 1;
-    }
-
-    #sync-info {
-        padding: 1 0;
-        background: $panel;
-        margin-bottom: 1;
-    }
-
-    #dialog-buttons {
-        height: auto;
-        layout: horizontal;
-        align: center middle;
-    }
-    """
-
-    def __init__(self, cloud_timestamp: Optional[str], local_timestamp: Optional[str]):
-        """Initialize sync direction dialog.
-
-        Args:
-            cloud_timestamp: Last cloud sync timestamp (ISO format)
-            local_timestamp: Last local sync timestamp (ISO format)
-        """
-        super().__init__()
-        self.cloud_timestamp = cloud_timestamp or "Never"
-        self.local_timestamp = local_timestamp or "Never"
-
-    def compose(self) -> ComposeResult:
-        """Compose the sync direction dialog."""
-        with Container(id="dialog-container"):
-            yield Label(f"{Icons.CLOUD}  Choose Sync Direction", classes="header")
-            yield Label(
-                "Both cloud and local data exist. Choose which direction to sync:"
-            )
-            with Container(id="sync-info"):
-                yield Label(f"☁️  Cloud last synced: {self.cloud_timestamp}")
-                yield Label(f"💾 Local last synced: {self.local_timestamp}")
-            with Horizontal(id="dialog-buttons"):
-                yield Button("Cancel", id="btn-cancel", variant="default")
-                yield Button("⬇ Download", id="btn-download", variant="primary")
-                yield Button("⬆ Upload", id="btn-upload", variant="success")
-
-    def on_button_pressed(self, event: Button.Pressed) -> None:
-        """Handle button press."""
-        if event.button.id == "btn-cancel":
-            self.dismiss(None)
-        elif event.button.id == "btn-download":
-            self.dismiss("download")
-        elif event.button.id == "btn-upload":
-            self.dismiss("upload")
-
-    def on_key(self, event) -> None:
-        """Handle keyboard shortcuts."""
-        if event.key == "escape":
-            self.dismiss(None)
-            event.prevent_default()
-
-
-class StartupSyncDialog(ModalScreen):
-    """Modal dialog shown on startup asking if user wants to download from cloud."""
-
-    DEFAULT_CSS = """
-    StartupSyncDialog {
-        align: center middle;
-    }
-
-    StartupSyncDialog > #dialog-container {
-        width: 60;
-        height: 18;
-        border: round $primary;
-        padding: 1;
-    }
-
-    #sync-info {
-        padding: 1 0;
-        background: $panel;
-        margin-bottom: 1;
-    }
-
-    #dialog-buttons {
-        height: auto;
-        layout: horizontal;
-        align: center middle;
-    }
-    """
-
-    def __init__(self, cloud_timestamp: Optional[str]):
-        """Initialize startup sync dialog.
-
-        Args:
-            cloud_timestamp: Last cloud sync timestamp (ISO format)
-        """
-        super().__init__()
-        self.cloud_timestamp = cloud_timestamp or "Unknown"
-
-    def compose(self) -> ComposeResult:
-        """Compose the startup sync dialog."""
-        with Container(id="dialog-container"):
-            yield Label(f"{Icons.CLOUD}  Cloud Data Found", classes="header")
-            yield Label("Cloud sync data is available. Do you want to download it?")
-            with Container(id="sync-info"):
-                yield Label(f"☁️  Last synced: {self.cloud_timestamp}")
-                yield Label("⚠️  This will replace your local data")
-            with Horizontal(id="dialog-buttons"):
-                yield Button("Skip", id="btn-skip", variant="default")
-                yield Button("⬇ Download", id="btn-download", variant="primary")
-
-    def on_button_pressed(self, event: Button.Pressed) -> None:
-        """Handle button press."""
-        if event.button.id == "btn-skip":
-            self.dismiss(False)
-        elif event.button.id == "btn-download":
-            self.dismiss(True)
-
-    def on_key(self, event) -> None:
-        """Handle keyboard shortcuts."""
-        if event.key == "escape":
-            self.dismiss(False)
-            event.prevent_default()
-
-
 class MoveTaskDialog(ModalScreen):
     """Modal dialog for moving a task to a different project."""
 
@@ -789,350 +659,6 @@ class MoveTaskDialog(ModalScreen):
             event.prevent_default()
 
 
-def _detect_terminal() -> Tuple[str, str]:
-    """Detect the current terminal emulator and return setup instructions.
-
-    Returns:
-        Tuple of (terminal_name, configuration_instructions)
-    """
-    term_program = os.environ.get("TERM_PROGRAM", "").lower()
-    ghostty_dir = os.environ.get("GHOSTTY_RESOURCES_DIR", "")
-
-    if ghostty_dir:
-        return (
-            "Ghostty",
-            "Config file: ~/.config/ghostty/config\n"
-            "Add: font-family = JetBrainsMono Nerd Font",
-        )
-    elif term_program == "vscode":
-        return (
-            "VS Code Terminal",
-            "Settings → Search 'terminal.integrated.fontFamily'\n"
-            "Set to: JetBrainsMono Nerd Font",
-        )
-    elif term_program == "iterm.app":
-        return (
-            "iTerm2",
-            "Preferences → Profiles → Text → Font\nSelect: JetBrainsMono Nerd Font",
-        )
-    elif term_program == "apple_terminal":
-        return (
-            "macOS Terminal",
-            "Preferences → Profiles → Text → Change Font\n"
-            "Select: JetBrainsMono Nerd Font",
-        )
-    elif term_program == "hyper":
-        return (
-            "Hyper",
-            "Config file: ~/.hyper.js\nSet fontFamily: 'JetBrainsMono Nerd Font'",
-        )
-    elif term_program == "alacritty":
-        return (
-            "Alacritty",
-            "Config file: ~/.config/alacritty/alacritty.yml\n"
-            "Set font.normal.family: JetBrainsMono Nerd Font",
-        )
-    elif term_program == "wezterm":
-        return (
-            "WezTerm",
-            "Config file: ~/.wezterm.lua\n"
-            "Set config.font = wezterm.font('JetBrainsMono Nerd Font')",
-        )
-    elif term_program == "kitty":
-        return (
-            "Kitty",
-            "Config file: ~/.config/kitty/kitty.conf\n"
-            "Set font_family JetBrainsMono Nerd Font",
-        )
-    else:
-        return (
-            "Unknown Terminal",
-            "Configure your terminal's font settings to use:\nJetBrainsMono Nerd Font",
-        )
-
-
-class OnboardingDialog(ModalScreen):
-    """Modal dialog for first-run onboarding and setup wizard."""
-
-    DEFAULT_CSS = """
-    OnboardingDialog {
-        align: center middle;
-    }
-
-    OnboardingDialog > #dialog-container {
-        width: 70;
-        height: auto;
-        border: round $primary;
-        padding: 1 2;
-    }
-
-    OnboardingDialog .section {
-        margin: 1 0;
-        padding: 1;
-        border: round $accent;
-        height: auto;
-    }
-
-    OnboardingDialog .section-header {
-        text-style: bold;
-        color: $accent;
-        margin-bottom: 1;
-    }
-
-    OnboardingDialog .section-description {
-        color: $text-muted;
-    }
-
-    OnboardingDialog .instructions {
-        color: $text;
-        margin: 1 0;
-    }
-
-    OnboardingDialog .link-row {
-        height: auto;
-    }
-
-    OnboardingDialog .setting-row {
-        height: auto;
-    }
-
-    OnboardingDialog .setting-hint {
-        color: $text-muted;
-        text-style: italic;
-        margin-left: 2;
-    }
-
-    OnboardingDialog #dialog-buttons {
-        height: auto;
-        layout: horizontal;
-        align: center middle;
-        margin-top: 1;
-    }
-
-    OnboardingDialog .welcome-header {
-        text-style: bold;
-        color: $primary;
-        text-align: center;
-        margin-bottom: 1;
-    }
-
-    OnboardingDialog .font-test-box {
-        background: $panel;
-        padding: 1;
-        margin: 1 0;
-        border: round $primary;
-        height: auto;
-    }
-
-    OnboardingDialog .font-test-icons {
-        text-align: center;
-        text-style: bold;
-        color: $accent;
-    }
-
-    OnboardingDialog .terminal-detected {
-        color: $success;
-        text-style: bold;
-    }
-
-    OnboardingDialog .font-status-good {
-        color: $success;
-        text-style: bold;
-    }
-
-    OnboardingDialog .font-status-bad {
-        color: $warning;
-    }
-
-    OnboardingDialog #font-help-section {
-        display: none;
-        height: auto;
-    }
-
-    OnboardingDialog #font-help-section.visible {
-        display: block;
-    }
-
-    OnboardingDialog TabbedContent {
-        height: auto;
-    }
-
-    OnboardingDialog TabPane {
-        padding: 1;
-        height: auto;
-    }
-    """
-
-    def __init__(self, current_settings: Settings):
-        super().__init__()
-        self.settings = current_settings
-        self.terminal_name, self.terminal_instructions = _detect_terminal()
-
-    def compose(self) -> ComposeResult:
-        """Compose the onboarding dialog."""
-        with Container(id="dialog-container"):
-            yield Label(
-                f"{Icons.STAR} Welcome to Tuido!",
-                classes="welcome-header",
-            )
-            yield Static(
-                "Let's get you set up for the best experience.",
-                classes="section-description",
-            )
-
-            with TabbedContent(initial="font-tab"):
-                # Font Setup Tab
-                with TabPane(f"{Icons.PALETTE} Font Setup", id="font-tab"):
-                    # Show detected terminal
-                    yield Static(
-                        f"{Icons.CHECK} Detected: {self.terminal_name}",
-                        classes="terminal-detected",
-                    )
-
-                    yield Static(
-                        "Tuido uses Nerd Font icons for a beautiful interface. "
-                        "Do these icons display correctly?",
-                        classes="section-description",
-                    )
-
-                    # Font test box with sample icons
-                    with Container(classes="font-test-box"):
-                        yield Static(
-                            f"  {Icons.CHECK}  {Icons.STAR}  {Icons.FOLDER}  {Icons.CLOCK}  {Icons.CLOUD_SUN}  ",
-                            classes="font-test-icons",
-                        )
-                        yield Static(
-                            "You should see: checkmark, star, folder, clock, sun/cloud",
-                            classes="setting-hint",
-                        )
-
-                    # Font status toggle
-                    with Horizontal(classes="setting-row"):
-                        yield Label("Icons display correctly:")
-                        yield Switch(value=True, id="font-working-switch")
-                        yield Static(
-                            "Yes, I see the icons!",
-                            id="font-status-label",
-                            classes="font-status-good",
-                        )
-
-                    # Show configuration instructions (hidden by default if icons work)
-                    with Container(id="font-help-section"):
-                        with Horizontal(classes="link-row"):
-                            yield Button(
-                                f"{Icons.DOWNLOAD} Download JetBrains Mono Nerd Font",
-                                id="btn-download-font",
-                                variant="primary",
-                            )
-                        yield Static(
-                            f"For {self.terminal_name}:\n{self.terminal_instructions}",
-                            classes="instructions",
-                        )
-                        yield Static(
-                            "After configuring, restart your terminal completely.",
-                            classes="setting-hint",
-                        )
-
-                # Weather Setup Tab
-                with TabPane(f"{Icons.CLOUD_SUN} Weather (Optional)", id="weather-tab"):
-                    yield Static(
-                        "The weather widget displays current conditions and forecast. "
-                        "Just enter your location below!",
-                        classes="section-description",
-                    )
-                    yield Label("Location:")
-                    yield Input(
-                        value=self.settings.weather_location,
-                        placeholder="e.g., San Francisco  or  London,UK",
-                        id="weather-location-input",
-                    )
-                    with Horizontal(classes="setting-row"):
-                        yield Label("Temperature Unit:")
-                        yield Switch(
-                            value=self.settings.weather_use_fahrenheit,
-                            id="weather-unit-switch",
-                        )
-                        yield Static(
-                            "Fahrenheit (°F)"
-                            if self.settings.weather_use_fahrenheit
-                            else "Celsius (°C)",
-                            id="weather-unit-label",
-                            classes="setting-hint",
-                        )
-                    with Horizontal(classes="setting-row"):
-                        yield Label("Enable Weather Widget:")
-                        yield Switch(
-                            value=self.settings.show_weather_widget,
-                            id="show-weather-switch",
-                        )
-                        yield Static(
-                            "Disable to skip weather setup",
-                            classes="setting-hint",
-                        )
-
-            with Horizontal(id="dialog-buttons"):
-                yield Button("Skip for Now", id="btn-skip", variant="default")
-                yield Button(
-                    f"{Icons.CHECK} Get Started",
-                    id="btn-save",
-                    variant="success",
-                )
-
-    def on_switch_changed(self, event: Switch.Changed) -> None:
-        """Handle switch changes for live updates."""
-        if event.switch.id == "font-working-switch":
-            # Toggle visibility of font help section
-            font_help = self.query_one("#font-help-section", Container)
-            font_status = self.query_one("#font-status-label", Static)
-            if event.value:
-                # Icons work - hide help section
-                font_help.remove_class("visible")
-                font_status.update("Yes, I see the icons!")
-                font_status.remove_class("font-status-bad")
-                font_status.add_class("font-status-good")
-            else:
-                # Icons don't work - show help section
-                font_help.add_class("visible")
-                font_status.update("No, I see rectangles □")
-                font_status.remove_class("font-status-good")
-                font_status.add_class("font-status-bad")
-        elif event.switch.id == "weather-unit-switch":
-            label = self.query_one("#weather-unit-label", Static)
-            label.update("Fahrenheit (°F)" if event.value else "Celsius (°C)")
-
-    def on_button_pressed(self, event: Button.Pressed) -> None:
-        """Handle button press."""
-        if event.button.id == "btn-download-font":
-            webbrowser.open("https://www.nerdfonts.com/font-downloads")
-        elif event.button.id == "btn-skip":
-            # Mark onboarding complete but don't save weather settings
-            self.settings.onboarding_complete = True
-            self.dismiss(self.settings)
-        elif event.button.id == "btn-save":
-            # Save all settings
-            weather_location = self.query_one(
-                "#weather-location-input", Input
-            ).value.strip()
-            weather_use_fahrenheit = self.query_one(
-                "#weather-unit-switch", Switch
-            ).value
-            show_weather = self.query_one("#show-weather-switch", Switch).value
-
-            self.settings.weather_location = weather_location
-            self.settings.weather_use_fahrenheit = weather_use_fahrenheit
-            self.settings.show_weather_widget = show_weather
-            self.settings.onboarding_complete = True
-            self.dismiss(self.settings)
-
-    def on_key(self, event) -> None:
-        """Handle keyboard shortcuts."""
-        if event.key == "escape":
-            # Treat escape as skip
-            self.settings.onboarding_complete = True
-            self.dismiss(self.settings)
-            event.prevent_default()
-
-
 class SettingsDialog(ModalScreen):
     """Modal dialog for application settings with tabbed layout."""
 
@@ -1318,6 +844,8 @@ class SettingsDialog(ModalScreen):
                         )
 
                     # Device Link Status
+                    from ..encryption import has_device_token, has_encryption_password
+
                     is_linked = has_device_token()
                     if is_linked:
                         yield Static(
@@ -1650,10 +1178,20 @@ class HelpDialog(ModalScreen):
                 "[bold yellow]?[/] - Show this help", classes="help-item", markup=True
             )
             yield Static(
-                "[bold yellow]q[/] - Quit application", classes="help-item", markup=True
+                "[bold yellow]F4[/] - Search and restore archived tasks",
+                classes="help-item",
+                markup=True,
             )
-
-            # Task shortcuts
+            yield Static(
+                "[bold yellow]F5[/] - Search tasks, notes and snippets",
+                classes="help-item",
+                markup=True,
+            )
+            yield Static(
+                "[bold yellow]q[/] - Quit application", classes="help-item", markup=True
+            )
+
+            # Task shortcuts
             yield Static("Tasks (when task selected)", classes="help-title")
             yield Static(
                 "[bold yellow]Enter[/] - Edit task", classes="help-item", markup=True
@@ -1866,24 +1404,24 @@ class RenameNoteDialog(ModalScreen):
             event.prevent_default()
 
 
-class AddSnippetDialog(ModalScreen):
-    """Modal dialog for adding a new code snippet."""
+class NoteHistoryDialog(ModalScreen):
+    """Modal dialog for picking a revision of a note to restore."""
 
     DEFAULT_CSS = """
-    AddSnippetDialog {
+    NoteHistoryDialog {
         align: center middle;
     }
 
     #dialog-container {
-        width: 70;
+        width: 60;
         height: auto;
         border: round $primary;
         padding: 1;
     }
 
-    #snippet-command-input {
-        height: 8;
-        min-height: 8;
+    #note-revision-list {
+        height: auto;
+        max-height: 15;
     }
 
     #dialog-buttons {
@@ -1893,46 +1431,54 @@ class AddSnippetDialog(ModalScreen):
     }
     """
 
+    def __init__(self, note: Note, revisions: List[NoteRevision]):
+        super().__init__()
+        self.note = note
+        self.revisions = revisions
+        self.selected_number: Optional[int] = None
+
     def compose(self) -> ComposeResult:
-        """Compose the add snippet dialog."""
+        """Compose the note history dialog."""
         with Container(id="dialog-container"):
-            yield Label(f"{Icons.PLUS} Add New Snippet", classes="header")
-            yield Label("Name:")
-            yield Input(placeholder="e.g., SSH to staging", id="snippet-name-input")
-            yield Label("Command/Code:")
-            yield TextArea(id="snippet-command-input")
-            yield Label("Tags (comma-separated, optional):")
-            yield Input(
-                placeholder="e.g., docker, ssh, deploy", id="snippet-tags-input"
-            )
+            yield Label(f"{Icons.CLOCK} Note History", classes="header")
+            yield Label(f"Restore a revision of: {self.note.title}")
+            yield ListView(id="note-revision-list")
             with Horizontal(id="dialog-buttons"):
                 yield Button("Cancel", id="btn-cancel", variant="default")
-                yield Button("Add Snippet", id="btn-add", variant="success")
+                yield Button("Restore", id="btn-restore", variant="success")
 
     def on_mount(self) -> None:
-        """Focus the name input field when dialog opens."""
-        self.query_one("#snippet-name-input", Input).focus()
+        """Populate the revision list after mounting."""
+        revision_list = self.query_one("#note-revision-list", ListView)
+        for revision in self.revisions:
+            try:
+                timestamp = datetime.fromisoformat(revision.created_at).strftime(
+                    "%b %d, %H:%M:%S"
+                )
+            except ValueError:
+                timestamp = "Unknown"
+            revision_list.append(
+                ListItem(
+                    Static(f"#{revision.number}  {timestamp}  ({revision.size:,} bytes)")
+                )
+            )
+        revision_list.focus()
+
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        """Handle revision selection."""
+        if event.list_view.id != "note-revision-list":
+            return
+
+        index = event.list_view.index
+        if index is not None and 0 <= index < len(self.revisions):
+            self.selected_number = self.revisions[index].number
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button press."""
         if event.button.id == "btn-cancel":
             self.dismiss(None)
-        elif event.button.id == "btn-add":
-            name = self.query_one("#snippet-name-input", Input).value.strip()
-            command = self.query_one("#snippet-command-input", TextArea).text.strip()
-            tags_str = self.query_one("#snippet-tags-input", Input).value.strip()
-
-            # Validate required fields
-            if not name or not command:
-                self.app.notify("Name and command are required", severity="warning")
-                return
-
-            # Parse tags from comma-separated string
-            tags = [t.strip() for t in tags_str.split(",") if t.strip()]
-
-            # Create new snippet
-            snippet = Snippet(name=name, command=command, tags=tags)
-            self.dismiss(snippet)
+        elif event.button.id == "btn-restore":
+            self.dismiss(self.selected_number)
 
     def on_key(self, event) -> None:
         """Handle keyboard shortcuts."""
@@ -1941,24 +1487,24 @@ class AddSnippetDialog(ModalScreen):
             event.prevent_default()
 
 
-class EditSnippetDialog(ModalScreen):
-    """Modal dialog for editing an existing code snippet."""
+class ArchiveDialog(ModalScreen):
+    """Modal dialog for searching archived tasks and picking one to restore."""
 
     DEFAULT_CSS = """
-    EditSnippetDialog {
+    ArchiveDialog {
         align: center middle;
     }
 
     #dialog-container {
-        width: 70;
+        width: 80;
         height: auto;
         border: round $primary;
         padding: 1;
     }
 
-    #snippet-command-input {
-        height: 8;
-        min-height: 8;
+    #archive-results {
+        height: auto;
+        max-height: 15;
     }
 
     #dialog-buttons {
@@ -1968,58 +1514,70 @@ class EditSnippetDialog(ModalScreen):
     }
     """
 
-    def __init__(self, snippet: Snippet):
+    # Results shown per search
+    LIMIT = 50
+
+    def __init__(
+        self,
+        search: Callable[[str, int], List[Task]],
+        project_names: Dict[str, str],
+    ):
         super().__init__()
-        self.snippet = snippet
+        self.search = search
+        self.project_names = project_names
+        self.results: List[Task] = []
+        self.selected_task: Optional[Task] = None
 
     def compose(self) -> ComposeResult:
-        """Compose the edit snippet dialog."""
+        """Compose the archive dialog."""
         with Container(id="dialog-container"):
-            yield Label(f"{Icons.PENCIL} Edit Snippet", classes="header")
-            yield Label("Name:")
-            yield Input(
-                value=self.snippet.name,
-                placeholder="e.g., SSH to staging",
-                id="snippet-name-input",
-            )
-            yield Label("Command/Code:")
-            yield TextArea(text=self.snippet.command, id="snippet-command-input")
-            yield Label("Tags (comma-separated, optional):")
-            yield Input(
-                value=", ".join(self.snippet.tags) if self.snippet.tags else "",
-                placeholder="e.g., docker, ssh, deploy",
-                id="snippet-tags-input",
-            )
+            yield Label(f"{Icons.SEARCH} Archived Tasks", classes="header")
+            yield Input(placeholder="Search archived tasks (Enter)", id="archive-query")
+            yield ListView(id="archive-results")
             with Horizontal(id="dialog-buttons"):
-                yield Button("Cancel", id="btn-cancel", variant="default")
-                yield Button("Save", id="btn-save", variant="success")
+                yield Button("Close", id="btn-cancel", variant="default")
+                yield Button("Restore", id="btn-restore", variant="success")
 
     def on_mount(self) -> None:
-        """Focus the name input field when dialog opens."""
-        self.query_one("#snippet-name-input", Input).focus()
+        """Show the most recently archived tasks."""
+        self._show_results("")
+        self.query_one("#archive-query", Input).focus()
+
+    def _show_results(self, query: str) -> None:
+        """Run a search and list its results."""
+        self.results = self.search(query, self.LIMIT)
+        self.selected_task = self.results[0] if self.results else None
+        result_list = self.query_one("#archive-results", ListView)
+        result_list.clear()
+        for task in self.results:
+            try:
+                completed = datetime.fromisoformat(task.completed_at).strftime("%b %d, %Y")
+            except (TypeError, ValueError):
+                completed = "Unknown"
+            project = self.project_names.get(task.project_id, "?")
+            result_list.append(
+                ListItem(Static(f"{task.title}  [dim]{project} - {completed}[/]"))
+            )
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Search when Enter is pressed in the query field."""
+        if event.input.id == "archive-query":
+            self._show_results(event.value.strip())
+
+    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+        """Track the highlighted result."""
+        if event.list_view.id != "archive-results":
+            return
+        index = event.list_view.index
+        if index is not None and 0 <= index < len(self.results):
+            self.selected_task = self.results[index]
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button press."""
         if event.button.id == "btn-cancel":
             self.dismiss(None)
-        elif event.button.id == "btn-save":
-            name = self.query_one("#snippet-name-input", Input).value.strip()
-            command = self.query_one("#snippet-command-input", TextArea).text.strip()
-            tags_str = self.query_one("#snippet-tags-input", Input).value.strip()
-
-            # Validate required fields
-            if not name or not command:
-                self.app.notify("Name and command are required", severity="warning")
-                return
-
-            # Parse tags from comma-separated string
-            tags = [t.strip() for t in tags_str.split(",") if t.strip()]
-
-            # Update snippet
-            self.snippet.name = name
-            self.snippet.command = command
-            self.snippet.tags = tags
-            self.dismiss(self.snippet)
+        elif event.button.id == "btn-restore":
+            self.dismiss(self.selected_task)
 
     def on_key(self, event) -> None:
         """Handle keyboard shortcuts."""
@@ -2028,343 +1586,267 @@ class EditSnippetDialog(ModalScreen):
             event.prevent_default()
 
 
-class DeviceLinkDialog(ModalScreen):
-    """Modal dialog for device authorization flow.
-
-    This dialog handles the device linking process:
-    1. Requests a device code from the server
-    2. Displays the user code and verification URL
-    3. Polls for authorization while user confirms on the web
-    4. Saves credentials on success
-    """
+class SearchDialog(ModalScreen):
+    """Modal dialog for searching tasks, notes and snippets as you type."""
 
     DEFAULT_CSS = """
-    DeviceLinkDialog {
+    SearchDialog {
         align: center middle;
     }
 
-    DeviceLinkDialog > #dialog-container {
-        width: 60;
+    #dialog-container {
+        width: 80;
         height: auto;
         border: round $primary;
-        padding: 1 2;
+        padding: 1;
     }
 
-    DeviceLinkDialog .header {
-        text-style: bold;
-        color: $primary;
-        text-align: center;
-        margin-bottom: 1;
+    #search-results {
+        height: auto;
+        max-height: 15;
     }
 
-    DeviceLinkDialog .section-description {
+    #search-status {
         color: $text-muted;
-        text-align: center;
     }
+    """
 
-    DeviceLinkDialog #code-display {
-        background: $panel;
-        padding: 1 2;
-        margin: 1 0;
-        text-align: center;
-        border: round $accent;
-        height: auto;
-    }
+    # Results shown per query
+    LIMIT = 50
 
-    DeviceLinkDialog #user-code {
-        text-style: bold;
-        color: $accent;
-        text-align: center;
-    }
+    KIND_ICONS = {"task": Icons.CHECK_SQUARE, "note": Icons.FILE, "snippet": Icons.CODE}
 
-    DeviceLinkDialog #verification-url {
-        color: $primary;
-        text-align: center;
-        margin-top: 1;
-    }
+    def __init__(
+        self,
+        search: Callable[[str, int], List[SearchHit]],
+        project_names: Dict[str, str],
+    ):
+        super().__init__()
+        self.search = search
+        self.project_names = project_names
+        self.results: List[SearchHit] = []
 
-    DeviceLinkDialog #status-container {
-        height: auto;
-        margin: 1 0;
-    }
+    def compose(self) -> ComposeResult:
+        """Compose the search dialog."""
+        with Container(id="dialog-container"):
+            yield Label(f"{Icons.SEARCH} Search Everything", classes="header")
+            yield Input(placeholder="Search tasks, notes and snippets", id="search-query")
+            yield ListView(id="search-results")
+            yield Static("", id="search-status")
 
-    DeviceLinkDialog #status-text {
-        text-align: center;
-    }
+    def on_mount(self) -> None:
+        """Focus the query field."""
+        self.query_one("#search-query", Input).focus()
+
+    def _show_results(self, query: str) -> None:
+        """Run a search and list its results."""
+        self.results = self.search(query, self.LIMIT) if query else []
+        result_list = self.query_one("#search-results", ListView)
+        result_list.clear()
+        for hit in self.results:
+            icon = self.KIND_ICONS.get(hit.kind, Icons.FILE)
+            where = self.project_names.get(hit.parent, "?") if hit.kind == "task" else hit.kind
+            result_list.append(ListItem(Static(f"{icon} {hit.title}  [dim]{where}[/]")))
+        if self.results:
+            result_list.index = 0
+        status = self.query_one("#search-status", Static)
+        if not query:
+            status.update("Type to search; Enter opens the selected result")
+        else:
+            status.update(f"{len(self.results)} result(s)")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Search as the query is typed."""
+        if event.input.id == "search-query":
+            self._show_results(event.value.strip())
 
-    DeviceLinkDialog .status-pending {
-        color: $warning;
-    }
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Open the highlighted result."""
+        if event.input.id == "search-query":
+            self._open(self.query_one("#search-results", ListView).index)
 
-    DeviceLinkDialog .status-success {
-        color: $success;
-    }
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        """Open a clicked or Enter-selected result."""
+        if event.list_view.id == "search-results":
+            self._open(event.list_view.index)
 
-    DeviceLinkDialog .status-error {
-        color: $error;
-    }
+    def _open(self, index: Optional[int]) -> None:
+        """Close the dialog with the result at an index, if there is one."""
+        if index is not None and 0 <= index < len(self.results):
+            self.dismiss(self.results[index])
 
-    DeviceLinkDialog #dialog-buttons {
-        height: auto;
-        layout: horizontal;
+    def on_key(self, event) -> None:
+        """Handle keyboard shortcuts."""
+        if event.key == "escape":
+            self.dismiss(None)
+            event.prevent_default()
+        elif event.key in ("down", "up") and self.results:
+            # Move through the results without leaving the query field
+            result_list = self.query_one("#search-results", ListView)
+            if event.key == "down":
+                result_list.action_cursor_down()
+            else:
+                result_list.action_cursor_up()
+            event.prevent_default()
+
+
+class AddSnippetDialog(ModalScreen):
+    """Modal dialog for adding a new code snippet."""
+
+    DEFAULT_CSS = """
+    AddSnippetDialog {
         align: center middle;
-        margin-top: 1;
     }
 
-    DeviceLinkDialog LoadingIndicator {
-        height: 3;
+    #dialog-container {
+        width: 70;
+        height: auto;
+        border: round $primary;
+        padding: 1;
     }
 
-    DeviceLinkDialog #loading-container {
-        height: auto;
+    #snippet-command-input {
+        height: 8;
+        min-height: 8;
     }
 
-    DeviceLinkDialog .user-info {
-        color: $success;
-        text-align: center;
-        margin: 1 0;
+    #dialog-buttons {
+        height: auto;
+        layout: horizontal;
+        align: center middle;
     }
     """
 
-    def __init__(self, api_url: str = "https://tuido.dev/api"):
-        super().__init__()
-        self.api_url = api_url
-        self.device_code: Optional[str] = None
-        self.authorization_task = None
-        self._cancelled = False
-
     def compose(self) -> ComposeResult:
-        """Compose the device link dialog."""
+        """Compose the add snippet dialog."""
         with Container(id="dialog-container"):
-            yield Label(f"{Icons.LINK} Link Device", classes="header")
-            yield Static(
-                "Link this device to your Tuido account",
-                classes="section-description",
+            yield Label(f"{Icons.PLUS} Add New Snippet", classes="header")
+            yield Label("Name:")
+            yield Input(placeholder="e.g., SSH to staging", id="snippet-name-input")
+            yield Label("Command/Code:")
+            yield TextArea(id="snippet-command-input")
+            yield Label("Tags (comma-separated, optional):")
+            yield Input(
+                placeholder="e.g., docker, ssh, deploy", id="snippet-tags-input"
             )
-
-            # Loading state (shown initially)
-            with Container(id="loading-container"):
-                yield LoadingIndicator(id="loading-indicator")
-                yield Static("Requesting device code...", id="status-text")
-
-            # Code display (hidden initially, shown after code received)
-            with Container(id="code-display"):
-                yield Static("", id="user-code")
-                yield Static("", id="verification-url")
-
-            # Status container for polling updates
-            with Container(id="status-container"):
-                yield Static("", id="auth-status")
-
             with Horizontal(id="dialog-buttons"):
                 yield Button("Cancel", id="btn-cancel", variant="default")
-                yield Button(
-                    f"{Icons.LINK} Open Browser",
-                    id="btn-open-browser",
-                    variant="primary",
-                    disabled=True,
-                )
+                yield Button("Add Snippet", id="btn-add", variant="success")
 
     def on_mount(self) -> None:
-        """Start the device authorization flow when dialog mounts."""
-        # Hide code display initially
-        self.query_one("#code-display", Container).display = False
-        self.query_one("#status-container", Container).display = False
-
-        # Start authorization flow
-        self.authorization_task = self.run_worker(
-            self._run_authorization_flow(), exclusive=True
-        )
-
-    async def _run_authorization_flow(self) -> None:
-        """Run the device authorization flow."""
-        client = CloudSyncClient(api_url=self.api_url, api_token="")
-
-        try:
-            async for result in client.authorize_device():
-                if self._cancelled:
-                    return
-
-                if isinstance(result, DeviceCodeResponse):
-                    # Show the device code to the user
-                    self._show_device_code(result)
-                elif isinstance(result, AuthorizationResult):
-                    self._update_auth_status(result)
-                    if result.status in ("authorized", "expired", "denied", "error"):
-                        break
-        except Exception as e:
-            self._show_error(str(e))
-
-    def _show_device_code(self, code_response: DeviceCodeResponse) -> None:
-        """Display the device code to the user."""
-        self.device_code = code_response.device_code
-
-        # Hide loading, show code display
-        self.query_one("#loading-container", Container).display = False
-        self.query_one("#code-display", Container).display = True
-        self.query_one("#status-container", Container).display = True
-
-        # Update code display
-        user_code = self.query_one("#user-code", Static)
-        user_code.update(f"  {code_response.user_code}  ")
-
-        verification_url = self.query_one("#verification-url", Static)
-        verification_url.update(f"Go to: {code_response.verification_url}")
-
-        # Update status
-        status = self.query_one("#auth-status", Static)
-        status.update("Waiting for you to confirm in browser...")
-        status.remove_class("status-success", "status-error")
-        status.add_class("status-pending")
-
-        # Enable browser button and store URL
-        browser_btn = self.query_one("#btn-open-browser", Button)
-        browser_btn.disabled = False
-        self._verification_url = code_response.verification_url
-
-    def _update_auth_status(self, result: AuthorizationResult) -> None:
-        """Update the authorization status display."""
-        status = self.query_one("#auth-status", Static)
-
-        if result.status == "pending":
-            status.update("Waiting for you to confirm in browser...")
-            status.remove_class("status-success", "status-error")
-            status.add_class("status-pending")
-
-        elif result.status == "authorized":
-            # Success!
-            status.update(f"{Icons.CHECK} Device linked successfully!")
-            status.remove_class("status-pending", "status-error")
-            status.add_class("status-success")
-
-            # Show user info if available
-            if result.user_email:
-                user_info = f"Linked to: {result.user_email}"
-                if result.user_name:
-                    user_info = f"Linked to: {result.user_name} ({result.user_email})"
-                auth_status_container = self.query_one("#status-container", Container)
-                auth_status_container.mount(Static(user_info, classes="user-info"))
-
-            # Change Cancel to Done
-            cancel_btn = self.query_one("#btn-cancel", Button)
-            cancel_btn.label = "Done"
-            cancel_btn.variant = "success"
-
-            # Hide browser button
-            self.query_one("#btn-open-browser", Button).display = False
-
-        elif result.status == "expired":
-            status.update(f"{Icons.TIMES} Code expired. Please try again.")
-            status.remove_class("status-pending", "status-success")
-            status.add_class("status-error")
-
-        elif result.status == "denied":
-            status.update(f"{Icons.TIMES} Authorization denied.")
-            status.remove_class("status-pending", "status-success")
-            status.add_class("status-error")
-
-        elif result.status == "error":
-            error_msg = result.error or "Unknown error"
-            status.update(f"{Icons.WARNING} Error: {error_msg}")
-            status.remove_class("status-pending", "status-success")
-            status.add_class("status-error")
-
-    def _show_error(self, error: str) -> None:
-        """Show an error message."""
-        self.query_one("#loading-container", Container).display = False
-        self.query_one("#code-display", Container).display = False
-        self.query_one("#status-container", Container).display = True
-
-        status = self.query_one("#auth-status", Static)
-        status.update(f"{Icons.WARNING} {error}")
-        status.remove_class("status-pending", "status-success")
-        status.add_class("status-error")
+        """Focus the name input field when dialog opens."""
+        self.query_one("#snippet-name-input", Input).focus()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button press."""
         if event.button.id == "btn-cancel":
-            self._cancelled = True
-            if self.authorization_task:
-                self.authorization_task.cancel()
-            # Return True if device was successfully linked
-            is_linked = has_device_token()
-            self.dismiss(is_linked)
+            self.dismiss(None)
+        elif event.button.id == "btn-add":
+            name = self.query_one("#snippet-name-input", Input).value.strip()
+            command = self.query_one("#snippet-command-input", TextArea).text.strip()
+            tags_str = self.query_one("#snippet-tags-input", Input).value.strip()
 
-        elif event.button.id == "btn-open-browser":
-            if hasattr(self, "_verification_url"):
-                webbrowser.open(self._verification_url)
+            # Validate required fields
+            if not name or not command:
+                self.app.notify("Name and command are required", severity="warning")
+                return
+
+            # Parse tags from comma-separated string
+            tags = [t.strip() for t in tags_str.split(",") if t.strip()]
+
+            # Create new snippet
+            snippet = Snippet(name=name, command=command, tags=tags)
+            self.dismiss(snippet)
 
     def on_key(self, event) -> None:
         """Handle keyboard shortcuts."""
         if event.key == "escape":
-            self._cancelled = True
-            if self.authorization_task:
-                self.authorization_task.cancel()
-            self.dismiss(False)
+            self.dismiss(None)
             event.prevent_default()
 
 
-class UnlinkDeviceDialog(ModalScreen):
-    """Modal dialog for unlinking the current device."""
+class EditSnippetDialog(ModalScreen):
+    """Modal dialog for editing an existing code snippet."""
 
     DEFAULT_CSS = """
-    UnlinkDeviceDialog {
+    EditSnippetDialog {
         align: center middle;
     }
 
-    UnlinkDeviceDialog > #dialog-container {
-        width: 55;
+    #dialog-container {
+        width: 70;
         height: auto;
-        border: round $warning;
-        padding: 1 2;
-    }
-
-    UnlinkDeviceDialog .header {
-        text-style: bold;
-        color: $warning;
-        margin-bottom: 1;
+        border: round $primary;
+        padding: 1;
     }
 
-    UnlinkDeviceDialog .section-description {
-        color: $text-muted;
-        margin-bottom: 1;
+    #snippet-command-input {
+        height: 8;
+        min-height: 8;
     }
 
-    UnlinkDeviceDialog #dialog-buttons {
+    #dialog-buttons {
         height: auto;
         layout: horizontal;
         align: center middle;
-        margin-top: 1;
     }
     """
 
+    def __init__(self, snippet: Snippet):
+        super().__init__()
+        self.snippet = snippet
+
     def compose(self) -> ComposeResult:
-        """Compose the unlink device dialog."""
+        """Compose the edit snippet dialog."""
         with Container(id="dialog-container"):
-            yield Label(f"{Icons.WARNING} Unlink Device", classes="header")
-            yield Static(
-                "Are you sure you want to unlink this device?",
-                classes="section-description",
+            yield Label(f"{Icons.PENCIL} Edit Snippet", classes="header")
+            yield Label("Name:")
+            yield Input(
+                value=self.snippet.name,
+                placeholder="e.g., SSH to staging",
+                id="snippet-name-input",
             )
-            yield Static(
-                "You will need to link again to use cloud sync.",
-                classes="section-description",
+            yield Label("Command/Code:")
+            yield TextArea(text=self.snippet.command, id="snippet-command-input")
+            yield Label("Tags (comma-separated, optional):")
+            yield Input(
+                value=", ".join(self.snippet.tags) if self.snippet.tags else "",
+                placeholder="e.g., docker, ssh, deploy",
+                id="snippet-tags-input",
             )
             with Horizontal(id="dialog-buttons"):
                 yield Button("Cancel", id="btn-cancel", variant="default")
-                yield Button("Unlink", id="btn-unlink", variant="warning")
+                yield Button("Save", id="btn-save", variant="success")
+
+    def on_mount(self) -> None:
+        """Focus the name input field when dialog opens."""
+        self.query_one("#snippet-name-input", Input).focus()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button press."""
         if event.button.id == "btn-cancel":
-            self.dismiss(False)
-        elif event.button.id == "btn-unlink":
-            # Delete device credentials from keyring
-            delete_device_credentials()
-            self.dismiss(True)
+            self.dismiss(None)
+        elif event.button.id == "btn-save":
+            name = self.query_one("#snippet-name-input", Input).value.strip()
+            command = self.query_one("#snippet-command-input", TextArea).text.strip()
+            tags_str = self.query_one("#snippet-tags-input", Input).value.strip()
+
+            # Validate required fields
+            if not name or not command:
+                self.app.notify("Name and command are required", severity="warning")
+                return
+
+            # Parse tags from comma-separated string
+            tags = [t.strip() for t in tags_str.split(",") if t.strip()]
+
+            # Update snippet
+            self.snippet.name = name
+            self.snippet.command = command
+            self.snippet.tags = tags
+            self.dismiss(self.snippet)
 
     def on_key(self, event) -> None:
         """Handle keyboard shortcuts."""
         if event.key == "escape":
-            self.dismiss(False)
+            self.dismiss(None)
             event.prevent_default()
@@ -0,0 +1,367 @@
+"""First-run setup wizard."""
+
+from __future__ import annotations
+
+import os
+import webbrowser
+from typing import Tuple
+
+from textual.app import ComposeResult
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import (
+    Button,
+    Input,
+    Label,
+    Static,
+    Switch,
+    TabbedContent,
+    TabPane,
+)
+
+from ..icons import Icons
+from ..models import Settings
+
+
+def _detect_terminal() -> Tuple[str, str]:
+    """Detect the current terminal emulator and return setup instructions.
+
+    Returns:
+        Tuple of (terminal_name, configuration_instructions)
+    """
+    term_program = os.environ.get("TERM_PROGRAM", "").lower()
+    ghostty_dir = os.environ.get("GHOSTTY_RESOURCES_DIR", "")
+
+    if ghostty_dir:
+        return (
+            "Ghostty",
+            "Config file: ~/.config/ghostty/config\n"
+            "Add: font-family = JetBrainsMono Nerd Font",
+        )
+    elif term_program == "vscode":
+        return (
+            "VS Code Terminal",
+            "Settings → Search 'terminal.integrated.fontFamily'\n"
+            "Set to: JetBrainsMono Nerd Font",
+        )
+    elif term_program == "iterm.app":
+        return (
+            "iTerm2",
+            "Preferences → Profiles → Text → Font\nSelect: JetBrainsMono Nerd Font",
+        )
+    elif term_program == "apple_terminal":
+        return (
+            "macOS Terminal",
+            "Preferences → Profiles → Text → Change Font\n"
+            "Select: JetBrainsMono Nerd Font",
+        )
+    elif term_program == "hyper":
+        return (
+            "Hyper",
+            "Config file: ~/.hyper.js\nSet fontFamily: 'JetBrainsMono Nerd Font'",
+        )
+    elif term_program == "alacritty":
+        return (
+            "Alacritty",
+            "Config file: ~/.config/alacritty/alacritty.yml\n"
+            "Set font.normal.family: JetBrainsMono Nerd Font",
+        )
+    elif term_program == "wezterm":
+        return (
+            "WezTerm",
+            "Config file: ~/.wezterm.lua\n"
+            "Set config.font = wezterm.font('JetBrainsMono Nerd Font')",
+        )
+    elif term_program == "kitty":
+        return (
+            "Kitty",
+            "Config file: ~/.config/kitty/kitty.conf\n"
+            "Set font_family JetBrainsMono Nerd Font",
+        )
+    else:
+        return (
+            "Unknown Terminal",
+            "Configure your terminal's font settings to use:\nJetBrainsMono Nerd Font",
+        )
+
+
+class OnboardingDialog(ModalScreen):
+    """Modal dialog for first-run onboarding and setup wizard."""
+
+    DEFAULT_CSS = """
+    OnboardingDialog {
+        align: center middle;
+    }
+
+    OnboardingDialog > #dialog-container {
+        width: 70;
+        height: auto;
+        border: round $primary;
+        padding: 1 2;
+    }
+
+    OnboardingDialog .section {
+        margin: 1 0;
+        padding: 1;
+        border: round $accent;
+        height: auto;
+    }
+
+    OnboardingDialog .section-header {
+        text-style: bold;
+        color: $accent;
+        margin-bottom: 1;
+    }
+
+    OnboardingDialog .section-description {
+        color: $text-muted;
+    }
+
+    OnboardingDialog .instructions {
+        color: $text;
+        margin: 1 0;
+    }
+
+    OnboardingDialog .link-row {
+        height: auto;
+    }
+
+    OnboardingDialog .setting-row {
+        height: auto;
+    }
+
+    OnboardingDialog .setting-hint {
+        color: $text-muted;
+        text-style: italic;
+        margin-left: 2;
+    }
+
+    OnboardingDialog #dialog-buttons {
+        height: auto;
+        layout: horizontal;
+        align: center middle;
+        margin-top: 1;
+    }
+
+    OnboardingDialog .welcome-header {
+        text-style: bold;
+        color: $primary;
+        text-align: center;
+        margin-bottom: 1;
+    }
+
+    OnboardingDialog .font-test-box {
+        background: $panel;
+        padding: 1;
+        margin: 1 0;
+        border: round $primary;
+        height: auto;
+    }
+
+    OnboardingDialog .font-test-icons {
+        text-align: center;
+        text-style: bold;
+        color: $accent;
+    }
+
+    OnboardingDialog .terminal-detected {
+        color: $success;
+        text-style: bold;
+    }
+
+    OnboardingDialog .font-status-good {
+        color: $success;
+        text-style: bold;
+    }
+
+    OnboardingDialog .font-status-bad {
+        color: $warning;
+    }
+
+    OnboardingDialog #font-help-section {
+        display: none;
+        height: auto;
+    }
+
+    OnboardingDialog #font-help-section.visible {
+        display: block;
+    }
+
+    OnboardingDialog TabbedContent {
+        height: auto;
+    }
+
+    OnboardingDialog TabPane {
+        padding: 1;
+        height: auto;
+    }
+    """
+
+    def __init__(self, current_settings: Settings):
+        super().__init__()
+        self.settings = current_settings
+        self.terminal_name, self.terminal_instructions = _detect_terminal()
+
+    def compose(self) -> ComposeResult:
+        """Compose the onboarding dialog."""
+        with Container(id="dialog-container"):
+            yield Label(
+                f"{Icons.STAR} Welcome to Tuido!",
+                classes="welcome-header",
+            )
+            yield Static(
+                "Let's get you set up for the best experience.",
+                classes="section-description",
+            )
+
+            with TabbedContent(initial="font-tab"):
+                # Font Setup Tab
+                with TabPane(f"{Icons.PALETTE} Font Setup", id="font-tab"):
+                    # Show detected terminal
+                    yield Static(
+                        f"{Icons.CHECK} Detected: {self.terminal_name}",
+                        classes="terminal-detected",
+                    )
+
+                    yield Static(
+                        "Tuido uses Nerd Font icons for a beautiful interface. "
+                        "Do these icons display correctly?",
+                        classes="section-description",
+                    )
+
+                    # Font test box with sample icons
+                    with Container(classes="font-test-box"):
+                        yield Static(
+                            f"  {Icons.CHECK}  {Icons.STAR}  {Icons.FOLDER}  {Icons.CLOCK}  {Icons.CLOUD_SUN}  ",
+                            classes="font-test-icons",
+                        )
+                        yield Static(
+                            "You should see: checkmark, star, folder, clock, sun/cloud",
+                            classes="setting-hint",
+                        )
+
+                    # Font status toggle
+                    with Horizontal(classes="setting-row"):
+                        yield Label("Icons display correctly:")
+                        yield Switch(value=True, id="font-working-switch")
+                        yield Static(
+                            "Yes, I see the icons!",
+                            id="font-status-label",
+                            classes="font-status-good",
+                        )
+
+                    # Show configuration instructions (hidden by default if icons work)
+                    with Container(id="font-help-section"):
+                        with Horizontal(classes="link-row"):
+                            yield Button(
+                                f"{Icons.DOWNLOAD} Download JetBrains Mono Nerd Font",
+                                id="btn-download-font",
+                                variant="primary",
+                            )
+                        yield Static(
+                            f"For {self.terminal_name}:\n{self.terminal_instructions}",
+                            classes="instructions",
+                        )
+                        yield Static(
+                            "After configuring, restart your terminal completely.",
+                            classes="setting-hint",
+                        )
+
+                # Weather Setup Tab
+                with TabPane(f"{Icons.CLOUD_SUN} Weather (Optional)", id="weather-tab"):
+                    yield Static(
+                        "The weather widget displays current conditions and forecast. "
+                        "Just enter your location below!",
+                        classes="section-description",
+                    )
+                    yield Label("Location:")
+                    yield Input(
+                        value=self.settings.weather_location,
+                        placeholder="e.g., San Francisco  or  London,UK",
+                        id="weather-location-input",
+                    )
+                    with Horizontal(classes="setting-row"):
+                        yield Label("Temperature Unit:")
+                        yield Switch(
+                            value=self.settings.weather_use_fahrenheit,
+                            id="weather-unit-switch",
+                        )
+                        yield Static(
+                            "Fahrenheit (°F)"
+                            if self.settings.weather_use_fahrenheit
+                            else "Celsius (°C)",
+                            id="weather-unit-label",
+                            classes="setting-hint",
+                        )
+                    with Horizontal(classes="setting-row"):
+                        yield Label("Enable Weather Widget:")
+                        yield Switch(
+                            value=self.settings.show_weather_widget,
+                            id="show-weather-switch",
+                        )
+                        yield Static(
+                            "Disable to skip weather setup",
+                            classes="setting-hint",
+                        )
+
+            with Horizontal(id="dialog-buttons"):
+                yield Button("Skip for Now", id="btn-skip", variant="default")
+                yield Button(
+                    f"{Icons.CHECK} Get Started",
+                    id="btn-save",
+                    variant="success",
+                )
+
+    def on_switch_changed(self, event: Switch.Changed) -> None:
+        """Handle switch changes for live updates."""
+        if event.switch.id == "font-working-switch":
+            # Toggle visibility of font help section
+            font_help = self.query_one("#font-help-section", Container)
+            font_status = self.query_one("#font-status-label", Static)
+            if event.value:
+                # Icons work - hide help section
+                font_help.remove_class("visible")
+                font_status.update("Yes, I see the icons!")
+                font_status.remove_class("font-status-bad")
+                font_status.add_class("font-status-good")
+            else:
+                # Icons don't work - show help section
+                font_help.add_class("visible")
+                font_status.update("No, I see rectangles □")
+                font_status.remove_class("font-status-good")
+                font_status.add_class("font-status-bad")
+        elif event.switch.id == "weather-unit-switch":
+            label = self.query_one("#weather-unit-label", Static)
+            label.update("Fahrenheit (°F)" if event.value else "Celsius (°C)")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button press."""
+        if event.button.id == "btn-download-font":
+            webbrowser.open("https://www.nerdfonts.com/font-downloads")
+        elif event.button.id == "btn-skip":
+            # Mark onboarding complete but don't save weather settings
+            self.settings.onboarding_complete = True
+            self.dismiss(self.settings)
+        elif event.button.id == "btn-save":
+            # Save all settings
+            weather_location = self.query_one(
+                "#weather-location-input", Input
+            ).value.strip()
+            weather_use_fahrenheit = self.query_one(
+                "#weather-unit-switch", Switch
+            ).value
+            show_weather = self.query_one("#show-weather-switch", Switch).value
+
+            self.settings.weather_location = weather_location
+            self.settings.weather_use_fahrenheit = weather_use_fahrenheit
+            self.settings.show_weather_widget = show_weather
+            self.settings.onboarding_complete = True
+            self.dismiss(self.settings)
+
+    def on_key(self, event) -> None:
+        """Handle keyboard shortcuts."""
+        if event.key == "escape":
+            # Treat escape as skip
+            self.settings.onboarding_complete = True
+            self.dismiss(self.settings)
+            event.prevent_default()
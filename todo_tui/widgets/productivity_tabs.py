@@ -7,9 +7,7 @@ from textual.containers import Container
 from textual.widgets import TabbedContent, TabPane
 
 from ..icons import Icons
-from .forecast_widget import ForecastWidget
 from .pomodoro_widget import PomodoroWidget
-from .weather_widget import WeatherWidget
 
 
 class ProductivityTabs(Container):
@@ -64,6 +62,10 @@ class ProductivityTabs(Container):
     def compose(self) -> ComposeResult:
         """Compose the tabbed productivity widget."""
         if self.show_weather:
+            # Weather widgets are only imported when enabled
+            from .forecast_widget import ForecastWidget
+            from .weather_widget import WeatherWidget
+
             # Show all tabs: Weather, Forecast, Pomodoro
             with TabbedContent(initial="weather-tab"):
                 with TabPane(f"{Icons.CLOUD_SUN} Weather", id="weather-tab"):
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from textual.app import ComposeResult
 from textual.binding import Binding
@@ -11,7 +11,7 @@ from textual.message import Message
 from textual.widgets import ListItem, ListView, Static
 
 from ..icons import Icons
-from ..models import Project, Task
+from ..models import Project, ProjectStats
 
 
 class ProjectSelected(Message):
@@ -56,7 +56,7 @@ class ProjectListPanel(Container):
     def __init__(self, id: str = "projects-panel"):
         super().__init__(id=id)
         self.projects: List[Project] = []
-        self.all_tasks: List[Task] = []
+        self.stats: Dict[str, ProjectStats] = {}
         self.selected_project_id: Optional[str] = None
 
     def compose(self) -> ComposeResult:
@@ -72,9 +72,9 @@ class ProjectListPanel(Container):
         self.projects = projects
         self._update_list()
 
-    def update_tasks(self, tasks: List[Task]) -> None:
-        """Update the task list and refresh display."""
-        self.all_tasks = tasks
+    def update_stats(self, stats: Dict[str, ProjectStats]) -> None:
+        """Update the per-project task counts and refresh display."""
+        self.stats = stats
         self._update_list()
 
     def _update_list(self) -> None:
@@ -97,8 +97,8 @@ class ProjectListPanel(Container):
             return
 
         # Calculate total task count for "All Tasks"
-        total_count = len(self.all_tasks)
-        total_completed = sum(1 for t in self.all_tasks if t.completed)
+        total_count = sum(s.total for s in self.stats.values())
+        total_completed = sum(s.completed for s in self.stats.values())
 
         # Add "All Tasks" option with count
         all_tasks_label = f"{Icons.LIST} All Tasks ({total_completed}/{total_count})"
@@ -106,10 +106,9 @@ class ProjectListPanel(Container):
 
         # Add projects with task counts
         for project in self.projects:
-            # Count tasks for this project
-            project_tasks = [t for t in self.all_tasks if t.project_id == project.id]
-            task_count = len(project_tasks)
-            completed_count = sum(1 for t in project_tasks if t.completed)
+            stats = self.stats.get(project.id) or ProjectStats(project_id=project.id)
+            task_count = stats.total
+            completed_count = stats.completed
 
             project_label = (
                 f"{Icons.FOLDER} {project.name} ({completed_count}/{task_count})"
@@ -134,6 +133,14 @@ class ProjectListPanel(Container):
             self.selected_project_id = project.id
             self.post_message(ProjectSelected(project.id))
 
+    def select_project(self, project_id: Optional[str]) -> None:
+        """Highlight a project (None for All Tasks) without posting a message."""
+        index = next(
+            (i + 1 for i, p in enumerate(self.projects) if p.id == project_id), 0
+        )
+        self.selected_project_id = project_id if index else None
+        self.query_one("#project-list", ListView).index = index
+
     def add_project(self, project: Project) -> None:
         """Add a new project to the list."""
         self.projects.append(project)
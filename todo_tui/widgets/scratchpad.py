@@ -3,9 +3,8 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Optional, Set
 
-import pyperclip
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, Vertical
@@ -24,9 +23,14 @@ from textual.widgets import (
 )
 
 from ..icons import Icons
-from ..markdown_syntax import register_markdown_language
 from ..models import Note
-from .dialogs import AddNoteDialog, ConfirmDialog, InfoDialog, RenameNoteDialog
+from .dialogs import (
+    AddNoteDialog,
+    ConfirmDialog,
+    InfoDialog,
+    NoteHistoryDialog,
+    RenameNoteDialog,
+)
 
 if TYPE_CHECKING:
     from ..storage import StorageManager
@@ -186,6 +190,7 @@ class ScratchpadPanel(Container):
         Binding("ctrl+n", "add_note", "New Note", show=False),
         Binding("f2", "rename_note", "Rename Note", show=False),
         Binding("delete", "delete_note", "Delete Note", show=False),
+        Binding("f3", "note_history", "Note History", show=False),
         Binding("ctrl+shift+c", "copy_selected", "Copy Selected", show=False),
     ]
 
@@ -221,6 +226,12 @@ class ScratchpadPanel(Container):
                     variant="default",
                     classes="note-action-btn compact",
                 )
+                yield Button(
+                    f"{Icons.CLOCK}",
+                    id="btn-note-history",
+                    variant="default",
+                    classes="note-action-btn compact",
+                )
                 yield Button(
                     f"{Icons.TRASH}",
                     id="btn-delete-note",
@@ -252,12 +263,18 @@ class ScratchpadPanel(Container):
 
     def on_mount(self) -> None:
         """Load notes when widget is mounted."""
+        if not self.is_attached:
+            # Built lazily and the app quit before the panel was mounted
+            return
         # Set up border title
         note_list_section = self.query_one("#note-list-section")
         note_list_section.border_title = f"{Icons.LIST} Notes"
 
         # Set up markdown syntax highlighting after widget is fully initialized
         def setup_markdown():
+            # tree-sitter and the markdown grammar load here, not at import
+            from ..markdown_syntax import register_markdown_language
+
             textarea = self.query_one("#scratchpad-textarea", TextArea)
             # Use current app theme instead of hardcoded value
             current_theme = self.app.theme or "catppuccin-mocha"
@@ -365,6 +382,57 @@ class ScratchpadPanel(Container):
             markdown_viewer.update("")
             self.current_note = None
 
+    def refresh_notes(self, changed_ids: Set[str]) -> None:
+        """Reload notes changed by another instance, keeping the selection.
+
+        The open note's editor is only updated when it has no autosave
+        pending; otherwise the local edits are kept and saved over the
+        external change.
+
+        Args:
+            changed_ids: IDs of notes whose content changed.
+        """
+        current_note_id = self.current_note.id if self.current_note else None
+        self.notes = self.storage.load_notes()
+        self._update_note_list()
+
+        list_view = self.query_one("#note-list-view", ListView)
+        for i, note in enumerate(self.notes):
+            if note.id != current_note_id:
+                continue
+            list_view.index = i
+            if note.id in changed_ids and self._debounce_timer is None:
+                textarea = self.query_one("#scratchpad-textarea", TextArea)
+                cursor = textarea.cursor_location
+                self._select_note(note)
+                # Keep the cursor where it was, as far as the new text allows
+                row = min(cursor[0], textarea.document.line_count - 1)
+                column = min(cursor[1], len(textarea.document.get_line(row)))
+                textarea.cursor_location = (row, column)
+            else:
+                self.current_note = note
+            return
+
+        # The open note was deleted elsewhere
+        if self.notes:
+            self._select_note(self.notes[0])
+
+    def select_note(self, note_id: str) -> bool:
+        """Open a note by ID, e.g. from a search result.
+
+        Returns:
+            True if the note exists.
+        """
+        for i, note in enumerate(self.notes):
+            if note.id != note_id:
+                continue
+            if self.current_note:
+                self._save_current_note()
+            self.query_one("#note-list-view", ListView).index = i
+            self._select_note(note)
+            return True
+        return False
+
     def _select_note(self, note: Note) -> None:
         """Select and display a note.
 
@@ -376,6 +444,10 @@ class ScratchpadPanel(Container):
             self._debounce_timer.stop()
             self._debounce_timer = None
 
+        # Fold the autosave patches of the note being left into its file
+        if self.current_note is not None and self.current_note.id != note.id:
+            self.storage.fold_note(self.current_note.id)
+
         self.current_note = note
 
         # Update editor content (suppress event handling for programmatic change)
@@ -444,7 +516,8 @@ class ScratchpadPanel(Container):
 
         textarea = self.query_one("#scratchpad-textarea", TextArea)
         self.current_note.content = textarea.text
-        self.storage.update_note(self.current_note)
+        # Only the edited span is written; see StorageManager.autosave_note
+        self.storage.autosave_note(self.current_note)
 
         # Properly stop and clear the debounce timer
         if self._debounce_timer is not None:
@@ -514,6 +587,38 @@ class ScratchpadPanel(Container):
 
         self.app.push_screen(RenameNoteDialog(self.current_note), check_rename_note)
 
+    def action_note_history(self) -> None:
+        """Show the current note's revisions and restore the chosen one."""
+        if not self.current_note:
+            return
+
+        # Record the current content so it can be restored as well
+        self._save_current_note()
+        self.storage.fold_note(self.current_note.id)
+
+        note = self.current_note
+        revisions = self.storage.list_note_revisions(note.id)
+        if not revisions:
+            self.app.push_screen(
+                InfoDialog("This note has no saved revisions yet.", "Note History")
+            )
+            return
+
+        def check_restore(number: Optional[int]) -> None:
+            """Callback when dialog is dismissed."""
+            if number is None or self.current_note is not note:
+                return
+            content = self.storage.get_note_revision(note.id, number)
+            if content is None:
+                return
+
+            note.content = content
+            self.storage.update_note(note)
+            # Refresh the editor and preview with the restored content
+            self._select_note(note)
+
+        self.app.push_screen(NoteHistoryDialog(note, revisions), check_restore)
+
     def action_delete_note(self) -> None:
         """Delete the current note after confirmation."""
         if not self.current_note:
@@ -567,6 +672,8 @@ class ScratchpadPanel(Container):
             return
 
         try:
+            import pyperclip
+
             pyperclip.copy(selected_text)
             self.app.notify("✓ Selected text copied to clipboard", severity="success")
         except Exception as e:
@@ -585,6 +692,8 @@ class ScratchpadPanel(Container):
             return
 
         try:
+            import pyperclip
+
             pyperclip.copy(self.current_note.content)
             self.app.notify("✓ Note copied to clipboard", severity="success")
         except Exception as e:
@@ -605,6 +714,8 @@ class ScratchpadPanel(Container):
             self.action_add_note()
         elif event.button.id == "btn-rename-note":
             self.action_rename_note()
+        elif event.button.id == "btn-note-history":
+            self.action_note_history()
         elif event.button.id == "btn-delete-note":
             self.action_delete_note()
         elif event.button.id == "btn-copy-all":
@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
-import pyperclip
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, Vertical
 from textual.message import Message
 from textual.widgets import Button, Input, Label, ListItem, ListView, Static, TextArea
 
+from ..fuzzy import FuzzyIndex, frecency
 from ..icons import Icons
 from ..models import Snippet
 from .dialogs import AddSnippetDialog, ConfirmDialog, EditSnippetDialog
@@ -163,6 +164,10 @@ class SnippetsPanel(Container):
         Binding("escape", "clear_search", "Clear", show=False),
     ]
 
+    # Snippets listed at a time; more are listed when the cursor nears the end
+    PAGE_SIZE = 100
+    PAGE_MARGIN = 10
+
     def __init__(self, storage: StorageManager, id: str = "snippets-panel") -> None:
         """Initialize the snippets panel.
 
@@ -176,6 +181,11 @@ class SnippetsPanel(Container):
         self.filtered_snippets: List[Snippet] = []
         self.current_snippet: Optional[Snippet] = None
         self.search_query: str = ""
+        # Fuzzy matcher over the snippets it was last synced with
+        self._matcher = FuzzyIndex()
+        self._matched: Optional[List[Snippet]] = None
+        # Ranked snippets not listed yet
+        self._more: Iterator[Snippet] = iter(())
 
     def compose(self) -> ComposeResult:
         """Compose the snippets panel layout."""
@@ -226,6 +236,9 @@ class SnippetsPanel(Container):
 
     def on_mount(self) -> None:
         """Initialize after widget is mounted."""
+        if not self.is_attached:
+            # Built lazily and the app quit before the panel was mounted
+            return
         self.snippets = self.storage.load_snippets()
         self._update_list()
 
@@ -239,17 +252,6 @@ class SnippetsPanel(Container):
         else:
             self._clear_detail_view()
 
-    def _sort_snippets(self, snippets: List[Snippet]) -> List[Snippet]:
-        """Sort snippets by usage count (descending).
-
-        Args:
-            snippets: List of snippets to sort
-
-        Returns:
-            Sorted list of snippets
-        """
-        return sorted(snippets, key=lambda s: s.uses, reverse=True)
-
     def _get_snippet_at_index(self, index: Optional[int]) -> Optional[Snippet]:
         """Get snippet at index if valid.
 
@@ -264,24 +266,80 @@ class SnippetsPanel(Container):
         return None
 
     def _filter_snippets(self) -> None:
-        """Filter snippets based on search query."""
-        if not self.search_query:
-            self.filtered_snippets = self.snippets
-        else:
-            query = self.search_query.lower()
-            self.filtered_snippets = [
-                s
+        """Rank snippets by fuzzy match of the search query and frecency.
+
+        Only the first page is listed; the rest is ranked as it is needed.
+        """
+        if self._matched is not self.snippets:
+            now = datetime.now()
+            self._matcher.sync(
+                (
+                    s.id,
+                    " ".join([s.name, *s.tags, s.command]),
+                    frecency(s.uses, s.last_used, now),
+                )
                 for s in self.snippets
-                if query in s.name.lower()
-                or query in s.command.lower()
-                or any(query in tag.lower() for tag in (s.tags or []))
-            ]
+            )
+            self._matched = self.snippets
+        by_id = {s.id: s for s in self.snippets}
+        self._more = (
+            by_id[match.key] for match in self._matcher.search(self.search_query)
+        )
+        self.filtered_snippets = list(islice(self._more, self.PAGE_SIZE))
+
+    def _show_more(self) -> bool:
+        """List the next page of ranked snippets.
+
+        Returns:
+            True if any were listed.
+        """
+        page = list(islice(self._more, self.PAGE_SIZE))
+        self.filtered_snippets.extend(page)
+        list_view = self.query_one("#snippet-list-view", ListView)
+        for snippet in page:
+            list_view.append(self._snippet_item(snippet))
+        return bool(page)
+
+    def _listed_index(self, snippet_id: str, show_more: bool = False) -> Optional[int]:
+        """Get the list index of a listed snippet.
+
+        Args:
+            snippet_id: ID of the snippet.
+            show_more: List more pages until the snippet is reached (only
+                for snippets known to match).
+        """
+        start = 0
+        while True:
+            for i, snippet in enumerate(self.filtered_snippets[start:], start):
+                if snippet.id == snippet_id:
+                    return i
+            start = len(self.filtered_snippets)
+            if not show_more or not self._show_more():
+                return None
+
+    def _snippet_item(self, snippet: Snippet) -> ListItem:
+        """Build the list item showing a snippet."""
+        # Format tags
+        tags_str = " ".join(f"#{tag}" for tag in snippet.tags) if snippet.tags else ""
+
+        # Format usage count
+        uses_str = f"({snippet.uses})" if snippet.uses > 0 else "(0)"
+
+        # Create snippet item display with markup
+        meta = f"{tags_str}  {uses_str}" if tags_str else uses_str
+        # Escape snippet name to prevent markup injection
+        escaped_name = escape_markup(snippet.name)
+        content = Static(
+            f"[bold]{Icons.CODE} {escaped_name}[/]\n[dim]{meta}[/]",
+            classes="snippet-list-item",
+            markup=True,
+        )
+        return ListItem(content)
 
     def _update_list(self) -> None:
         """Update the snippet list view."""
-        # Filter first, then sort the filtered results
+        # Filter and rank (best match, then most used first)
         self._filter_snippets()
-        self.filtered_snippets = self._sort_snippets(self.filtered_snippets)
 
         # Get list view
         list_view = self.query_one("#snippet-list-view", ListView)
@@ -300,24 +358,7 @@ class SnippetsPanel(Container):
 
         # Populate list with snippets
         for snippet in self.filtered_snippets:
-            # Format tags
-            tags_str = (
-                " ".join(f"#{tag}" for tag in snippet.tags) if snippet.tags else ""
-            )
-
-            # Format usage count
-            uses_str = f"({snippet.uses})" if snippet.uses > 0 else "(0)"
-
-            # Create snippet item display with markup
-            meta = f"{tags_str}  {uses_str}" if tags_str else uses_str
-            # Escape snippet name to prevent markup injection
-            escaped_name = escape_markup(snippet.name)
-            content = Static(
-                f"[bold]{Icons.CODE} {escaped_name}[/]\n[dim]{meta}[/]",
-                classes="snippet-list-item",
-                markup=True,
-            )
-            list_view.append(ListItem(content))
+            list_view.append(self._snippet_item(snippet))
 
     def _update_detail_view(self, snippet: Snippet) -> None:
         """Update the detail view with the selected snippet.
@@ -383,6 +424,13 @@ class SnippetsPanel(Container):
             self._update_detail_view(snippet)
             self.post_message(SnippetSelected(snippet))
 
+    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+        """List more snippets when the cursor nears the end of the list."""
+        if event.list_view.id != "snippet-list-view" or event.list_view.index is None:
+            return
+        if event.list_view.index >= len(self.filtered_snippets) - self.PAGE_MARGIN:
+            self._show_more()
+
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle search input changes (real-time filtering).
 
@@ -418,6 +466,8 @@ class SnippetsPanel(Container):
 
         try:
             # Copy to clipboard
+            import pyperclip
+
             pyperclip.copy(self.current_snippet.command)
 
             # Update usage stats
@@ -427,7 +477,7 @@ class SnippetsPanel(Container):
             # Save to storage
             self.storage.update_snippet(self.current_snippet)
 
-            # Reload and refresh list (to re-sort)
+            # Reload and refresh list (to re-rank)
             self.snippets = self.storage.load_snippets()
             self._update_list()
 
@@ -546,6 +596,25 @@ class SnippetsPanel(Container):
         self.search_query = ""
         self._update_list()
 
+    def select_snippet(self, snippet_id: str) -> bool:
+        """Show a snippet by ID, e.g. from a search result.
+
+        Clears the search query so the snippet is listed.
+
+        Returns:
+            True if the snippet exists.
+        """
+        self.action_clear_search()
+        if not any(snippet.id == snippet_id for snippet in self.snippets):
+            return False
+        i = self._listed_index(snippet_id, show_more=True)
+        if i is None:
+            return False
+        self.query_one("#snippet-list-view", ListView).index = i
+        self.current_snippet = self.filtered_snippets[i]
+        self._update_detail_view(self.current_snippet)
+        return True
+
     def reload_snippets(self) -> None:
         """Reload snippets from storage and update UI.
 
@@ -563,3 +632,18 @@ class SnippetsPanel(Container):
             self._update_detail_view(self.current_snippet)
         else:
             self._clear_detail_view()
+
+    def refresh_snippets(self) -> None:
+        """Reload snippets changed by another instance, keeping the selection."""
+        current_id = self.current_snippet.id if self.current_snippet else None
+        self.snippets = self.storage.load_snippets()
+        self._update_list()
+
+        i = self._listed_index(current_id) if current_id else None
+        if i is not None:
+            self.current_snippet = self.filtered_snippets[i]
+            self._update_detail_view(self.current_snippet)
+            self.query_one("#snippet-list-view", ListView).index = i
+            return
+        self.current_snippet = None
+        self._clear_detail_view()
@@ -0,0 +1,506 @@
+"""Cloud sync dialogs: sync direction, device linking and unlinking.
+
+Only imported when cloud sync is used; ``cloud_sync`` (httpx) and
+``encryption`` (cryptography) are in turn imported inside the handlers
+that need them.
+"""
+
+from __future__ import annotations
+
+import webbrowser
+from typing import TYPE_CHECKING, Optional
+
+from textual.app import ComposeResult
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import Button, Label, LoadingIndicator, Static
+
+from ..icons import Icons
+
+if TYPE_CHECKING:
+    from ..cloud_sync import AuthorizationResult, DeviceCodeResponse
+
+
+class SyncDirectionDialog(ModalScreen):
+    """Modal dialog for choosing cloud sync direction."""
+
+    DEFAULT_CSS = """
+    SyncDirectionDialog {
+        align: center middle;
+    }
+
+    SyncDirectionDialog > #dialog-container {
+        width: 60;
+        height: 20;
+        border: round $primary;
+        padding: 1;
+    }
+
+    #sync-info {
+        padding: 1 0;
+        background: $panel;
+        margin-bottom: 1;
+    }
+
+    #dialog-buttons {
+        height: auto;
+        layout: horizontal;
+        align: center middle;
+    }
+    """
+
+    def __init__(self, cloud_timestamp: Optional[str], local_timestamp: Optional[str]):
+        """Initialize sync direction dialog.
+
+        Args:
+            cloud_timestamp: Last cloud sync timestamp (ISO format)
+            local_timestamp: Last local sync timestamp (ISO format)
+        """
+        super().__init__()
+        self.cloud_timestamp = cloud_timestamp or "Never"
+        self.local_timestamp = local_timestamp or "Never"
+
+    def compose(self) -> ComposeResult:
+        """Compose the sync direction dialog."""
+        with Container(id="dialog-container"):
+            yield Label(f"{Icons.CLOUD}  Choose Sync Direction", classes="header")
+            yield Label(
+                "Both cloud and local data exist. Choose which direction to sync:"
+            )
+            with Container(id="sync-info"):
+                yield Label(f"☁️  Cloud last synced: {self.cloud_timestamp}")
+                yield Label(f"💾 Local last synced: {self.local_timestamp}")
+            with Horizontal(id="dialog-buttons"):
+                yield Button("Cancel", id="btn-cancel", variant="default")
+                yield Button("⬇ Download", id="btn-download", variant="primary")
+                yield Button("⬆ Upload", id="btn-upload", variant="success")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button press."""
+        if event.button.id == "btn-cancel":
+            self.dismiss(None)
+        elif event.button.id == "btn-download":
+            self.dismiss("download")
+        elif event.button.id == "btn-upload":
+            self.dismiss("upload")
+
+    def on_key(self, event) -> None:
+        """Handle keyboard shortcuts."""
+        if event.key == "escape":
+            self.dismiss(None)
+            event.prevent_default()
+
+
+class StartupSyncDialog(ModalScreen):
+    """Modal dialog shown on startup asking if user wants to download from cloud."""
+
+    DEFAULT_CSS = """
+    StartupSyncDialog {
+        align: center middle;
+    }
+
+    StartupSyncDialog > #dialog-container {
+        width: 60;
+        height: 18;
+        border: round $primary;
+        padding: 1;
+    }
+
+    #sync-info {
+        padding: 1 0;
+        background: $panel;
+        margin-bottom: 1;
+    }
+
+    #dialog-buttons {
+        height: auto;
+        layout: horizontal;
+        align: center middle;
+    }
+    """
+
+    def __init__(self, cloud_timestamp: Optional[str]):
+        """Initialize startup sync dialog.
+
+        Args:
+            cloud_timestamp: Last cloud sync timestamp (ISO format)
+        """
+        super().__init__()
+        self.cloud_timestamp = cloud_timestamp or "Unknown"
+
+    def compose(self) -> ComposeResult:
+        """Compose the startup sync dialog."""
+        with Container(id="dialog-container"):
+            yield Label(f"{Icons.CLOUD}  Cloud Data Found", classes="header")
+            yield Label("Cloud sync data is available. Do you want to download it?")
+            with Container(id="sync-info"):
+                yield Label(f"☁️  Last synced: {self.cloud_timestamp}")
+                yield Label("⚠️  This will replace your local data")
+            with Horizontal(id="dialog-buttons"):
+                yield Button("Skip", id="btn-skip", variant="default")
+                yield Button("⬇ Download", id="btn-download", variant="primary")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button press."""
+        if event.button.id == "btn-skip":
+            self.dismiss(False)
+        elif event.button.id == "btn-download":
+            self.dismiss(True)
+
+    def on_key(self, event) -> None:
+        """Handle keyboard shortcuts."""
+        if event.key == "escape":
+            self.dismiss(False)
+            event.prevent_default()
+
+
+class DeviceLinkDialog(ModalScreen):
+    """Modal dialog for device authorization flow.
+
+    This dialog handles the device linking process:
+    1. Requests a device code from the server
+    2. Displays the user code and verification URL
+    3. Polls for authorization while user confirms on the web
+    4. Saves credentials on success
+    """
+
+    DEFAULT_CSS = """
+    DeviceLinkDialog {
+        align: center middle;
+    }
+
+    DeviceLinkDialog > #dialog-container {
+        width: 60;
+        height: auto;
+        border: round $primary;
+        padding: 1 2;
+    }
+
+    DeviceLinkDialog .header {
+        text-style: bold;
+        color: $primary;
+        text-align: center;
+        margin-bottom: 1;
+    }
+
+    DeviceLinkDialog .section-description {
+        color: $text-muted;
+        text-align: center;
+    }
+
+    DeviceLinkDialog #code-display {
+        background: $panel;
+        padding: 1 2;
+        margin: 1 0;
+        text-align: center;
+        border: round $accent;
+        height: auto;
+    }
+
+    DeviceLinkDialog #user-code {
+        text-style: bold;
+        color: $accent;
+        text-align: center;
+    }
+
+    DeviceLinkDialog #verification-url {
+        color: $primary;
+        text-align: center;
+        margin-top: 1;
+    }
+
+    DeviceLinkDialog #status-container {
+        height: auto;
+        margin: 1 0;
+    }
+
+    DeviceLinkDialog #status-text {
+        text-align: center;
+    }
+
+    DeviceLinkDialog .status-pending {
+        color: $warning;
+    }
+
+    DeviceLinkDialog .status-success {
+        color: $success;
+    }
+
+    DeviceLinkDialog .status-error {
+        color: $error;
+    }
+
+    DeviceLinkDialog #dialog-buttons {
+        height: auto;
+        layout: horizontal;
+        align: center middle;
+        margin-top: 1;
+    }
+
+    DeviceLinkDialog LoadingIndicator {
+        height: 3;
+    }
+
+    DeviceLinkDialog #loading-container {
+        height: auto;
+    }
+
+    DeviceLinkDialog .user-info {
+        color: $success;
+        text-align: center;
+        margin: 1 0;
+    }
+    """
+
+    def __init__(self, api_url: str = "https://tuido.dev/api"):
+        super().__init__()
+        self.api_url = api_url
+        self.device_code: Optional[str] = None
+        self.authorization_task = None
+        self._cancelled = False
+
+    def compose(self) -> ComposeResult:
+        """Compose the device link dialog."""
+        with Container(id="dialog-container"):
+            yield Label(f"{Icons.LINK} Link Device", classes="header")
+            yield Static(
+                "Link this device to your Tuido account",
+                classes="section-description",
+            )
+
+            # Loading state (shown initially)
+            with Container(id="loading-container"):
+                yield LoadingIndicator(id="loading-indicator")
+                yield Static("Requesting device code...", id="status-text")
+
+            # Code display (hidden initially, shown after code received)
+            with Container(id="code-display"):
+                yield Static("", id="user-code")
+                yield Static("", id="verification-url")
+
+            # Status container for polling updates
+            with Container(id="status-container"):
+                yield Static("", id="auth-status")
+
+            with Horizontal(id="dialog-buttons"):
+                yield Button("Cancel", id="btn-cancel", variant="default")
+                yield Button(
+                    f"{Icons.LINK} Open Browser",
+                    id="btn-open-browser",
+                    variant="primary",
+                    disabled=True,
+                )
+
+    def on_mount(self) -> None:
+        """Start the device authorization flow when dialog mounts."""
+        # Hide code display initially
+        self.query_one("#code-display", Container).display = False
+        self.query_one("#status-container", Container).display = False
+
+        # Start authorization flow
+        self.authorization_task = self.run_worker(
+            self._run_authorization_flow(), exclusive=True
+        )
+
+    async def _run_authorization_flow(self) -> None:
+        """Run the device authorization flow."""
+        from ..cloud_sync import (
+            AuthorizationResult,
+            CloudSyncClient,
+            DeviceCodeResponse,
+        )
+
+        client = CloudSyncClient(api_url=self.api_url, api_token="")
+
+        try:
+            async for result in client.authorize_device():
+                if self._cancelled:
+                    return
+
+                if isinstance(result, DeviceCodeResponse):
+                    # Show the device code to the user
+                    self._show_device_code(result)
+                elif isinstance(result, AuthorizationResult):
+                    self._update_auth_status(result)
+                    if result.status in ("authorized", "expired", "denied", "error"):
+                        break
+        except Exception as e:
+            self._show_error(str(e))
+
+    def _show_device_code(self, code_response: DeviceCodeResponse) -> None:
+        """Display the device code to the user."""
+        self.device_code = code_response.device_code
+
+        # Hide loading, show code display
+        self.query_one("#loading-container", Container).display = False
+        self.query_one("#code-display", Container).display = True
+        self.query_one("#status-container", Container).display = True
+
+        # Update code display
+        user_code = self.query_one("#user-code", Static)
+        user_code.update(f"  {code_response.user_code}  ")
+
+        verification_url = self.query_one("#verification-url", Static)
+        verification_url.update(f"Go to: {code_response.verification_url}")
+
+        # Update status
+        status = self.query_one("#auth-status", Static)
+        status.update("Waiting for you to confirm in browser...")
+        status.remove_class("status-success", "status-error")
+        status.add_class("status-pending")
+
+        # Enable browser button and store URL
+        browser_btn = self.query_one("#btn-open-browser", Button)
+        browser_btn.disabled = False
+        self._verification_url = code_response.verification_url
+
+    def _update_auth_status(self, result: AuthorizationResult) -> None:
+        """Update the authorization status display."""
+        status = self.query_one("#auth-status", Static)
+
+        if result.status == "pending":
+            status.update("Waiting for you to confirm in browser...")
+            status.remove_class("status-success", "status-error")
+            status.add_class("status-pending")
+
+        elif result.status == "authorized":
+            # Success!
+            status.update(f"{Icons.CHECK} Device linked successfully!")
+            status.remove_class("status-pending", "status-error")
+            status.add_class("status-success")
+
+            # Show user info if available
+            if result.user_email:
+                user_info = f"Linked to: {result.user_email}"
+                if result.user_name:
+                    user_info = f"Linked to: {result.user_name} ({result.user_email})"
+                auth_status_container = self.query_one("#status-container", Container)
+                auth_status_container.mount(Static(user_info, classes="user-info"))
+
+            # Change Cancel to Done
+            cancel_btn = self.query_one("#btn-cancel", Button)
+            cancel_btn.label = "Done"
+            cancel_btn.variant = "success"
+
+            # Hide browser button
+            self.query_one("#btn-open-browser", Button).display = False
+
+        elif result.status == "expired":
+            status.update(f"{Icons.TIMES} Code expired. Please try again.")
+            status.remove_class("status-pending", "status-success")
+            status.add_class("status-error")
+
+        elif result.status == "denied":
+            status.update(f"{Icons.TIMES} Authorization denied.")
+            status.remove_class("status-pending", "status-success")
+            status.add_class("status-error")
+
+        elif result.status == "error":
+            error_msg = result.error or "Unknown error"
+            status.update(f"{Icons.WARNING} Error: {error_msg}")
+            status.remove_class("status-pending", "status-success")
+            status.add_class("status-error")
+
+    def _show_error(self, error: str) -> None:
+        """Show an error message."""
+        self.query_one("#loading-container", Container).display = False
+        self.query_one("#code-display", Container).display = False
+        self.query_one("#status-container", Container).display = True
+
+        status = self.query_one("#auth-status", Static)
+        status.update(f"{Icons.WARNING} {error}")
+        status.remove_class("status-pending", "status-success")
+        status.add_class("status-error")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button press."""
+        if event.button.id == "btn-cancel":
+            self._cancelled = True
+            if self.authorization_task:
+                self.authorization_task.cancel()
+            # Return True if device was successfully linked
+            from ..encryption import has_device_token
+
+            is_linked = has_device_token()
+            self.dismiss(is_linked)
+
+        elif event.button.id == "btn-open-browser":
+            if hasattr(self, "_verification_url"):
+                webbrowser.open(self._verification_url)
+
+    def on_key(self, event) -> None:
+        """Handle keyboard shortcuts."""
+        if event.key == "escape":
+            self._cancelled = True
+            if self.authorization_task:
+                self.authorization_task.cancel()
+            self.dismiss(False)
+            event.prevent_default()
+
+
+class UnlinkDeviceDialog(ModalScreen):
+    """Modal dialog for unlinking the current device."""
+
+    DEFAULT_CSS = """
+    UnlinkDeviceDialog {
+        align: center middle;
+    }
+
+    UnlinkDeviceDialog > #dialog-container {
+        width: 55;
+        height: auto;
+        border: round $warning;
+        padding: 1 2;
+    }
+
+    UnlinkDeviceDialog .header {
+        text-style: bold;
+        color: $warning;
+        margin-bottom: 1;
+    }
+
+    UnlinkDeviceDialog .section-description {
+        color: $text-muted;
+        margin-bottom: 1;
+    }
+
+    UnlinkDeviceDialog #dialog-buttons {
+        height: auto;
+        layout: horizontal;
+        align: center middle;
+        margin-top: 1;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        """Compose the unlink device dialog."""
+        with Container(id="dialog-container"):
+            yield Label(f"{Icons.WARNING} Unlink Device", classes="header")
+            yield Static(
+                "Are you sure you want to unlink this device?",
+                classes="section-description",
+            )
+            yield Static(
+                "You will need to link again to use cloud sync.",
+                classes="section-description",
+            )
+            with Horizontal(id="dialog-buttons"):
+                yield Button("Cancel", id="btn-cancel", variant="default")
+                yield Button("Unlink", id="btn-unlink", variant="warning")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button press."""
+        if event.button.id == "btn-cancel":
+            self.dismiss(False)
+        elif event.button.id == "btn-unlink":
+            # Delete device credentials from keyring
+            from ..encryption import delete_device_credentials
+
+            delete_device_credentials()
+            self.dismiss(True)
+
+    def on_key(self, event) -> None:
+        """Handle keyboard shortcuts."""
+        if event.key == "escape":
+            self.dismiss(False)
+            event.prevent_default()
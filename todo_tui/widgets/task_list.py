@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from functools import partial
+from typing import Callable, List, Optional, Set, Tuple
 
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
 from textual.message import Message
+from textual.timer import Timer
 from textual.widgets import Input, ListItem, ListView, Static
 
+from ..fuzzy import FuzzyIndex
 from ..icons import Icons
 from ..models import Task
 
@@ -51,8 +54,30 @@ class TaskListPanel(Container):
         Binding("ctrl+s", "cycle_sort", "Sort", show=True),
     ]
 
-    def __init__(self, id: str = "task-list-panel"):
+    # Seconds of no typing before the search index is queried
+    SEARCH_DELAY = 0.3
+
+    def __init__(
+        self,
+        id: str = "task-list-panel",
+        search: Optional[Callable[[str], Set[str]]] = None,
+    ):
+        """Initialize the panel.
+
+        Args:
+            id: Widget ID.
+            search: Returns the IDs of the tasks matching a query (the
+                storage's search index). Called on a worker thread once
+                typing pauses; the tasks it finds are then listed after the
+                fuzzy title matches, along with tasks whose description
+                contains the query.
+        """
         super().__init__(id=id)
+        self.search = search
+        self._matcher = FuzzyIndex()
+        # The query last looked up with ``search`` and the task IDs it found
+        self._index_hits: Tuple[str, Set[str]] = ("", set())
+        self._search_timer: Optional[Timer] = None
         self.tasks: List[Task] = []
         self.displayed_tasks: List[Task] = []
         self.selected_task: Optional[Task] = None
@@ -78,6 +103,8 @@ class TaskListPanel(Container):
 
         self.tasks = tasks
         self._update_list()
+        if self.search_query.strip():
+            self._schedule_index_search()
 
     def _sort_tasks(self, tasks: List[Task]) -> List[Task]:
         """Sort tasks based on current sort mode, with completed tasks at bottom."""
@@ -144,19 +171,10 @@ class TaskListPanel(Container):
             )
             return
 
-        # Filter tasks based on search query
-        filtered_tasks = self.tasks
-        if self.search_query:
-            query_lower = self.search_query.lower()
-            filtered_tasks = [
-                t
-                for t in self.tasks
-                if query_lower in t.title.lower()
-                or query_lower in t.description.lower()
-            ]
-
-        # Apply sorting
-        filtered_tasks = self._sort_tasks(filtered_tasks)
+        # Apply sorting, then filter and rank by the search query
+        filtered_tasks = self._sort_tasks(self.tasks)
+        if self.search_query.strip():
+            filtered_tasks = self._match_tasks(filtered_tasks)
 
         # Store the displayed tasks for selection logic
         self.displayed_tasks = filtered_tasks
@@ -196,6 +214,71 @@ class TaskListPanel(Container):
                 )
             )
 
+    def _match_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Get the tasks matching the search query, best first.
+
+        Fuzzy title matches come first, ranked; tasks whose description
+        contains the query, or that the search index found (by notes or
+        subtasks), follow in list order. Completed tasks stay at the bottom.
+
+        Args:
+            tasks: The tasks, sorted.
+        """
+        self._matcher.sync((t.id, t.title, 0.0) for t in self.tasks)
+        by_id = {t.id: t for t in tasks}
+        matches = [
+            by_id[match.key] for match in self._matcher.search(self.search_query)
+        ]
+        query_lower = self.search_query.lower()
+        found = set()
+        for task in tasks:
+            # Summary tasks carry their description lowercased, without the body
+            text = task.search_text if task.summary_only else task.description.lower()
+            if query_lower in text:
+                found.add(task.id)
+        if self.search is not None:
+            query, hits = self._index_hits
+            if query == self.search_query:
+                found |= hits
+        ranked = {t.id for t in matches}
+        matches += [t for t in tasks if t.id in found and t.id not in ranked]
+        matches.sort(key=lambda t: t.completed)
+        return matches
+
+    def _schedule_index_search(self) -> None:
+        """Query the search index for the current query once typing pauses."""
+        if self.search is None:
+            return
+        if self._search_timer is not None:
+            self._search_timer.stop()
+        self._search_timer = self.set_timer(self.SEARCH_DELAY, self._start_index_search)
+
+    def _start_index_search(self) -> None:
+        """Run the index query off the UI thread (it may build the index)."""
+        self._search_timer = None
+        query = self.search_query
+        if query.strip() and self.search is not None:
+            self.run_worker(
+                partial(self._search_index, query),
+                thread=True,
+                exclusive=True,
+                group="task-search",
+            )
+
+    def _search_index(self, query: str) -> None:
+        """Worker: look a query up in the search index."""
+        hits = self.search(query)
+        self.app.call_from_thread(self._show_index_hits, query, hits)
+
+    def _show_index_hits(self, query: str, hits: Set[str]) -> None:
+        """List the tasks the index found, unless the query changed meanwhile."""
+        if query != self.search_query:
+            return
+        self._index_hits = (query, hits)
+        listed = {t.id for t in self.displayed_tasks}
+        if not hits <= listed:
+            self._update_list()
+
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle task selection."""
         # Get the index of the selected item
@@ -234,6 +317,27 @@ class TaskListPanel(Container):
             self.selected_task = None
             self.post_message(TaskSelected(None))
 
+    def select_task(self, task_id: str) -> bool:
+        """Select a listed task by ID, e.g. from a search result.
+
+        Clears the search query so the task is shown.
+
+        Returns:
+            True if the task is in the list.
+        """
+        if self.search_query:
+            self.search_query = ""
+            self.query_one("#task-search-input", Input).value = ""
+            self._update_list()
+        for i, task in enumerate(self.displayed_tasks):
+            if task.id != task_id:
+                continue
+            self.query_one("#task-list", ListView).index = i
+            self.selected_task = task
+            self.post_message(TaskSelected(task))
+            return True
+        return False
+
     def refresh_display(self) -> None:
         """Refresh the task list display."""
         self._update_list()
@@ -243,6 +347,8 @@ class TaskListPanel(Container):
         if event.input.id == "task-search-input":
             self.search_query = event.value
             self._update_list()
+            if self.search_query.strip():
+                self._schedule_index_search()
 
     def action_focus_search(self) -> None:
         """Focus the search input."""